@@ -13,6 +13,7 @@ from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QLibraryInfo, Qt
 from PyQt5.QtGui import QPalette, QColor, QIcon
 from ui.main_window import MainWindow
+from ui.dataset_writer import enable_copy_on_write
 from ui.resource_utils import resource_path
 from ui.logging_utils import init_logging, get_logger
 
@@ -77,6 +78,8 @@ def main():
     """Initialize and run the application."""
     log_path = init_logging()
     logger.info("Starting DataLens (log: %s)", log_path)
+    # The Main and Editing Views share one copy of the data until edited.
+    enable_copy_on_write()
     # Step 1: Set AppUserModelID BEFORE QApplication (critical for Windows taskbar icon)
     if platform.system() == 'Windows':
         try:
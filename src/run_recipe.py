@@ -0,0 +1,92 @@
+"""
+Headless recipe runner.
+
+Rebuilds a cleaned dataset by replaying a working copy's preprocessing
+recipe (see ``ui.recipes``) on a fresh original, without the GUI, e.g.
+from a nightly job::
+
+    python run_recipe.py orders.recipe.json cleaned.csv --input orders.csv
+    python run_recipe.py copies/Sales_orders_1.csv cleaned.csv --workspace ~/DataLens/Sales
+
+With ``--workspace`` the recipe is the one stored with that working
+copy, the input defaults to the copy's original and the workspace's
+engine setting is used.  The output is a plain CSV unless
+``--compression`` is given.
+"""
+
+import argparse
+import os
+import sys
+
+from ui.compression import available_codecs
+from ui.engines import DEFAULT_ENGINE, engine_options, get_engine
+from ui.logging_utils import get_logger
+from ui.metadata_store import load_settings
+from ui.operations import describe_operation
+from ui.recipes import RecipeError, RecipeStore, read_recipe, run_recipe
+
+
+logger = get_logger(__name__)
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Replay a preprocessing recipe on a fresh dataset."
+    )
+    parser.add_argument("recipe", help="exported recipe file, or a working copy "
+                                       "(e.g. copies/foo_1.csv) with --workspace")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--workspace", help="workspace folder holding the working copy")
+    parser.add_argument("--input", help="dataset to replay the recipe on "
+                                        "(default: the copy's original)")
+    parser.add_argument("--engine", choices=[name for name, _ in engine_options()],
+                        help="dataframe engine (default: the workspace's, else pandas)")
+    parser.add_argument("--compression", choices=available_codecs(),
+                        help="compress the output (default: none)")
+    parser.add_argument("--force", action="store_true",
+                        help="run a recipe with edits that cannot be replayed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    settings = {}
+    if args.workspace:
+        data_folder = os.path.join(args.workspace, "data")
+        recipe = RecipeStore(data_folder).load(args.recipe)
+        if recipe is None:
+            print(f"No recipe is stored for {args.recipe} in {args.workspace}.", file=sys.stderr)
+            return 1
+        settings = load_settings(args.workspace)
+        input_path = args.input
+        if input_path is None and recipe.get("original"):
+            input_path = os.path.join(data_folder, recipe["original"].replace("/", os.sep))
+    else:
+        try:
+            recipe = read_recipe(args.recipe)
+        except RecipeError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        input_path = args.input
+    if input_path is None:
+        print("No input dataset: pass --input.", file=sys.stderr)
+        return 1
+
+    engine = get_engine(args.engine or settings.get('engine', DEFAULT_ENGINE))
+    codec = args.compression
+
+    def report(done, total, op):
+        print(f"[{done}/{total}] {describe_operation(op)}")
+
+    try:
+        df = run_recipe(recipe, input_path, args.output, engine, codec, args.force, report)
+    except (RecipeError, OSError) as e:
+        logger.error("Recipe run failed: %s", e)
+        print(str(e), file=sys.stderr)
+        return 1
+    print(f"Wrote {args.output}: {len(df):,} rows, {len(df.columns)} columns")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Incremental loading of CSVs that another process keeps appending to.
+
+A watched original remembers the file it was imported from (its
+*source*) and ``offset``: the byte position in the source just past the
+last row copied into the workspace.  When the source grows,
+``read_appended`` returns only the complete rows written since (a row
+still being written is left for the next poll), the stored original is
+extended with those bytes, and ``parse_rows`` parses them against the
+source's header.  ``append_frame`` then adds them to a frame already in
+memory, keeping its dtypes where the new values allow.
+
+Sources must be plain (uncompressed) CSV files that only ever grow.
+"""
+
+import io
+import os
+import warnings
+
+import pandas as pd
+
+from .compression import detect_codec, open_dataset
+from .fingerprint import BLOCK_SIZE
+
+
+# Quiet period after a change notification before the source is read, so
+# a burst of writes is picked up in one pass.
+WATCH_DEBOUNCE_MS = 500
+
+
+class SourceTruncated(OSError):
+    """A watched source is shorter than the rows already read from it."""
+
+
+def header_line(path):
+    """Raw bytes of the first line of ``path``, newline included."""
+    with open_dataset(path) as f:
+        return f.readline()
+
+
+def check_source(source, stored, offset):
+    """Raise ValueError unless ``source`` can continue the stored original.
+
+    The source must be a plain CSV at least ``offset`` bytes long whose
+    first block matches the stored original's.
+    """
+    if not os.path.isfile(source):
+        raise ValueError(f"{source} does not exist.")
+    if detect_codec(source) is not None:
+        raise ValueError(f"{os.path.basename(source)} is compressed; only plain CSV files can be watched.")
+    if os.path.getsize(source) < offset:
+        raise ValueError(f"{os.path.basename(source)} is shorter than the imported data.")
+    length = min(offset, BLOCK_SIZE)
+    with open(source, 'rb') as f:
+        head = f.read(length)
+    with open_dataset(stored) as f:
+        if f.read(length) != head:
+            raise ValueError(
+                f"{os.path.basename(source)} does not start with the rows of the imported data.")
+
+
+def read_appended(source, offset):
+    """Return ``(data, new_offset)``: the complete rows written past ``offset``.
+
+    ``data`` is empty when nothing (or only a partial row) was added.
+    Raises ``SourceTruncated`` if the file shrank below ``offset``.
+    """
+    size = os.path.getsize(source)
+    if size < offset:
+        raise SourceTruncated(f"{source} was truncated")
+    if size == offset:
+        return b"", offset
+    with open(source, 'rb') as f:
+        f.seek(offset)
+        data = f.read(size - offset)
+    end = data.rfind(b"\n") + 1
+    return data[:end], offset + end
+
+
+def parse_rows(header, data, like=None):
+    """Parse ``data`` (CSV rows without a header) using ``header``.
+
+    With ``like``, columns whose dtype ``read_csv`` would not infer the
+    same way (datetimes, pyarrow strings) are converted to ``like``'s.
+    """
+    rows = pd.read_csv(io.BytesIO(header + data), low_memory=False)
+    if like is None:
+        return rows
+    for col in rows.columns.intersection(like.columns):
+        dtype = like[col].dtype
+        if rows[col].dtype == dtype or isinstance(dtype, pd.CategoricalDtype):
+            continue  # categories are merged by append_frame
+        try:
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    rows[col] = pd.to_datetime(rows[col]).astype(dtype)
+            elif isinstance(dtype, pd.StringDtype):
+                rows[col] = rows[col].astype(dtype)
+        except (ValueError, TypeError):
+            pass  # left as parsed; concat widens the column
+    return rows
+
+
+def append_frame(frame, rows):
+    """Return ``frame`` with ``rows`` added at the end.
+
+    Only ``frame``'s columns are kept (a projected load stays projected);
+    the new rows are numbered on from the last index label.  Categorical
+    columns gain the new rows' categories; other columns are widened by
+    ``concat`` if the new values do not fit (e.g. a downcast int8).
+    """
+    rows = rows.reindex(columns=frame.columns)
+    start = frame.index[-1] + 1 if len(frame) and pd.api.types.is_integer_dtype(frame.index) else len(frame)
+    rows.index = pd.RangeIndex(start, start + len(rows))
+    frame = frame.copy(deep=False)
+    for col in frame.columns:
+        dtype = frame[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            new = pd.Index(rows[col].dropna().unique()).difference(dtype.categories)
+            if len(new):
+                frame[col] = frame[col].cat.add_categories(new)
+            rows[col] = rows[col].astype(frame[col].dtype)
+    return pd.concat([frame, rows])
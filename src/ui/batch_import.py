@@ -0,0 +1,161 @@
+"""
+Batch import of CSV shards.
+
+Nightly drops arrive as dozens of CSV files.  ``copy_shards`` brings one
+of them (or a group of shards concatenated into one file) into
+``data/originals/`` in a single pass over the bytes: the copy, its
+content fingerprint and the newline count a header scan needs are all
+produced by the same read.  Where the filesystem can clone (and the
+workspace stores datasets uncompressed), the copy is a reflink and the
+one read is only the hashing.
+
+``DataManager.import_batch`` runs ``copy_shards`` for every file of a
+batch on a small thread pool (file I/O and hashing release the GIL) and
+registers the results in one metadata update.
+
+Shards "match" when their header rows are identical.  Concatenating such
+files as text gives the same table as concatenating their parses.
+"""
+
+import csv
+import glob
+import hashlib
+import os
+import re
+import threading
+
+from .compression import open_dataset_writer
+from .excel_io import ImportCancelled
+from .file_utils import reflink
+from .fingerprint import BLOCK_SIZE
+
+
+# Files copied and hashed at the same time.
+IMPORT_WORKERS = 4
+
+
+def expand_sources(folder, pattern="*.csv"):
+    """Return the files under ``folder`` matching ``pattern``, sorted by path.
+
+    ``pattern`` is a glob relative to ``folder``; ``**`` matches
+    sub-folders.
+    """
+    matches = glob.glob(os.path.join(folder, pattern), recursive=True)
+    return sorted(path for path in matches if os.path.isfile(path))
+
+
+def read_header(path):
+    """Return the column names of a CSV's header row as a tuple."""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        return tuple(next(csv.reader(f), ()))
+
+
+def group_shards(paths):
+    """Group ``paths`` by header row, keeping the order files were given in.
+
+    Returns a list of path lists; files that cannot be read form groups
+    of their own (the import reports their error).
+    """
+    groups = {}
+    for path in paths:
+        try:
+            key = read_header(path)
+        except (OSError, csv.Error):
+            key = path
+        groups.setdefault(key if key else path, []).append(path)
+    return list(groups.values())
+
+
+def combined_name(paths):
+    """Name for the concatenation of ``paths``: their common stem, e.g. ``sales.csv``."""
+    stems = [os.path.splitext(os.path.basename(p))[0] for p in paths]
+    prefix = re.sub(r"[\s_\-.]*\d*$", "", os.path.commonprefix(stems))
+    return f"{prefix}.csv" if prefix else f"{stems[0]}_combined.csv"
+
+
+def unique_name(name, taken):
+    """``name``, or ``<stem>_2.csv``, ``<stem>_3.csv``, ... if it is in ``taken``."""
+    stem, ext = os.path.splitext(name)
+    candidate, n = name, 1
+    while candidate in taken:
+        n += 1
+        candidate = f"{stem}_{n}{ext}"
+    return candidate
+
+
+class BatchProgress:
+    """Bytes processed by all workers of a batch, and its cancel flag."""
+
+    def __init__(self, total_bytes):
+        self.total = max(total_bytes, 1)
+        self.done = 0
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def advance(self, nbytes):
+        if self.cancelled:
+            raise ImportCancelled()
+        with self._lock:
+            self.done += nbytes
+
+    @property
+    def fraction(self):
+        return min(self.done / self.total, 1.0)
+
+
+def copy_shards(sources, dest, progress=None, codec=None):
+    """Write ``sources`` to ``dest`` as one CSV and return ``{hash, lines}``.
+
+    With several sources, the header row is taken from the first and
+    skipped in the rest.  ``dest`` is compressed with ``codec`` (see
+    ``compression``).  ``hash`` is the content fingerprint of ``dest``
+    (see ``fingerprint.content_hash``) and ``lines`` the number of lines
+    in it, header included.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    counter = {"lines": 0, "last": b"\n"}
+
+    def consume(block):
+        digest.update(block)
+        counter["lines"] += block.count(b"\n")
+        counter["last"] = block[-1:]
+        if progress is not None:
+            progress.advance(len(block))
+
+    if codec is None and len(sources) == 1 and reflink(sources[0], dest):
+        with open(dest, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                consume(block)
+    else:
+        with open_dataset_writer(dest, codec) as out:
+            for i, source in enumerate(sources):
+                with open(source, 'rb') as f:
+                    first = f.read(BLOCK_SIZE)
+                    if i > 0:
+                        first = _skip_header(f, first)
+                        if counter["last"] != b"\n":  # unterminated last row
+                            out.write(b"\n")
+                            consume(b"\n")
+                    for block in _chain(first, f):
+                        out.write(block)
+                        consume(block)
+    lines = counter["lines"] + (counter["last"] != b"\n")
+    return {"hash": digest.hexdigest(), "lines": lines}
+
+
+def _skip_header(f, block):
+    """Drop the bytes up to and including the first newline of a file."""
+    while True:
+        end = block.find(b"\n")
+        if end >= 0:
+            return block[end + 1:]
+        more = f.read(BLOCK_SIZE)
+        if not more:
+            return b""
+        block = more
+
+
+def _chain(first, f):
+    if first:
+        yield first
+    yield from iter(lambda: f.read(BLOCK_SIZE), b'')
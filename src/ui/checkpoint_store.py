@@ -0,0 +1,246 @@
+"""
+Named checkpoints of working copies.
+
+A checkpoint is a snapshot of the Editing View frame saved under a name
+next to the working copy it was made from, so a cleaning session can be
+picked up again (or branched) after the workspace is closed::
+
+    data/.checkpoints/copies/foo_1.csv.ckpt/index.json
+    data/.checkpoints/copies/foo_1.csv.ckpt/<digest>.feather
+
+Columns are stored one per Feather file named after a hash of their
+contents, and every checkpoint of a copy draws on the same files: a new
+checkpoint writes only the columns no earlier checkpoint already holds,
+so a checkpoint taken after a few edits costs about the size of those
+edits.  Restoring reads the column files back, which is much faster
+than parsing the copy's CSV.
+
+Each entry also keeps the edit log of the session it was taken from and
+the state of the copy it applies to, so the log can be adopted again as
+long as the copy has not been saved since.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .dataset_cache import HAS_PYARROW
+from .file_utils import atomic_write
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+CHECKPOINTS_DIRNAME = ".checkpoints"
+_VALUE = "v"  # name of the single column inside each file
+
+
+def column_digest(series):
+    """Content hash of ``series`` (values and dtype, not its name or labels)."""
+    digest = hashlib.sha1(str(series.dtype).encode("utf-8"))
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        digest.update(pd.util.hash_pandas_object(series.dtype.categories.to_series(), index=False)
+                      .to_numpy().tobytes())
+    hashes = pd.util.hash_pandas_object(series, index=False, categorize=False)
+    digest.update(np.ascontiguousarray(hashes.to_numpy()).tobytes())
+    return digest.hexdigest()[:24]
+
+
+class CheckpointStore:
+    """Checkpoints and their column files for the copies of one workspace."""
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.root = os.path.join(data_folder, CHECKPOINTS_DIRNAME)
+
+    @property
+    def available(self):
+        return HAS_PYARROW
+
+    def _dir(self, rel_path):
+        return os.path.join(self.root, rel_path.replace("/", os.sep) + ".ckpt")
+
+    def _index_path(self, rel_path):
+        return os.path.join(self._dir(rel_path), "index.json")
+
+    def _file_path(self, rel_path, file_id):
+        return os.path.join(self._dir(rel_path), f"{file_id}.feather")
+
+    # ── Index ─────────────────────────────────────────────────────────────
+
+    def list(self, rel_path):
+        """Checkpoints of ``rel_path``, oldest first (entries of ``index.json``)."""
+        try:
+            with open(self._index_path(rel_path), 'r') as f:
+                return json.load(f).get("checkpoints", [])
+        except FileNotFoundError:
+            return []
+        except Exception:
+            logger.exception("Unreadable checkpoint index for %s", rel_path)
+            return []
+
+    def get(self, rel_path, name):
+        return next((cp for cp in self.list(rel_path) if cp["name"] == name), None)
+
+    def _write_index(self, rel_path, checkpoints):
+        def write(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump({"checkpoints": checkpoints}, f, indent=1, default=str)
+
+        atomic_write(self._index_path(rel_path), write)
+        self._prune(rel_path, checkpoints)
+
+    # ── Read / write ──────────────────────────────────────────────────────
+
+    def _write_series(self, rel_path, series):
+        """Store ``series`` unless an identical column is stored already; returns its file id."""
+        file_id = column_digest(series)
+        path = self._file_path(rel_path, file_id)
+        if not os.path.isfile(path):
+            frame = series.reset_index(drop=True).to_frame(_VALUE)
+            atomic_write(path, lambda tmp: frame.to_feather(tmp))
+        return file_id
+
+    def _read_series(self, rel_path, file_id, dtype):
+        series = pd.read_feather(self._file_path(rel_path, file_id))[_VALUE]
+        if dtype == "object" and series.dtype != object:
+            series = series.astype(object)  # text comes back as str
+        return series
+
+    def save(self, rel_path, name, df, operations=None, base=None, projection=None, progress=None):
+        """Store ``df`` as checkpoint ``name`` of ``rel_path``, replacing one of that name.
+
+        ``operations`` / ``base`` are the session's edit log and the state
+        of the copy it applies to (see ``DataManager.save_checkpoint``).
+        ``progress(fraction)`` is called after every column.  Raises
+        ValueError if a column cannot be stored (mixed value types).
+        Returns the new entry.
+        """
+        os.makedirs(self._dir(rel_path), exist_ok=True)
+        columns = []
+        total = len(df.columns) + 1
+        try:
+            for position in range(len(df.columns)):
+                series = df.iloc[:, position]
+                columns.append({
+                    "name": df.columns[position],
+                    "file": self._write_series(rel_path, series),
+                    "dtype": str(series.dtype),
+                })
+                if progress is not None:
+                    progress((position + 1) / total)
+            if isinstance(df.index, pd.RangeIndex):
+                index = {"start": df.index.start, "stop": df.index.stop, "step": df.index.step}
+            else:
+                labels = df.index.to_series()
+                index = {"file": self._write_series(rel_path, labels), "dtype": str(labels.dtype),
+                         "name": df.index.name}
+        except (ValueError, TypeError) as e:
+            # Mixed-type object columns have no Arrow equivalent.
+            self._prune(rel_path, self.list(rel_path))
+            raise ValueError(f"Column cannot be stored in a checkpoint: {e}") from e
+
+        entry = {
+            "name": name,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "rows": len(df),
+            "columns": columns,
+            "index": index,
+            "operations": operations,
+            "base": base,
+            "projection": projection,
+        }
+        checkpoints = [cp for cp in self.list(rel_path) if cp["name"] != name]
+        checkpoints.append(entry)
+        self._write_index(rel_path, checkpoints)
+        if progress is not None:
+            progress(1.0)
+        logger.info("Saved checkpoint %r of %s (%d columns)", name, rel_path, len(columns))
+        return entry
+
+    def load(self, rel_path, name, progress=None):
+        """Return ``(df, entry)`` for checkpoint ``name`` of ``rel_path``.
+
+        Raises KeyError if there is no such checkpoint and OSError if its
+        files cannot be read.
+        """
+        entry = self.get(rel_path, name)
+        if entry is None:
+            raise KeyError(name)
+        values = {}
+        columns = entry["columns"]
+        try:
+            for position, column in enumerate(columns):
+                values[position] = self._read_series(rel_path, column["file"], column["dtype"])
+                if progress is not None:
+                    progress((position + 1) / (len(columns) + 1))
+            index = entry["index"]
+            if "file" in index:
+                labels = self._read_series(rel_path, index["file"], index["dtype"])
+                # ``rename``: ``name=None`` would keep the Series name.
+                index = pd.Index(labels).rename(index.get("name"))
+            else:
+                index = pd.RangeIndex(index["start"], index["stop"], index["step"])
+        except Exception as e:
+            raise OSError(f"checkpoint files of {name!r} could not be read: {e}") from e
+        df = pd.DataFrame(values, copy=False)
+        if not columns:
+            df = pd.DataFrame(index=pd.RangeIndex(entry["rows"]))
+        df.columns = pd.Index([column["name"] for column in columns])
+        df.index = index
+        if progress is not None:
+            progress(1.0)
+        return df, entry
+
+    def delete(self, rel_path, name):
+        """Remove checkpoint ``name``; column files no other checkpoint uses go with it."""
+        checkpoints = [cp for cp in self.list(rel_path) if cp["name"] != name]
+        if not checkpoints:
+            self.invalidate(rel_path)
+            return
+        self._write_index(rel_path, checkpoints)
+
+    def _prune(self, rel_path, checkpoints):
+        """Delete column files none of ``checkpoints`` refers to."""
+        keep = set()
+        for cp in checkpoints:
+            keep.update(column["file"] for column in cp["columns"])
+            if "file" in cp["index"]:
+                keep.add(cp["index"]["file"])
+        folder = self._dir(rel_path)
+        if not os.path.isdir(folder):
+            return
+        for name in os.listdir(folder):
+            stem, ext = os.path.splitext(name)
+            if ext == ".feather" and stem not in keep:
+                try:
+                    os.remove(os.path.join(folder, name))
+                except OSError:
+                    logger.exception("Failed to remove stale checkpoint file %s", name)
+
+    # ── Housekeeping ──────────────────────────────────────────────────────
+
+    def invalidate(self, rel_path):
+        """Drop every checkpoint of ``rel_path``."""
+        shutil.rmtree(self._dir(rel_path), ignore_errors=True)
+
+    def rename(self, old_rel, new_rel):
+        """Move the checkpoints along with a renamed copy."""
+        src, dst = self._dir(old_rel), self._dir(new_rel)
+        if not os.path.isdir(src):
+            return
+        shutil.rmtree(dst, ignore_errors=True)
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(src, dst)
+        except OSError:
+            logger.exception("Failed to move checkpoints %s -> %s", old_rel, new_rel)
+
+    def clear(self):
+        """Delete every checkpoint in this workspace."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,549 @@
+"""
+Out-of-core datasets.
+
+A CSV that does not fit in memory is opened as a ``ChunkedDataset``: the
+file is parsed once, ``CHUNK_ROWS`` rows at a time, into Feather files in
+a scratch folder under ``data/.cache/chunks/``::
+
+    data/.cache/chunks/<pid>/<dataset id>/000000.feather
+    data/.cache/chunks/<pid>/<dataset id>/000001.feather
+
+Only one chunk is ever held in memory.  The UI pages through the dataset
+with ``page`` and asks for single columns or streamed aggregates; the
+preprocessing operations that can run chunk by chunk (see
+``ChunkedDataset.apply``) write a new dataset next to the old one, which
+stays intact for undo.  Operations that need the whole frame at once
+raise ``OperationError``.
+
+A dataset is immutable and removes its folder once the last reference
+to it is gone.  Folders left behind by a process that did not exit
+cleanly are removed the next time the workspace is opened.
+"""
+
+import bisect
+import io
+import os
+import shutil
+import sys
+import threading
+import uuid
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .compression import disk_position, open_dataset, open_dataset_writer
+from .dataset_cache import CACHE_DIRNAME
+from .file_utils import clone_file
+from .logging_utils import get_logger
+from .operations import OperationError, apply_operation, describe_operation
+
+
+logger = get_logger(__name__)
+
+CHUNKS_DIRNAME = "chunks"
+# Rows per chunk file: a few tens of MB for typical tables.
+CHUNK_ROWS = 250_000
+# Rows materialised as the in-memory preview of an out-of-core dataset.
+PREVIEW_ROWS = 1_000
+
+# Operations whose result for a chunk depends on that chunk alone.
+_ROW_LOCAL = frozenset({
+    "rename_column", "drop_column", "change_type", "filter_rows",
+    "replace_values", "round_column",
+})
+_FILLS = ("Fill with Mean", "Fill with Median", "Fill with Mode")
+
+_swept = set()  # chunk roots cleared of stale sessions by this process
+
+
+def physical_memory():
+    """Total physical memory in bytes, or None if it cannot be determined."""
+    if sys.platform == "win32":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullTotalPhys
+        return None
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _pid_alive(pid):
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows; assume it lives.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def session_folder(data_folder):
+    """Scratch folder for this process's chunked datasets in ``data_folder``.
+
+    The first call per workspace removes the folders of processes that
+    are no longer running.
+    """
+    root = os.path.join(data_folder, CACHE_DIRNAME, CHUNKS_DIRNAME)
+    if root not in _swept:
+        _swept.add(root)
+        try:
+            names = os.listdir(root)
+        except OSError:
+            names = []
+        for name in names:
+            if name.isdigit() and int(name) != os.getpid() and not _pid_alive(int(name)):
+                logger.info("Removing stale chunk folder %s", name)
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    folder = os.path.join(root, str(os.getpid()))
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+# ── Chunk files ───────────────────────────────────────────────────────────
+
+def _as_text(series):
+    """Values as strings, keeping missing values missing."""
+    return series.astype(object).where(series.isna(), series.astype(str))
+
+
+def _write_chunk(df, path):
+    df = df.reset_index(drop=True)
+    try:
+        df.to_feather(path)
+    except (ValueError, TypeError):
+        # Mixed-type object columns have no Arrow type; store them as text.
+        df = df.copy()
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = _as_text(df[col])
+        df.to_feather(path)
+
+
+def _common_dtype(dtypes):
+    """The dtype ``pd.concat`` would give columns of ``dtypes``."""
+    unique = list(dict.fromkeys(dtypes))
+    if len(unique) == 1:
+        return unique[0]
+    return pd.concat([pd.Series(dtype=d) for d in unique]).dtype
+
+
+def _cast(series, dtype):
+    if series.dtype == dtype:
+        return series
+    if dtype == object:
+        return _as_text(series)
+    return series.astype(dtype)
+
+
+class _ChunkWriter:
+    """Collects the chunks of a new dataset and unifies their dtypes."""
+
+    def __init__(self, parent_folder):
+        self.folder = os.path.join(parent_folder, uuid.uuid4().hex)
+        os.makedirs(self.folder)
+        self._files = []  # (file name, rows, {column: dtype})
+        self._columns = None
+        self._template = None  # zero-row frame with the first chunk's dtypes
+        self.reverse = False  # chunks are being added last-to-first
+
+    def add(self, df):
+        if self._columns is None:
+            self._columns = list(df.columns)
+            self._template = df.iloc[:0]
+        if not len(df):
+            return
+        name = f"{len(self._files):06d}.feather"
+        _write_chunk(df, os.path.join(self.folder, name))
+        self._files.append((name, len(df), dict(df.dtypes.items())))
+
+    def link(self, source_path, rows, dtypes):
+        """Reuse an unchanged chunk file of another dataset."""
+        name = f"{len(self._files):06d}.feather"
+        clone_file(source_path, os.path.join(self.folder, name))
+        self._files.append((name, rows, dtypes))
+
+    def finish(self):
+        """Return the ``ChunkedDataset`` of the chunks added so far."""
+        files = self._files[::-1] if self.reverse else self._files
+        if self._columns is None:
+            self._columns, self._template = [], pd.DataFrame()
+        targets = {
+            col: _common_dtype([dtypes[col] for _, _, dtypes in files] or [self._template[col].dtype])
+            for col in self._columns
+        }
+        for name, _rows, dtypes in files:
+            stale = [col for col in self._columns if dtypes[col] != targets[col]]
+            if not stale:
+                continue
+            path = os.path.join(self.folder, name)
+            df = pd.read_feather(path)
+            for col in stale:
+                df[col] = _cast(df[col], targets[col])
+            os.remove(path)  # may be linked to another dataset's chunk
+            _write_chunk(df, path)
+        return ChunkedDataset(self.folder, [(name, rows) for name, rows, _ in files],
+                              self._columns)
+
+    def abort(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+# ── Datasets ──────────────────────────────────────────────────────────────
+
+class ChunkedDataset:
+    """A table stored as row chunks on disk; see the module docstring."""
+
+    def __init__(self, folder, chunks, columns):
+        self.folder = folder
+        self._names = [name for name, _ in chunks]
+        self._offsets = [0]
+        for _, rows in chunks:
+            self._offsets.append(self._offsets[-1] + rows)
+        self._columns = list(columns)
+        self._dtypes = None
+        self._last = (None, None)  # (chunk index, frame) of the last page read
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, shutil.rmtree, folder, True)
+
+    @classmethod
+    def from_csv(cls, path, parent_folder, progress=None, is_cancelled=None,
+                 chunk_rows=CHUNK_ROWS, **read_kwargs):
+        """Split the CSV at ``path`` into a new dataset under ``parent_folder``.
+
+        ``progress(bytes_read, total_bytes, rows)`` and ``is_cancelled()``
+        behave as in ``dataset_loader.read_csv_chunked`` (cancelling raises
+        ``LoadCancelled``).
+        """
+        from .dataset_loader import LoadCancelled
+
+        writer = _ChunkWriter(parent_folder)
+        total_bytes = os.path.getsize(path)
+        rows = 0
+        try:
+            with open_dataset(path) as fh:
+                with pd.read_csv(fh, chunksize=chunk_rows, **read_kwargs) as reader:
+                    for chunk in reader:
+                        if is_cancelled is not None and is_cancelled():
+                            raise LoadCancelled()
+                        writer.add(chunk)
+                        rows += len(chunk)
+                        if progress is not None:
+                            progress(min(disk_position(fh), total_bytes), total_bytes, rows)
+            if rows == 0:
+                with open_dataset(path) as fh:
+                    writer.add(pd.read_csv(fh, **read_kwargs))
+            dataset = writer.finish()
+        except BaseException:
+            writer.abort()
+            raise
+        logger.info("Opened %s out of core: %d rows in %d chunks",
+                    path, len(dataset), dataset.chunk_count)
+        return dataset
+
+    # ── Shape ──
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    @property
+    def chunk_count(self):
+        return len(self._names)
+
+    @property
+    def columns(self):
+        return pd.Index(self._columns)
+
+    @property
+    def shape(self):
+        return len(self), len(self._columns)
+
+    @property
+    def dtypes(self):
+        if self._dtypes is None:
+            self._dtypes = self.head(0).dtypes
+        return self._dtypes
+
+    # ── Reading ──
+
+    def _path(self, index):
+        return os.path.join(self.folder, self._names[index])
+
+    def _read(self, index, columns=None):
+        return pd.read_feather(self._path(index), columns=columns)
+
+    def iter_chunks(self, columns=None):
+        """Yield the chunks in order (only ``columns``, if given)."""
+        for index in range(self.chunk_count):
+            yield self._read(index, columns)
+
+    def page(self, start, stop):
+        """Rows ``start:stop`` as a frame indexed by row position."""
+        start, stop = max(start, 0), min(stop, len(self))
+        if stop <= start:
+            return pd.DataFrame({col: pd.Series(dtype=t) for col, t in self.dtypes.items()})
+        first = bisect.bisect_right(self._offsets, start) - 1
+        parts = []
+        index = first
+        while index < self.chunk_count and self._offsets[index] < stop:
+            with self._lock:
+                cached_index, chunk = self._last
+                if cached_index != index:
+                    chunk = self._read(index)
+                    self._last = (index, chunk)
+            base = self._offsets[index]
+            parts.append(chunk.iloc[max(start - base, 0):stop - base])
+            index += 1
+        df = parts[0] if len(parts) == 1 else pd.concat(parts)
+        df = df.copy()
+        df.index = pd.RangeIndex(start, stop)
+        return df
+
+    def head(self, n=PREVIEW_ROWS):
+        if not self.chunk_count:
+            return pd.DataFrame(columns=self._columns)
+        df = self._read(0)
+        return df.iloc[:n].copy() if n < len(df) else df
+
+    def column(self, name):
+        """One whole column, read chunk by chunk."""
+        parts = [chunk[name] for chunk in self.iter_chunks([name])]
+        if not parts:
+            return pd.Series(dtype=self.dtypes[name], name=name)
+        return pd.concat(parts, ignore_index=True)
+
+    def null_counts(self):
+        """Missing values per column, streamed."""
+        counts = pd.Series(0, index=self.columns, dtype='int64')
+        for chunk in self.iter_chunks():
+            counts += chunk.isna().sum()
+        return counts
+
+    def corr(self, columns=None):
+        """Pearson correlations of numeric ``columns``, streamed.
+
+        Matches ``DataFrame.corr``: each pair uses the rows where both
+        values are present.  Values are shifted by the first chunk's
+        means so the running sums stay well conditioned.
+        """
+        if columns is None:
+            columns = [c for c, t in self.dtypes.items() if pd.api.types.is_numeric_dtype(t)]
+        columns = list(columns)
+        k = len(columns)
+        count = np.zeros((k, k))
+        sum_x = np.zeros((k, k))   # [i, j]: sum of column i where j is present
+        sum_xx = np.zeros((k, k))
+        sum_xy = np.zeros((k, k))
+        shift = None
+        for chunk in self.iter_chunks(columns):
+            values = chunk.to_numpy(dtype='float64', na_value=np.nan)
+            if shift is None:
+                shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(k)
+            present = ~np.isnan(values)
+            x = np.where(present, values - shift, 0.0)
+            weight = present.astype('float64')
+            count += weight.T @ weight
+            sum_x += x.T @ weight
+            sum_xx += (x * x).T @ weight
+            sum_xy += x.T @ x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = count * sum_xy - sum_x * sum_x.T
+            var = count * sum_xx - sum_x * sum_x
+            corr = cov / np.sqrt(var * var.T)
+        corr[count < 2] = np.nan
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=columns, columns=columns)
+
+    def filter(self, mask_fn):
+        """New dataset of the rows where ``mask_fn(chunk)`` is True."""
+        writer = _ChunkWriter(os.path.dirname(self.folder))
+        try:
+            writer.add(self.head(0))
+            for chunk in self.iter_chunks():
+                writer.add(chunk[mask_fn(chunk)])
+            return writer.finish()
+        except BaseException:
+            writer.abort()
+            raise
+
+    def to_csv(self, path, codec=None):
+        """Stream the dataset into a CSV file, compressed with ``codec`` (see ``compression``)."""
+        with open_dataset_writer(path, codec) as raw:
+            out = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+            if not self.chunk_count:
+                self.head(0).to_csv(out, index=False)
+            for index, chunk in enumerate(self.iter_chunks()):
+                chunk.to_csv(out, index=False, header=index == 0)
+            out.flush()
+            out.detach()
+
+    # ── Operations ──
+
+    def apply(self, op, progress=None):
+        """Return the dataset ``op`` produces, computed chunk by chunk.
+
+        Supports the row-local operations (rename, drop column, type
+        change, filter, replace, rounding), ``set_value``,
+        ``missing_values`` and ``drop_duplicates``.  ``progress(fraction)``
+        receives 0..1.
+        """
+        name, params = op["op"], op.get("params", {})
+        writer = _ChunkWriter(os.path.dirname(self.folder))
+        try:
+            if name in _ROW_LOCAL:
+                self._map(writer, lambda chunk: apply_operation(chunk, op), progress)
+            elif name == "set_value":
+                self._set_value(writer, op, progress)
+            elif name == "missing_values":
+                self._missing_values(writer, params["action"], params.get("column"), progress)
+            elif name == "drop_duplicates":
+                self._drop_duplicates(writer, params.get("keep", "first"), progress)
+            else:
+                raise OperationError(
+                    f"{describe_operation(op)} needs the whole dataset in memory and is not "
+                    f"available for datasets opened out of core.",
+                    "Not Available Out of Core",
+                )
+            return writer.finish()
+        except BaseException:
+            writer.abort()
+            raise
+
+    def _report(self, progress, done):
+        if progress is not None and self.chunk_count:
+            progress(done / self.chunk_count)
+
+    def _map(self, writer, fn, progress, columns=None):
+        writer.add(fn(self.head(0)))
+        for index, chunk in enumerate(self.iter_chunks(columns)):
+            writer.add(fn(chunk))
+            self._report(progress, index + 1)
+
+    def _set_value(self, writer, op, progress):
+        row = op["params"]["row"]
+        if not 0 <= row < len(self):
+            raise OperationError(f"Row {row} is out of range.")
+        target = bisect.bisect_right(self._offsets, row) - 1
+        writer.add(self.head(0))
+        for index in range(self.chunk_count):
+            base = self._offsets[index]
+            rows = self._offsets[index + 1] - base
+            if index == target:
+                local = dict(op, params=dict(op["params"], row=row - base))
+                writer.add(apply_operation(self._read(index), local))
+            else:
+                writer.link(self._path(index), rows, dict(self.dtypes.items()))
+            self._report(progress, index + 1)
+
+    def _missing_values(self, writer, action, column, progress):
+        cols = list(self._columns) if column is None else [column]
+        if action in _FILLS:
+            fills = {}
+            for col in cols:
+                numeric = pd.api.types.is_numeric_dtype(self.dtypes[col])
+                if action == "Fill with Mean" and numeric:
+                    fills[col] = self._mean(col)
+                elif action == "Fill with Median" and numeric:
+                    fills[col] = self.column(col).median()
+                elif action == "Fill with Mode":
+                    mode = self.column(col).mode()
+                    if not mode.empty:
+                        fills[col] = mode[0]
+
+            def fill(chunk):
+                chunk = chunk.copy()
+                for col, value in fills.items():
+                    chunk[col] = chunk[col].fillna(value)
+                return chunk
+
+            self._map(writer, fill, progress)
+        elif action in ("Forward Fill", "Backward Fill"):
+            self._carry_fill(writer, cols, action == "Backward Fill", progress)
+        else:
+            op = {"op": "missing_values", "params": {"action": action, "column": column}}
+            self._map(writer, lambda chunk: apply_operation(chunk, op), progress)
+
+    def _mean(self, col):
+        total, count = 0.0, 0
+        for chunk in self.iter_chunks([col]):
+            values = chunk[col]
+            total += values.sum()
+            count += values.count()
+        return total / count if count else np.nan
+
+    def _carry_fill(self, writer, cols, backward, progress):
+        """Forward (or backward) fill, carrying the last value across chunks."""
+        carry = {}
+        writer.reverse = backward
+        order = range(self.chunk_count - 1, -1, -1) if backward else range(self.chunk_count)
+        writer.add(self.head(0))
+        for done, index in enumerate(order, start=1):
+            chunk = self._read(index)
+            for col in cols:
+                values = chunk[col].bfill() if backward else chunk[col].ffill()
+                if col in carry:
+                    values = values.fillna(carry[col])
+                chunk[col] = values
+                valid = values.dropna()
+                if len(valid):
+                    carry[col] = valid.iloc[0] if backward else valid.iloc[-1]
+            writer.add(chunk)
+            self._report(progress, done)
+
+    def _drop_duplicates(self, writer, keep, progress):
+        """Drop repeated rows, matching them by a 64-bit hash of their values."""
+        def hashes(chunk):
+            return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+        writer.add(self.head(0))
+        if keep is False:
+            everything = np.concatenate([hashes(chunk) for chunk in self.iter_chunks()] or
+                                        [np.empty(0, dtype=np.uint64)])
+            values, counts = np.unique(everything, return_counts=True)
+            repeated = values[counts > 1]
+            del everything
+            for index, chunk in enumerate(self.iter_chunks()):
+                writer.add(chunk[~np.isin(hashes(chunk), repeated)])
+                self._report(progress, index + 1)
+            return
+
+        backward = keep == "last"
+        writer.reverse = backward
+        seen = np.empty(0, dtype=np.uint64)  # sorted hashes of rows kept so far
+        order = range(self.chunk_count - 1, -1, -1) if backward else range(self.chunk_count)
+        for done, index in enumerate(order, start=1):
+            chunk = self._read(index)
+            if backward:
+                chunk = chunk.iloc[::-1]
+            h = hashes(chunk)
+            first = np.zeros(len(h), dtype=bool)
+            first[np.unique(h, return_index=True)[1]] = True
+            pos = np.searchsorted(seen, h)
+            known = (pos < len(seen)) & (seen[np.minimum(pos, max(len(seen) - 1, 0))] == h) \
+                if len(seen) else np.zeros(len(h), dtype=bool)
+            mask = first & ~known
+            kept = chunk[mask]
+            writer.add(kept.iloc[::-1] if backward else kept)
+            # Both runs are sorted, so the stable sort is a linear merge.
+            seen = np.sort(np.concatenate([seen, h[mask]]), kind='stable')
+            self._report(progress, done)
@@ -0,0 +1,195 @@
+"""
+Per-column storage for working copies.
+
+In column mode a saved working copy is a set of single-column Feather
+files plus a manifest.  The copy's CSV is left as it was::
+
+    data/.columns/copies/foo_1.csv.cols/manifest.json
+    data/.columns/copies/foo_1.csv.cols/<file id>.feather
+
+A save rewrites only the columns that changed since the previous save
+and points the manifest at the existing files of the others, so adding
+one feature column to a wide frame writes one file.  Files are never
+overwritten: a rewritten column gets a new file and the manifest swap is
+the commit point.
+
+Every manifest carries a random ``token``.  A save names the token it
+builds on; when the manifest on disk is a different one (an earlier save
+failed, or the files changed behind our back) every column is written.
+"""
+
+import json
+import os
+import shutil
+import uuid
+
+import pandas as pd
+
+from .dataset_cache import HAS_PYARROW, file_stamp
+from .file_utils import atomic_write
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+COLUMNS_DIRNAME = ".columns"
+_VALUE = "v"  # name of the single column inside each file
+
+
+def new_token():
+    """Fresh manifest token."""
+    return uuid.uuid4().hex
+
+
+class ColumnStore:
+    """Column files and manifests for the copies of one workspace."""
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.root = os.path.join(data_folder, COLUMNS_DIRNAME)
+
+    @property
+    def available(self):
+        return HAS_PYARROW
+
+    def _dir(self, rel_path):
+        return os.path.join(self.root, rel_path.replace("/", os.sep) + ".cols")
+
+    def _manifest_path(self, rel_path):
+        return os.path.join(self._dir(rel_path), "manifest.json")
+
+    def _column_path(self, rel_path, file_id):
+        return os.path.join(self._dir(rel_path), f"{file_id}.feather")
+
+    # ── Manifest ──────────────────────────────────────────────────────────
+
+    def has_store(self, rel_path):
+        return os.path.isfile(self._manifest_path(rel_path))
+
+    def load_manifest(self, rel_path, base_path):
+        """Return the manifest of ``rel_path`` if it matches ``base_path``, else None."""
+        try:
+            with open(self._manifest_path(rel_path), 'r') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception("Unreadable column manifest for %s", rel_path)
+            return None
+        if manifest.get("base_stamp") != file_stamp(base_path):
+            logger.warning("Column files of %s do not match its base file; ignoring them", rel_path)
+            return None
+        return manifest
+
+    # ── Read / write ──────────────────────────────────────────────────────
+
+    def load(self, rel_path, base_path, columns=None):
+        """Return ``(df, token)`` from the column files, or ``(None, None)``.
+
+        With ``columns``, only the files of those columns are read.
+        """
+        if not self.available:
+            return None, None
+        manifest = self.load_manifest(rel_path, base_path)
+        if manifest is None:
+            return None, None
+        entries = manifest["columns"]
+        if columns is not None:
+            wanted = set(columns)
+            entries = [entry for entry in entries if entry["name"] in wanted]
+        try:
+            values = [
+                pd.read_feather(self._column_path(rel_path, entry["file"]))[_VALUE]
+                for entry in entries
+            ]
+        except Exception:
+            logger.exception("Discarding unreadable column files for %s", rel_path)
+            return None, None
+        if values:
+            df = pd.concat(values, axis=1)
+        else:
+            df = pd.DataFrame(index=pd.RangeIndex(manifest.get("rows", 0)))
+        df.columns = [entry["name"] for entry in entries]
+        return df, manifest["token"]
+
+    def save(self, rel_path, base_path, df, dirty, base_token, token):
+        """Write ``df`` as the columns of ``rel_path`` under manifest ``token``.
+
+        ``dirty`` names the columns changed since the save that wrote
+        ``base_token`` (None: all of them); the files of every other
+        column are reused.  Returns the number of column files written.
+        """
+        reusable = {}
+        previous = self.load_manifest(rel_path, base_path)
+        if (previous is not None and dirty is not None and base_token is not None
+                and previous.get("token") == base_token
+                and previous.get("rows") == len(df)):
+            names = [entry["name"] for entry in previous["columns"]]
+            reusable = {
+                entry["name"]: entry["file"] for entry in previous["columns"]
+                if names.count(entry["name"]) == 1
+                and os.path.isfile(self._column_path(rel_path, entry["file"]))
+            }
+
+        os.makedirs(self._dir(rel_path), exist_ok=True)
+        names = list(df.columns)
+        entries = []
+        written = 0
+        for position, name in enumerate(names):
+            file_id = None
+            if dirty is not None and name not in dirty and names.count(name) == 1:
+                file_id = reusable.get(name)
+            if file_id is None:
+                file_id = uuid.uuid4().hex[:16]
+                column = df.iloc[:, position].reset_index(drop=True).to_frame(_VALUE)
+                column.to_feather(self._column_path(rel_path, file_id))
+                written += 1
+            entries.append({"name": name, "file": file_id, "dtype": str(df.dtypes.iloc[position])})
+
+        manifest = {
+            "token": token,
+            "base_stamp": file_stamp(base_path),
+            "rows": len(df),
+            "columns": entries,
+        }
+
+        def write(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=1, default=str)
+
+        atomic_write(self._manifest_path(rel_path), write)
+        self._prune(rel_path, {entry["file"] for entry in entries})
+        logger.debug("Saved %s: %d of %d columns written", rel_path, written, len(names))
+        return written
+
+    def _prune(self, rel_path, keep_ids):
+        folder = self._dir(rel_path)
+        for name in os.listdir(folder):
+            stem, ext = os.path.splitext(name)
+            if ext == ".feather" and stem not in keep_ids:
+                try:
+                    os.remove(os.path.join(folder, name))
+                except OSError:
+                    logger.exception("Failed to remove stale column file %s", name)
+
+    # ── Housekeeping ──────────────────────────────────────────────────────
+
+    def invalidate(self, rel_path):
+        """Drop the column files of ``rel_path``."""
+        shutil.rmtree(self._dir(rel_path), ignore_errors=True)
+
+    def rename(self, old_rel, new_rel):
+        """Move the column files along with a renamed copy."""
+        src, dst = self._dir(old_rel), self._dir(new_rel)
+        if not os.path.isdir(src):
+            return
+        shutil.rmtree(dst, ignore_errors=True)
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(src, dst)
+        except OSError:
+            logger.exception("Failed to move column files %s -> %s", old_rel, new_rel)
+
+    def clear(self):
+        """Delete every column store in this workspace."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -181,7 +181,7 @@ class AnalysisPanel(QWidget):
         ax = self.corr_figure.add_subplot(111)
 
         # Calculate correlation
-        corr = numeric_df.corr()
+        corr = self._correlations(numeric_df.columns)
 
         # Plot heatmap
         sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax, fmt=".2f")
@@ -190,6 +190,20 @@ class AnalysisPanel(QWidget):
         apply_dark_theme(self.corr_figure, ax)
         self.corr_canvas.draw()
 
+    def _column(self, column):
+        """The whole of ``column``; ``data`` is only a preview when out of core."""
+        lazy = self.data_manager.lazy_data
+        if lazy is not None:
+            return lazy.column(column)
+        return self.data_manager.data[column]
+
+    def _correlations(self, columns):
+        """Correlation matrix of ``columns`` over all rows (streamed when out of core)."""
+        lazy = self.data_manager.lazy_data
+        if lazy is not None:
+            return lazy.corr(columns)
+        return self.data_manager.data[list(columns)].corr()
+
     def on_data_loaded(self, df):
         """Handle when new data is loaded."""
         # Update column dropdown
@@ -234,7 +248,7 @@ class AnalysisPanel(QWidget):
             return
 
         column = self.column_combo.currentText()
-        df = self.data_manager.data
+        series = self._column(column)
 
         if self.viz_type_combo.count() == 0:
             return
@@ -246,19 +260,19 @@ class AnalysisPanel(QWidget):
         ax = self.figure.add_subplot(111)
 
         try:
-            if pd.api.types.is_numeric_dtype(df[column]):
+            if pd.api.types.is_numeric_dtype(series):
                 if viz_type == "Box Plot":
-                    sns.boxplot(y=df[column], ax=ax)
+                    sns.boxplot(y=series, ax=ax)
                     ax.set_title(f"Box Plot of {column}")
                 elif viz_type == "Histogram":
-                    sns.histplot(df[column], kde=True, ax=ax)
+                    sns.histplot(series, kde=True, ax=ax)
                     ax.set_title(f"Histogram of {column}")
                 elif viz_type == "Density Plot":
-                    sns.kdeplot(df[column], ax=ax)
+                    sns.kdeplot(series, ax=ax)
                     ax.set_title(f"Density Plot of {column}")
             else:
                 # For categorical data
-                value_counts = df[column].value_counts()
+                value_counts = series.value_counts()
                 if viz_type == "Bar Chart":
                     sns.barplot(x=value_counts.index, y=value_counts.values, ax=ax, palette='viridis')
                     ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
@@ -306,7 +320,8 @@ class AnalysisPanel(QWidget):
             
     def run_basic_statistics(self, column):
         """Run basic statistics on the selected column."""
-        df = self.data_manager.data
+        series = self._column(column)
+        rows = self.data_manager.row_count
         
         # Clear previous results
         self.results_table.setRowCount(0)
@@ -329,45 +344,45 @@ class AnalysisPanel(QWidget):
             
             # Basic count statistics (for all data types)
             stats.append(("Basic Information", ""))
-            stats.append(("Count", len(df)))
-            stats.append(("Missing Values", df[column].isna().sum()))
-            stats.append(("Missing Percentage", f"{df[column].isna().sum() / max(len(df), 1) * 100:.2f}%"))
-            stats.append(("Unique Values", df[column].nunique()))
+            stats.append(("Count", rows))
+            stats.append(("Missing Values", series.isna().sum()))
+            stats.append(("Missing Percentage", f"{series.isna().sum() / max(rows, 1) * 100:.2f}%"))
+            stats.append(("Unique Values", series.nunique()))
             
             # Numeric statistics
-            if pd.api.types.is_numeric_dtype(df[column]):
+            if pd.api.types.is_numeric_dtype(series):
                 # Central tendency
                 stats.append(("", ""))  # Empty row as separator
                 stats.append(("Central Tendency", ""))
-                stats.append(("Mean", f"{df[column].mean():.4f}"))
-                stats.append(("Median", f"{df[column].median():.4f}"))
-                stats.append(("Mode", f"{df[column].mode().iloc[0] if not df[column].mode().empty else 'N/A'}"))
+                stats.append(("Mean", f"{series.mean():.4f}"))
+                stats.append(("Median", f"{series.median():.4f}"))
+                stats.append(("Mode", f"{series.mode().iloc[0] if not series.mode().empty else 'N/A'}"))
                 
                 # Dispersion
                 stats.append(("", ""))  # Empty row as separator
                 stats.append(("Dispersion", ""))
-                stats.append(("Standard Deviation", f"{df[column].std():.4f}"))
-                stats.append(("Variance", f"{df[column].var():.4f}"))
-                stats.append(("Range", f"{df[column].max() - df[column].min():.4f}"))
-                stats.append(("Min", f"{df[column].min():.4f}"))
-                stats.append(("Max", f"{df[column].max():.4f}"))
+                stats.append(("Standard Deviation", f"{series.std():.4f}"))
+                stats.append(("Variance", f"{series.var():.4f}"))
+                stats.append(("Range", f"{series.max() - series.min():.4f}"))
+                stats.append(("Min", f"{series.min():.4f}"))
+                stats.append(("Max", f"{series.max():.4f}"))
                 
                 # Quartiles
                 stats.append(("", ""))  # Empty row as separator
                 stats.append(("Quartiles", ""))
-                q1 = df[column].quantile(0.25)
-                q3 = df[column].quantile(0.75)
+                q1 = series.quantile(0.25)
+                q3 = series.quantile(0.75)
                 iqr = q3 - q1
                 stats.append(("Q1 (25%)", f"{q1:.4f}"))
-                stats.append(("Q2 (50%)", f"{df[column].quantile(0.5):.4f}"))
+                stats.append(("Q2 (50%)", f"{series.quantile(0.5):.4f}"))
                 stats.append(("Q3 (75%)", f"{q3:.4f}"))
                 stats.append(("IQR", f"{iqr:.4f}"))
                 
                 # Shape
                 stats.append(("", ""))  # Empty row as separator
                 stats.append(("Distribution Shape", ""))
-                stats.append(("Skewness", f"{df[column].skew():.4f}"))
-                stats.append(("Kurtosis", f"{df[column].kurtosis():.4f}"))
+                stats.append(("Skewness", f"{series.skew():.4f}"))
+                stats.append(("Kurtosis", f"{series.kurtosis():.4f}"))
                 
                 # Outlier boundaries
                 stats.append(("", ""))  # Empty row as separator
@@ -376,30 +391,30 @@ class AnalysisPanel(QWidget):
                 upper_bound = q3 + 1.5 * iqr
                 stats.append(("Lower Bound", f"{lower_bound:.4f}"))
                 stats.append(("Upper Bound", f"{upper_bound:.4f}"))
-                stats.append(("Potential Outliers", f"{((df[column] < lower_bound) | (df[column] > upper_bound)).sum()}"))
+                stats.append(("Potential Outliers", f"{((series < lower_bound) | (series > upper_bound)).sum()}"))
                 
                 # Correlations
-                numeric_cols = df.select_dtypes(include=[np.number]).columns
+                numeric_cols = self.data_manager.data.select_dtypes(include=[np.number]).columns
                 if len(numeric_cols) > 1:  # Only if there are other numeric columns
                     stats.append(("", ""))  # Empty row as separator
                     stats.append(("Correlations", ""))
+                    correlations = self._correlations(numeric_cols)[column]
                     for col in numeric_cols:
                         if col != column:
-                            corr = df[column].corr(df[col])
-                            stats.append((f"Correlation with {col}", f"{corr:.4f}"))
+                            stats.append((f"Correlation with {col}", f"{correlations[col]:.4f}"))
             
             # Categorical statistics
             else:
                 # Frequency analysis
                 stats.append(("", ""))  # Empty row as separator
                 stats.append(("Frequency Analysis", ""))
-                value_counts = df[column].value_counts()
+                value_counts = series.value_counts()
                 top_n = min(5, len(value_counts))
                 
                 for i in range(top_n):
                     value = value_counts.index[i]
                     count = value_counts.iloc[i]
-                    percentage = count / max(len(df), 1) * 100
+                    percentage = count / max(rows, 1) * 100
                     stats.append((f"Top {i+1}: {value}", f"{count} ({percentage:.2f}%)"))
             
             # Display results with formatting
@@ -11,6 +11,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QKeySequence
 from . import modal
+from ..dataset_writer import snapshot
+from ..operations import make_operation
 import pandas as pd
 
 class DataPreviewPanel(QWidget):
@@ -136,6 +138,7 @@ class DataPreviewPanel(QWidget):
     def setup_connections(self):
         """Setup signal connections."""
         self.data_manager.data_loaded.connect(self.on_data_loaded)
+        self.data_manager.rows_appended.connect(self.on_rows_appended)
         self.prev_btn.clicked.connect(self.previous_page)
         self.next_btn.clicked.connect(self.next_page)
         self.page_spin.valueChanged.connect(self.go_to_page)
@@ -162,12 +165,24 @@ class DataPreviewPanel(QWidget):
         # Reset to page 1
         self.current_page = 0
         
-        # Reference the full dataset (copy only made when filtering)
-        self.filtered_data = df
+        # Reference the full dataset (copy only made when filtering); out
+        # of core that is the on-disk dataset, read one page at a time
+        lazy = self.data_manager.lazy_data
+        self.filtered_data = lazy if lazy is not None else df
         
         # Update the table view with the latest data
         self.update_table_view()
         
+    def on_rows_appended(self, rows):
+        """Extend the table with rows appended to the dataset, keeping the current page."""
+        df = self.data_manager.data
+        if not isinstance(self.filtered_data, pd.DataFrame) or df is None:
+            return
+        if len(self.filtered_data) + len(rows) == len(df):
+            # No filter applied: the new rows are part of the view.
+            self.filtered_data = df
+        self.update_table_view()
+
     def on_rows_per_page_changed(self, text):
         """Handle rows per page selection change."""
         self.MAX_ROWS_PER_PAGE = int(text)
@@ -180,7 +195,7 @@ class DataPreviewPanel(QWidget):
             return
             
         # Always use the latest data from data_manager
-        df = self.data_manager.data.copy()
+        df = snapshot(self.data_manager.data)
         
         column = self.filter_column_combo.currentText()
         condition = self.filter_condition_combo.currentText()
@@ -191,23 +206,27 @@ class DataPreviewPanel(QWidget):
             if df[column].dtype in ['int64', 'float64']:
                 value = float(value)
             
-            # Apply filter condition
-            if condition == "equals":
-                mask = df[column] == value
-            elif condition == "not equals":
-                mask = df[column] != value
-            elif condition == "greater than":
-                mask = df[column] > value
-            elif condition == "less than":
-                mask = df[column] < value
-            elif condition == "contains":
-                mask = df[column].astype(str).str.contains(str(value), case=False, na=False)
-            elif condition == "starts with":
-                mask = df[column].astype(str).str.startswith(str(value), na=False)
-            elif condition == "ends with":
-                mask = df[column].astype(str).str.endswith(str(value), na=False)
+            def filter_mask(df):
+                if condition == "equals":
+                    return df[column] == value
+                if condition == "not equals":
+                    return df[column] != value
+                if condition == "greater than":
+                    return df[column] > value
+                if condition == "less than":
+                    return df[column] < value
+                if condition == "contains":
+                    return df[column].astype(str).str.contains(str(value), case=False, na=False)
+                if condition == "starts with":
+                    return df[column].astype(str).str.startswith(str(value), na=False)
+                return df[column].astype(str).str.endswith(str(value), na=False)
             
-            self.filtered_data = df[mask]
+            lazy = self.data_manager.lazy_data
+            if lazy is not None:
+                # Filter chunk by chunk into a scratch dataset
+                self.filtered_data = lazy.filter(filter_mask)
+            else:
+                self.filtered_data = df[filter_mask(df)]
             self.current_page = 0
             self.update_table_view()
             
@@ -217,7 +236,11 @@ class DataPreviewPanel(QWidget):
     def clear_filter(self):
         """Clear the current filter."""
         # Always use the latest data from data_manager
-        self.filtered_data = self.data_manager.data.copy() if self.data_manager.data is not None else None
+        lazy = self.data_manager.lazy_data
+        if lazy is not None:
+            self.filtered_data = lazy
+        else:
+            self.filtered_data = snapshot(self.data_manager.data) if self.data_manager.data is not None else None
         self.filter_value_edit.clear()
         self.current_page = 0
         self.update_table_view()
@@ -234,7 +257,7 @@ class DataPreviewPanel(QWidget):
         self.total_pages = (len(self.filtered_data) + self.MAX_ROWS_PER_PAGE - 1) // self.MAX_ROWS_PER_PAGE
         
         # Update info label
-        total_rows = len(self.data_manager.data)
+        total_rows = self.data_manager.row_count
         filtered_rows = len(self.filtered_data)
         if filtered_rows < total_rows:
             self.info_label.setText(f"Showing {filtered_rows} of {total_rows} rows × {self.filtered_data.shape[1]} columns")
@@ -305,7 +328,7 @@ class DataPreviewPanel(QWidget):
         
         try:
             # Convert the value to the appropriate type based on the column's data type
-            original_dtype = self.filtered_data[column_name].dtype
+            original_dtype = self.filtered_data.dtypes[column_name]
             if pd.api.types.is_numeric_dtype(original_dtype):
                 if pd.api.types.is_integer_dtype(original_dtype):
                     new_value = int(new_value)
@@ -314,6 +337,10 @@ class DataPreviewPanel(QWidget):
             elif pd.api.types.is_bool_dtype(original_dtype):
                 new_value = new_value.lower() in ['true', 'yes', '1', 't', 'y']
                 
+            if self.data_manager.is_out_of_core:
+                self._edit_out_of_core(actual_row_idx, column_name, new_value)
+                return
+                
             # Save current state for undo functionality
             if hasattr(self.data_manager, 'save_state'):
                 self.data_manager.save_state()
@@ -326,6 +353,16 @@ class DataPreviewPanel(QWidget):
             original_index = self.filtered_data.index[actual_row_idx]
             self.data_manager._data.loc[original_index, column_name] = new_value
             
+            # Log the edit by row position so it can be replayed on reload;
+            # duplicate index labels cannot be pinned to one position
+            position = self.data_manager._data.index.get_loc(original_index)
+            if isinstance(position, int):
+                self.data_manager.record_operation(make_operation(
+                    "set_value", row=position, column=column_name, value=new_value
+                ), self.data_manager._data)
+            else:
+                self.data_manager.mark_untracked()
+            
             # Emit the data_loaded signal to update all panels
             self.data_manager.data_loaded.emit(self.data_manager._data)
             
@@ -334,6 +371,17 @@ class DataPreviewPanel(QWidget):
             # Revert to the original value
             self.update_current_page()
     
+    def _edit_out_of_core(self, row, column_name, value):
+        """Apply a cell edit to an out-of-core dataset (rewrites one chunk)."""
+        if self.filtered_data is not self.data_manager.lazy_data:
+            raise ValueError("clear the filter to edit a dataset opened out of core")
+        op = make_operation("set_value", row=row, column=column_name, value=value)
+        result = self.data_manager.run_operation(op)
+        self.data_manager.save_state()
+        self.data_manager.record_operation(op, result)
+        self.data_manager.set_out_of_core_result(result)
+        self.data_manager.data_loaded.emit(self.data_manager._data)
+
     def update_current_page(self):
         """Update the table with the current page of data."""
         if self.filtered_data is None:
@@ -341,6 +389,11 @@ class DataPreviewPanel(QWidget):
             
         start_idx = self.current_page * self.MAX_ROWS_PER_PAGE
         end_idx = min(start_idx + self.MAX_ROWS_PER_PAGE, len(self.filtered_data))
+        if isinstance(self.filtered_data, pd.DataFrame):
+            page_data = self.filtered_data.iloc[start_idx:end_idx]
+        else:
+            # Out of core: read just this page from the chunk files
+            page_data = self.filtered_data.page(start_idx, end_idx)
         
         # Update table
         self.table.setRowCount(end_idx - start_idx)
@@ -353,9 +406,9 @@ class DataPreviewPanel(QWidget):
         
         try:
             # Populate data for current page
-            for row_idx, df_idx in enumerate(range(start_idx, end_idx)):
+            for row_idx in range(end_idx - start_idx):
                 for col_idx in range(self.filtered_data.shape[1]):
-                    value = str(self.filtered_data.iloc[df_idx, col_idx])
+                    value = str(page_data.iloc[row_idx, col_idx])
                     item = QTableWidgetItem(value)
                     self.table.setItem(row_idx, col_idx, item)
                     
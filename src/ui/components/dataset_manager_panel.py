@@ -11,16 +11,56 @@ from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
     QListWidget, QListWidgetItem, QFileDialog, QScrollArea,
     QInputDialog, QLabel, QMenu, QWidget, QSizePolicy,
-    QGraphicsDropShadowEffect
+    QGraphicsDropShadowEffect, QCheckBox, QComboBox, QProgressDialog,
+    QApplication
 )
 from . import modal
 from PyQt5.QtCore import Qt, pyqtSignal, QSize, QPoint, QEvent
 from PyQt5.QtGui import QFont, QColor, QCursor
 from ui.theme import get_colors, current_theme
+from ui.file_utils import is_shared
+from ui.engines import DEFAULT_ENGINE, engine_options
+from ui.batch_import import expand_sources, group_shards
+from ui.compression import CODEC_LABELS, available_codecs, detect_codec
+from ui.excel_io import ImportCancelled, is_excel_file
+from ui.quick_scan import format_shape
+from ui.sqlite_io import DEFAULT_CHUNK_ROWS, is_sqlite_file, list_sources
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────
 
+# copy_storage setting values and their labels in the bottom bar
+_COPY_STORAGE_OPTIONS = [
+    ("csv", "Full CSV"),
+    ("delta", "Edit log"),
+    ("columns", "Changed columns"),
+]
+
+# Undo history memory budgets in MB ("" = a share of physical memory).
+_UNDO_MEMORY_OPTIONS = [
+    ("", "Automatic"),
+    (128, "128 MB"),
+    (256, "256 MB"),
+    (512, "512 MB"),
+    (1024, "1 GB"),
+    (2048, "2 GB"),
+    (4096, "4 GB"),
+]
+
+
+def _show_scan(label, details_parts, scan):
+    """Append a quick scan's shape to a card's details line; columns go in the tooltip."""
+    if not scan:
+        return
+    label.setText("  \u00b7  ".join([format_shape(scan)] + details_parts))
+    dtypes = scan.get('dtypes') or {}
+    names = scan.get('columns', [])
+    lines = [f"{name}: {dtypes[name]}" if dtypes.get(name) else name for name in names[:30]]
+    if len(names) > 30:
+        lines.append(f"... {len(names) - 30} more")
+    label.setToolTip("\n".join(lines))
+
+
 def _format_size(size):
     """Format file size in human-readable format."""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -30,6 +70,16 @@ def _format_size(size):
     return f"{size:.1f} TB"
 
 
+def _disk_size(file_path):
+    """On-disk size of a dataset file, with its codec if it is stored compressed."""
+    size = _format_size(os.path.getsize(file_path))
+    try:
+        codec = detect_codec(file_path)
+    except OSError:
+        codec = None
+    return f"{size} {CODEC_LABELS[codec]}" if codec else size
+
+
 def _colors():
     return get_colors(current_theme())
 
@@ -61,7 +111,7 @@ class OriginalCard(QWidget):
     new_copy_clicked = pyqtSignal(str)   # original filename
     menu_requested = pyqtSignal(str)     # original filename
 
-    def __init__(self, filename, file_path, imported_at=None, missing=False):
+    def __init__(self, filename, file_path, imported_at=None, missing=False, watching=False):
         super().__init__()
         c = _colors()
         self.filename = filename
@@ -107,7 +157,7 @@ class OriginalCard(QWidget):
 
         details_parts = []
         if not missing and os.path.exists(file_path):
-            details_parts.append(_format_size(os.path.getsize(file_path)))
+            details_parts.append(_disk_size(file_path))
         if imported_at:
             details_parts.append(imported_at)
         elif not missing and os.path.exists(file_path):
@@ -115,10 +165,13 @@ class OriginalCard(QWidget):
             details_parts.append(mod.strftime("%Y-%m-%d %H:%M"))
         if missing:
             details_parts.append("File missing")
+        elif watching:
+            details_parts.append("Watching for new rows")
 
-        details_label = QLabel("  \u00b7  ".join(details_parts))
-        details_label.setStyleSheet(f"color: {c['text_secondary']}; font-size: 9px; background: transparent; border: none;")
-        info.addWidget(details_label)
+        self._details_parts = details_parts
+        self.details_label = QLabel("  \u00b7  ".join(details_parts))
+        self.details_label.setStyleSheet(f"color: {c['text_secondary']}; font-size: 9px; background: transparent; border: none;")
+        info.addWidget(self.details_label)
 
         layout.addLayout(info, 1)
 
@@ -173,6 +226,10 @@ class OriginalCard(QWidget):
         self.ctx_btn.clicked.connect(lambda: self.menu_requested.emit(self.filename))
         layout.addWidget(self.ctx_btn, 0, Qt.AlignVCenter)
 
+    def set_scan(self, scan):
+        """Show the row/column counts of a quick scan in the details line."""
+        _show_scan(self.details_label, self._details_parts, scan)
+
 
 # ── Working Copy Card (right column) ──────────────────────────────────────
 
@@ -180,7 +237,9 @@ class CopyCard(QWidget):
     """Card widget for a working copy dataset."""
 
     load_clicked = pyqtSignal(str)    # copy relative path
+    load_columns_clicked = pyqtSignal(str)
     rename_clicked = pyqtSignal(str)
+    export_recipe_clicked = pyqtSignal(str)
     delete_clicked = pyqtSignal(str)
 
     def __init__(self, copy_rel_path, file_path, is_active=False, missing=False):
@@ -253,14 +312,19 @@ class CopyCard(QWidget):
         # Details line
         details_parts = []
         if not missing and os.path.exists(file_path):
-            details_parts.append(_format_size(os.path.getsize(file_path)))
+            if is_shared(file_path):
+                # Still a link to its original: no extra disk space used
+                details_parts.append("Shared with original")
+            else:
+                details_parts.append(_disk_size(file_path))
             mod = datetime.fromtimestamp(os.path.getmtime(file_path))
             details_parts.append(mod.strftime("%Y-%m-%d %H:%M"))
         if missing:
             details_parts.append("File missing")
-        details_label = QLabel("  \u00b7  ".join(details_parts))
-        details_label.setStyleSheet(f"color: {c['text_secondary']}; font-size: 9px; background: transparent; border: none;")
-        info.addWidget(details_label)
+        self._details_parts = details_parts
+        self.details_label = QLabel("  \u00b7  ".join(details_parts))
+        self.details_label.setStyleSheet(f"color: {c['text_secondary']}; font-size: 9px; background: transparent; border: none;")
+        info.addWidget(self.details_label)
 
         layout.addLayout(info, 1)
 
@@ -324,6 +388,10 @@ class CopyCard(QWidget):
         self.menu_btn.clicked.connect(self._show_menu)
         layout.addWidget(self.menu_btn, 0, Qt.AlignVCenter)
 
+    def set_scan(self, scan):
+        """Show the row/column counts of a quick scan in the details line."""
+        _show_scan(self.details_label, self._details_parts, scan)
+
     def _show_menu(self):
         c = _colors()
         menu = QMenu(self)
@@ -345,11 +413,15 @@ class CopyCard(QWidget):
             }}
         """)
         load_action = menu.addAction("Load")
+        columns_action = menu.addAction("Load Selected Columns...")
         rename_action = menu.addAction("Rename")
+        recipe_action = menu.addAction("Export Recipe...")
         delete_action = menu.addAction("Delete Copy")
 
         if self.is_active or self.missing:
             load_action.setEnabled(False)
+        if self.missing:
+            columns_action.setEnabled(False)
         # Renaming the active working copy is safe: DataManager.rename_copy()
         # updates active_working_copy so future saves go to the new filename.
         if self.missing:
@@ -358,8 +430,12 @@ class CopyCard(QWidget):
         action = menu.exec(self.menu_btn.mapToGlobal(self.menu_btn.rect().bottomLeft()))
         if action == load_action:
             self.load_clicked.emit(self.copy_rel_path)
+        elif action == columns_action:
+            self.load_columns_clicked.emit(self.copy_rel_path)
         elif action == rename_action:
             self.rename_clicked.emit(self.copy_rel_path)
+        elif action == recipe_action:
+            self.export_recipe_clicked.emit(self.copy_rel_path)
         elif action == delete_action:
             self.delete_clicked.emit(self.copy_rel_path)
 
@@ -462,6 +538,7 @@ class DatasetManagerDialog(QDialog):
     """Two-column dataset manager with originals and working copies."""
 
     dataset_activated = pyqtSignal(str)  # workspace-relative path (originals/ or copies/)
+    dataset_activated_columns = pyqtSignal(str, list)  # relative path, columns to load
     dataset_deleted = pyqtSignal(str)    # relative path
     dataset_renamed = pyqtSignal(str, str)
     workspace_reset = pyqtSignal()       # emitted after full reset
@@ -474,6 +551,7 @@ class DatasetManagerDialog(QDialog):
         self.current_dataset = None
         self.data_manager = None
         self._selected_original = None
+        self._scan_cards = {}  # rel path -> card waiting for a background scan
         self.setFixedSize(760, 520)
         self.init_ui()
 
@@ -591,10 +669,8 @@ class DatasetManagerDialog(QDialog):
         left_col.addWidget(self.left_empty)
         self.left_empty.hide()
 
-        # Import button at bottom of left column
-        self.import_btn = QPushButton("+ Import Dataset")
-        self.import_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.import_btn.setStyleSheet(f"""
+        # Import buttons at bottom of left column
+        import_btn_style = f"""
             QPushButton {{
                 background: transparent;
                 color: {c['accent']};
@@ -608,10 +684,20 @@ class DatasetManagerDialog(QDialog):
             QPushButton:hover {{
                 background: {c['accent_subtle']};
             }}
-        """)
+        """
+        self.import_btn = QPushButton("+ Import Dataset")
+        self.import_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        self.import_btn.setStyleSheet(import_btn_style)
         self.import_btn.clicked.connect(self.import_dataset)
         left_col.addWidget(self.import_btn)
 
+        self.import_folder_btn = QPushButton("+ Import Folder")
+        self.import_folder_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        self.import_folder_btn.setToolTip("Import every CSV in a folder, or those matching a pattern")
+        self.import_folder_btn.setStyleSheet(import_btn_style)
+        self.import_folder_btn.clicked.connect(self.import_folder)
+        left_col.addWidget(self.import_folder_btn)
+
         body.addLayout(left_col)
 
         # Vertical separator
@@ -770,6 +856,103 @@ class DatasetManagerDialog(QDialog):
         self.reset_btn.clicked.connect(self._on_reset_workspace)
         bottom.addWidget(self.reset_btn)
 
+        # Per-workspace load setting: infer compact dtypes on import/activation
+        self.compact_check = QCheckBox("Compact memory on load")
+        self.compact_check.setToolTip(
+            "Read datasets with inferred compact dtypes (categories, Arrow strings,\n"
+            "parsed dates, narrowed numbers). Applies the next time a dataset is loaded."
+        )
+        self.compact_check.setStyleSheet(f"""
+            QCheckBox {{
+                color: {c['text_secondary']};
+                background: transparent;
+                font-size: 10px;
+                margin-left: 12px;
+            }}
+        """)
+        self.compact_check.toggled.connect(self._on_compact_toggled)
+        bottom.addWidget(self.compact_check)
+
+        # Per-workspace save setting: how working copies are written
+        storage_label = QLabel("Save copies as")
+        storage_label.setStyleSheet(
+            f"color: {c['text_secondary']}; background: transparent; font-size: 10px; margin-left: 12px;")
+        bottom.addWidget(storage_label)
+        self.storage_combo = QComboBox()
+        for key, label in _COPY_STORAGE_OPTIONS:
+            self.storage_combo.addItem(label, key)
+        self.storage_combo.setToolTip(
+            "Full CSV: rewrite the whole file on every save.\n"
+            "Edit log: store the edits applied to the copy (with periodic checkpoints);\n"
+            "a copy whose edits cannot be replayed is still saved in full.\n"
+            "Changed columns: store one file per column and rewrite only the\n"
+            "columns edited since the last save."
+        )
+        self.storage_combo.setStyleSheet(f"""
+            QComboBox {{
+                color: {c['text_primary']};
+                background: {c['bg_input']};
+                border: 1px solid {c['border_medium']};
+                border-radius: 4px;
+                padding: 2px 6px;
+                font-size: 10px;
+            }}
+        """)
+        self.storage_combo.currentIndexChanged.connect(self._on_storage_changed)
+        bottom.addWidget(self.storage_combo)
+
+        # Per-workspace dataframe engine (see ui.engines)
+        engine_label = QLabel("Engine")
+        engine_label.setStyleSheet(
+            f"color: {c['text_secondary']}; background: transparent; font-size: 10px; margin-left: 12px;")
+        bottom.addWidget(engine_label)
+        self.engine_combo = QComboBox()
+        for key, label in engine_options():
+            self.engine_combo.addItem(label, key)
+        self.engine_combo.setToolTip(
+            "pandas: the standard CSV parser and NumPy text columns.\n"
+            "Arrow: multithreaded CSV parsing and writing, Arrow-backed text\n"
+            "columns and text filters/group-bys on all cores.\n"
+            "Applies the next time a dataset is loaded."
+        )
+        self.engine_combo.setStyleSheet(self.storage_combo.styleSheet())
+        self.engine_combo.currentIndexChanged.connect(self._on_engine_changed)
+        bottom.addWidget(self.engine_combo)
+
+        # Per-workspace compression of stored datasets (see ui.compression)
+        compression_label = QLabel("Compression")
+        compression_label.setStyleSheet(
+            f"color: {c['text_secondary']}; background: transparent; font-size: 10px; margin-left: 12px;")
+        bottom.addWidget(compression_label)
+        self.compression_combo = QComboBox()
+        self.compression_combo.addItem("None", "")
+        for codec in available_codecs():
+            self.compression_combo.addItem(CODEC_LABELS[codec], codec)
+        self.compression_combo.setToolTip(
+            "Store originals and copies as compressed CSV. Files stay readable\n"
+            "whatever this is set to; new imports and saves use it."
+        )
+        self.compression_combo.setStyleSheet(self.storage_combo.styleSheet())
+        self.compression_combo.currentIndexChanged.connect(self._on_compression_changed)
+        bottom.addWidget(self.compression_combo)
+
+        # Memory the undo history may hold before older steps go to disk
+        undo_label = QLabel("Undo memory")
+        undo_label.setStyleSheet(
+            f"color: {c['text_secondary']}; background: transparent; font-size: 10px; margin-left: 12px;")
+        bottom.addWidget(undo_label)
+        self.undo_memory_combo = QComboBox()
+        for mb, label in _UNDO_MEMORY_OPTIONS:
+            self.undo_memory_combo.addItem(label, mb)
+        self.undo_memory_combo.setToolTip(
+            "Memory the undo history may use. Older steps beyond it are moved\n"
+            "to disk, and dropped once they take several times as much there.\n"
+            "Automatic: a tenth of the computer's memory."
+        )
+        self.undo_memory_combo.setStyleSheet(self.storage_combo.styleSheet())
+        self.undo_memory_combo.currentIndexChanged.connect(self._on_undo_memory_changed)
+        bottom.addWidget(self.undo_memory_combo)
+
         bottom.addStretch()
         close_btn = QPushButton("Close")
         close_btn.setCursor(QCursor(Qt.PointingHandCursor))
@@ -802,6 +985,10 @@ class DatasetManagerDialog(QDialog):
 
     def set_data_manager(self, dm):
         """Provide a reference to the DataManager for two-tier operations."""
+        if self.data_manager is not dm:
+            if self.data_manager is not None:
+                self.data_manager.scan_ready.disconnect(self._on_scan_ready)
+            dm.scan_ready.connect(self._on_scan_ready)
         self.data_manager = dm
         self.current_dataset = dm.active_working_copy
         self.refresh()
@@ -817,9 +1004,108 @@ class DatasetManagerDialog(QDialog):
         """Rebuild both columns from data_manager state."""
         if self.data_manager and self.workspace_path:
             self.data_manager.validate_metadata()
+        self._sync_settings()
         self._refresh_left()
         self._refresh_right()
 
+    def _attach_scan(self, card, rel_path):
+        """Show a card's row/column counts, scanning in the background if not cached."""
+        scan = self.data_manager.cached_scan(rel_path)
+        if scan is not None:
+            card.set_scan(scan)
+            return
+        self._scan_cards[rel_path] = card
+        self.data_manager.request_scans([rel_path])
+
+    def _on_scan_ready(self, rel_path, scan):
+        card = self._scan_cards.pop(rel_path, None)
+        if card is not None:
+            try:
+                card.set_scan(scan)
+            except RuntimeError:
+                pass  # the card was rebuilt in the meantime
+
+    def _sync_settings(self):
+        """Reflect the workspace settings in the bottom-bar controls."""
+        enabled = self.data_manager is not None
+        self.compact_check.setEnabled(enabled)
+        self.compact_check.blockSignals(True)
+        self.compact_check.setChecked(
+            bool(enabled and self.data_manager.get_setting('compact_dtypes', False))
+        )
+        self.compact_check.blockSignals(False)
+        self.storage_combo.setEnabled(enabled)
+        self.storage_combo.blockSignals(True)
+        storage = self.data_manager.get_setting('copy_storage', 'csv') if enabled else 'csv'
+        self.storage_combo.setCurrentIndex(max(self.storage_combo.findData(storage), 0))
+        self.storage_combo.blockSignals(False)
+        self.engine_combo.setEnabled(enabled and self.engine_combo.count() > 1)
+        self.engine_combo.blockSignals(True)
+        engine = self.data_manager.get_setting('engine', DEFAULT_ENGINE) if enabled else DEFAULT_ENGINE
+        self.engine_combo.setCurrentIndex(max(self.engine_combo.findData(engine), 0))
+        self.engine_combo.blockSignals(False)
+        self.compression_combo.setEnabled(enabled)
+        self.compression_combo.blockSignals(True)
+        codec = (self.data_manager.storage_codec if enabled else None) or ""
+        self.compression_combo.setCurrentIndex(max(self.compression_combo.findData(codec), 0))
+        self.compression_combo.blockSignals(False)
+        self.undo_memory_combo.setEnabled(enabled)
+        self.undo_memory_combo.blockSignals(True)
+        budget = (self.data_manager.get_setting('undo_memory_mb') if enabled else None) or ""
+        if self.undo_memory_combo.findData(budget) < 0:
+            # A budget set in metadata.json by hand
+            self.undo_memory_combo.addItem(f"{budget:g} MB", budget)
+        self.undo_memory_combo.setCurrentIndex(self.undo_memory_combo.findData(budget))
+        self.undo_memory_combo.blockSignals(False)
+
+    def _on_compact_toggled(self, checked):
+        if self.data_manager:
+            self.data_manager.set_setting('compact_dtypes', checked)
+
+    def _on_storage_changed(self, index):
+        if self.data_manager:
+            self.data_manager.set_setting('copy_storage', self.storage_combo.itemData(index))
+
+    def _on_engine_changed(self, index):
+        if self.data_manager:
+            self.data_manager.set_setting('engine', self.engine_combo.itemData(index))
+
+    def _on_undo_memory_changed(self, index):
+        if self.data_manager:
+            self.data_manager.set_setting('undo_memory_mb', self.undo_memory_combo.itemData(index) or None)
+
+    def _on_compression_changed(self, index):
+        if not self.data_manager:
+            return
+        codec = self.compression_combo.itemData(index) or None
+        self.data_manager.set_setting('storage_compression', codec)
+        if not self.data_manager.get_originals():
+            return
+        how = f"with {CODEC_LABELS[codec]} compression" if codec else "uncompressed"
+        if not modal.show_question(
+            self, "Rewrite Datasets?",
+            f"Rewrite the existing datasets {how} as well?\n\n"
+            "Otherwise only new imports and saves use the new setting."
+        ):
+            return
+
+        progress = QProgressDialog("Rewriting datasets...", "Stop", 0, 1000, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+
+        def report(fraction):
+            progress.setValue(int(fraction * 1000))
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        try:
+            self.data_manager.recompress_datasets(report)
+        except Exception as e:
+            modal.show_error(self, "Error", f"Error rewriting datasets: {str(e)}")
+        finally:
+            progress.close()
+        self.refresh()
+
     def _refresh_left(self):
         """Rebuild the originals column.
 
@@ -856,8 +1142,11 @@ class DatasetManagerDialog(QDialog):
                 continue
             file_path = os.path.join(originals_dir, filename)
             imported_at = info.get('imported_at')
-            missing = not os.path.isfile(file_path)
-            card = OriginalCard(filename, file_path, imported_at, missing)
+            missing = not self.data_manager.file_exists_on_disk(orig_rel)
+            card = OriginalCard(filename, file_path, imported_at, missing,
+                                self.data_manager.is_watched(filename))
+            if not missing:
+                self._attach_scan(card, orig_rel)
             card.new_copy_clicked.connect(self._on_new_copy)
             card.menu_requested.connect(self._on_original_menu)
             card.mousePressEvent = lambda e, fn=filename: self._select_original(fn)
@@ -915,13 +1204,16 @@ class DatasetManagerDialog(QDialog):
         self.load_original_btn.show()
 
         for copy_rel in copies:
-            file_path = self.data_manager._resolve_data_path(copy_rel)
-            if not os.path.isfile(file_path):
+            if not self.data_manager.file_exists_on_disk(copy_rel):
                 continue
+            file_path = self.data_manager._resolve_data_path(copy_rel)
             is_active = (copy_rel == self.current_dataset)
             card = CopyCard(copy_rel, file_path, is_active, False)
+            self._attach_scan(card, copy_rel)
             card.load_clicked.connect(self._on_load_copy)
+            card.load_columns_clicked.connect(self._on_load_copy_columns)
             card.rename_clicked.connect(self._on_rename_copy)
+            card.export_recipe_clicked.connect(self._on_export_recipe)
             card.delete_clicked.connect(self._on_delete_copy)
             self.right_layout.insertWidget(self.right_layout.count() - 1, card)
 
@@ -945,13 +1237,16 @@ class DatasetManagerDialog(QDialog):
         self.right_layout.insertWidget(self.right_layout.count() - 1, header)
 
         for copy_rel in unassigned:
-            file_path = self.data_manager._resolve_data_path(copy_rel)
-            if not os.path.isfile(file_path):
+            if not self.data_manager.file_exists_on_disk(copy_rel):
                 continue
+            file_path = self.data_manager._resolve_data_path(copy_rel)
             is_active = (copy_rel == self.current_dataset)
             card = CopyCard(copy_rel, file_path, is_active, False)
+            self._attach_scan(card, copy_rel)
             card.load_clicked.connect(self._on_load_copy)
+            card.load_columns_clicked.connect(self._on_load_copy_columns)
             card.rename_clicked.connect(self._on_rename_copy)
+            card.export_recipe_clicked.connect(self._on_export_recipe)
             card.delete_clicked.connect(self._on_delete_copy)
             self.right_layout.insertWidget(self.right_layout.count() - 1, card)
 
@@ -1011,14 +1306,34 @@ class DatasetManagerDialog(QDialog):
 
     def import_dataset(self):
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Import Dataset", "", "CSV Files (*.csv);;All Files (*)"
+            self, "Import Dataset", "",
+            "Data Files (*.csv *.xlsx *.xlsm *.xls *.sqlite *.sqlite3 *.db);;CSV Files (*.csv);;"
+            "Excel Files (*.xlsx *.xlsm *.xls);;SQLite Databases (*.sqlite *.sqlite3 *.db);;"
+            "All Files (*)"
         )
         if not file_path or not self.data_manager:
             return
 
+        if is_excel_file(file_path):
+            self._import_excel(file_path)
+            return
+        if is_sqlite_file(file_path):
+            self._import_sqlite(file_path)
+            return
+
         filename = os.path.basename(file_path)
         originals = self.data_manager.get_originals()
 
+        existing = self.data_manager.find_original_by_content(file_path)
+        if existing is not None:
+            modal.show_info(
+                self, "Already Imported",
+                f"{filename} has the same content as the original {existing}."
+            )
+            self._selected_original = existing
+            self.refresh()
+            return
+
         if filename in originals:
             result = modal.show_import_duplicate(self, filename)
             if result == "cancel":
@@ -1038,6 +1353,146 @@ class DatasetManagerDialog(QDialog):
         except Exception as e:
             modal.show_error(self, "Error", f"Error importing dataset: {str(e)}")
 
+    def _import_excel(self, file_path):
+        """Import each sheet of a workbook as its own original."""
+        progress = QProgressDialog(
+            f"Importing {os.path.basename(file_path)}...", "Cancel", 0, 1000, self
+        )
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+
+        def report(fraction):
+            progress.setValue(int(fraction * 1000))
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        try:
+            imported = self.data_manager.import_excel(file_path, report)
+        except ImportCancelled:
+            return
+        except Exception as e:
+            modal.show_error(self, "Error", f"Error importing workbook: {str(e)}")
+            return
+        finally:
+            progress.close()
+
+        if not imported:
+            modal.show_warning(self, "Nothing Imported", "The workbook has no sheets with data.")
+            return
+        self._selected_original = imported[0][0]
+        self.refresh()
+
+    def _import_sqlite(self, file_path):
+        """Import a table, view or query result of a SQLite database as an original."""
+        database = os.path.basename(file_path)
+        try:
+            sources = list_sources(file_path)
+        except Exception as e:
+            modal.show_error(self, "Error", f"Error reading database: {str(e)}")
+            return
+        choice = modal.show_sqlite_source(
+            self, database, sources,
+            self.data_manager.get_setting('sqlite_chunk_rows', DEFAULT_CHUNK_ROWS),
+        )
+        if choice is None:
+            return
+        table, query, chunk_rows = choice
+        self.data_manager.set_setting('sqlite_chunk_rows', chunk_rows)
+
+        progress = QProgressDialog(f"Importing {table or 'query'} from {database}...", "Cancel", 0, 1000, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+
+        def report(fraction):
+            if fraction is None:
+                progress.setRange(0, 0)  # row count unknown: busy indicator
+            else:
+                progress.setValue(int(fraction * 1000))
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        try:
+            orig_name, _copy_rel = self.data_manager.import_sqlite(
+                file_path, table=table, query=query, chunk_rows=chunk_rows, progress=report)
+        except ImportCancelled:
+            return
+        except Exception as e:
+            modal.show_error(self, "Error", f"Error importing from database: {str(e)}")
+            return
+        finally:
+            progress.close()
+
+        if orig_name:
+            self._selected_original = orig_name
+            self.refresh()
+
+    def import_folder(self):
+        """Import the CSVs of a folder (optionally filtered by a glob) in one batch."""
+        if not self.data_manager:
+            return
+        folder = QFileDialog.getExistingDirectory(self, "Import Folder", "")
+        if not folder:
+            return
+        pattern, ok = QInputDialog.getText(
+            self, "Import Folder",
+            "Files to import (use ** to include sub-folders):", text="*.csv"
+        )
+        pattern = pattern.strip()
+        if not ok or not pattern:
+            return
+
+        paths = [p for p in expand_sources(folder, pattern) if not is_excel_file(p)]
+        if not paths:
+            modal.show_warning(self, "Nothing to Import",
+                               f"No CSV files in {folder} match {pattern}.")
+            return
+
+        groups = group_shards(paths)
+        shards = [group for group in groups if len(group) > 1]
+        if shards:
+            answer = modal.show_question_3way(
+                self, "Combine Shards?",
+                f"{sum(len(g) for g in shards)} of the {len(paths)} files have the same "
+                f"columns as another file ({len(shards)} group(s)).\n\n"
+                "Combine each group into a single original?"
+            )
+            if answer == "cancel":
+                return
+            if answer == "no":
+                groups = [[path] for path in paths]
+
+        progress = QProgressDialog(
+            f"Importing {len(paths)} files...", "Cancel", 0, 1000, self
+        )
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+
+        def report(fraction):
+            progress.setValue(int(fraction * 1000))
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        try:
+            imported, duplicates = self.data_manager.import_batch(groups, report)
+        except ImportCancelled:
+            return
+        except Exception as e:
+            modal.show_error(self, "Error", f"Error importing folder: {str(e)}")
+            return
+        finally:
+            progress.close()
+
+        if imported:
+            self._selected_original = imported[0][0]
+            self.refresh()
+        if duplicates:
+            names = sorted({existing for _, existing in duplicates})
+            modal.show_info(
+                self, "Already Imported",
+                f"Imported {len(imported)} dataset(s). {len(duplicates)} file(s) had the "
+                f"same content as existing originals: {', '.join(names)}."
+            )
+
     def _on_new_copy(self, original_filename):
         if not self.data_manager:
             return
@@ -1064,6 +1519,29 @@ class DatasetManagerDialog(QDialog):
         self.current_dataset = copy_rel_path
         self.refresh()
 
+    def _on_load_copy_columns(self, copy_rel_path):
+        """Load only the columns picked from the copy's header scan."""
+        if not self.data_manager or not self.workspace_path:
+            return
+        scan = self.data_manager.scan_dataset(copy_rel_path)
+        if not scan or not scan.get('columns'):
+            modal.show_error(self, "Error", "Could not read the columns of this dataset.")
+            return
+        columns = modal.show_column_picker(
+            self, "Load Selected Columns",
+            f"Choose the columns of '{os.path.basename(copy_rel_path)}' to load. "
+            "More can be added later without reloading.",
+            scan['columns'], scan.get('dtypes'),
+        )
+        if not columns:
+            return
+        if len(columns) == len(scan['columns']):
+            self._on_load_copy(copy_rel_path)
+            return
+        self.dataset_activated_columns.emit(copy_rel_path, columns)
+        self.current_dataset = copy_rel_path
+        self.refresh()
+
     def _on_load_original(self):
         if not self._selected_original:
             return
@@ -1101,6 +1579,8 @@ class DatasetManagerDialog(QDialog):
             }}
         """)
         load_action = menu.addAction("Load Original Directly")
+        watching = self.data_manager.is_watched(original_filename)
+        watch_action = menu.addAction("Stop Watching Source" if watching else "Watch Source for New Rows...")
         delete_action = menu.addAction("Delete Original")
 
         # Find the card's context button for positioning
@@ -1110,6 +1590,12 @@ class DatasetManagerDialog(QDialog):
         action = menu.exec(pos)
         if action == load_action:
             self._on_load_original_for(original_filename)
+        elif action == watch_action:
+            if watching:
+                self.data_manager.unwatch_original(original_filename)
+                self.refresh()
+            else:
+                self._on_watch_original(original_filename)
         elif action == delete_action:
             self._on_delete_original(original_filename)
 
@@ -1127,6 +1613,27 @@ class DatasetManagerDialog(QDialog):
         self.current_dataset = orig_rel
         self.refresh()
 
+    def _on_watch_original(self, original_filename):
+        """Follow the file an original was imported from as rows are appended to it."""
+        source = self.data_manager.original_source(original_filename)
+        if not source or not os.path.isfile(source):
+            source, _ = QFileDialog.getOpenFileName(
+                self, f"Source of {original_filename}", "", "CSV Files (*.csv)"
+            )
+            if not source:
+                return
+        try:
+            self.data_manager.watch_original(original_filename, source)
+        except (ValueError, OSError) as e:
+            modal.show_error(self, "Cannot Watch File", str(e))
+            return
+        self.refresh()
+        modal.show_info(
+            self, "Watching File",
+            f"Rows appended to {os.path.basename(source)} will be added to "
+            f"'{original_filename}' and its unedited copies, including the loaded data."
+        )
+
     def _on_delete_original(self, original_filename):
         """Delete an original and all its copies."""
         if not self.data_manager:
@@ -1170,6 +1677,31 @@ class DatasetManagerDialog(QDialog):
                 self.current_dataset = new_rel
             self.refresh()
 
+    def _on_export_recipe(self, copy_rel_path):
+        """Save the steps that produced a copy from its original, for ``run_recipe.py``."""
+        stem = os.path.splitext(os.path.basename(copy_rel_path))[0]
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Recipe", f"{stem}.recipe.json", "Recipe Files (*.json)"
+        )
+        if not path:
+            return
+        try:
+            recipe = self.data_manager.export_recipe(path, copy_rel_path)
+        except OSError as e:
+            modal.show_error(self, "Error", f"Error exporting recipe: {str(e)}")
+            return
+        if recipe is None:
+            return
+        steps = len(recipe["steps"])
+        if not recipe["complete"]:
+            modal.show_warning(
+                self, "Recipe Incomplete",
+                f"Exported {steps} steps, but some edits to '{os.path.basename(copy_rel_path)}' "
+                "cannot be replayed, so running the recipe will not rebuild it exactly."
+            )
+            return
+        modal.show_info(self, "Recipe Exported", f"Exported {steps} steps to {os.path.basename(path)}.")
+
     def _on_delete_copy(self, copy_rel_path):
         display_name = os.path.basename(copy_rel_path)
         if not modal.show_question(self, "Delete Working Copy",
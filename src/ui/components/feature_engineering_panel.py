@@ -12,14 +12,14 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QSize, QEvent
 from PyQt5.QtGui import QFont, QCursor
-import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder
+from sklearn.preprocessing import OneHotEncoder
 from datetime import datetime
 
 from ui.theme import get_colors, current_theme
 from ui.components import modal
 from ui.logging_utils import get_logger
+from ui.operations import OperationError, apply_operation, make_operation
 
 
 logger = get_logger(__name__)
@@ -322,6 +322,10 @@ class ToggleChipSelector(QWidget):
             return self._chips[key][1]
         return False
 
+    def checked(self):
+        """Keys of the chips that are ON, in display order."""
+        return [key for key, (_, state) in self._chips.items() if state]
+
     def set_checked(self, key, checked):
         if key in self._chips:
             btn, _ = self._chips[key]
@@ -453,7 +457,6 @@ class FeatureEngineeringPanel(QWidget):
     def __init__(self, data_manager):
         super().__init__()
         self.data_manager = data_manager
-        self.label_encoders = {}
         self.init_ui()
         self.setup_connections()
 
@@ -1014,11 +1017,20 @@ class FeatureEngineeringPanel(QWidget):
         self._power_widget.setVisible(op == "power")
         self._bins_widget.setVisible(op == "bin")
 
+    def _commit_operation(self, op):
+        """Apply ``op`` to the current data, record it (undoably) and notify listeners."""
+        df = apply_operation(self.data_manager.data, op)
+        self.data_manager.check_result(df)
+        self.data_manager.save_state()
+        self.data_manager.record_operation(op, df)
+        self.data_manager._data = df
+        self.data_manager.data_loaded.emit(df)
+        self.data_modified.emit()
+
     def apply_numeric_operation(self):
         if self.data_manager.data is None:
             return
 
-        df = self.data_manager.data.copy()
         col = self.numeric_chip_selector.selected_one()
         operation = self.numeric_ops_cards.selected()
         new_name = self.numeric_name_edit.text()
@@ -1034,59 +1046,15 @@ class FeatureEngineeringPanel(QWidget):
             return
 
         try:
-            if operation == "square":
-                df[new_name] = df[col] ** 2
-            elif operation == "power":
-                power = self.power_spin.value()
-                df[new_name] = df[col] ** power
-            elif operation == "sqrt":
-                if (df[col] < 0).any():
-                    raise ValueError("Cannot compute square root of negative values")
-                df[new_name] = np.sqrt(df[col])
-            elif operation == "log":
-                # Handle zeros with +1 offset
-                df[new_name] = np.log(df[col] + 1)
-            elif operation == "abs":
-                df[new_name] = df[col].abs()
-            elif operation == "bin":
-                bins = self.bins_spin.value()
-                df[new_name] = pd.qcut(df[col], bins, labels=False, duplicates='drop')
-            elif operation == "normalize":
-                col_min = df[col].min()
-                col_max = df[col].max()
-                if col_max == col_min:
-                    df[new_name] = 0.0
-                else:
-                    df[new_name] = (df[col] - col_min) / (col_max - col_min)
-            elif operation == "zscore":
-                col_mean = df[col].mean()
-                col_std = df[col].std()
-                if col_std == 0:
-                    df[new_name] = 0.0
-                else:
-                    df[new_name] = (df[col] - col_mean) / col_std
-            else:
-                # Binary operations requiring second column
-                col2 = self.second_chip_selector.selected_one()
-                if not col2:
-                    modal.show_warning(self, "Warning", "Please select a second column.")
-                    return
-                if operation == "ratio":
-                    if (df[col2] == 0).any():
-                        raise ValueError("Division by zero encountered")
-                    df[new_name] = df[col] / df[col2]
-                elif operation == "add":
-                    df[new_name] = df[col] + df[col2]
-                elif operation == "subtract":
-                    df[new_name] = df[col] - df[col2]
-                elif operation == "multiply":
-                    df[new_name] = df[col] * df[col2]
-
-            self.data_manager._data = df
-            self.data_manager.data_loaded.emit(df)
-            self.data_modified.emit()
+            self._commit_operation(make_operation(
+                "numeric_feature", column=col, method=operation, new_name=new_name,
+                column2=self.second_chip_selector.selected_one(),
+                power=self.power_spin.value(), bins=self.bins_spin.value(),
+            ))
             modal.show_info(self, "Success", "New feature created successfully!")
 
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error creating feature: {str(e)}")
 
@@ -1112,7 +1080,6 @@ class FeatureEngineeringPanel(QWidget):
         if self.data_manager.data is None:
             return
 
-        df = self.data_manager.data.copy()
         col = self.cat_chip_selector.selected_one()
         method = self.encoding_cards.selected()
 
@@ -1124,50 +1091,21 @@ class FeatureEngineeringPanel(QWidget):
             return
 
         try:
-            # Apply rare category grouping if enabled
+            rare_threshold = None
             if self.rare_group_check.isChecked():
-                threshold = self.rare_threshold_spin.value() / 100.0
-                freq = df[col].value_counts(normalize=True)
-                rare_cats = freq[freq < threshold].index
-                if len(rare_cats) > 0:
-                    df[col] = df[col].replace(rare_cats, "Other")
-
-            if method == "Label Encoding":
-                if col not in self.label_encoders:
-                    self.label_encoders[col] = LabelEncoder()
-                df[f"{col}_encoded"] = self.label_encoders[col].fit_transform(df[col])
-
-            elif method == "One-Hot Encoding":
-                encoded = pd.get_dummies(df[col], prefix=col)
-                df = pd.concat([df, encoded], axis=1)
-
-            elif method == "Binary Encoding":
-                unique_values = df[col].unique()
-                n_values = len(unique_values)
-                n_bits = int(np.ceil(np.log2(max(n_values, 2))))
-                value_to_binary = {val: format(i, f'0{n_bits}b')
-                                   for i, val in enumerate(unique_values)}
-                for bit in range(n_bits):
-                    df[f"{col}_bin_{bit}"] = df[col].map(
-                        lambda x, b=bit: int(value_to_binary[x][b]))
-
-            elif method == "Frequency Encoding":
-                frequency = df[col].value_counts(normalize=True)
-                df[f"{col}_freq"] = df[col].map(frequency)
-
-            elif method == "Target Encoding":
+                rare_threshold = self.rare_threshold_spin.value() / 100.0
+            target_col = None
+            if method == "Target Encoding":
                 target_col = self.target_col_combo.currentText()
-                if not target_col:
-                    modal.show_warning(self, "Warning", "Please select a target column.")
-                    return
-                target_mean = df.groupby(col)[target_col].mean()
-                df[f"{col}_target_encoded"] = df[col].map(target_mean)
-
-            self.data_manager._data = df
-            self.data_manager.data_loaded.emit(df)
-            self.data_modified.emit()
+
+            self._commit_operation(make_operation(
+                "encode_categorical", column=col, method=method,
+                rare_threshold=rare_threshold, target_column=target_col,
+            ))
             modal.show_info(self, "Success", "Categorical encoding applied successfully!")
 
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error applying encoding: {str(e)}")
 
@@ -1177,7 +1115,6 @@ class FeatureEngineeringPanel(QWidget):
         if self.data_manager.data is None:
             return
 
-        df = self.data_manager.data.copy()
         col = self.dt_chip_selector.selected_one()
 
         if not col:
@@ -1185,53 +1122,10 @@ class FeatureEngineeringPanel(QWidget):
             return
 
         try:
-            dt_series = pd.to_datetime(df[col])
-
-            if self.dt_toggle_chips.is_checked("year"):
-                df[f"{col}_year"] = dt_series.dt.year
-            if self.dt_toggle_chips.is_checked("month"):
-                df[f"{col}_month"] = dt_series.dt.month
-            if self.dt_toggle_chips.is_checked("day"):
-                df[f"{col}_day"] = dt_series.dt.day
-            if self.dt_toggle_chips.is_checked("weekday"):
-                df[f"{col}_weekday"] = dt_series.dt.dayofweek
-            if self.dt_toggle_chips.is_checked("hour"):
-                df[f"{col}_hour"] = dt_series.dt.hour
-            if self.dt_toggle_chips.is_checked("minute"):
-                df[f"{col}_minute"] = dt_series.dt.minute
-            if self.dt_toggle_chips.is_checked("quarter"):
-                df[f"{col}_quarter"] = dt_series.dt.quarter
-            if self.dt_toggle_chips.is_checked("is_weekend"):
-                df[f"{col}_is_weekend"] = dt_series.dt.dayofweek.isin([5, 6]).astype(int)
-
-            # New extractions
-            if self.dt_toggle_chips.is_checked("is_month_start"):
-                df[f"{col}_is_month_start"] = dt_series.dt.is_month_start.astype(int)
-            if self.dt_toggle_chips.is_checked("is_month_end"):
-                df[f"{col}_is_month_end"] = dt_series.dt.is_month_end.astype(int)
-            if self.dt_toggle_chips.is_checked("season"):
-                month = dt_series.dt.month
-                df[f"{col}_season"] = month.map({
-                    12: "Winter", 1: "Winter", 2: "Winter",
-                    3: "Spring", 4: "Spring", 5: "Spring",
-                    6: "Summer", 7: "Summer", 8: "Summer",
-                    9: "Fall", 10: "Fall", 11: "Fall",
-                })
-            if self.dt_toggle_chips.is_checked("days_since_min"):
-                min_date = dt_series.min()
-                df[f"{col}_days_since_min"] = (dt_series - min_date).dt.days
-            if self.dt_toggle_chips.is_checked("cyclical_month"):
-                month = dt_series.dt.month
-                df[f"{col}_month_sin"] = np.sin(2 * np.pi * month / 12)
-                df[f"{col}_month_cos"] = np.cos(2 * np.pi * month / 12)
-            if self.dt_toggle_chips.is_checked("cyclical_dow"):
-                dow = dt_series.dt.dayofweek
-                df[f"{col}_dow_sin"] = np.sin(2 * np.pi * dow / 7)
-                df[f"{col}_dow_cos"] = np.cos(2 * np.pi * dow / 7)
-
-            self.data_manager._data = df
-            self.data_manager.data_loaded.emit(df)
-            self.data_modified.emit()
+            self._commit_operation(make_operation(
+                "datetime_features", column=col,
+                features=self.dt_toggle_chips.checked(),
+            ))
             modal.show_info(self, "Success", "DateTime features extracted successfully!")
 
         except Exception as e:
@@ -1317,7 +1211,6 @@ class FeatureEngineeringPanel(QWidget):
         if self.data_manager.data is None:
             return
 
-        df = self.data_manager.data.copy()
         method = self.combine_method_cards.selected()
         new_name = self.combine_name_edit.text()
 
@@ -1335,47 +1228,14 @@ class FeatureEngineeringPanel(QWidget):
             return
 
         try:
-            if method == "sum":
-                df[new_name] = df[selected_columns].sum(axis=1)
-            elif method == "mean":
-                df[new_name] = df[selected_columns].mean(axis=1)
-            elif method == "product":
-                df[new_name] = df[selected_columns].prod(axis=1)
-            elif method == "ratio":
-                if len(selected_columns) != 2:
-                    modal.show_warning(self, "Warning", "Ratio requires exactly 2 columns.")
-                    return
-                c1, c2 = selected_columns
-                if (df[c2] == 0).any():
-                    raise ValueError("Division by zero encountered")
-                df[new_name] = df[c1] / df[c2]
-            elif method == "poly":
-                # Generate polynomial combinations up to chosen degree
-                degree = self._poly_degree
-                num_cols = [c for c in selected_columns
-                            if np.issubdtype(df[c].dtype, np.number)]
-                if len(num_cols) < 2:
-                    modal.show_warning(self, "Warning",
-                                        "Polynomial requires at least 2 numeric columns.")
-                    return
-                # Squared terms
-                for c in num_cols:
-                    df[f"{c}_sq"] = df[c] ** 2
-                # Interaction terms
-                for i in range(len(num_cols)):
-                    for j in range(i + 1, len(num_cols)):
-                        df[f"{num_cols[i]}_x_{num_cols[j]}"] = df[num_cols[i]] * df[num_cols[j]]
-                if degree >= 3:
-                    for c in num_cols:
-                        df[f"{c}_cb"] = df[c] ** 3
-            elif method == "concat":
-                sep = self.concat_separator_edit.text() or "_"
-                df[new_name] = df[selected_columns].astype(str).agg(sep.join, axis=1)
-
-            self.data_manager._data = df
-            self.data_manager.data_loaded.emit(df)
-            self.data_modified.emit()
+            self._commit_operation(make_operation(
+                "combine_columns", columns=selected_columns, method=method,
+                new_name=new_name, degree=self._poly_degree,
+                separator=self.concat_separator_edit.text() or "_",
+            ))
             modal.show_info(self, "Success", "Combined feature created successfully!")
 
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error creating combined feature: {str(e)}")
@@ -527,6 +527,15 @@ class MachineLearningPanel(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
+        # Shown while an out-of-core dataset is modelled from its preview
+        self.preview_notice = QLabel()
+        self.preview_notice.setWordWrap(True)
+        self.preview_notice.hide()
+        self.preview_notice.setStyleSheet(
+            f"color: {_colors()['warning']}; font-size: 11px; padding: 4px 8px; background: transparent;"
+        )
+        layout.addWidget(self.preview_notice)
+
         tabs = QTabWidget()
         tabs.addTab(self._build_training_tab(), "Model Training")
         tabs.addTab(self._build_evaluation_tab(), "Model Evaluation")
@@ -537,6 +546,10 @@ class MachineLearningPanel(QWidget):
         """Re-apply inline styles for the current theme."""
         c = _colors()
 
+        self.preview_notice.setStyleSheet(
+            f"color: {c['warning']}; font-size: 11px; padding: 4px 8px; background: transparent;"
+        )
+
         # Refresh chip/card/segmented selectors
         self.target_chips.refresh_styles()
         self.features_chips.refresh_styles()
@@ -1151,6 +1164,9 @@ class MachineLearningPanel(QWidget):
     # ── Data Load Handler ──────────────────────────────────────────────────
 
     def on_data_loaded(self, df):
+        notice = self.data_manager.preview_notice
+        self.preview_notice.setText(notice or "")
+        self.preview_notice.setVisible(notice is not None)
         if df is None:
             return
 
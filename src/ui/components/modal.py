@@ -5,7 +5,8 @@ avoiding the Windows system alert sound and OS-native appearance.
 """
 
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QWidget, QLineEdit
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QWidget, QLineEdit,
+    QListWidget, QListWidgetItem, QPlainTextEdit, QSpinBox
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QCursor
@@ -882,3 +883,428 @@ def show_reset_workspace(parent):
 
     _resize()
     return dialog.exec() == QDialog.Accepted
+
+
+def show_column_picker(parent, title, message, columns, dtypes=None, selected=None):
+    """
+    Let the user tick a subset of ``columns`` (e.g. to load only those).
+    ``dtypes`` maps column names to a type label shown next to each name;
+    ``selected`` are ticked initially (default: all).
+    Returns the ticked names in ``columns`` order, or None if cancelled.
+    """
+    c = _colors()
+    dtypes = dtypes or {}
+    selected = set(columns if selected is None else selected)
+
+    dialog = QDialog(parent, Qt.FramelessWindowHint)
+    dialog.setModal(True)
+    dialog.setAttribute(Qt.WA_TranslucentBackground)
+
+    overlay = QWidget(dialog)
+    overlay.setStyleSheet("background: rgba(0, 0, 0, 0.6);")
+
+    box = QWidget(overlay)
+    box.setStyleSheet(f"""
+        QWidget {{
+            background-color: {c['bg_input']};
+            border: 1px solid rgba(255,255,255,0.10);
+            border-radius: 10px;
+            border-left: 3px solid {c['accent']};
+        }}
+    """)
+
+    box_layout = QVBoxLayout(box)
+    box_layout.setContentsMargins(24, 24, 24, 24)
+    box_layout.setSpacing(12)
+
+    title_label = QLabel(title)
+    title_label.setStyleSheet(f"""
+        QLabel {{
+            color: {c['text_primary']};
+            font-size: 15px;
+            font-weight: 700;
+            background: transparent;
+            border: none;
+        }}
+    """)
+    box_layout.addWidget(title_label)
+
+    body_label = QLabel(message)
+    body_label.setWordWrap(True)
+    body_label.setStyleSheet(f"""
+        QLabel {{
+            color: {c['text_secondary']};
+            font-size: 13px;
+            background: transparent;
+            border: none;
+            padding-right: 8px;
+        }}
+    """)
+    box_layout.addWidget(body_label)
+
+    filter_input = QLineEdit()
+    filter_input.setPlaceholderText("Filter columns")
+    filter_input.setStyleSheet(f"""
+        QLineEdit {{
+            background-color: {c['bg_primary']};
+            color: {c['text_primary']};
+            border: 1px solid {c['border_medium']};
+            border-radius: 6px;
+            padding: 8px 12px;
+            font-size: 13px;
+        }}
+        QLineEdit:focus {{
+            border-color: {c['accent']};
+        }}
+    """)
+    box_layout.addWidget(filter_input)
+
+    column_list = QListWidget()
+    column_list.setMinimumHeight(220)
+    column_list.setStyleSheet(f"""
+        QListWidget {{
+            background-color: {c['bg_primary']};
+            color: {c['text_primary']};
+            border: 1px solid {c['border_medium']};
+            border-radius: 6px;
+            padding: 4px;
+            font-size: 12px;
+        }}
+    """)
+    for name in columns:
+        label = f"{name}    ({dtypes[name]})" if name in dtypes else str(name)
+        item = QListWidgetItem(label)
+        item.setData(Qt.UserRole, name)
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+        item.setCheckState(Qt.Checked if name in selected else Qt.Unchecked)
+        column_list.addItem(item)
+    box_layout.addWidget(column_list)
+
+    def _items():
+        return [column_list.item(i) for i in range(column_list.count())]
+
+    def _on_filter(text):
+        needle = text.strip().lower()
+        for item in _items():
+            item.setHidden(bool(needle) and needle not in str(item.data(Qt.UserRole)).lower())
+    filter_input.textChanged.connect(_on_filter)
+
+    small_btn_style = f"""
+        QPushButton {{
+            background-color: transparent;
+            color: {c['text_secondary']};
+            border: 1px solid {c['border']};
+            border-radius: 6px;
+            padding: 4px 12px;
+            font-size: 11px;
+            font-weight: 600;
+            min-height: 0px;
+        }}
+        QPushButton:hover {{
+            background-color: {c['bg_hover']};
+            color: {c['text_primary']};
+        }}
+    """
+
+    def _set_visible_checked(state):
+        for item in _items():
+            if not item.isHidden():
+                item.setCheckState(state)
+
+    select_layout = QHBoxLayout()
+    select_layout.setSpacing(8)
+    all_btn = QPushButton("All")
+    all_btn.setCursor(QCursor(Qt.PointingHandCursor))
+    all_btn.setStyleSheet(small_btn_style)
+    all_btn.clicked.connect(lambda: _set_visible_checked(Qt.Checked))
+    select_layout.addWidget(all_btn)
+    none_btn = QPushButton("None")
+    none_btn.setCursor(QCursor(Qt.PointingHandCursor))
+    none_btn.setStyleSheet(small_btn_style)
+    none_btn.clicked.connect(lambda: _set_visible_checked(Qt.Unchecked))
+    select_layout.addWidget(none_btn)
+    select_layout.addStretch()
+    count_label = QLabel()
+    count_label.setStyleSheet(f"""
+        QLabel {{
+            color: {c['text_secondary']};
+            font-size: 11px;
+            background: transparent;
+            border: none;
+        }}
+    """)
+    select_layout.addWidget(count_label)
+    box_layout.addLayout(select_layout)
+
+    btn_layout = QHBoxLayout()
+    btn_layout.setSpacing(8)
+    btn_layout.addStretch()
+
+    cancel_btn = QPushButton("Cancel")
+    cancel_btn.setCursor(QCursor(Qt.PointingHandCursor))
+    cancel_btn.setMinimumWidth(80)
+    cancel_btn.setStyleSheet(f"""
+        QPushButton {{
+            background-color: transparent;
+            color: {c['text_secondary']};
+            border: 1px solid {c['border']};
+            border-radius: 6px;
+            padding: 8px 20px;
+            font-size: 12px;
+            font-weight: 600;
+            min-height: 0px;
+        }}
+        QPushButton:hover {{
+            background-color: {c['bg_hover']};
+            color: {c['text_primary']};
+        }}
+    """)
+    cancel_btn.clicked.connect(dialog.reject)
+    btn_layout.addWidget(cancel_btn)
+
+    load_btn = QPushButton("Load")
+    load_btn.setCursor(QCursor(Qt.PointingHandCursor))
+    load_btn.setMinimumWidth(80)
+    load_btn.setStyleSheet(f"""
+        QPushButton {{
+            background-color: {c['accent']};
+            color: {c['text_inverse']};
+            border: none;
+            border-radius: 6px;
+            padding: 8px 20px;
+            font-size: 12px;
+            font-weight: 600;
+            min-height: 0px;
+        }}
+        QPushButton:hover {{
+            background-color: {c['accent_hover']};
+        }}
+        QPushButton:disabled {{
+            background-color: {c['border_subtle']};
+            color: {c['text_disabled']};
+        }}
+    """)
+    load_btn.clicked.connect(dialog.accept)
+    btn_layout.addWidget(load_btn)
+
+    def _on_item_changed(*_):
+        ticked = sum(item.checkState() == Qt.Checked for item in _items())
+        count_label.setText(f"{ticked} of {len(columns)} selected")
+        load_btn.setEnabled(ticked > 0)
+    column_list.itemChanged.connect(_on_item_changed)
+    _on_item_changed()
+
+    box_layout.addLayout(btn_layout)
+
+    def _resize():
+        dialog.resize(parent.size() if parent else dialog.size())
+        overlay.setGeometry(0, 0, dialog.width(), dialog.height())
+        box_w = min(460, dialog.width() - 60)
+        box.setFixedWidth(box_w)
+        box.adjustSize()
+        bx = (dialog.width() - box_w) // 2
+        by = (dialog.height() - box.height()) // 2
+        box.move(bx, by)
+
+    dialog.resizeEvent = lambda e: _resize()
+
+    if parent:
+        dialog.resize(parent.size())
+        dialog.move(parent.mapToGlobal(parent.rect().topLeft()))
+    else:
+        dialog.resize(500, 500)
+
+    _resize()
+    if dialog.exec() != QDialog.Accepted:
+        return None
+    return [item.data(Qt.UserRole) for item in _items() if item.checkState() == Qt.Checked]
+
+
+def show_sqlite_source(parent, database, sources, chunk_rows):
+    """
+    Choose what to import from a SQLite database: one of ``sources``
+    (``(name, "table" | "view")`` pairs) or a SQL query, and the rows
+    fetched per chunk.
+    Returns ``(table, query, chunk_rows)`` with one of table/query set,
+    or None if cancelled.
+    """
+    c = _colors()
+
+    dialog = QDialog(parent, Qt.FramelessWindowHint)
+    dialog.setModal(True)
+    dialog.setAttribute(Qt.WA_TranslucentBackground)
+
+    overlay = QWidget(dialog)
+    overlay.setStyleSheet("background: rgba(0, 0, 0, 0.6);")
+
+    box = QWidget(overlay)
+    box.setStyleSheet(f"""
+        QWidget {{
+            background-color: {c['bg_input']};
+            border: 1px solid rgba(255,255,255,0.10);
+            border-radius: 10px;
+            border-left: 3px solid {c['accent']};
+        }}
+    """)
+
+    box_layout = QVBoxLayout(box)
+    box_layout.setContentsMargins(24, 24, 24, 24)
+    box_layout.setSpacing(12)
+
+    title_label = QLabel(f"Import from {database}")
+    title_label.setStyleSheet(f"""
+        QLabel {{
+            color: {c['text_primary']};
+            font-size: 15px;
+            font-weight: 700;
+            background: transparent;
+            border: none;
+        }}
+    """)
+    box_layout.addWidget(title_label)
+
+    label_style = f"""
+        QLabel {{
+            color: {c['text_secondary']};
+            font-size: 13px;
+            background: transparent;
+            border: none;
+            padding-right: 8px;
+        }}
+    """
+    input_style = f"""
+        background-color: {c['bg_primary']};
+        color: {c['text_primary']};
+        border: 1px solid {c['border_medium']};
+        border-radius: 6px;
+        font-size: 12px;
+    """
+
+    tables_label = QLabel("Choose a table or view:")
+    tables_label.setStyleSheet(label_style)
+    box_layout.addWidget(tables_label)
+
+    source_list = QListWidget()
+    source_list.setMinimumHeight(160)
+    source_list.setStyleSheet(f"QListWidget {{ {input_style} padding: 4px; }}")
+    for name, kind in sources:
+        item = QListWidgetItem(f"{name}    ({kind})")
+        item.setData(Qt.UserRole, name)
+        source_list.addItem(item)
+    box_layout.addWidget(source_list)
+
+    query_label = QLabel("Or import the result of a query:")
+    query_label.setStyleSheet(label_style)
+    box_layout.addWidget(query_label)
+
+    query_input = QPlainTextEdit()
+    query_input.setPlaceholderText("SELECT ... FROM ...")
+    query_input.setFixedHeight(72)
+    query_input.setStyleSheet(f"QPlainTextEdit {{ {input_style} padding: 6px; }}")
+    box_layout.addWidget(query_input)
+
+    chunk_layout = QHBoxLayout()
+    chunk_label = QLabel("Rows per chunk:")
+    chunk_label.setStyleSheet(label_style)
+    chunk_layout.addWidget(chunk_label)
+    chunk_input = QSpinBox()
+    chunk_input.setRange(1_000, 1_000_000)
+    chunk_input.setSingleStep(10_000)
+    chunk_input.setGroupSeparatorShown(True)
+    chunk_input.setValue(chunk_rows)
+    chunk_input.setToolTip("Rows read from the database at a time; lower it to use less memory")
+    chunk_input.setStyleSheet(f"QSpinBox {{ {input_style} padding: 4px 8px; }}")
+    chunk_layout.addWidget(chunk_input)
+    chunk_layout.addStretch()
+    box_layout.addLayout(chunk_layout)
+
+    btn_layout = QHBoxLayout()
+    btn_layout.setSpacing(8)
+    btn_layout.addStretch()
+
+    cancel_btn = QPushButton("Cancel")
+    cancel_btn.setCursor(QCursor(Qt.PointingHandCursor))
+    cancel_btn.setMinimumWidth(80)
+    cancel_btn.setStyleSheet(f"""
+        QPushButton {{
+            background-color: transparent;
+            color: {c['text_secondary']};
+            border: 1px solid {c['border']};
+            border-radius: 6px;
+            padding: 8px 20px;
+            font-size: 12px;
+            font-weight: 600;
+            min-height: 0px;
+        }}
+        QPushButton:hover {{
+            background-color: {c['bg_hover']};
+            color: {c['text_primary']};
+        }}
+    """)
+    cancel_btn.clicked.connect(dialog.reject)
+    btn_layout.addWidget(cancel_btn)
+
+    import_btn = QPushButton("Import")
+    import_btn.setCursor(QCursor(Qt.PointingHandCursor))
+    import_btn.setMinimumWidth(80)
+    import_btn.setStyleSheet(f"""
+        QPushButton {{
+            background-color: {c['accent']};
+            color: {c['text_inverse']};
+            border: none;
+            border-radius: 6px;
+            padding: 8px 20px;
+            font-size: 12px;
+            font-weight: 600;
+            min-height: 0px;
+        }}
+        QPushButton:hover {{
+            background-color: {c['accent_hover']};
+        }}
+        QPushButton:disabled {{
+            background-color: {c['border_subtle']};
+            color: {c['text_disabled']};
+        }}
+    """)
+    import_btn.clicked.connect(dialog.accept)
+    btn_layout.addWidget(import_btn)
+
+    def _update_import_btn():
+        # A query, when typed, takes precedence over the list selection.
+        source_list.setEnabled(not query_input.toPlainText().strip())
+        import_btn.setEnabled(bool(query_input.toPlainText().strip() or source_list.selectedItems()))
+    source_list.itemSelectionChanged.connect(_update_import_btn)
+    query_input.textChanged.connect(_update_import_btn)
+    source_list.itemDoubleClicked.connect(lambda _item: dialog.accept())
+    _update_import_btn()
+
+    box_layout.addLayout(btn_layout)
+
+    def _resize():
+        dialog.resize(parent.size() if parent else dialog.size())
+        overlay.setGeometry(0, 0, dialog.width(), dialog.height())
+        box_w = min(480, dialog.width() - 60)
+        box.setFixedWidth(box_w)
+        box.adjustSize()
+        bx = (dialog.width() - box_w) // 2
+        by = (dialog.height() - box.height()) // 2
+        box.move(bx, by)
+
+    dialog.resizeEvent = lambda e: _resize()
+
+    if parent:
+        dialog.resize(parent.size())
+        dialog.move(parent.mapToGlobal(parent.rect().topLeft()))
+    else:
+        dialog.resize(520, 560)
+
+    _resize()
+    if dialog.exec() != QDialog.Accepted:
+        return None
+    query = query_input.toPlainText().strip()
+    if query:
+        return None, query, chunk_input.value()
+    selected = source_list.selectedItems()
+    if not selected:
+        return None
+    return selected[0].data(Qt.UserRole), None, chunk_input.value()
@@ -14,10 +14,10 @@ from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QKeySequence
 import pandas as pd
 import numpy as np
-from scipy import stats
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
 from copy import deepcopy
 from . import modal
+from ..chunked import ChunkedDataset
+from ..operations import OperationError, make_operation, outlier_mask
 
 class PreprocessingPanel(QWidget):
     """Panel for data preprocessing operations."""
@@ -52,7 +52,47 @@ class PreprocessingPanel(QWidget):
         self.update_data_view()
         self.data_manager.data_loaded.emit(df)
         self.data_modified.emit()
+
+    def _commit_operation(self, op, df, emit=True):
+        """Commit ``df`` (the result of ``op``) and record ``op`` for replay.
+
+        The undo snapshot is taken here, after the result has been
+        computed, so a failed operation leaves history untouched.  With
+        ``emit=False`` only this panel's table is refreshed.  ``df`` may be
+        the ``ChunkedDataset`` of an out-of-core dataset (see
+        ``_run_operation``).
+        """
+        self.data_manager.check_result(df)
+        self.save_state()
+        self.data_manager.record_operation(op, df)
+        if isinstance(df, ChunkedDataset):
+            df = self.data_manager.set_out_of_core_result(df)
+        if emit:
+            self._commit_edit(df)
+        else:
+            self.data_manager._data = df
+            self.update_data_view()
         
+    def _run_operation(self, op):
+        """Compute ``op`` on the whole dataset with the workspace's engine.
+
+        Out of core it runs chunk by chunk behind a progress dialog.
+        """
+        if not self.data_manager.is_out_of_core:
+            return self.data_manager.run_operation(op)
+        progress = QProgressDialog("Processing dataset...", None, 0, 1000, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+
+        def report(fraction):
+            progress.setValue(int(fraction * 1000))
+            QApplication.processEvents()
+
+        try:
+            return self.data_manager.run_operation(op, report)
+        finally:
+            progress.close()
+
     def init_ui(self):
         """Initialize the user interface."""
         layout = QVBoxLayout(self)
@@ -451,6 +491,12 @@ class PreprocessingPanel(QWidget):
         button_layout.addWidget(self.undo_btn)
         button_layout.addWidget(self.redo_btn)
         button_layout.addStretch()
+        self.history_label = QLabel("")
+        self.history_label.setToolTip(
+            "Memory held by undo history. Older steps are moved to disk "
+            "once it exceeds the workspace's undo memory budget."
+        )
+        button_layout.addWidget(self.history_label)
         layout.addLayout(button_layout)
 
     def setup_connections(self):
@@ -641,55 +687,14 @@ class PreprocessingPanel(QWidget):
         progress.show()
         
         try:
-            # Save current state for undo functionality
-            self.save_state()
-            
-            df = self.data_manager.data.copy()
-            
-            # Get the data
-            data = df[column]
-            
+            op = make_operation("transform", column=column, method=transform)
             progress.setValue(20)
             
-            # Apply transformation
-            if transform == "Standard Scale":
-                scaler = StandardScaler()
-                df[column] = scaler.fit_transform(data.values.reshape(-1, 1))
-            elif transform == "Min-Max Scale":
-                scaler = MinMaxScaler()
-                df[column] = scaler.fit_transform(data.values.reshape(-1, 1))
-            elif transform == "Robust Scale":
-                scaler = RobustScaler()
-                df[column] = scaler.fit_transform(data.values.reshape(-1, 1))
-            elif transform == "Log Transform":
-                # Handle negative or zero values
-                min_val = data.min()
-                if min_val <= 0:
-                    offset = abs(min_val) + 1
-                    df[column] = np.log(data + offset)
-                else:
-                    df[column] = np.log(data)
-            elif transform == "Square Root":
-                # Handle negative values
-                min_val = data.min()
-                if min_val < 0:
-                    offset = abs(min_val)
-                    df[column] = np.sqrt(data + offset)
-                else:
-                    df[column] = np.sqrt(data)
-            elif transform == "Box-Cox":
-                # Box-Cox requires positive values
-                min_val = data.min()
-                if min_val <= 0:
-                    offset = abs(min_val) + 1
-                    transformed, lambda_val = stats.boxcox(data + offset)
-                else:
-                    transformed, lambda_val = stats.boxcox(data)
-                df[column] = transformed
+            df = self._run_operation(op)
             
             progress.setValue(80)
             
-            self._commit_edit(df)
+            self._commit_operation(op, df)
             
             progress.setValue(100)
             modal.show_info(self, "Success", 
@@ -715,57 +720,21 @@ class PreprocessingPanel(QWidget):
             return
             
         try:
-            # Save current state for undo functionality
-            self.save_state()
-            
-            df = self.data_manager.data.copy()
-            
-            # Apply filter based on condition
-            if condition == "equals":
-                try:
-                    # Try to convert value to numeric if column is numeric
-                    if pd.api.types.is_numeric_dtype(df[column]):
-                        df = df[df[column] == float(value)]
-                    else:
-                        df = df[df[column] == value]
-                except ValueError:
-                    # If conversion fails, use string comparison
-                    df = df[df[column] == value]
-            elif condition == "not equals":
-                try:
-                    if pd.api.types.is_numeric_dtype(df[column]):
-                        df = df[df[column] != float(value)]
-                    else:
-                        df = df[df[column] != value]
-                except ValueError:
-                    df = df[df[column] != value]
-            elif condition == "greater than":
-                try:
-                    df = df[df[column] > float(value)]
-                except ValueError:
-                    modal.show_warning(self, "Invalid Value", 
-                                      "Please enter a numeric value for 'greater than' comparison.")
-                    return
-            elif condition == "less than":
-                try:
-                    df = df[df[column] < float(value)]
-                except ValueError:
-                    modal.show_warning(self, "Invalid Value", 
-                                      "Please enter a numeric value for 'less than' comparison.")
-                    return
-            elif condition == "contains":
-                df = df[df[column].astype(str).str.contains(value, case=False, na=False)]
+            op = make_operation("filter_rows", column=column, condition=condition, value=value)
+            df = self._run_operation(op)
             
             if len(df) == 0:
                 modal.show_warning(self, "No Data", 
                                   "The filter returned no results. Please try a different filter.")
                 return
                 
-            self._commit_edit(df)
+            self._commit_operation(op, df)
             
             modal.show_info(self, "Success", 
                                   "Filter applied successfully! Click 'Apply Changes to Main View' to update the main data preview.")
             
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error applying filter: {str(e)}")
 
@@ -784,68 +753,21 @@ class PreprocessingPanel(QWidget):
             return
             
         try:
-            # Save current state for undo functionality
-            self.save_state()
-            
-            df = self.data_manager.data.copy()
-            
-            # Get selected column if any
+            # Replace in the selected column, or in all columns if none is selected
             column = self.get_selected_column()
-            
-            # Replace in selected column or all columns
-            if column:
-                # Try to convert values based on column type
-                if pd.api.types.is_numeric_dtype(df[column]):
-                    try:
-                        find_numeric = float(find_value)
-                        replace_numeric = float(replace_value) if replace_value else np.nan
-                        
-                        if exact_match:
-                            # Only replace exact matches
-                            mask = df[column] == find_numeric
-                            df.loc[mask, column] = replace_numeric
-                        else:
-                            # Use pandas replace which can handle partial matches
-                            df[column] = df[column].replace(find_numeric, replace_numeric)
-                    except ValueError:
-                        modal.show_warning(self, "Type Mismatch", 
-                                          "Cannot convert values to match column type.")
-                        return
-                else:
-                    if exact_match:
-                        # Only replace exact matches for string columns
-                        mask = df[column].astype(str) == find_value
-                        df.loc[mask, column] = replace_value
-                    else:
-                        # Use pandas replace which can handle partial matches
-                        df[column] = df[column].replace(find_value, replace_value)
-            else:
-                # Replace in all columns
-                if exact_match:
-                    # For exact match, we need to iterate through columns
-                    for col in df.columns:
-                        if pd.api.types.is_numeric_dtype(df[col]):
-                            try:
-                                find_numeric = float(find_value)
-                                replace_numeric = float(replace_value) if replace_value else np.nan
-                                mask = df[col] == find_numeric
-                                df.loc[mask, col] = replace_numeric
-                            except ValueError:
-                                # Skip columns where conversion fails
-                                continue
-                        else:
-                            # For non-numeric columns, compare as strings
-                            mask = df[col].astype(str) == find_value
-                            df.loc[mask, col] = replace_value
-                else:
-                    # Use pandas replace for non-exact matches
-                    df = df.replace(find_value, replace_value)
+            op = make_operation(
+                "replace_values", find=find_value, replace=replace_value,
+                column=column, exact=exact_match,
+            )
+            df = self._run_operation(op)
                 
-            self._commit_edit(df)
+            self._commit_operation(op, df)
             
             modal.show_info(self, "Success", 
                                   "Replace operation completed successfully! Click 'Apply Changes to Main View' to update the main data preview.")
             
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error replacing values: {str(e)}")
 
@@ -855,18 +777,24 @@ class PreprocessingPanel(QWidget):
             return
             
         df = self.data_manager.data
+        # Out of core, pages are read from the chunk files
+        lazy = self.data_manager.lazy_data
+        total_rows = self.data_manager.row_count
         rows_per_page = int(self.rows_per_page_combo.currentText())
         current_page = self.page_spin.value() - 1
         
         start_idx = current_page * rows_per_page
-        end_idx = min(start_idx + rows_per_page, len(df))
+        end_idx = min(start_idx + rows_per_page, total_rows)
         
         # Update page spinner maximum
-        total_pages = (len(df) + rows_per_page - 1) // rows_per_page
+        total_pages = (total_rows + rows_per_page - 1) // rows_per_page
         self.page_spin.setMaximum(total_pages)
         
         # Get current page of data
-        page_data = df.iloc[start_idx:end_idx]
+        if lazy is not None:
+            page_data = lazy.page(start_idx, end_idx)
+        else:
+            page_data = df.iloc[start_idx:end_idx]
         
         # Update table
         self.data_view.setRowCount(len(page_data))
@@ -961,12 +889,10 @@ class PreprocessingPanel(QWidget):
             return
             
         try:
-            df = self.data_manager.data.copy()
-            df = df.rename(columns={old_name: new_name})
+            op = make_operation("rename_column", old=old_name, new=new_name)
+            df = self._run_operation(op)
             
-            self.save_state()
-            
-            self._commit_edit(df)
+            self._commit_operation(op, df)
             
             modal.show_info(self, "Success", 
                                   f"Column '{old_name}' renamed to '{new_name}' successfully! Click 'Apply Changes to Main View' to update the main data preview.")
@@ -977,12 +903,10 @@ class PreprocessingPanel(QWidget):
     def remove_column(self, column_name):
         """Remove a column from the dataset."""
         try:
-            df = self.data_manager.data.copy()
-            df = df.drop(columns=[column_name])
+            op = make_operation("drop_column", column=column_name)
+            df = self._run_operation(op)
             
-            self.save_state()
-            
-            self._commit_edit(df)
+            self._commit_operation(op, df)
             
             modal.show_info(self, "Success", 
                                   f"Column '{column_name}' removed successfully! Click 'Apply Changes to Main View' to update the main data preview.")
@@ -1030,6 +954,7 @@ class PreprocessingPanel(QWidget):
             self.rows_per_page_combo.setEnabled(False)
             self.undo_btn.setEnabled(False)
             self.redo_btn.setEnabled(False)
+            self.history_label.setText("")
             return
 
         # Set the data loaded flag
@@ -1127,6 +1052,15 @@ class PreprocessingPanel(QWidget):
         """Update the enabled state of undo/redo buttons."""
         self.undo_btn.setEnabled(len(self.data_manager.history) > 0)
         self.redo_btn.setEnabled(len(self.data_manager.redo_stack) > 0)
+        steps = len(self.data_manager.history) + len(self.data_manager.redo_stack)
+        if not steps:
+            self.history_label.setText("")
+            return
+        memory, disk = self.data_manager.history_usage()
+        text = f"History: {steps} step{'s' if steps != 1 else ''}, {memory / 1024 ** 2:.1f} MB in memory"
+        if disk:
+            text += f", {disk / 1024 ** 2:.1f} MB on disk"
+        self.history_label.setText(text)
         
     def undo(self):
         """Undo the last operation."""
@@ -1158,7 +1092,7 @@ class PreprocessingPanel(QWidget):
         
         if file_name:
             try:
-                self.data_manager.data.to_csv(file_name, index=False)
+                self.data_manager.export_csv(file_name)
                 modal.show_info(self, "Success", "Data exported successfully!")
             except Exception as e:
                 modal.show_error(self, "Error", f"Error exporting data: {str(e)}")
@@ -1169,22 +1103,11 @@ class PreprocessingPanel(QWidget):
             return
             
         try:
-            df = self.data_manager.data.copy()
-            
-            if new_type == "datetime":
-                df[column_name] = pd.to_datetime(df[column_name])
-            elif new_type == "boolean":
-                df[column_name] = df[column_name].astype(bool)
-            else:
-                df[column_name] = df[column_name].astype(new_type)
-            
-            self.save_state()
-            
-            # Update the data manager with the new dataframe
-            self.data_manager._data = df
+            op = make_operation("change_type", column=column_name, dtype=new_type)
+            df = self._run_operation(op)
             
             # Update only the local view without emitting data_loaded signal
-            self.update_data_view()
+            self._commit_operation(op, df, emit=False)
             
             modal.show_info(self, "Success", 
                                   f"Column '{column_name}' type changed to {new_type} successfully! Click 'Apply Changes to Main View' to update the main data preview.")
@@ -1353,86 +1276,32 @@ class PreprocessingPanel(QWidget):
         progress.show()
         
         try:
-            # Save current state for undo functionality
-            self.save_state()
-            
-            df = self.data_manager.data.copy()
             column = self.outlier_column_combo.currentText()
             method = self.handling_method_combo.currentText()
             
-            # Get the data and create a Series with the original index
-            data = pd.Series(df[column].dropna().values, index=df[column].dropna().index)
-            
-            progress.setValue(20)
-            
-            # Get the outlier detection method and threshold from stored results
+            # Re-detect with the stored method/threshold on the entire column
             bounds = self.current_outliers['bounds']
-            detection_method = bounds['method']
-            threshold = bounds['threshold']
+            op = make_operation(
+                "handle_outliers", column=column, detection_method=bounds['method'],
+                threshold=bounds['threshold'], action=method,
+            )
+            handled = int(outlier_mask(
+                self.data_manager.data[column].dropna(), bounds['method'], bounds['threshold']
+            ).sum())
             
-            # Re-detect outliers on the entire dataset to ensure we handle all outliers
-            if detection_method == "IQR Method":
-                Q1 = np.percentile(data, 25)
-                Q3 = np.percentile(data, 75)
-                IQR = Q3 - Q1
-                if IQR == 0:  # Handle case where IQR is zero
-                    is_outlier = pd.Series(False, index=data.index)
-                else:
-                    lower_bound = Q1 - threshold * IQR
-                    upper_bound = Q3 + threshold * IQR
-                    is_outlier = (data < lower_bound) | (data > upper_bound)
-            elif detection_method == "Z-Score Method":
-                mean = data.mean()
-                std = data.std()
-                if std == 0:  # Handle case where std is zero
-                    is_outlier = pd.Series(False, index=data.index)
-                else:
-                    z_scores = np.abs((data - mean) / std)
-                    is_outlier = z_scores > threshold
-            elif detection_method == "Modified Z-Score":
-                median = np.median(data)
-                mad = np.median(np.abs(data - median))
-                if mad == 0:  # Handle case where MAD is zero
-                    is_outlier = pd.Series(False, index=data.index)
-                else:
-                    modified_z_scores = 0.6745 * np.abs(data - median) / mad
-                    is_outlier = modified_z_scores > threshold
+            progress.setValue(20)
             
-            # Create mask for all outliers in the dataset
-            outlier_mask = is_outlier
-            
-            progress.setValue(50)
-            
-            # Handle outliers using the selected method
-            if method == "Remove outliers":
-                df = df[~outlier_mask]
-            else:
-                if method == "Cap outliers":
-                    # For capping, use percentiles
-                    lower_bound = np.percentile(data[~outlier_mask], 1)
-                    upper_bound = np.percentile(data[~outlier_mask], 99)
-                    data[outlier_mask] = data[outlier_mask].clip(lower_bound, upper_bound)
-                elif method == "Replace with mean":
-                    replacement = data[~outlier_mask].mean()
-                    data[outlier_mask] = replacement
-                elif method == "Replace with median":
-                    replacement = data[~outlier_mask].median()
-                    data[outlier_mask] = replacement
-                
-                df.loc[data.index, column] = data
+            df = self._run_operation(op)
             
             progress.setValue(90)
             
-            # Update the data manager with the new dataframe
-            self.data_manager._data = df
-            
             # Update only the local view without emitting data_loaded signal
-            self.update_data_view()
+            self._commit_operation(op, df, emit=False)
             
             progress.setValue(100)
             modal.show_info(self, "Success", 
                                   f"Outliers handled successfully! "
-                                  f"Handled {outlier_mask.sum()} outliers from the entire dataset. "
+                                  f"Handled {handled} outliers from the entire dataset. "
                                   f"Click 'Apply Changes to Main View' to update the main data preview.")
             
         except Exception as e:
@@ -1499,26 +1368,17 @@ class PreprocessingPanel(QWidget):
             return
             
         try:
-            # Save current state for undo functionality
-            self.save_state()
+            op = make_operation("round_column", column=column, digits=digits)
+            df = self._run_operation(op)
             
-            df = self.data_manager.data.copy()
-            
-            # Check if column is numeric
-            if not pd.api.types.is_numeric_dtype(df[column]):
-                modal.show_warning(self, "Invalid Column Type", 
-                                  "Rounding can only be applied to numeric columns.")
-                return
-                
-            # Apply rounding
-            df[column] = df[column].round(digits)
-            
-            self._commit_edit(df)
+            self._commit_operation(op, df)
 
             modal.show_info(self, "Success",
                                   f"Column '{column}' rounded to {digits} decimal places successfully! "
                                   f"Click 'Apply Changes to Main View' to update the main data preview.")
             
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error applying rounding: {str(e)}")
 
@@ -1541,47 +1401,27 @@ class PreprocessingPanel(QWidget):
             return
             
         try:
-            # Save current state for undo functionality
-            self.save_state()
-            
-            df = self.data_manager.data.copy()
-            
             # Create a progress dialog
             progress = QProgressDialog("Splitting column...", "Cancel", 0, 100, self)
             progress.setWindowModality(Qt.WindowModality.WindowModal)
             progress.show()
             progress.setValue(10)
             
-            # Split the column into multiple columns
-            split_df = df[column].str.split(delimiter, expand=True)
+            op = make_operation("split_column", column=column, delimiter=delimiter)
+            before = len(self.data_manager.data.columns)
+            df = self._run_operation(op)
             
-            # If split was successful, add new columns to the dataframe
-            if split_df is not None and not split_df.empty:
-                # Generate new column names
-                new_columns = [f"{column}_{i+1}" for i in range(split_df.shape[1])]
-                
-                # Rename the split columns
-                split_df.columns = new_columns
-                
-                progress.setValue(50)
-                
-                # Add the new columns to the original dataframe
-                for new_col in new_columns:
-                    df[new_col] = split_df[new_col]
-                
-                progress.setValue(90)
-                self._commit_edit(df)
-                
-                progress.setValue(100)
-                
-                modal.show_info(self, "Success", 
-                                      f"Column '{column}' split into {len(new_columns)} new columns successfully! "
-                                      f"Click 'Apply Changes to Main View' to update the main data preview.")
-            else:
-                modal.show_warning(self, "Split Failed", 
-                                  "The split operation did not produce any new columns. "
-                                  "Please check your delimiter and try again.")
+            progress.setValue(90)
+            self._commit_operation(op, df)
+            
+            progress.setValue(100)
             
+            modal.show_info(self, "Success", 
+                                  f"Column '{column}' split into {len(df.columns) - before} new columns successfully! "
+                                  f"Click 'Apply Changes to Main View' to update the main data preview.")
+            
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error splitting column: {str(e)}")
         finally:
@@ -1629,58 +1469,29 @@ class PreprocessingPanel(QWidget):
             return
             
         try:
-            # Save current state for undo functionality
-            self.save_state()
-            
-            df = self.data_manager.data.copy()
-            
             # Create a progress dialog
             progress = QProgressDialog("Unpivoting columns...", "Cancel", 0, 100, self)
             progress.setWindowModality(Qt.WindowModality.WindowModal)
             progress.show()
             progress.setValue(10)
             
-            # Get all columns except the ID column
-            value_columns = [col for col in df.columns if col != id_column]
-            
-            if not value_columns:
-                modal.show_warning(self, "Invalid Selection", 
-                                  "There must be at least one column to unpivot.")
-                return
-                
-            progress.setValue(30)
-            
-            # Create a new dataframe for the unpivoted data
-            unpivoted_data = []
-            
-            # For each row in the original dataframe
-            for idx, row in df.iterrows():
-                id_value = row[id_column]
-                # For each value column, create a new row
-                for col in value_columns:
-                    unpivoted_data.append({
-                        id_column: id_value,
-                        'Variable': col,
-                        'Value': row[col]
-                    })
+            op = make_operation("unpivot", id_column=id_column)
+            value_count = len(self.data_manager.data.columns) - 1
+            unpivoted_df = self._run_operation(op)
             
             progress.setValue(70)
             
-            # Create the new unpivoted dataframe
-            unpivoted_df = pd.DataFrame(unpivoted_data)
-            
-            # Update the data manager with the new dataframe
-            self.data_manager._data = unpivoted_df
-            
             # Update only the local view without emitting data_loaded signal
-            self.update_data_view()
+            self._commit_operation(op, unpivoted_df, emit=False)
             
             progress.setValue(100)
             
             modal.show_info(self, "Success", 
-                                  f"Unpivoted {len(value_columns)} columns successfully! "
+                                  f"Unpivoted {value_count} columns successfully! "
                                   f"Click 'Apply Changes to Main View' to update the main data preview.")
             
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error unpivoting columns: {str(e)}")
         finally:
@@ -1701,46 +1512,19 @@ class PreprocessingPanel(QWidget):
             return
             
         try:
-            # Save current state for undo functionality
-            self.save_state()
-            
-            df = self.data_manager.data.copy()
-            
             # Create a progress dialog
             progress = QProgressDialog("Grouping data...", "Cancel", 0, 100, self)
             progress.setWindowModality(Qt.WindowModality.WindowModal)
             progress.show()
             progress.setValue(10)
             
-            # Get numeric columns for aggregation (except the groupby column)
-            numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-            if column in numeric_columns:
-                numeric_columns.remove(column)
-                
-            if not numeric_columns and aggregation != 'count':
-                modal.show_warning(self, "Invalid Selection", 
-                                  f"There are no numeric columns to apply '{aggregation}' aggregation. "
-                                  f"Only 'count' can be used with non-numeric data.")
-                return
-                
-            progress.setValue(30)
-            
-            # Apply the groupby operation
-            if aggregation == 'count':
-                # Count can be applied to any column
-                grouped_df = df.groupby(column).size().reset_index(name='count')
-            else:
-                # For other aggregations, apply to numeric columns
-                agg_dict = {col: aggregation for col in numeric_columns}
-                grouped_df = df.groupby(column).agg(agg_dict).reset_index()
+            op = make_operation("group_by", column=column, aggregation=aggregation)
+            grouped_df = self._run_operation(op)
             
             progress.setValue(70)
             
-            # Update the data manager with the new dataframe
-            self.data_manager._data = grouped_df
-            
             # Update only the local view without emitting data_loaded signal
-            self.update_data_view()
+            self._commit_operation(op, grouped_df, emit=False)
             
             progress.setValue(100)
             
@@ -1748,6 +1532,8 @@ class PreprocessingPanel(QWidget):
                                   f"Data grouped by '{column}' with '{aggregation}' aggregation successfully! "
                                   f"Click 'Apply Changes to Main View' to update the main data preview.")
 
+        except OperationError as e:
+            modal.show_warning(self, e.title, str(e))
         except Exception as e:
             modal.show_error(self, "Error", f"Error grouping data: {str(e)}")
         finally:
@@ -1763,35 +1549,13 @@ class PreprocessingPanel(QWidget):
         action = self.missing_action_combo.currentText()
 
         try:
-            self.save_state()
-            df = self.data_manager.data.copy()
-
-            if column == "All Columns":
-                cols = df.columns.tolist()
-            else:
-                cols = [column]
-
-            for col in cols:
-                if action == "Drop Rows":
-                    df.dropna(subset=[col], inplace=True)
-                elif action == "Fill with Mean":
-                    if pd.api.types.is_numeric_dtype(df[col]):
-                        df[col] = df[col].fillna(df[col].mean())
-                elif action == "Fill with Median":
-                    if pd.api.types.is_numeric_dtype(df[col]):
-                        df[col] = df[col].fillna(df[col].median())
-                elif action == "Fill with Mode":
-                    if not df[col].mode().empty:
-                        df[col] = df[col].fillna(df[col].mode()[0])
-                elif action == "Fill with 0":
-                    if pd.api.types.is_numeric_dtype(df[col]):
-                        df[col] = df[col].fillna(0)
-                elif action == "Forward Fill":
-                    df[col] = df[col].ffill()
-                elif action == "Backward Fill":
-                    df[col] = df[col].bfill()
+            op = make_operation(
+                "missing_values", action=action,
+                column=None if column == "All Columns" else column,
+            )
+            df = self._run_operation(op)
 
-            self._commit_edit(df)
+            self._commit_operation(op, df)
             modal.show_info(
                 self,
                 "Success",
@@ -1799,7 +1563,6 @@ class PreprocessingPanel(QWidget):
             )
 
         except Exception as e:
-            self.undo()
             modal.show_error(self, "Error", f"Error handling missing values: {str(e)}")
 
     def handle_duplicates(self):
@@ -1810,21 +1573,14 @@ class PreprocessingPanel(QWidget):
         action = self.duplicates_action_combo.currentText()
 
         try:
-            self.save_state()
-            df = self.data_manager.data.copy()
-            initial_count = len(df)
-
-            if action == "Remove Duplicates":
-                df = df.drop_duplicates()
-            elif action == "Keep First":
-                df = df.drop_duplicates(keep='first')
-            elif action == "Keep Last":
-                df = df.drop_duplicates(keep='last')
-
-            final_count = len(df)
-            removed = initial_count - final_count
-
-            self._commit_edit(df)
+            # "Remove Duplicates" keeps the first occurrence, like "Keep First"
+            keep = 'last' if action == "Keep Last" else 'first'
+            op = make_operation("drop_duplicates", keep=keep)
+            initial_count = self.data_manager.row_count
+            df = self._run_operation(op)
+            removed = initial_count - len(df)
+
+            self._commit_operation(op, df)
             modal.show_info(
                 self,
                 "Success",
@@ -1832,7 +1588,6 @@ class PreprocessingPanel(QWidget):
             )
 
         except Exception as e:
-            self.undo()
             modal.show_error(self, "Error", f"Error handling duplicates: {str(e)}")
 
     def _copy_data_view_selection(self):
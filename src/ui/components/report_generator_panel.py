@@ -928,8 +928,9 @@ class ReportGeneratorPanel(QWidget):
         df = self.data_manager.data
         if df is None:
             return ""
-        numeric_stats = df.describe().round(2).to_html()
-        categorical_stats = df.select_dtypes(include=['object']).describe().to_html()
+        engine = self.data_manager.engine
+        numeric_stats = engine.describe(df).round(2).to_html()
+        categorical_stats = engine.describe(df, text=True).to_html()
         return {
             "numeric_stats": numeric_stats,
             "categorical_stats": categorical_stats
@@ -1519,6 +1519,13 @@ class VisualizationPanel(QWidget):
             grip.setCursor(Qt.CursorShape.SplitVCursor)
             handle_layout.addWidget(grip)
 
+        # Shown while an out-of-core dataset is charted from its preview
+        self.preview_notice = QLabel()
+        self.preview_notice.setWordWrap(True)
+        self.preview_notice.hide()
+        self._style_preview_notice()
+        main_layout.addWidget(self.preview_notice)
+
         main_layout.addWidget(self.splitter)
 
     # ── Visualization controls / chart splitter auto-fit ───────────────────
@@ -1872,6 +1879,8 @@ class VisualizationPanel(QWidget):
     def update_theme(self, theme_name: str):
         """Update visualization panel chrome + chart to match the app theme."""
         self._chart_theme = theme_name
+        if hasattr(self, 'preview_notice'):
+            self._style_preview_notice()
         # Restyle the matplotlib toolbar + expand button
         if hasattr(self, 'toolbar'):
             self._apply_toolbar_theme(theme_name)
@@ -1929,8 +1938,17 @@ class VisualizationPanel(QWidget):
         dlg = FullScreenChartDialog(self.figure, parent=self.window())
         dlg.exec_()
 
+    def _style_preview_notice(self):
+        c = get_colors(current_theme())
+        self.preview_notice.setStyleSheet(
+            f"color: {c['warning']}; font-size: 11px; padding: 4px 8px; background: transparent;"
+        )
+
     def on_data_loaded(self, df):
         """Handle when new data is loaded."""
+        notice = self.data_manager.preview_notice
+        self.preview_notice.setText(notice or "")
+        self.preview_notice.setVisible(notice is not None)
         if df is None or df.empty:
             self.x_axis_combo.clear()
             self.y_axis_combo.clear()
@@ -1981,6 +1999,11 @@ class VisualizationPanel(QWidget):
         # Column lists / enabled widgets can change the controls pane height.
         self._schedule_sync_viz_controls_split()
 
+    def on_rows_appended(self, rows):
+        """Redraw the current chart with rows appended to the data, keeping its settings."""
+        if self.canvas.isVisible() and self.figure.get_axes():
+            self.schedule_update()
+
     def on_series_selection_changed(self):
         """Handle changes in selected series."""
         self.selected_series = [item.text() for item in self.series_list.selectedItems()]
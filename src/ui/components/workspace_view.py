@@ -5,6 +5,7 @@ Workspace view containing all data analysis tools.
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QFrame, QSplitter, QTabWidget, QFileDialog,
+    QProgressDialog, QApplication, QMenu, QInputDialog,
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
@@ -17,8 +18,10 @@ from .preprocessing_panel import PreprocessingPanel
 from .feature_engineering_panel import FeatureEngineeringPanel
 from .machine_learning_panel import MachineLearningPanel
 from .report_generator_panel import ReportGeneratorPanel
-from .dataset_manager_panel import DatasetManagerDialog
+from .dataset_manager_panel import DatasetManagerDialog, _format_size
 from ..data_manager import DataManager
+from ..dataset_writer import snapshot
+from ..excel_io import write_excel
 from ..theme import get_colors, current_theme, RADIUS_MD, RADIUS_LG
 
 class WorkspaceView(QWidget):
@@ -44,6 +47,9 @@ class WorkspaceView(QWidget):
         self._dirty_tabs = set()
         self._latest_df = None
         self._syncing_edit_from_main = False
+        self._load_progress = None  # QProgressDialog for background loads
+        self._load_name = ""
+        self._confirm_save = False  # show a confirmation when the user's save lands
         self.init_ui()
         self.setup_connections()
 
@@ -112,9 +118,24 @@ class WorkspaceView(QWidget):
         self.dataset_label.setFont(dataset_font)
         self.dataset_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
         self.dataset_label.setToolTip("Currently loaded dataset (Original | Copy OR Original)")
-        self._apply_dataset_label_style()
         header_layout.addWidget(self.dataset_label)
 
+        # Memory footprint after a compact-dtype load (hidden otherwise)
+        self.memory_label = QLabel()
+        self.memory_label.setFont(dataset_font)
+        self.memory_label.setToolTip("In-memory size of the loaded dataset with compact dtypes")
+        self.memory_label.hide()
+        self._apply_dataset_label_style()
+        header_layout.addWidget(self.memory_label)
+
+        # Pull in columns a "Load Selected Columns" session left out
+        self.add_columns_btn = QPushButton("+ Columns")
+        self.add_columns_btn.setProperty("cssClass", "outline")
+        self.add_columns_btn.setToolTip("Load more columns of the current dataset")
+        self.add_columns_btn.clicked.connect(self.load_more_columns)
+        self.add_columns_btn.hide()
+        header_layout.addWidget(self.add_columns_btn)
+
         header_layout.addStretch()
 
         # Action button group
@@ -137,6 +158,16 @@ class WorkspaceView(QWidget):
         self.reset_edit_btn.clicked.connect(self.reset_editing_view)
         header_layout.addWidget(self.reset_edit_btn)
 
+        # Named checkpoints of the Editing View, kept next to the working copy
+        self.checkpoints_btn = QPushButton("Checkpoints")
+        self.checkpoints_btn.setProperty("cssClass", "outline")
+        self.checkpoints_btn.setToolTip("Save or restore named snapshots of the Editing View")
+        self.checkpoints_btn.setEnabled(False)
+        self.checkpoints_menu = QMenu(self)
+        self.checkpoints_menu.aboutToShow.connect(self._build_checkpoints_menu)
+        self.checkpoints_btn.setMenu(self.checkpoints_menu)
+        header_layout.addWidget(self.checkpoints_btn)
+
         # Discard Changes button (left of Save)
         self.discard_btn = QPushButton("Discard Changes")
         self.discard_btn.setEnabled(False)
@@ -204,10 +235,23 @@ class WorkspaceView(QWidget):
         
     def setup_connections(self):
         """Setup signal connections."""
+        # Background loads: progress dialog is closed before any error modal.
+        self.main_data_manager.load_started.connect(self._on_load_started)
+        self.main_data_manager.load_progress.connect(self._on_load_progress)
+        self.main_data_manager.load_cancelled.connect(self._on_load_cancelled)
+        self.main_data_manager.memory_report.connect(self._on_memory_report)
+        self.main_data_manager.data_error.connect(self._close_load_progress)
         self.main_data_manager.data_error.connect(self.show_error)
+        # Background saves
+        self.main_data_manager.save_started.connect(self.update_save_button)
+        self.main_data_manager.save_finished.connect(self._on_save_finished)
+        self.main_data_manager.save_failed.connect(self._on_save_failed)
         self.edit_data_manager.data_error.connect(self.show_error)
         self.main_data_manager.data_loaded.connect(self.on_main_data_loaded)
         self.edit_data_manager.data_loaded.connect(self.on_edit_data_loaded)
+        # Rows appended to a watched original (see DataManager.watch_original)
+        self.main_data_manager.rows_appended.connect(self.on_main_rows_appended)
+        self.edit_data_manager.rows_appended.connect(self.on_edit_rows_appended)
 
         # Hard guard: the Main View preview must never update from Editing View
         # signals (undo/redo included). If any accidental connection exists,
@@ -260,8 +304,9 @@ class WorkspaceView(QWidget):
         self.visualization_panel.set_workspace_path(workspace_path)
         self.report_generator_panel.set_workspace_path(workspace_path)
 
-        # Try to load existing workspace data
-        self.main_data_manager.load_workspace_data()
+        # Try to load existing workspace data (parsed in the background;
+        # on_main_data_loaded fires once the frame is ready)
+        self.main_data_manager.load_workspace_data_async()
         self._update_apply_buttons()
         self._update_dataset_label()
         
@@ -284,9 +329,17 @@ class WorkspaceView(QWidget):
         if file_path:
             try:
                 if file_path.endswith('.csv'):
-                    self.main_data_manager.data.to_csv(file_path, index=False)
+                    self.main_data_manager.export_csv(file_path)
                 elif file_path.endswith('.xlsx'):
-                    self.main_data_manager.data.to_excel(file_path, index=False)
+                    if self.main_data_manager.is_out_of_core:
+                        modal.show_warning(
+                            self,
+                            "Dataset Too Large",
+                            "This dataset is opened out of core and is too large for an "
+                            "Excel workbook. Save it as CSV instead."
+                        )
+                        return
+                    self._export_excel(file_path)
                     
                 modal.show_info(
                     self,
@@ -300,13 +353,28 @@ class WorkspaceView(QWidget):
                     f"Error saving data: {str(e)}"
                 )
     
-    def activate_dataset_from_manager(self, relative_path):
+    def _export_excel(self, file_path):
+        """Stream the Main View data into an ``.xlsx`` workbook."""
+        progress = QProgressDialog("Exporting to Excel...", None, 0, 1000, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+
+        def report(fraction):
+            progress.setValue(int(fraction * 1000))
+            QApplication.processEvents()
+
+        try:
+            write_excel(self.main_data_manager.data, file_path, progress=report)
+        finally:
+            progress.close()
+
+    def activate_dataset_from_manager(self, relative_path, columns=None):
         """Activate a workspace-internal dataset (original or working copy).
 
         Loads the file via ``DataManager.activate_dataset`` so that the
         active_working_copy pointer is the only thing that changes —
         the file is never re-imported and never re-registered as a new
-        original.
+        original.  With ``columns``, only those columns are loaded.
         """
         if self.has_pending_edits:
             # Edits in the sandbox will be replaced by the new dataset.
@@ -334,14 +402,11 @@ class WorkspaceView(QWidget):
             elif result == "yes":
                 self.save_workspace()
 
-        self.main_data_manager.activate_dataset(relative_path)
+        # Parsed in the background; on_main_data_loaded updates the header
+        # and the dataset manager once the frame is ready.
+        self.main_data_manager.activate_dataset_async(relative_path, columns)
         self.has_unsaved_changes = False
         self.update_save_button()
-        self._update_dataset_label()
-
-        if self.dataset_manager_dialog:
-            active = self.main_data_manager.active_working_copy
-            self.dataset_manager_dialog.set_current_dataset(active)
 
     def on_dataset_deleted(self, rel_path):
         """Handle dataset deletion from the manager."""
@@ -384,6 +449,7 @@ class WorkspaceView(QWidget):
         """Show the dataset manager dialog."""
         self.dataset_manager_dialog = DatasetManagerDialog(self)
         self.dataset_manager_dialog.dataset_activated.connect(self.activate_dataset_from_manager)
+        self.dataset_manager_dialog.dataset_activated_columns.connect(self.activate_dataset_from_manager)
         self.dataset_manager_dialog.dataset_deleted.connect(self.on_dataset_deleted)
         self.dataset_manager_dialog.dataset_renamed.connect(self.on_dataset_renamed)
         self.dataset_manager_dialog.workspace_reset.connect(self.on_workspace_reset)
@@ -401,6 +467,8 @@ class WorkspaceView(QWidget):
         has_edit_data = self.edit_data_manager.data is not None
         self.apply_btn.setEnabled(has_edit_data and self.has_pending_edits)
         self.reset_edit_btn.setEnabled(has_edit_data and self.has_pending_edits)
+        self.checkpoints_btn.setEnabled(
+            has_edit_data and self.main_data_manager.active_working_copy is not None)
 
     def _apply_discard_btn_style(self):
         """Apply the correct style to the discard button based on state."""
@@ -435,11 +503,13 @@ class WorkspaceView(QWidget):
                 }}
             """)
 
-    def update_save_button(self):
+    def update_save_button(self, *_):
         """Update the save button and discard button state."""
         has_data = self.main_data_manager.data is not None
         # "Save Workspace" only matters when there is something to save.
         self.save_btn.setEnabled(has_data and self.has_unsaved_changes)
+        self.save_btn.setToolTip(
+            "A save is still being written" if self.main_data_manager.is_saving else "")
         self.export_btn.setEnabled(has_data)
 
         # Update discard button
@@ -460,31 +530,118 @@ class WorkspaceView(QWidget):
             self.save_btn.style().polish(self.save_btn)
 
     def save_workspace(self):
-        """Save the current workspace data."""
+        """Save the current workspace data.
+
+        The write happens on the data manager's writer thread; the
+        confirmation (or error) is shown once it has landed.
+        """
         if self.main_data_manager.data is None:
             return
 
-        try:
-            self.main_data_manager.save_workspace_data()
-            self.has_unsaved_changes = False
-            self.update_save_button()
+        if self.main_data_manager.missing_columns:
+            # A copy is always saved whole; never overwrite it with a subset.
+            if not self.main_data_manager.can_load_columns:
+                modal.show_warning(
+                    self,
+                    "Partial Dataset",
+                    "Only some columns of this dataset are loaded and the edits since "
+                    "reshape its rows, so it cannot be saved. Export it as a CSV instead."
+                )
+                return
+            if not modal.show_question(
+                self,
+                "Partial Dataset",
+                "Only some columns of this dataset are loaded. Load the remaining "
+                "columns and save the whole dataset?"
+            ):
+                return
+            if not self._load_columns(None):
+                return
 
-            if self.dataset_manager_dialog and self.main_data_manager.active_working_copy:
-                self.dataset_manager_dialog.set_current_dataset(
-                    self.main_data_manager.active_working_copy)
+        saved = self.main_data_manager._operations_snapshot()
+        if not self.main_data_manager.save_workspace_data():
+            modal.show_error(self, "Error", "Error saving workspace. See the application log for details.")
+            return
+        if self.main_data_manager.operations == []:
+            # The save wrote a new base; the Editing View's log must follow it.
+            self.edit_data_manager.rebase_operations(saved)
+        self._confirm_save = True
+        self.has_unsaved_changes = False
+        self.update_save_button()
 
-            modal.show_info(
+        if self.dataset_manager_dialog and self.main_data_manager.active_working_copy:
+            self.dataset_manager_dialog.set_current_dataset(
+                self.main_data_manager.active_working_copy)
+
+    def load_more_columns(self):
+        """Pick more columns of a projected dataset and add them to the data."""
+        missing = self.main_data_manager.missing_columns
+        if not missing:
+            return
+        if not self.main_data_manager.can_load_columns:
+            modal.show_warning(
                 self,
-                "Success",
-                "Workspace data saved successfully!"
+                "Load Columns",
+                "The edits to this dataset reshape its rows, so more columns cannot "
+                "be matched to them. Reload the dataset to pick different columns."
             )
+            return
+
+        if self.has_pending_edits:
+            # The Editing View is rebuilt from the Main View afterwards.
+            result = modal.show_question_3way(
+                self,
+                "Pending Edits",
+                "You have pending edits in the Editing View. Do you want to apply them before loading more columns?"
+            )
+            if result == "cancel":
+                return
+            elif result == "yes":
+                self.apply_edits_to_main_view()
+            else:
+                self.reset_editing_view()
+
+        scan = self.main_data_manager.scan_dataset(self.main_data_manager.active_working_copy) or {}
+        names = modal.show_column_picker(
+            self, "Load Columns",
+            "Choose the columns to add to the loaded data.",
+            missing, scan.get('dtypes'), selected=[],
+        )
+        if names:
+            self._load_columns(names)
+
+    def _load_columns(self, names):
+        """Run ``DataManager.load_columns``; returns False (after reporting) on failure."""
+        try:
+            self.main_data_manager.load_columns(names)
         except Exception as e:
             modal.show_error(
                 self,
                 "Error",
-                f"Error saving workspace: {str(e)}"
+                f"Error loading columns: {str(e)}"
+            )
+            return False
+        return True
+
+    def _on_save_finished(self, name):
+        self.update_save_button()
+        if self._confirm_save and not self.main_data_manager.is_saving:
+            self._confirm_save = False
+            modal.show_info(
+                self,
+                "Success",
+                "Workspace data saved successfully!"
             )
 
+    def _on_save_failed(self, message):
+        self._confirm_save = False
+        # The Editing View's log was rebased onto a file that was not written.
+        self.edit_data_manager.mark_untracked()
+        # The data is still in memory; let the user retry.
+        self.has_unsaved_changes = True
+        self.update_save_button()
+        modal.show_error(self, "Error", message)
+
     def discard_changes(self):
         """Discard all unsaved changes by reloading from last saved state."""
         if not self.has_unsaved_changes:
@@ -498,7 +655,7 @@ class WorkspaceView(QWidget):
 
         if result:
             # Reload from last saved workspace data
-            self.main_data_manager.load_workspace_data()
+            self.main_data_manager.load_workspace_data_async()
             self.has_unsaved_changes = False
             self.update_save_button()
 
@@ -516,18 +673,31 @@ class WorkspaceView(QWidget):
             elif result == "yes":
                 self.save_workspace()
 
+        self.main_data_manager.cancel_load()
+        # The home screen reads metadata.json directly.
+        self.main_data_manager.flush_metadata()
         self.back_to_home.emit()
 
+    def shutdown(self):
+        """Stop background work before the application exits."""
+        self.main_data_manager.cancel_load(wait=True)
+        # Never exit with a save half-way through the queue.
+        self.main_data_manager.flush_saves()
+        self.main_data_manager.flush_metadata()
+        self._close_load_progress()
+
     def on_main_data_loaded(self, df):
         """Handle when Main View data is loaded.
 
         Updates the left-hand preview and refreshes the Editing View draft to
         match the newly loaded dataset.
         """
+        self._close_load_progress()
         self.update_save_button()
         self._update_dataset_label()
         if self.dataset_manager_dialog:
-            self.dataset_manager_dialog.refresh()
+            self.dataset_manager_dialog.set_current_dataset(
+                self.main_data_manager.active_working_copy)
 
         # Main View preview is always visible
         self.data_preview.on_data_loaded(df)
@@ -538,26 +708,89 @@ class WorkspaceView(QWidget):
             if df is None:
                 self.edit_data_manager.clear_data()
             else:
-                self.edit_data_manager._data = df.copy()
+                # Shares the Main View's columns until either side edits them.
+                self.edit_data_manager._data = snapshot(df)
+                self.edit_data_manager.sync_operations_from(self.main_data_manager)
                 self.edit_data_manager.data_loaded.emit(self.edit_data_manager._data)
             self.has_pending_edits = False
             self._update_apply_buttons()
         finally:
             self._syncing_edit_from_main = False
 
+    # ── Background load progress ───────────────────────────────────────────
+
+    def _on_load_started(self, name):
+        """Show a cancellable progress dialog for a background load."""
+        self._close_load_progress()
+        # Parent to the dataset manager when it is open so the dialog is
+        # not blocked behind it.
+        parent = QApplication.activeModalWidget() or self
+        progress = QProgressDialog(f"Loading {name}...", "Cancel", 0, 1000, parent)
+        progress.setWindowTitle("Loading Dataset")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(400)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.canceled.connect(self.main_data_manager.cancel_load)
+        progress.setValue(0)
+        self._load_progress = progress
+        self._load_name = name
+        self.memory_label.hide()
+
+    def _on_load_progress(self, bytes_read, total_bytes, rows):
+        if self._load_progress is None:
+            return
+        if total_bytes > 0:
+            self._load_progress.setValue(int(bytes_read * 1000 / total_bytes))
+        self._load_progress.setLabelText(
+            f"Loading {self._load_name}...\n"
+            f"{rows:,} rows  \u00b7  {_format_size(bytes_read)} of {_format_size(total_bytes)}"
+        )
+
+    def _on_memory_report(self, report):
+        """Show the footprint (and savings) of a compact-dtype load."""
+        compact = report.get('compact_bytes', 0)
+        saved = report.get('baseline_bytes', 0) - compact
+        text = f"\u00b7  {_format_size(compact)} in memory"
+        if saved > 0:
+            text += f" (saved ~{_format_size(saved)})"
+        self.memory_label.setText(text)
+        self.memory_label.show()
+
+    def _on_load_cancelled(self):
+        self._close_load_progress()
+        self._update_dataset_label()
+        if self.dataset_manager_dialog:
+            self.dataset_manager_dialog.set_current_dataset(
+                self.main_data_manager.active_working_copy)
+
+    def _close_load_progress(self, *_):
+        progress = self._load_progress
+        if progress is None:
+            return
+        self._load_progress = None
+        # QProgressDialog emits canceled() when closed; detach first so
+        # closing after a successful load does not count as a cancel.
+        progress.canceled.disconnect()
+        progress.hide()
+        progress.deleteLater()
+
     # ── Header dataset label helpers ───────────────────────────────────────
 
     def _apply_dataset_label_style(self):
         """Apply theme-aware styling to the current-dataset header label."""
         c = get_colors(current_theme())
-        self.dataset_label.setStyleSheet(f"""
+        style = f"""
             QLabel {{
                 color: {c['text_secondary']};
                 background: transparent;
                 border: none;
                 padding: 0px 0px;
             }}
-        """)
+        """
+        self.dataset_label.setStyleSheet(style)
+        if hasattr(self, "memory_label"):
+            self.memory_label.setStyleSheet(style)
 
     def _format_active_dataset_text(self):
         """Return 'Dataset: Original | Copy' (or 'Dataset: Original')."""
@@ -585,7 +818,15 @@ class WorkspaceView(QWidget):
 
     def _update_dataset_label(self):
         if hasattr(self, "dataset_label"):
-            self.dataset_label.setText(self._format_active_dataset_text())
+            text = self._format_active_dataset_text()
+            if self.main_data_manager.is_out_of_core:
+                text += " (out of core)"
+            projected = self.main_data_manager.projected_columns
+            if projected is not None:
+                total = len(projected) + len(self.main_data_manager.missing_columns)
+                text += f" ({len(projected)} of {total} columns)"
+            self.dataset_label.setText(text)
+            self.add_columns_btn.setVisible(bool(self.main_data_manager.missing_columns))
 
     def on_edit_data_loaded(self, df):
         """Handle when Editing View data changes."""
@@ -611,6 +852,24 @@ class WorkspaceView(QWidget):
             self._dirty_tabs.discard(current)
             self._tab_panels[current].on_data_loaded(df)
 
+    def on_main_rows_appended(self, rows):
+        """Carry rows appended to the Main View over to the Editing View.
+
+        A draft with pending edits is left alone; it is replaced by the
+        Main View when applied or reset.
+        """
+        if not self.has_pending_edits and self.edit_data_manager.data is not None:
+            self.edit_data_manager.append_rows(rows)
+
+    def on_edit_rows_appended(self, rows):
+        """Redraw the chart for appended rows; other tabs refresh when next shown."""
+        self._latest_df = self.edit_data_manager.data
+        panels = getattr(self, "_tab_panels", {})
+        self._dirty_tabs = set(panels.keys())
+        if panels.get(self.tabs.currentIndex()) is self.visualization_panel:
+            self._dirty_tabs.discard(self.tabs.currentIndex())
+            self.visualization_panel.on_rows_appended(rows)
+
     def _on_tab_changed(self, index):
         """Refresh a tab panel when the user switches to it (if dirty)."""
         if index in self._dirty_tabs and self._latest_df is not None:
@@ -627,14 +886,91 @@ class WorkspaceView(QWidget):
         """Promote Editing View data into the Main View."""
         if self.edit_data_manager.data is None:
             return
-        df = self.edit_data_manager.data.copy()
+        df = snapshot(self.edit_data_manager.data)
         self.main_data_manager._data = df
+        self.main_data_manager.sync_operations_from(self.edit_data_manager)
         self.main_data_manager.data_loaded.emit(df)
         self.has_unsaved_changes = True
         self.has_pending_edits = False
         self.update_save_button()
         self._update_apply_buttons()
 
+    # ── Checkpoints ───────────────────────────────────────────────────────
+
+    def _build_checkpoints_menu(self):
+        """Fill the Checkpoints menu with the active copy's checkpoints, newest first."""
+        menu = self.checkpoints_menu
+        menu.clear()
+        menu.addAction("Save Checkpoint...", self.save_checkpoint)
+        menu.addSeparator()
+        checkpoints = self.main_data_manager.list_checkpoints()
+        if not checkpoints:
+            menu.addAction("No checkpoints").setEnabled(False)
+        for checkpoint in checkpoints:
+            name = checkpoint["name"]
+            created = checkpoint["created"].replace("T", " ")
+            submenu = menu.addMenu(f"{name}  ({checkpoint['rows']:,} rows, {created})")
+            submenu.addAction("Restore", lambda name=name: self.restore_checkpoint(name))
+            submenu.addAction("Delete", lambda name=name: self.delete_checkpoint(name))
+
+    def _checkpoint_progress(self, label):
+        progress = QProgressDialog(label, None, 0, 1000, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.show()
+
+        def report(fraction):
+            progress.setValue(int(fraction * 1000))
+            QApplication.processEvents()
+
+        return progress, report
+
+    def save_checkpoint(self):
+        """Save the Editing View data as a named checkpoint of the working copy."""
+        if self.edit_data_manager.data is None:
+            return
+        existing = {cp["name"] for cp in self.main_data_manager.list_checkpoints()}
+        default = f"Checkpoint {len(existing) + 1}"
+        name, ok = QInputDialog.getText(
+            self, "Save Checkpoint", "Name for this checkpoint:", text=default
+        )
+        name = name.strip()
+        if not (ok and name):
+            return
+        if name in existing and not modal.show_question(
+            self, "Save Checkpoint", f"Replace the checkpoint '{name}'?"
+        ):
+            return
+        progress, report = self._checkpoint_progress("Saving checkpoint...")
+        try:
+            self.main_data_manager.save_checkpoint(name, self.edit_data_manager, progress=report)
+        except Exception as e:
+            modal.show_error(self, "Error", f"Error saving checkpoint: {str(e)}")
+        finally:
+            progress.close()
+
+    def restore_checkpoint(self, name):
+        """Load checkpoint ``name`` into the Editing View (undoable)."""
+        if self.has_pending_edits and not modal.show_question(
+            self, "Restore Checkpoint",
+            f"Replace the Editing View with the checkpoint '{name}'? "
+            "You can undo this in the Preprocessing tab."
+        ):
+            return
+        progress, report = self._checkpoint_progress("Restoring checkpoint...")
+        try:
+            df, operations, projection = self.main_data_manager.load_checkpoint(name, progress=report)
+        except Exception as e:
+            modal.show_error(self, "Error", f"Error restoring checkpoint: {str(e)}")
+            return
+        finally:
+            progress.close()
+        # Marks the Editing View as having pending edits (see on_edit_data_loaded).
+        self.edit_data_manager.restore_frame(df, operations, projection)
+
+    def delete_checkpoint(self, name):
+        if modal.show_question(self, "Delete Checkpoint", f"Delete the checkpoint '{name}'?"):
+            self.main_data_manager.delete_checkpoint(name)
+
     def reset_editing_view(self):
         """Discard pending edits by resetting Editing View to Main View data."""
         if self.main_data_manager.data is None:
@@ -644,8 +980,9 @@ class WorkspaceView(QWidget):
             return
         self._syncing_edit_from_main = True
         try:
-            df = self.main_data_manager.data.copy()
+            df = snapshot(self.main_data_manager.data)
             self.edit_data_manager._data = df
+            self.edit_data_manager.sync_operations_from(self.main_data_manager)
             self.edit_data_manager.data_loaded.emit(df)
             self.has_pending_edits = False
             self._update_apply_buttons()
@@ -0,0 +1,170 @@
+"""
+Transparent compression for stored datasets.
+
+With the ``storage_compression`` setting, originals and copies are
+written as gzip or zstd streams of their CSV text.  Files keep their
+``.csv`` names (metadata, copy naming and every path in the workspace are
+unchanged); readers recognise a compressed file by its magic bytes, so
+plain and compressed files can live side by side and switching the
+setting never makes a dataset unreadable.
+
+Every read of a stored dataset goes through ``open_dataset`` and every
+write through ``open_dataset_writer``.  Fingerprints hash the
+*uncompressed* bytes, so a dataset keeps its fingerprint whatever codec
+it is stored with.
+
+gzip is always available; zstd needs pyarrow (its bundled codec).
+"""
+
+import gzip
+import io
+import os
+
+from .dataset_cache import HAS_PYARROW
+
+
+# Codec names and their labels in the dataset manager.
+CODEC_LABELS = {"gzip": "gzip", "zstd": "zstd"}
+GZIP_LEVEL = 6
+# Compressed CSV is typically 4-10x smaller; used where only an estimate
+# of the text size is needed (see ``estimated_text_size``).
+TYPICAL_RATIO = 4
+
+_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+_BLOCK_SIZE = 1 << 20
+
+
+def available_codecs():
+    """Codec names usable in this installation."""
+    return ["gzip", "zstd"] if HAS_PYARROW else ["gzip"]
+
+
+def _codec_of(head):
+    for magic, codec in _MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def detect_codec(path):
+    """Return ``"gzip"``, ``"zstd"`` or None for a plain file."""
+    with open(path, 'rb') as f:
+        return _codec_of(f.read(4))
+
+
+def estimated_text_size(path):
+    """Size of the CSV text of ``path``: exact for plain files, estimated otherwise."""
+    size = os.path.getsize(path)
+    return size if detect_codec(path) is None else size * TYPICAL_RATIO
+
+
+def text_size(path):
+    """Exact size of the CSV text of ``path`` (decompressing it if needed)."""
+    if detect_codec(path) is None:
+        return os.path.getsize(path)
+    size = 0
+    with open_dataset(path) as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b''):
+            size += len(block)
+    return size
+
+
+class _DecodedStream(io.RawIOBase):
+    """Decompressed view of a file that also reports the position on disk."""
+
+    def __init__(self, raw, decoded):
+        super().__init__()
+        self._raw = raw
+        self._decoded = decoded
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._decoded.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def disk_position(self):
+        return self._raw.tell()
+
+    def close(self):
+        if not self.closed:
+            self._decoded.close()
+            self._raw.close()
+        super().close()
+
+
+def open_dataset(path):
+    """Open a stored dataset for reading its CSV text as bytes.
+
+    Compressed files are decompressed on the fly.  Use
+    ``disk_position(stream)`` for progress against ``os.path.getsize``.
+    """
+    raw = open(path, 'rb')
+    try:
+        codec = _codec_of(raw.read(4))
+        raw.seek(0)
+        if codec is None:
+            return raw
+        if codec == "gzip":
+            decoded = gzip.GzipFile(fileobj=raw, mode='rb')
+        else:
+            import pyarrow as pa
+
+            decoded = pa.CompressedInputStream(pa.PythonFile(raw, mode='r'), codec)
+    except BaseException:
+        raw.close()
+        raise
+    return io.BufferedReader(_DecodedStream(raw, decoded), _BLOCK_SIZE)
+
+
+def disk_position(stream):
+    """Bytes of the file on disk consumed by a stream from ``open_dataset``."""
+    raw = getattr(stream, 'raw', None)
+    if isinstance(raw, _DecodedStream):
+        return raw.disk_position()
+    return stream.tell()
+
+
+def open_dataset_writer(path, codec=None, append=False):
+    """Open ``path`` for writing CSV bytes, compressed with ``codec`` (None: plain).
+
+    With ``append``, bytes are added to the end of the file; pass the
+    codec it is stored with (see ``detect_codec``).  Compressed data is
+    appended as a new gzip member or zstd frame, which readers decode as
+    one stream.
+    """
+    if codec is None:
+        return open(path, 'ab' if append else 'wb')
+    if codec == "gzip":
+        # mtime=0: equal content gives equal bytes.
+        return gzip.GzipFile(path, mode='ab' if append else 'wb',
+                             compresslevel=GZIP_LEVEL, mtime=0)
+    import pyarrow as pa
+
+    if append:
+        return pa.CompressedOutputStream(pa.OSFile(path, mode='a'), codec)
+    return pa.CompressedOutputStream(path, codec)
+
+
+def write_frame(df, path, codec=None):
+    """``df.to_csv(path, index=False)``, compressed with ``codec``."""
+    if codec is None:
+        df.to_csv(path, index=False)
+        return
+    with open_dataset_writer(path, codec) as out:
+        text = io.TextIOWrapper(out, encoding='utf-8', newline='')
+        df.to_csv(text, index=False)
+        text.flush()
+        text.detach()
+
+
+def recompress(src, dst, codec=None):
+    """Copy the CSV text of ``src`` (plain or compressed) to ``dst`` stored with ``codec``."""
+    with open_dataset(src) as fin, open_dataset_writer(dst, codec) as fout:
+        for block in iter(lambda: fin.read(_BLOCK_SIZE), b''):
+            fout.write(block)
@@ -6,15 +6,57 @@ import os
 import re
 import json
 import shutil
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 import pandas as pd
 import numpy as np
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QThread, pyqtSignal, QTimer
 from scipy import stats
 from .logging_utils import get_logger
+from .append_watch import (
+    WATCH_DEBOUNCE_MS, SourceTruncated, append_frame, check_source, header_line, parse_rows,
+    read_appended,
+)
+from .batch_import import IMPORT_WORKERS, BatchProgress, combined_name, copy_shards, unique_name
+from .chunked import PREVIEW_ROWS, ChunkedDataset, physical_memory, session_folder
+from .checkpoint_store import CheckpointStore
+from .dataset_cache import HAS_PYARROW, DatasetCache, file_stamp
+from .dataset_loader import DatasetLoadWorker, LoadCancelled
+from .dataset_writer import DatasetWriter, copy_on_write, snapshot
+from .column_store import ColumnStore, new_token
+from .compression import (
+    available_codecs, detect_codec, estimated_text_size, open_dataset_writer, recompress, text_size,
+    write_frame,
+)
+from .delta_store import DEFAULT_CHECKPOINT_EVERY, DeltaStore
+from .dtype_utils import frame_schema, read_csv_compact, schema_read_kwargs
+from .engines import DEFAULT_ENGINE, get_engine
+from .directory_index import DirectoryIndex
+from .excel_io import ImportCancelled, excel_to_csv
+from .file_utils import atomic_write, clone_file, detach, is_shared
+from .fingerprint import FrameCache, content_hash, fingerprint_entry, stamp_matches
+from .metadata_store import WorkspaceMetadata
+from .quick_scan import ScanCache, scan_csv
+from .recipes import RecipeStore, new_recipe, write_recipe
+from .sqlite_io import DEFAULT_CHUNK_ROWS, count_rows, query_to_csv, quote_identifier
+from .undo_history import FullSnapshot, compact, frame_buffers
+from .operations import (
+    RESHAPES, OperationError, apply_operation, changed_columns, describe_operation, kept_rows,
+)
 
 
 logger = get_logger(__name__)
 
+# Without an ``out_of_core_mb`` setting, CSVs larger than this share of
+# physical memory are opened out of core (see ``chunked``).
+OUT_OF_CORE_MEMORY_SHARE = 0.25
+# Without an ``undo_memory_mb`` setting, undo history beyond this share of
+# physical memory (or ``UNDO_MEMORY_FALLBACK`` bytes) is spilled to disk.
+UNDO_MEMORY_SHARE = 0.1
+UNDO_MEMORY_FALLBACK = 512 * 1024 * 1024
+# Spilled history may take this many times the memory budget on disk.
+UNDO_DISK_RATIO = 4
+
 
 def sanitize_basename(name: str) -> str:
     """Normalize a filename base for use in copy filenames.
@@ -56,28 +98,107 @@ class DataManager(QObject):
     # Signals for notifying UI of data changes
     data_loaded = pyqtSignal(pd.DataFrame)
     data_error = pyqtSignal(str)
+    # Background loads (see *_async methods); data_loaded still fires only
+    # once the complete frame is available.
+    load_started = pyqtSignal(str)                            # display name
+    load_progress = pyqtSignal('qint64', 'qint64', 'qint64')  # bytes_read, total_bytes, rows
+    load_cancelled = pyqtSignal()
+    # Emitted after a compact-dtype read with {rows, baseline_bytes, compact_bytes}.
+    memory_report = pyqtSignal(object)
+    # Background saves (see save_workspace_data).
+    save_started = pyqtSignal(str)   # display name
+    save_finished = pyqtSignal(str)  # display name
+    save_failed = pyqtSignal(str)    # error message
+    # Emitted (from the scan thread) when a requested quick scan finishes.
+    scan_ready = pyqtSignal(str, object)  # data-relative path, scan dict
+    # Emitted with the rows just added to the end of ``data`` (see
+    # ``watch_original``); ``data`` already includes them.
+    rows_appended = pyqtSignal(pd.DataFrame)
 
     def __init__(self):
         """Initialize the data manager."""
         super().__init__()
         self._data = None
+        # ChunkedDataset of a dataset opened out of core; ``_data`` then
+        # holds only its first PREVIEW_ROWS rows.
+        self._lazy = None
+        # {path, columns, all_columns} when only some columns of the
+        # dataset were loaded (see ``activate_dataset``), else None.
+        self._projection = None
+        # True while ``_data`` is exactly the active dataset's file, so rows
+        # appended to that file can be appended in memory too.
+        self._tailing = False
         self.history = []  # Stack for undo
         self.redo_stack = []  # Stack for redo
-        self.max_history = 20  # Maximum number of operations to store
+        # (Memory use of both stacks is bounded by ``_undo_memory_bytes``.)
+        # The entry ``save_state`` pushed for the edit being recorded; it is
+        # shrunk to a delta once ``record_operation`` sees the result.
+        self._pending_entry = None
+        # Operations applied since the dataset was read from disk, or None
+        # once an edit that cannot be replayed has been made.
+        self.operations = []
+        # Columns changed since the last save (None: all of them) and the
+        # column-store manifest that save produced (see column_store).
+        self._dirty_columns = set()
+        self._column_token = None
+        self._queued_column_save = None  # (path, base_token, dirty) of the last queued column save
         self.workspace_path = None
         self.workspace_name = ""
         self._active_working_copy = None  # filename of the current working copy
         self._originals = {}  # {original_filename: {"imported_at": str, "copies": [str]}}
         self._unassigned_copies = []  # copy rel paths found on disk with no parent original
+        self._settings = {}  # per-workspace preferences persisted in metadata.json
+        self._schemas = {}  # {data-relative path: frame_schema()} recorded on save
+        # {data-relative path: {hash, size, mtime_ns}}; also written by the
+        # load and writer threads, hence the lock.
+        self._fingerprints = {}
+        self._fingerprint_lock = threading.Lock()
+        self._frames = FrameCache()  # recently read frames by (fingerprint, variant)
+        self._scans = None  # ScanCache of the open workspace
+        self._scan_queue = []  # (rel_path, abs_path, ScanCache) waiting for the scan thread
+        self._scan_lock = threading.Lock()
+        self._scan_thread = None
+        self._metadata = None  # WorkspaceMetadata of the open workspace
+        self._dir_index = DirectoryIndex()
+        self._watcher = None  # QFileSystemWatcher on the sources of watched originals
+        self._watch_timer = None
+        self._load_thread = None
+        self._load_worker = None
+        self._load_on_success = None
+        self._load_error_prefix = ""
+        self._writer = DatasetWriter(self)
+        self._writer.save_started.connect(
+            lambda path: self.save_started.emit(os.path.basename(path)))
+        self._writer.save_finished.connect(
+            lambda path: self.save_finished.emit(os.path.basename(path)))
+        # Saves record new fingerprints; persist them.
+        self._writer.save_finished.connect(lambda _path: self._update_metadata())
+        self._writer.save_failed.connect(self._on_save_failed)
+        self._writer.save_failed.connect(
+            lambda path, message: self.save_failed.emit(
+                f"Error saving {os.path.basename(path)}: {message}"))
 
     def clear_data(self):
         """Clear the current data."""
+        self.cancel_load()
         self._data = None
+        self._lazy = None
+        self._projection = None
+        self._tailing = False
         self.history = []
         self.redo_stack = []
+        self.operations = []
+        self._dirty_columns = set()
+        self._column_token = None
         self._active_working_copy = None
         self._originals = {}
+        self._sync_watches()
         self._unassigned_copies = []
+        self._settings = {}
+        self._schemas = {}
+        with self._fingerprint_lock:
+            self._fingerprints = {}
+        self._frames.clear()
         self.data_loaded.emit(pd.DataFrame())
 
     @property
@@ -85,6 +206,65 @@ class DataManager(QObject):
         """Get the current dataframe."""
         return self._data
 
+    @property
+    def engine(self):
+        """The dataframe engine selected for this workspace (see ``engines``)."""
+        return get_engine(self.get_setting('engine', DEFAULT_ENGINE))
+
+    @property
+    def storage_codec(self):
+        """Codec new dataset files are compressed with (``storage_compression`` setting), or None."""
+        codec = self.get_setting('storage_compression')
+        return codec if codec in available_codecs() else None
+
+    @property
+    def lazy_data(self):
+        """The ``ChunkedDataset`` of an out-of-core dataset, else None."""
+        return self._lazy
+
+    @property
+    def projected_columns(self):
+        """Columns of the dataset loaded so far, or None if all of them were loaded."""
+        return None if self._projection is None else list(self._projection['columns'])
+
+    @property
+    def missing_columns(self):
+        """Columns of a projected dataset that have not been loaded (empty otherwise)."""
+        if self._projection is None:
+            return []
+        loaded = set(self._projection['columns'])
+        return [col for col in self._projection['all_columns'] if col not in loaded]
+
+    @property
+    def can_load_columns(self):
+        """True if ``load_columns`` can add columns to the current data.
+
+        New columns are matched to the rows by index, which only holds
+        while no edit has reshaped the rows (or cannot be replayed).
+        """
+        return (bool(self.missing_columns) and self._data is not None
+                and self.operations is not None
+                and not any(op['op'] in RESHAPES for op in self.operations))
+
+    @property
+    def is_out_of_core(self):
+        return self._lazy is not None
+
+    @property
+    def row_count(self):
+        """Rows of the whole dataset (``data`` is only a preview when out of core)."""
+        if self._lazy is not None:
+            return len(self._lazy)
+        return 0 if self._data is None else len(self._data)
+
+    @property
+    def preview_notice(self):
+        """Notice for views that only see ``data``, or None if it holds every row."""
+        if self._lazy is None:
+            return None
+        return (f"Out-of-core dataset: computed on the first {len(self._data):,} "
+                f"of {len(self._lazy):,} rows.")
+
     @property
     def active_working_copy(self):
         """Get the filename of the current working copy."""
@@ -134,6 +314,537 @@ class DataManager(QObject):
         data_folder = os.path.abspath(os.path.join(self.workspace_path, "data"))
         return os.path.relpath(os.path.abspath(abs_path), data_folder).replace("\\", "/")
 
+    # ── Reading ───────────────────────────────────────────────────────────
+
+    def _dataset_cache(self):
+        """Return the sidecar cache for the active workspace's data folder."""
+        return DatasetCache(os.path.join(self.workspace_path, "data"))
+
+    def _delta_store(self):
+        """Return the edit-log store for the active workspace's data folder."""
+        return DeltaStore(os.path.join(self.workspace_path, "data"))
+
+    def _column_store(self):
+        """Return the per-column store for the active workspace's data folder."""
+        return ColumnStore(os.path.join(self.workspace_path, "data"))
+
+    def _checkpoint_store(self):
+        """Return the named-checkpoint store for the active workspace's data folder."""
+        return CheckpointStore(os.path.join(self.workspace_path, "data"))
+
+    def _recipe_store(self):
+        """Return the recipe store for the active workspace's data folder."""
+        return RecipeStore(os.path.join(self.workspace_path, "data"))
+
+    def _load_dataset(self, abs_path, progress=None, is_cancelled=None, columns=None):
+        """Read a dataset from its column files, edit log or base file.
+
+        Returns ``(df, state)``; ``state`` holds the replayed
+        ``operations`` (empty unless the copy has an edit log), the
+        ``column_token`` of the column files it was read from, if any, and
+        the ``memory_report`` of a compact parse.
+        Log replay starts from the newest valid checkpoint, so the base
+        file is only parsed when no checkpoint covers the log.
+
+        With ``columns``, only those columns are read (column files,
+        sidecar or the CSV reader's ``usecols``) and the frame is always
+        held in memory; a copy with an edit log is still rebuilt in full,
+        since its edits may involve any column.
+        """
+        state = {'operations': [], 'column_token': None, 'lazy': None}
+        # A save of this file may still be in flight; read what it writes.
+        self._writer.wait_for(abs_path)
+        if columns is None and self._opens_out_of_core(abs_path):
+            return self._load_out_of_core(abs_path, state, progress, is_cancelled)
+        if not self._is_inside_workspace_data(abs_path):
+            return self._read_dataset(abs_path, progress, is_cancelled, columns, state), state
+
+        rel_path = self._rel_path_for(abs_path)
+        df, token = self._column_store().load(rel_path, abs_path, columns)
+        if df is not None:
+            logger.debug("Loaded %s from column files", rel_path)
+            if progress is not None:
+                size = os.path.getsize(abs_path)
+                progress(size, size, len(df))
+            if columns is None:
+                state['column_token'] = token
+            return df, state
+
+        store = self._delta_store()
+        record = store.load(rel_path)
+        if record is not None and record.get('base_stamp') != file_stamp(abs_path):
+            logger.warning("Edit log for %s does not match its base file; ignoring it", rel_path)
+            record = None
+        if record is None:
+            return self._read_dataset(abs_path, progress, is_cancelled, columns, state), state
+        if columns is not None:
+            df, state = self._load_dataset(abs_path, progress, is_cancelled)
+            wanted = set(columns)
+            return df[[col for col in df.columns if col in wanted]], state
+
+        ops = record.get('operations', [])
+        step, df = store.latest_checkpoint(rel_path, record)
+        if df is None:
+            df = self._read_dataset(abs_path, progress, is_cancelled, state=state)
+        for index, op in enumerate(ops[step:], start=step):
+            if is_cancelled is not None and is_cancelled():
+                raise LoadCancelled()
+            try:
+                df = apply_operation(df, op)
+            except Exception as e:
+                raise ValueError(
+                    f"could not replay edit {index + 1} ({describe_operation(op)}): {e}"
+                ) from e
+        logger.debug("Rebuilt %s from checkpoint %d + %d operations", rel_path, step, len(ops) - step)
+        state['operations'] = list(ops)
+        return df, state
+
+    def _adopt_loaded(self, df, state):
+        """Make a freshly read frame current; nothing is dirty yet."""
+        self._data = df
+        self._lazy = state['lazy']
+        self._projection = state.get('projection')
+        self._tailing = False
+        self.history = []  # entries only rebuild frames of the dataset they were made on
+        self.redo_stack = []
+        self.operations = state['operations']
+        self._column_token = state['column_token']
+        self._dirty_columns = set()
+        if state.get('memory_report') is not None:
+            self.memory_report.emit(state['memory_report'])
+
+    # ── Out-of-core datasets ──────────────────────────────────────────────
+
+    def _out_of_core_bytes(self):
+        """File size from which CSVs are opened out of core, or None (never)."""
+        setting = self.get_setting('out_of_core_mb')
+        if setting is not None:
+            return int(setting * 1024 * 1024) if setting > 0 else None
+        memory = physical_memory()
+        return int(memory * OUT_OF_CORE_MEMORY_SHARE) if memory else None
+
+    def _opens_out_of_core(self, abs_path):
+        if not (HAS_PYARROW and self.workspace_path):
+            return False
+        if self._is_inside_workspace_data(abs_path) and \
+                self._column_store().has_store(self._rel_path_for(abs_path)):
+            return False  # the column files supersede the CSV
+        threshold = self._out_of_core_bytes()
+        return threshold is not None and estimated_text_size(abs_path) >= threshold
+
+    def _chunk_folder(self):
+        return session_folder(os.path.join(self.workspace_path, "data"))
+
+    def _load_out_of_core(self, abs_path, state, progress=None, is_cancelled=None):
+        """Open ``abs_path`` as a ``ChunkedDataset`` and replay its edit log, if any."""
+        rel_path = self._rel_path_for(abs_path) if self._is_inside_workspace_data(abs_path) else None
+        schema = self._schemas.get(rel_path) if rel_path else None
+        read_kwargs = schema_read_kwargs(schema) if schema else {}
+        lazy = ChunkedDataset.from_csv(abs_path, self._chunk_folder(), progress, is_cancelled,
+                                       **read_kwargs)
+        record = self._delta_store().load(rel_path) if rel_path else None
+        if record is not None and record.get('base_stamp') == file_stamp(abs_path):
+            ops = record.get('operations', [])
+            for index, op in enumerate(ops):
+                if is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled()
+                try:
+                    lazy = lazy.apply(op)
+                except Exception as e:
+                    raise ValueError(
+                        f"could not replay edit {index + 1} ({describe_operation(op)}): {e}"
+                    ) from e
+            state['operations'] = list(ops)
+        state['lazy'] = lazy
+        return lazy.head(PREVIEW_ROWS), state
+
+    def run_operation(self, op, progress=None):
+        """Return the result of ``op`` on the current dataset without making it current.
+
+        Out of core the result is a new ``ChunkedDataset`` (see
+        ``ChunkedDataset.apply``; ``progress(fraction)`` receives 0..1),
+        otherwise a DataFrame.
+        """
+        if self._lazy is not None:
+            return self._lazy.apply(op, progress)
+        return self.engine.apply_operation(self._data, op)
+
+    def check_result(self, result):
+        """Refuse an in-memory result while the dataset is out of core.
+
+        Such a result was computed from the preview rows only; making it
+        current would replace the dataset with them.
+        """
+        if self._lazy is not None and not isinstance(result, ChunkedDataset):
+            raise OperationError(
+                "This operation needs the whole dataset in memory and is not "
+                "available for datasets opened out of core.",
+                "Not Available Out of Core",
+            )
+
+    def export_csv(self, path):
+        """Write the whole current dataset to ``path``, streaming it when out of core.
+
+        Always written by pandas, whatever the engine, so the exported
+        text does not depend on the workspace's settings.
+        """
+        if self._lazy is not None:
+            self._lazy.to_csv(path)
+        else:
+            write_frame(self._data, path)
+
+    def set_out_of_core_result(self, dataset):
+        """Make ``dataset`` (from ``run_operation``) current; returns its preview frame."""
+        self._lazy = dataset
+        self._data = dataset.head(PREVIEW_ROWS)
+        return self._data
+
+    def _read_dataset(self, abs_path, progress=None, is_cancelled=None, columns=None, state=None):
+        """Parse a dataset file into a DataFrame.
+
+        Files inside the workspace data tree are served from the
+        in-memory frame cache (keyed by content fingerprint), their
+        columnar sidecar, or the sidecar of a file with identical content,
+        in that order; otherwise the CSV is parsed (with the schema
+        recorded at its last save, if any) and the sidecar is (re)written
+        for the next activation.  ``progress`` / ``is_cancelled`` are supplied by background loads
+        and switch parsing to chunked mode.  With ``columns``, only those
+        columns are read and nothing is cached.  A parse's memory report
+        is put in ``state`` (see ``_load_dataset``).
+        """
+        if not self._is_inside_workspace_data(abs_path):
+            return self._parse_csv(abs_path, progress, is_cancelled, columns=columns, state=state)
+
+        cache = self._dataset_cache()
+        rel_path = self._rel_path_for(abs_path)
+        variant = self._cache_variant()
+        fingerprint = self._fingerprint_path(abs_path)
+        # Without Copy-on-Write every cached frame would be a full copy.
+        key = (fingerprint, variant) if fingerprint and copy_on_write() else None
+
+        df = self._frames.get(key) if key else None
+        source = "memory"
+        if df is not None:
+            # The caller owns the frame; keep the cached one out of its reach.
+            if columns is not None:
+                df = df[[col for col in df.columns if col in set(columns)]]
+            df = snapshot(df)
+        else:
+            df = cache.load(rel_path, abs_path, variant, columns)
+            source = "sidecar cache"
+        if df is None and fingerprint:
+            df = self._load_sidecar_by_fingerprint(fingerprint, rel_path, variant, columns)
+            source = "sidecar cache of identical file"
+        if df is not None:
+            logger.debug("Loaded %s from %s", rel_path, source)
+            if progress is not None:
+                size = os.path.getsize(abs_path)
+                progress(size, size, len(df))
+            if columns is not None:
+                return df
+        else:
+            df = self._parse_csv(abs_path, progress, is_cancelled, self._schemas.get(rel_path),
+                                 columns, state)
+            if columns is not None:
+                return df
+            cache.store(rel_path, abs_path, df, variant)
+        if key:
+            self._frames.put(key, snapshot(df))
+        return df
+
+    def _load_sidecar_by_fingerprint(self, fingerprint, rel_path, variant, columns=None):
+        """Read the sidecar of another file with the same content, if one is valid."""
+        with self._fingerprint_lock:
+            twins = [rel for rel, entry in self._fingerprints.items()
+                     if rel != rel_path and entry.get('hash') == fingerprint]
+        cache = self._dataset_cache()
+        for twin in twins:
+            twin_path = self._resolve_data_path(twin)
+            with self._fingerprint_lock:
+                entry = self._fingerprints.get(twin)
+            if not stamp_matches(entry, twin_path):
+                continue
+            df = cache.load(twin, twin_path, variant, columns)
+            if df is not None:
+                return df
+        return None
+
+    # ── Fingerprints ──────────────────────────────────────────────────────
+
+    def _fingerprint_path(self, abs_path, known_hash=None):
+        """Return the content fingerprint of a workspace file, hashing only if it changed.
+
+        Safe to call from the load and writer threads.  Returns None if
+        the file cannot be read.
+        """
+        rel_path = self._rel_path_for(abs_path)
+        with self._fingerprint_lock:
+            entry = self._fingerprints.get(rel_path)
+        if known_hash is None and stamp_matches(entry, abs_path):
+            return entry['hash']
+        try:
+            entry = fingerprint_entry(abs_path, known_hash)
+        except OSError:
+            logger.exception("Failed to fingerprint %s", rel_path)
+            return None
+        with self._fingerprint_lock:
+            self._fingerprints[rel_path] = entry
+        return entry['hash']
+
+    # ── Quick scans ───────────────────────────────────────────────────────
+
+    def _scan_cache(self):
+        data_folder = os.path.join(self.workspace_path, "data")
+        if self._scans is None or self._scans.data_folder != data_folder:
+            self._scans = ScanCache(data_folder)
+        return self._scans
+
+    def _stored_shape(self, relative_path, abs_path):
+        """Shape recorded by a column-store or edit-log save, or None.
+
+        For such copies the CSV is only the base, so scanning it would
+        report the wrong shape.
+        """
+        manifest = self._column_store().load_manifest(relative_path, abs_path)
+        if manifest is not None:
+            return {
+                'rows': manifest.get('rows', 0),
+                'columns': [entry['name'] for entry in manifest['columns']],
+                'dtypes': {entry['name']: entry.get('dtype') for entry in manifest['columns']},
+            }
+        record = self._delta_store().load(relative_path)
+        if (record is not None and record.get('operations') and 'shape' in record
+                and record.get('base_stamp') == file_stamp(abs_path)):
+            return record['shape']
+        return None
+
+    def cached_scan(self, relative_path):
+        """Return ``{rows, columns, dtypes}`` for a dataset if known without reading it.
+
+        Uses the shape stored by column/edit-log saves or a cached
+        header scan; returns None when the file would have to be read
+        (see ``request_scans``).
+        """
+        if not self.workspace_path or not relative_path:
+            return None
+        abs_path = self._resolve_data_path(relative_path)
+        try:
+            shape = self._stored_shape(relative_path, abs_path)
+        except OSError:
+            return None
+        if shape is not None:
+            return shape
+        return self._scan_cache().get(relative_path, abs_path)
+
+    def scan_dataset(self, relative_path):
+        """Return ``{rows, columns, dtypes}`` for a dataset, scanning its header if needed."""
+        scan = self.cached_scan(relative_path)
+        if scan is not None or not self.workspace_path:
+            return scan
+        abs_path = self._resolve_data_path(relative_path)
+        try:
+            scan = scan_csv(abs_path)
+        except Exception:
+            logger.exception("Failed to scan %s", relative_path)
+            return None
+        cache = self._scan_cache()
+        cache.put(relative_path, abs_path, scan)
+        cache.save()
+        return scan
+
+    def request_scans(self, relative_paths):
+        """Scan datasets without a cached result on a background thread.
+
+        Each result is emitted through ``scan_ready`` as it completes.
+        """
+        if not self.workspace_path:
+            return
+        cache = self._scan_cache()
+        jobs = [(rel, self._resolve_data_path(rel), cache) for rel in relative_paths]
+        with self._scan_lock:
+            queued = {job[0] for job in self._scan_queue}
+            self._scan_queue.extend(job for job in jobs if job[0] not in queued)
+            if self._scan_thread is None or not self._scan_thread.is_alive():
+                self._scan_thread = threading.Thread(
+                    target=self._run_scans, name="dataset-scan", daemon=True
+                )
+                self._scan_thread.start()
+
+    def _run_scans(self):
+        touched = set()
+        while True:
+            with self._scan_lock:
+                if not self._scan_queue:
+                    self._scan_thread = None
+                    break
+                rel_path, abs_path, cache = self._scan_queue.pop(0)
+            try:
+                scan = cache.get(rel_path, abs_path)
+                if scan is None:
+                    scan = scan_csv(abs_path)
+                    cache.put(rel_path, abs_path, scan)
+                    touched.add(cache)
+            except Exception as e:
+                logger.info("Could not scan %s: %s", rel_path, e)
+                continue
+            self.scan_ready.emit(rel_path, scan)
+        for cache in touched:
+            cache.save()
+
+    def _forget_fingerprint(self, relative_path):
+        with self._fingerprint_lock:
+            self._fingerprints.pop(relative_path, None)
+
+    def fingerprint(self, relative_path):
+        """Return the content fingerprint of a data-relative file, or None.
+
+        Files with equal fingerprints have equal bytes, so the value can
+        key any cache of results derived from a dataset.
+        """
+        if not self.workspace_path or not relative_path:
+            return None
+        abs_path = self._resolve_data_path(relative_path)
+        if not os.path.isfile(abs_path):
+            return None
+        return self._fingerprint_path(abs_path)
+
+    def find_original_by_content(self, file_path):
+        """Return the original whose bytes equal ``file_path``'s, or None."""
+        if not self.workspace_path or not os.path.isfile(file_path):
+            return None
+        size = os.path.getsize(file_path)
+        wanted = None
+        for name in list(self._originals):
+            orig_path = os.path.join(self._originals_folder(), name)
+            try:
+                if detect_codec(orig_path) is None and os.path.getsize(orig_path) != size:
+                    continue  # cheap reject before hashing either file
+            except OSError:
+                continue
+            if wanted is None:
+                wanted = content_hash(file_path)
+            if self._fingerprint_path(orig_path) == wanted:
+                return name
+        return None
+
+    def _parse_csv(self, abs_path, progress=None, is_cancelled=None, schema=None, columns=None,
+                   state=None):
+        projection = {} if columns is None else {'usecols': list(columns)}
+        if schema:
+            try:
+                return self._read_csv(abs_path, progress, is_cancelled,
+                                      **schema_read_kwargs(schema, columns), **projection)
+            except LoadCancelled:
+                raise
+            except (ValueError, TypeError) as e:
+                logger.warning("Stored schema does not fit %s (%s); re-inferring dtypes", abs_path, e)
+        if columns is not None:
+            return self._read_csv(abs_path, progress, is_cancelled, **projection)
+        if self.get_setting('compact_dtypes', False):
+            df, report = read_csv_compact(abs_path, progress, is_cancelled)
+            if state is not None:
+                # Runs on the load thread; emitted once the load is adopted.
+                state['memory_report'] = report
+            return df
+        return self._read_csv(abs_path, progress, is_cancelled)
+
+    def _read_csv(self, abs_path, progress=None, is_cancelled=None, **read_kwargs):
+        return self.engine.read_csv(abs_path, progress, is_cancelled, **read_kwargs)
+
+    def _cache_variant(self):
+        """Tag for sidecars so compact, plain and other engines' parses are never mixed up."""
+        if self.get_setting('compact_dtypes', False):
+            return "compact"
+        engine = self.engine.name
+        return None if engine == DEFAULT_ENGINE else engine
+
+    # ── Background loading ────────────────────────────────────────────────
+
+    @property
+    def is_loading(self):
+        """True while a background load is in flight."""
+        return self._load_worker is not None
+
+    def _start_load(self, abs_path, on_success, error_prefix, columns=None):
+        """Load ``abs_path`` in a worker thread, then call ``on_success(df, state)``.
+
+        Any load already in flight is cancelled first; only the newest
+        load's result is ever applied.  ``columns`` is passed on to
+        ``_load_dataset``.
+        """
+        self.cancel_load()
+
+        worker = DatasetLoadWorker(
+            lambda progress, is_cancelled: self._load_dataset(abs_path, progress, is_cancelled, columns)
+        )
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_load_progress)
+        worker.loaded.connect(self._on_load_finished)
+        worker.failed.connect(self._on_load_failed)
+        worker.cancelled.connect(self._on_load_cancelled)
+        for done in (worker.loaded, worker.failed, worker.cancelled):
+            done.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+
+        self._load_thread = thread
+        self._load_worker = worker
+        self._load_on_success = on_success
+        self._load_error_prefix = error_prefix
+        self.load_started.emit(os.path.basename(abs_path))
+        thread.start()
+
+    def cancel_load(self, wait=False):
+        """Cancel the background load, if any.
+
+        With ``wait=True`` this blocks until the worker thread has exited
+        (used on shutdown so no thread outlives the window).
+        """
+        worker, thread = self._load_worker, self._load_thread
+        if worker is None:
+            return
+        worker.cancel()
+        self._reset_load_state()
+        if wait and thread is not None:
+            thread.quit()
+            thread.wait()
+        self.load_cancelled.emit()
+
+    def _reset_load_state(self):
+        self._load_thread = None
+        self._load_worker = None
+        self._load_on_success = None
+        self._load_error_prefix = ""
+
+    def _is_current_load(self):
+        """True when the emitting worker is the load we are waiting for."""
+        return self._load_worker is not None and self.sender() is self._load_worker
+
+    def _on_load_progress(self, bytes_read, total_bytes, rows):
+        if self._is_current_load():
+            self.load_progress.emit(bytes_read, total_bytes, rows)
+
+    def _on_load_finished(self, result):
+        if not self._is_current_load():
+            return  # superseded or cancelled load
+        on_success = self._load_on_success
+        self._reset_load_state()
+        on_success(*result)
+
+    def _on_load_failed(self, message):
+        if not self._is_current_load():
+            return
+        prefix = self._load_error_prefix
+        self._reset_load_state()
+        self.data_error.emit(f"{prefix}: {message}")
+
+    def _on_load_cancelled(self):
+        if self._is_current_load():
+            self._reset_load_state()
+            self.load_cancelled.emit()
+
     # ── Migration ──────────────────────────────────────────────────────────
 
     def _migrate_flat_structure(self):
@@ -148,6 +859,9 @@ class DataManager(QObject):
 
         data_folder = os.path.join(self.workspace_path, "data")
         metadata_path = os.path.join(self.workspace_path, "metadata.json")
+        # This one-off rewrite goes straight to the file; land pending updates first.
+        self.flush_metadata()
+        self._metadata = None
         try:
             with open(metadata_path, 'r') as f:
                 metadata = json.load(f)
@@ -224,38 +938,64 @@ class DataManager(QObject):
 
     # ── Metadata persistence ───────────────────────────────────────────────
 
+    def _metadata_store(self):
+        """Return the journaled metadata of the active workspace."""
+        if self._metadata is None or self._metadata.workspace_path != self.workspace_path:
+            self.flush_metadata()
+            self._metadata = WorkspaceMetadata(self.workspace_path, self)
+        return self._metadata
+
+    def flush_metadata(self):
+        """Write pending metadata updates to metadata.json now."""
+        if self._metadata is not None:
+            self._metadata.flush()
+
     def _update_metadata(self):
-        """Persist active_working_copy and originals map into metadata.json."""
+        """Persist active_working_copy, originals, settings, schemas and fingerprints into metadata.json.
+
+        Updates are journaled and batched (see ``metadata_store``); calling
+        this when nothing changed costs no I/O.
+        """
         if not self.workspace_path:
             return
-        metadata_path = os.path.join(self.workspace_path, "metadata.json")
-        try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            if self._active_working_copy is not None:
-                metadata['active_working_copy'] = self._active_working_copy
-            metadata['originals'] = self._originals
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=4)
-        except Exception:
-            logger.exception("Failed to update metadata.json at %s", metadata_path)
+        with self._fingerprint_lock:
+            fingerprints = dict(self._fingerprints)
+        fields = {
+            'originals': self._originals,
+            'settings': self._settings,
+            'schemas': self._schemas,
+            'fingerprints': fingerprints,
+        }
+        if self._active_working_copy is not None:
+            fields['active_working_copy'] = self._active_working_copy
+        self._metadata_store().update(**fields)
 
     def _load_originals_from_metadata(self):
-        """Load the originals map from metadata.json."""
+        """Load the originals map, settings, schemas and fingerprints from metadata.json."""
         if not self.workspace_path:
             return
-        metadata_path = os.path.join(self.workspace_path, "metadata.json")
-        try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            self._originals = metadata.get('originals', {})
-        except Exception:
-            self._originals = {}
+        metadata = self._metadata_store()
+        self._originals = metadata.get('originals', {})
+        self._settings = metadata.get('settings', {})
+        self._schemas = metadata.get('schemas', {})
+        with self._fingerprint_lock:
+            self._fingerprints = metadata.get('fingerprints', {})
+        self._sync_watches()
+
+    def get_setting(self, key, default=None):
+        """Return a per-workspace setting stored in metadata.json."""
+        return self._settings.get(key, default)
+
+    def set_setting(self, key, value):
+        """Update a per-workspace setting and persist it."""
+        self._settings[key] = value
+        self._update_metadata()
 
     def validate_metadata(self):
         """Reconcile metadata.json against the actual originals/ and copies/ folders.
 
-        - Drops copy entries whose files no longer exist on disk.
+        - Drops copy entries (and stored schemas and fingerprints) whose
+          files no longer exist on disk.
         - Keeps original entries even when the file is missing (so the
           UI can render a warning indicator).
         - Auto-registers any CSV in originals/ that is not in metadata.
@@ -269,24 +1009,30 @@ class DataManager(QObject):
         self._ensure_data_folders()
         originals_dir = self._originals_folder()
         copies_dir = self._copies_folder()
+        index = self._dir_index
+        listings = {}  # one folder lookup per pass, not one per file
+
+        def on_disk(rel_path):
+            rel_dir, _, name = rel_path.rpartition('/')
+            if rel_dir not in listings:
+                listings[rel_dir] = index.files(self._resolve_data_path(rel_dir))
+            return name in listings[rel_dir]
 
         # 1. Drop missing copy entries from metadata.
         for orig_name, info in list(self._originals.items()):
-            kept = []
-            for copy_rel in info.get('copies', []):
-                copy_abs = self._resolve_data_path(copy_rel)
-                if os.path.isfile(copy_abs):
-                    kept.append(copy_rel)
-            info['copies'] = kept
+            info['copies'] = [c for c in info.get('copies', []) if on_disk(c)]
+        for rel_path in list(self._schemas):
+            if not on_disk(rel_path):
+                del self._schemas[rel_path]
+        with self._fingerprint_lock:
+            stale = [rel for rel in self._fingerprints if not on_disk(rel)]
+            for rel_path in stale:
+                del self._fingerprints[rel_path]
 
         # 2. Register orphan originals (files in originals/ not in metadata).
-        try:
-            on_disk_originals = [
-                f for f in os.listdir(originals_dir)
-                if os.path.isfile(os.path.join(originals_dir, f)) and f.lower().endswith('.csv')
-            ]
-        except OSError:
-            on_disk_originals = []
+        on_disk_originals = sorted(
+            f for f in index.files(originals_dir) if f.lower().endswith('.csv')
+        )
 
         from datetime import datetime
         for fname in on_disk_originals:
@@ -301,13 +1047,9 @@ class DataManager(QObject):
                 }
 
         # 3. Match orphan copy files to a parent original by name pattern.
-        try:
-            on_disk_copies = [
-                f for f in os.listdir(copies_dir)
-                if os.path.isfile(os.path.join(copies_dir, f)) and f.lower().endswith('.csv')
-            ]
-        except OSError:
-            on_disk_copies = []
+        on_disk_copies = sorted(
+            f for f in index.files(copies_dir) if f.lower().endswith('.csv')
+        )
 
         tracked = set()
         for info in self._originals.values():
@@ -315,12 +1057,13 @@ class DataManager(QObject):
                 tracked.add(os.path.basename(copy_rel))
 
         ws_clean = sanitize_basename(self.workspace_name) if self.workspace_name else "workspace"
+        lookup = self._original_lookup()
         unassigned = []
         for copy_basename in on_disk_copies:
             if copy_basename in tracked:
                 continue
 
-            parent = self._guess_parent_original(copy_basename, ws_clean)
+            parent = self._guess_parent_original(copy_basename, ws_clean, lookup)
             if parent is not None:
                 copy_rel = f"copies/{copy_basename}"
                 self._originals[parent].setdefault('copies', []).append(copy_rel)
@@ -332,11 +1075,19 @@ class DataManager(QObject):
 
         self._update_metadata()
 
-    def _guess_parent_original(self, copy_basename, workspace_clean):
+    def _original_lookup(self):
+        """Map each original's sanitized basename to its filename (first one wins)."""
+        lookup = {}
+        for orig_name in self._originals:
+            lookup.setdefault(sanitize_basename(orig_name), orig_name)
+        return lookup
+
+    def _guess_parent_original(self, copy_basename, workspace_clean, lookup=None):
         """Try to determine which original a free-floating copy belongs to.
 
         Matches copies named ``{ws}_{file}_{N}.csv`` against each known
-        original's sanitized basename. Returns the original filename or
+        original's sanitized basename (``lookup``, from
+        ``_original_lookup()``). Returns the original filename or
         ``None`` if no match is found.
         """
         copy_root = sanitize_basename(copy_basename)
@@ -351,10 +1102,9 @@ class DataManager(QObject):
         candidate_root = m.group(1)
         if not candidate_root:
             return None
-        for orig_name in self._originals.keys():
-            if sanitize_basename(orig_name) == candidate_root:
-                return orig_name
-        return None
+        if lookup is None:
+            lookup = self._original_lookup()
+        return lookup.get(candidate_root)
 
     def get_unassigned_copies(self):
         """Return the list of orphan copy relative paths discovered on disk."""
@@ -386,7 +1136,7 @@ class DataManager(QObject):
         """Check if a data-relative path exists on disk."""
         if not self.workspace_path or not relative_path:
             return False
-        return os.path.isfile(self._resolve_data_path(relative_path))
+        return self._dir_index.exists(self._resolve_data_path(relative_path))
 
     # ── Two-tier dataset operations ────────────────────────────────────────
 
@@ -394,9 +1144,11 @@ class DataManager(QObject):
         """
         Import an external file as a Tier-1 original.
 
-        Copies the file into data/originals/, registers it, creates a
+        Copies the file into data/originals/ (compressed with the
+        ``storage_compression`` setting), registers it, creates a
         default working copy in data/copies/, and returns
-        (original_filename, copy_relative_path).
+        (original_filename, copy_relative_path).  The working copy is a
+        clone/hardlink of the original until it is first saved.
         """
         if not self.workspace_path:
             return None, None
@@ -407,9 +1159,211 @@ class DataManager(QObject):
         dest_path = os.path.join(self._originals_folder(), original_name)
 
         if os.path.abspath(file_path) != os.path.abspath(dest_path):
-            shutil.copy2(file_path, dest_path)
+            existing = self.find_original_by_content(file_path)
+            if existing is not None:
+                # Same bytes already imported (possibly under another name).
+                logger.info("%s has the same content as original %s; reusing it",
+                            file_path, existing)
+                return existing, self.create_working_copy(existing)
+            # Never hardlink the external file (it may be edited in place), and
+            # replace rather than overwrite so existing linked copies keep their bytes.
+            codec = self.storage_codec
+            if codec is None:
+                atomic_write(dest_path, lambda tmp: clone_file(file_path, tmp, allow_hardlink=False))
+            else:
+                atomic_write(dest_path, lambda tmp: recompress(file_path, tmp, codec))
+
+        copy_rel = self._register_original(original_name)
+        # Remembered so the original can later follow the file (see watch_original).
+        self._originals[original_name]['source'] = os.path.abspath(file_path)
+        self._update_metadata()
+        return original_name, copy_rel
+
+    def import_excel(self, file_path, progress=None):
+        """
+        Import an Excel workbook as Tier-1 originals, one per sheet.
+
+        Each non-empty sheet is streamed into ``data/originals/`` as
+        ``<workbook>.csv`` (single sheet) or ``<workbook>_<sheet>.csv``
+        (``_2``, ``_3``, ... appended if an original has that name) and
+        registered with a default working copy, exactly like
+        ``import_original``.  ``progress(fraction)`` may return False to
+        cancel (``excel_io.ImportCancelled``).  Returns a list of
+        ``(original_filename, copy_relative_path)``.
+        """
+        if not self.workspace_path:
+            return []
+
+        self._ensure_data_folders()
+        book = sanitize_basename(os.path.basename(file_path))
+        # Never replace an earlier import (or another sheet of this one).
+        taken = set(self._originals) | set(os.listdir(self._originals_folder()))
+
+        def name_for_sheet(sheet_name, sheet_count):
+            if sheet_count == 1:
+                name = f"{book}.csv"
+            else:
+                name = f"{book}_{self._sanitize_name(sheet_name) or 'Sheet'}.csv"
+            name = unique_name(name, taken)
+            taken.add(name)
+            return name
+
+        created = excel_to_csv(file_path, self._originals_folder(), name_for_sheet, progress)
+        codec = self.storage_codec
+        if codec is not None:
+            for name in created:
+                path = os.path.join(self._originals_folder(), name)
+                atomic_write(path, lambda tmp, path=path: recompress(path, tmp, codec))
+        imported = [(name, self._register_original(name)) for name in created]
+        self._update_metadata()
+        return imported
+
+    def import_sqlite(self, file_path, table=None, query=None, chunk_rows=None, progress=None):
+        """
+        Import a table or view of a SQLite database, or the result of
+        ``query`` on it, as a Tier-1 original.
+
+        Rows are streamed ``chunk_rows`` at a time (default: the
+        ``sqlite_chunk_rows`` setting) into ``data/originals/`` as
+        ``<database>_<table>.csv`` (``<database>_query.csv`` for a query;
+        ``_2``, ``_3``, ... appended if an original has that name) and
+        registered with a default working copy, exactly like
+        ``import_original``.  ``progress(fraction)`` receives 0..1 (None
+        while a query's row count is unknown) and may return False to
+        cancel (``excel_io.ImportCancelled``).  Returns
+        ``(original_filename, copy_relative_path)``.
+        """
+        if not self.workspace_path:
+            return None, None
+        if (table is None) == (query is None):
+            raise ValueError("Import either a table or a query.")
+
+        self._ensure_data_folders()
+        database = sanitize_basename(os.path.basename(file_path))
+        chunk_rows = chunk_rows or self.get_setting('sqlite_chunk_rows', DEFAULT_CHUNK_ROWS)
+        if table is not None:
+            original_name = f"{database}_{self._sanitize_name(table) or 'table'}.csv"
+            query = f"SELECT * FROM {quote_identifier(table)}"
+            total = count_rows(file_path, table)
+        else:
+            original_name = f"{database}_query.csv"
+            total = None
+        # Never replace an earlier import.
+        original_name = unique_name(
+            original_name, set(self._originals) | set(os.listdir(self._originals_folder())))
+
+        def rows_done(rows):
+            if progress is None:
+                return True
+            return progress(min(rows / total, 1.0) if total else None)
+
+        dest_path = os.path.join(self._originals_folder(), original_name)
+        codec = self.storage_codec
+        atomic_write(dest_path, lambda tmp: query_to_csv(
+            file_path, query, tmp, chunk_rows, rows_done, codec))
+        copy_rel = self._register_original(original_name)
+        self._update_metadata()
+        return original_name, copy_rel
+
+    def import_batch(self, groups, progress=None):
+        """
+        Import many CSV files as Tier-1 originals at once.
+
+        ``groups`` is a list of path lists: a single path is imported as
+        is, several paths are shards with the same header row that become
+        one original (see ``batch_import``).  The files are copied,
+        fingerprinted and header-scanned on ``IMPORT_WORKERS`` threads,
+        then registered with a default working copy each in a single
+        metadata update.  Content that is already an original is not
+        stored again.  ``progress(fraction)`` may return False to cancel
+        (``excel_io.ImportCancelled``); if the batch is cancelled or any
+        file fails, nothing is imported.
+
+        Returns ``(imported, duplicates)``: ``[(original_filename,
+        copy_relative_path)]`` and ``[(source_path, existing_original)]``.
+        """
+        if not self.workspace_path or not groups:
+            return [], []
+
+        self._ensure_data_folders()
+        folder = self._originals_folder()
+        taken = set(self._originals) | set(os.listdir(folder))
+        jobs = []
+        for sources in groups:
+            name = os.path.basename(sources[0]) if len(sources) == 1 else combined_name(sources)
+            name = unique_name(name, taken)
+            taken.add(name)
+            jobs.append((sources, os.path.join(folder, name)))
+        tracker = BatchProgress(sum(os.path.getsize(p) for sources, _ in jobs for p in sources))
+        codec = self.storage_codec
+
+        def import_one(sources, dest):
+            try:
+                result = copy_shards(sources, dest, tracker, codec)
+            except BaseException:
+                if os.path.exists(dest):
+                    os.remove(dest)
+                raise
+            try:
+                result['scan'] = scan_csv(dest, result['lines'])
+            except Exception as e:
+                logger.info("Could not scan %s: %s", dest, e)
+                result['scan'] = None
+            return result
 
+        with ThreadPoolExecutor(min(IMPORT_WORKERS, len(jobs))) as pool:
+            futures = [pool.submit(import_one, sources, dest) for sources, dest in jobs]
+            try:
+                pending = futures
+                while pending:
+                    _, pending = wait(pending, timeout=0.1, return_when=FIRST_EXCEPTION)
+                    if progress is not None and progress(tracker.fraction) is False:
+                        raise ImportCancelled()
+                    if any(f.done() and f.exception() is not None for f in futures):
+                        break
+                results = [f.result() for f in futures]
+            except BaseException:
+                tracker.cancelled = True
+                wait(futures)
+                for _, dest in jobs:
+                    if os.path.exists(dest):
+                        os.remove(dest)
+                raise
+
+        known = {}
+        for name in list(self._originals):
+            fingerprint = self._fingerprint_path(os.path.join(folder, name))
+            if fingerprint is not None:
+                known.setdefault(fingerprint, name)
+
+        imported, duplicates = [], []
+        scans = self._scan_cache()
+        for (sources, dest), result in zip(jobs, results):
+            existing = known.get(result['hash'])
+            if existing is not None:
+                os.remove(dest)
+                duplicates.extend((source, existing) for source in sources)
+                continue
+            name = os.path.basename(dest)
+            known[result['hash']] = name
+            self._fingerprint_path(dest, result['hash'])
+            copy_rel = self._register_original(name)
+            if result['scan'] is not None:
+                # The copy is a clone: same bytes, same stamp.
+                scans.put(f"originals/{name}", dest, result['scan'])
+                scans.put(copy_rel, self._resolve_data_path(copy_rel), result['scan'])
+            imported.append((name, copy_rel))
+        scans.save()
+        self._update_metadata()
+        return imported, duplicates
+
+    def _register_original(self, original_name):
+        """Record ``originals/<original_name>`` and give it a new working copy.
+
+        Returns the copy's relative path.  The caller persists metadata.
+        """
         from datetime import datetime
+        dest_path = os.path.join(self._originals_folder(), original_name)
         existing_copies = self._originals.get(original_name, {}).get('copies', [])
         self._originals[original_name] = {
             'path': f"originals/{original_name}",
@@ -420,19 +1374,28 @@ class DataManager(QObject):
         # Create a default working copy
         working_basename = self._generate_working_copy_name(original_name)
         working_path = os.path.join(self._copies_folder(), working_basename)
-        shutil.copy2(dest_path, working_path)
+        clone_file(dest_path, working_path)
+        # The copy starts out byte-identical: hash once, record for both.
+        self._fingerprint_path(working_path, self._fingerprint_path(dest_path))
 
         copy_rel = f"copies/{working_basename}"
         self._originals[original_name]['copies'].append(copy_rel)
+        self._start_recipe(copy_rel, original_name)
+        return copy_rel
 
-        self._update_metadata()
-        return original_name, copy_rel
+    def _start_recipe(self, copy_rel, original_filename):
+        """Give a copy identical to its original an empty recipe (see ``recipes``)."""
+        try:
+            self._recipe_store().start(copy_rel, f"originals/{original_filename}")
+        except OSError:
+            logger.exception("Failed to start the recipe of %s", copy_rel)
 
     def create_working_copy(self, original_filename):
         """
         Create a new working copy from an existing original.
 
-        Returns the new copy relative path (copies/...), or None on error.
+        The copy shares storage with the original (reflink or hardlink)
+        until it is first saved.  Returns the new copy relative path (copies/...), or None on error.
         """
         if not self.workspace_path:
             return None
@@ -444,7 +1407,8 @@ class DataManager(QObject):
 
         working_basename = self._generate_working_copy_name(original_filename)
         working_path = os.path.join(self._copies_folder(), working_basename)
-        shutil.copy2(original_path, working_path)
+        clone_file(original_path, working_path)
+        self._fingerprint_path(working_path, self._fingerprint_path(original_path))
 
         if original_filename not in self._originals:
             from datetime import datetime
@@ -455,12 +1419,22 @@ class DataManager(QObject):
             }
         copy_rel = f"copies/{working_basename}"
         self._originals[original_filename]['copies'].append(copy_rel)
+        watch = self._originals[original_filename].get('watch')
+        if watch is not None:
+            # A fresh copy is identical to the original: it grows with it.
+            watch['copies'][copy_rel] = file_stamp(working_path)
+        self._start_recipe(copy_rel, original_filename)
 
         self._update_metadata()
         return copy_rel
 
-    def activate_dataset(self, relative_path):
-        """Load a dataset from a data-relative path and set it as active."""
+    def activate_dataset(self, relative_path, columns=None):
+        """Load a dataset from a data-relative path and set it as active.
+
+        With ``columns``, only those columns are read; the rest can be
+        added later with ``load_columns`` and must be before the dataset
+        can be saved.
+        """
         if not self.workspace_path:
             return False
         abs_path = self._resolve_data_path(relative_path)
@@ -468,22 +1442,291 @@ class DataManager(QObject):
             return False
 
         try:
-            self._data = pd.read_csv(abs_path, low_memory=False)
-            self._active_working_copy = relative_path
-            self._update_metadata()
-            self.data_loaded.emit(self._data)
-            return True
+            df, state = self._load_dataset(abs_path, columns=columns)
         except Exception as e:
             self.data_error.emit(f"Error loading dataset: {str(e)}")
             return False
+        self._finish_activation(relative_path, df, state, columns)
+        return True
+
+    def activate_dataset_async(self, relative_path, columns=None):
+        """Like ``activate_dataset`` but parses in a worker thread.
+
+        Returns False if the path cannot be loaded at all; otherwise the
+        outcome is reported through ``data_loaded`` / ``data_error`` /
+        ``load_cancelled``.
+        """
+        if not self.workspace_path:
+            return False
+        abs_path = self._resolve_data_path(relative_path)
+        if not os.path.exists(abs_path):
+            return False
+
+        self._start_load(
+            abs_path,
+            lambda df, state: self._finish_activation(relative_path, df, state, columns),
+            "Error loading dataset",
+            columns,
+        )
+        return True
+
+    def _finish_activation(self, relative_path, df, state, columns=None):
+        if columns is not None:
+            all_columns = (self.scan_dataset(relative_path) or {}).get('columns') or list(df.columns)
+            if any(col not in df.columns for col in all_columns):
+                state['projection'] = {
+                    'path': relative_path,
+                    'columns': list(df.columns),
+                    'all_columns': list(all_columns),
+                }
+        self._adopt_loaded(df, state)
+        self._tailing = self._lazy is None
+        self._active_working_copy = relative_path
+        self._update_metadata()
+        self.data_loaded.emit(self._data)
+
+    def load_columns(self, names=None):
+        """Add columns a projected load left out (all of them by default).
+
+        Only the requested columns are read, and they are matched to the
+        current rows by index, so edits made since the load are kept.
+        Returns the names added; see ``can_load_columns``.
+        """
+        if not self.can_load_columns:
+            return []
+        missing = self.missing_columns
+        names = missing if names is None else [col for col in missing if col in set(names)]
+        if not names:
+            return []
+        clashes = [col for col in names if col in self._data.columns]
+        if clashes:
+            raise ValueError(f"The data already has columns named {', '.join(clashes)}")
+
+        abs_path = self._resolve_data_path(self._projection['path'])
+        extra, _ = self._load_dataset(abs_path, columns=names)
+        df = self._data.join(extra, how='left')
+        # Dataset columns in file order, then any the session added.
+        order = [col for col in self._projection['all_columns'] if col in df.columns]
+        self._data = df[order + [col for col in df.columns if col not in set(order)]]
+        self._projection = dict(self._projection, columns=self._projection['columns'] + names)
+        if not self.missing_columns:
+            logger.info("All columns of %s are loaded", self._projection['path'])
+            edited = self._projection.get('edited')
+            self._projection = None
+            if edited:
+                # Edits made on some columns may not replay the same on all
+                # of them (e.g. dropping duplicate rows): save a full file.
+                self.mark_untracked()
+        self._dirty_columns = None
+        self.data_loaded.emit(self._data)
+        return names
+
+    # ── Watched originals ─────────────────────────────────────────────────
+
+    def original_source(self, original_filename):
+        """Path of the file an original was imported from, or None if unknown."""
+        info = self._originals.get(original_filename, {})
+        return (info.get('watch') or {}).get('source') or info.get('source')
+
+    def is_watched(self, original_filename):
+        return bool(self._originals.get(original_filename, {}).get('watch'))
+
+    def watch_original(self, original_filename, source=None):
+        """Keep an original up to date with a file another process appends to.
+
+        ``source`` defaults to the file the original was imported from.
+        Whenever it grows, the complete rows added are appended to the
+        stored original, to the copies still identical to it, and to the
+        data in memory if it is one of those files as loaded (see
+        ``poll_watches``).  Raises ValueError if ``source`` does not
+        continue the stored original.
+        """
+        if not self.workspace_path or original_filename not in self._originals:
+            raise ValueError(f"{original_filename} is not an original of this workspace.")
+        source = os.path.abspath(source or self.original_source(original_filename) or "")
+        orig_rel = f"originals/{original_filename}"
+        path = self._resolve_data_path(orig_rel)
+        offset = text_size(path)
+        check_source(source, path, offset)
+
+        # Copies that are still the original's bytes grow along with it.
+        fingerprint = self.fingerprint(orig_rel)
+        copies = {}
+        for copy_rel in self._originals[original_filename].get('copies', []):
+            copy_path = self._resolve_data_path(copy_rel)
+            if (os.path.isfile(copy_path) and self._stored_shape(copy_rel, copy_path) is None
+                    and self.fingerprint(copy_rel) == fingerprint):
+                copies[copy_rel] = file_stamp(copy_path)
+        self._originals[original_filename]['watch'] = {
+            'source': source, 'offset': offset, 'copies': copies,
+        }
+        self._originals[original_filename]['source'] = source
+        logger.info("Watching %s for rows appended to %s", original_filename, source)
+        self._update_metadata()
+        self._sync_watches()
+        self.poll_watches()  # rows added since the import
+
+    def unwatch_original(self, original_filename):
+        """Stop following an original's source file."""
+        info = self._originals.get(original_filename)
+        if info is not None and info.pop('watch', None) is not None:
+            self._update_metadata()
+            self._sync_watches()
+
+    def _sync_watches(self):
+        """Point the file watcher at the sources of the watched originals."""
+        sources = {info['watch']['source'] for info in self._originals.values() if info.get('watch')}
+        if self._watcher is None:
+            if not sources:
+                return
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._on_source_changed)
+            self._watch_timer = QTimer(self)
+            self._watch_timer.setSingleShot(True)
+            self._watch_timer.setInterval(WATCH_DEBOUNCE_MS)
+            self._watch_timer.timeout.connect(self.poll_watches)
+        watched = set(self._watcher.files())
+        if watched - sources:
+            self._watcher.removePaths(sorted(watched - sources))
+        # Paths the watcher dropped (e.g. the file was replaced) are re-added.
+        missing = [path for path in sorted(sources - watched) if os.path.exists(path)]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_source_changed(self, path):
+        self._watch_timer.start()
+
+    def poll_watches(self):
+        """Append the rows written to watched sources since the last poll.
+
+        Only complete rows are read, starting at the byte offset recorded
+        for each source, and each source is read once.  Returns the
+        number of rows appended.
+        """
+        if not self.workspace_path:
+            return 0
+        total = 0
+        for name, info in list(self._originals.items()):
+            watch = info.get('watch')
+            if not watch:
+                continue
+            try:
+                data, offset = read_appended(watch['source'], watch['offset'])
+                if not data:
+                    continue
+                appended = self._append_to_stored(name, data)
+            except FileNotFoundError:
+                continue  # being rotated or replaced; looked at again on the next change
+            except SourceTruncated:
+                logger.warning("%s was truncated; no longer watching it for %s", watch['source'], name)
+                info.pop('watch')
+                self.data_error.emit(
+                    f"{os.path.basename(watch['source'])} was truncated, so rows can no longer be "
+                    f"appended to {name}. Import it again to pick up its new contents.")
+                continue
+            except OSError as e:
+                logger.exception("Failed to append rows to %s", name)
+                self.data_error.emit(f"Error appending rows to {name}: {str(e)}")
+                continue
+            watch['offset'] = offset
+            rows = data.count(b"\n")
+            total += rows
+            logger.info("Appended %d rows to %s", rows, name)
+            if self._tailing and self._data is not None and self._active_working_copy in appended:
+                try:
+                    self.append_rows(parse_rows(header_line(watch['source']), data, self._data))
+                except Exception:
+                    # The files have the rows; a reload shows them.
+                    logger.exception("Failed to parse rows appended to %s", name)
+                    self._tailing = False
+        self._update_metadata()
+        self._sync_watches()
+        return total
+
+    def _append_to_stored(self, original_filename, data):
+        """Append CSV rows to an original and to the copies still identical to it.
+
+        Copies that have been saved since the last append are dropped from
+        the watch.  Returns the data-relative paths that received ``data``.
+        """
+        watch = self._originals[original_filename]['watch']
+        self._prune_watched_copies(watch)
+        targets = [f"originals/{original_filename}"] + list(watch['copies'])
+        self._detach_unwatched_copies(original_filename, watch)
+
+        written = set()  # (device, inode): a hardlinked copy shares the original's file
+        for rel_path in targets:
+            path = self._resolve_data_path(rel_path)
+            st = os.stat(path)
+            if (st.st_dev, st.st_ino) not in written:
+                written.add((st.st_dev, st.st_ino))
+                with open_dataset_writer(path, detect_codec(path), append=True) as out:
+                    out.write(data)
+            self._forget_fingerprint(rel_path)
+        for copy_rel in targets[1:]:
+            watch['copies'][copy_rel] = file_stamp(self._resolve_data_path(copy_rel))
+        return targets
+
+    def _detach_unwatched_copies(self, original_filename, watch):
+        """Unlink copies that share the original's file but must not grow with it.
+
+        A copy saved as an edit log or column files keeps its CSV, often
+        still a hardlink of the original; appending in place would change
+        the base its edits apply to.
+        """
+        orig_path = self._resolve_data_path(f"originals/{original_filename}")
+        if not is_shared(orig_path):
+            return
+        orig_st = os.stat(orig_path)
+        for copy_rel in self._originals[original_filename].get('copies', []):
+            if copy_rel in watch['copies']:
+                continue
+            path = self._resolve_data_path(copy_rel)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if (st.st_dev, st.st_ino) == (orig_st.st_dev, orig_st.st_ino):
+                detach(path)
+                logger.debug("Detached %s from its original before appending", copy_rel)
+
+    def _prune_watched_copies(self, watch):
+        """Stop growing copies whose file changed since the last append (e.g. a save)."""
+        for copy_rel, stamp in list(watch['copies'].items()):
+            copy_path = self._resolve_data_path(copy_rel)
+            if not (os.path.isfile(copy_path) and file_stamp(copy_path) == stamp):
+                del watch['copies'][copy_rel]
+
+    def append_rows(self, rows):
+        """Add ``rows`` to the end of the data in memory and emit ``rows_appended``.
+
+        Columns are matched by name (a projected load keeps only its
+        columns) and new rows are numbered on from the last index label.
+        """
+        if self._data is None or self._lazy is not None:
+            return
+        self._data = append_frame(self._data, rows)
+        if self._active_working_copy and self._active_working_copy.startswith("copies/") \
+                and not self._tailing:
+            # The copy's file does not have these rows: save it whole.
+            self.mark_untracked()
+        self.rows_appended.emit(self._data.iloc[len(self._data) - len(rows):])
 
     def delete_copy(self, copy_rel_path):
         """Delete a single working copy and remove from tracking."""
         if not self.workspace_path:
             return
+        self.flush_saves()
         abs_path = self._resolve_data_path(copy_rel_path)
         if os.path.exists(abs_path):
             os.remove(abs_path)
+        self._dataset_cache().invalidate(copy_rel_path)
+        self._delta_store().invalidate(copy_rel_path)
+        self._column_store().invalidate(copy_rel_path)
+        self._checkpoint_store().invalidate(copy_rel_path)
+        self._recipe_store().invalidate(copy_rel_path)
+        self._schemas.pop(copy_rel_path, None)
+        self._forget_fingerprint(copy_rel_path)
 
         for orig, info in self._originals.items():
             copies = info.get('copies', [])
@@ -500,20 +1743,38 @@ class DataManager(QObject):
         """Delete an original and ALL its working copies."""
         if not self.workspace_path or original_filename not in self._originals:
             return []
+        self.flush_saves()
 
         info = self._originals[original_filename]
         deleted_copies = list(info.get('copies', []))
 
+        cache = self._dataset_cache()
+        deltas = self._delta_store()
+        columns = self._column_store()
+        checkpoints = self._checkpoint_store()
+        recipes = self._recipe_store()
+
         # Delete copy files
         for copy_rel in deleted_copies:
             abs_path = self._resolve_data_path(copy_rel)
             if os.path.exists(abs_path):
                 os.remove(abs_path)
+            cache.invalidate(copy_rel)
+            deltas.invalidate(copy_rel)
+            columns.invalidate(copy_rel)
+            checkpoints.invalidate(copy_rel)
+            recipes.invalidate(copy_rel)
+            self._schemas.pop(copy_rel, None)
+            self._forget_fingerprint(copy_rel)
 
         # Delete original file
         orig_path = os.path.join(self._originals_folder(), original_filename)
         if os.path.exists(orig_path):
             os.remove(orig_path)
+        cache.invalidate(f"originals/{original_filename}")
+        checkpoints.invalidate(f"originals/{original_filename}")
+        self._schemas.pop(f"originals/{original_filename}", None)
+        self._forget_fingerprint(f"originals/{original_filename}")
 
         # Clear active if it was one of the deleted
         if self._active_working_copy in deleted_copies:
@@ -523,6 +1784,7 @@ class DataManager(QObject):
             self._active_working_copy = None
 
         del self._originals[original_filename]
+        self._sync_watches()
         self._update_metadata()
         return deleted_copies
 
@@ -534,10 +1796,22 @@ class DataManager(QObject):
         new_rel = f"copies/{new_basename}"
         new_abs = self._resolve_data_path(new_rel)
 
+        self.flush_saves()
         if not os.path.exists(old_abs) or os.path.exists(new_abs):
             return False
 
         os.rename(old_abs, new_abs)
+        self._dataset_cache().rename(old_rel, new_rel)
+        self._delta_store().rename(old_rel, new_rel)
+        self._column_store().rename(old_rel, new_rel)
+        self._checkpoint_store().rename(old_rel, new_rel)
+        self._recipe_store().rename(old_rel, new_rel)
+        if old_rel in self._schemas:
+            self._schemas[new_rel] = self._schemas.pop(old_rel)
+        with self._fingerprint_lock:
+            # A rename keeps size and mtime, so the entry stays valid.
+            if old_rel in self._fingerprints:
+                self._fingerprints[new_rel] = self._fingerprints.pop(old_rel)
 
         # Update tracking robustly:
         # - Some older metadata stored copy entries as bare basenames ("file_1.csv")
@@ -550,6 +1824,9 @@ class DataManager(QObject):
                 if entry == old_rel or os.path.basename(entry) == old_basename:
                     copies[i] = new_rel
                     break
+            watched = (info.get('watch') or {}).get('copies', {})
+            if old_rel in watched:
+                watched[new_rel] = watched.pop(old_rel)
 
         if self._active_working_copy == old_rel:
             self._active_working_copy = new_rel
@@ -557,10 +1834,87 @@ class DataManager(QObject):
         self._update_metadata()
         return True
 
+    def recompress_datasets(self, progress=None):
+        """
+        Rewrite stored originals and copies with the current ``storage_compression``.
+
+        Copies still sharing their original's file are linked to the
+        rewritten original again.  Copies saved as an edit log or column
+        files keep their file, since those records are tied to it.
+        ``progress(fraction)`` may return False to stop early.  Returns
+        the number of files rewritten.
+        """
+        if not self.workspace_path:
+            return 0
+        self.flush_saves()
+        codec = self.storage_codec
+        watches = [info['watch'] for info in self._originals.values() if info.get('watch')]
+        for watch in watches:
+            self._prune_watched_copies(watch)
+
+        def same_file(a, b):
+            try:
+                return os.path.samefile(a, b)
+            except OSError:
+                return False
+
+        def has_records(rel_path, path):
+            return rel_path.startswith("copies/") and self._stored_shape(rel_path, path) is not None
+
+        targets = []  # (rel_path, copies linked to it)
+        linked_copies = set()
+        for name, info in self._originals.items():
+            rel_path = f"originals/{name}"
+            path = self._resolve_data_path(rel_path)
+            if not os.path.isfile(path):
+                continue
+            linked = [copy_rel for copy_rel in info.get('copies', [])
+                      if same_file(self._resolve_data_path(copy_rel), path)]
+            linked_copies.update(linked)
+            targets.append((rel_path, linked))
+        for copy_rel in [c for info in self._originals.values() for c in info.get('copies', [])] \
+                + self._unassigned_copies:
+            if copy_rel not in linked_copies and os.path.isfile(self._resolve_data_path(copy_rel)):
+                targets.append((copy_rel, []))
+
+        scans = self._scan_cache()
+        rewritten = 0
+        for index, (rel_path, linked) in enumerate(targets):
+            if progress is not None and progress(index / len(targets)) is False:
+                break
+            path = self._resolve_data_path(rel_path)
+            if detect_codec(path) == codec:
+                continue
+            if has_records(rel_path, path):
+                logger.info("Leaving %s as stored: its edits are recorded against it", rel_path)
+                continue
+            fingerprint = self._fingerprint_path(path)
+            scan = scans.get(rel_path, path)
+            atomic_write(path, lambda tmp: recompress(path, tmp, codec))
+            rewritten += 1
+            for file_rel in [rel_path] + [c for c in linked if not has_records(c, path)]:
+                file_path = self._resolve_data_path(file_rel)
+                if file_rel != rel_path:
+                    atomic_write(file_path, lambda tmp: clone_file(path, tmp))
+                    rewritten += 1
+                # Same content: the fingerprint and scan still hold.
+                if fingerprint is not None:
+                    self._fingerprint_path(file_path, fingerprint)
+                if scan is not None:
+                    scans.put(file_rel, file_path, scan)
+        scans.save()
+        # Rewritten copies of watched originals still hold the original's rows.
+        for watch in watches:
+            for copy_rel in watch['copies']:
+                watch['copies'][copy_rel] = file_stamp(self._resolve_data_path(copy_rel))
+        self._update_metadata()
+        return rewritten
+
     def reset_workspace_data(self):
         """Delete ALL datasets (originals + copies), clear metadata."""
         if not self.workspace_path:
             return
+        self.flush_saves()
 
         # Delete all files in originals/ and copies/
         for folder in (self._originals_folder(), self._copies_folder()):
@@ -569,27 +1923,42 @@ class DataManager(QObject):
                     fp = os.path.join(folder, f)
                     if os.path.isfile(fp):
                         os.remove(fp)
+        self._dataset_cache().clear()
+        self._delta_store().clear()
+        self._column_store().clear()
+        self._checkpoint_store().clear()
+        self._recipe_store().clear()
+        self._scans = None  # its file lived in the cache folder
 
         self._originals = {}
+        self._sync_watches()
+        self._schemas = {}
+        with self._fingerprint_lock:
+            self._fingerprints = {}
+        self._frames.clear()
         self._active_working_copy = None
         self._data = None
+        self._lazy = None
+        self._projection = None
+        self._tailing = False
         self.history = []
         self.redo_stack = []
+        self.operations = []
+        self._dirty_columns = set()
+        self._column_token = None
 
         # Update metadata to clean state
-        metadata_path = os.path.join(self.workspace_path, "metadata.json")
-        try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            from datetime import datetime
-            metadata['active_working_copy'] = None
-            metadata['originals'] = {}
-            metadata['last_modified'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            metadata['file_count'] = 0
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=4)
-        except Exception:
-            logger.exception("Failed to reset metadata.json at %s", metadata_path)
+        from datetime import datetime
+        metadata = self._metadata_store()
+        metadata.update(
+            active_working_copy=None,
+            originals={},
+            schemas={},
+            fingerprints={},
+            last_modified=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            file_count=0,
+        )
+        metadata.flush()
 
         self.data_loaded.emit(pd.DataFrame())
 
@@ -604,27 +1973,41 @@ class DataManager(QObject):
         a working copy auto-created and activated.
         """
         try:
-            self._data = pd.read_csv(file_path, low_memory=False)
-            self.data_loaded.emit(self._data)
+            df, state = self._load_dataset(file_path)
+            self._finish_load_csv(file_path, df, state)
+        except Exception as e:
+            self.data_error.emit(f"Error loading CSV file: {str(e)}")
 
-            if self.workspace_path:
-                self._ensure_data_folders()
+    def load_csv_async(self, file_path):
+        """Like ``load_csv`` but parses in a worker thread."""
+        self._start_load(
+            file_path,
+            lambda df, state: self._finish_load_csv(file_path, df, state),
+            "Error loading CSV file",
+        )
 
-                if self._is_inside_workspace_data(file_path):
-                    self._active_working_copy = self._rel_path_for(file_path)
-                else:
-                    original_name, copy_rel = self.import_original(file_path)
-                    if copy_rel:
-                        self._active_working_copy = copy_rel
-                        QTimer.singleShot(0, self.save_workspace_data)
+    def _finish_load_csv(self, file_path, df, state):
+        self._adopt_loaded(df, state)
+        self.data_loaded.emit(self._data)
 
-                QTimer.singleShot(0, self._update_metadata)
+        if self.workspace_path:
+            self._ensure_data_folders()
 
-        except Exception as e:
-            self.data_error.emit(f"Error loading CSV file: {str(e)}")
+            if self._is_inside_workspace_data(file_path):
+                self._active_working_copy = self._rel_path_for(file_path)
+            else:
+                original_name, copy_rel = self.import_original(file_path)
+                if copy_rel:
+                    # The fresh copy already holds the file's bytes (as a
+                    # clone of its original); saving would only rewrite them.
+                    self._active_working_copy = copy_rel
+
+            QTimer.singleShot(0, self._update_metadata)
 
     def set_workspace_path(self, workspace_path):
         """Set the active workspace path."""
+        if workspace_path != self.workspace_path:
+            self.flush_metadata()
         self.workspace_path = workspace_path
 
     def set_workspace_name(self, name):
@@ -664,7 +2047,10 @@ class DataManager(QObject):
         if self._data is None or column_name not in self._data.columns:
             return None
 
-        column_data = self._data[column_name]
+        if self._lazy is not None:
+            column_data = self._lazy.column(column_name)
+        else:
+            column_data = self._data[column_name]
 
         # Basic statistics
         basic_stats = {
@@ -689,15 +2075,279 @@ class DataManager(QObject):
         return basic_stats
 
     def save_workspace_data(self):
-        """Save current data to the active working copy."""
-        if self.workspace_path and self._data is not None and self._active_working_copy:
-            try:
-                self._ensure_data_folders()
-                path = self._resolve_data_path(self._active_working_copy)
+        """Save current data to the active working copy in the background.
+
+        The frame is snapshotted and handed to the writer thread, so this
+        returns immediately; ``save_started``/``save_finished``/
+        ``save_failed`` report progress.  Saves of a copy that is already
+        queued replace the queued one.  Returns True if a save was queued.
+
+        How a working copy is stored follows the ``copy_storage`` setting:
+        ``"csv"`` rewrites the file, ``"delta"`` writes its edit log (see
+        ``delta_store``) and ``"columns"`` rewrites only the columns
+        changed since the last save (see ``column_store``).
+        """
+        if not (self.workspace_path and self._data is not None and self._active_working_copy):
+            return False
+        if self.missing_columns:
+            logger.warning("Not saving %s: only %d of its columns are loaded",
+                           self._active_working_copy, len(self._projection['columns']))
+            return False
+        try:
+            self._ensure_data_folders()
+            rel_path = self._active_working_copy
+            path = self._resolve_data_path(rel_path)
+            lazy = self._lazy
+            df = snapshot(self._data)
+            storage = self._copy_storage(path)
+            self._record_recipe(rel_path, rebased=storage != 'delta')
+            if storage == 'delta':
+                store = self._delta_store()
+                operations = list(self.operations)
+                every = self.get_setting('delta_checkpoint_every', DEFAULT_CHECKPOINT_EVERY)
+                self._writer.submit(
+                    path, lambda: store.save(rel_path, path, operations, df, every)
+                )
+                return True
+
+            cache, deltas, columns = self._dataset_cache(), self._delta_store(), self._column_store()
+            variant = self._cache_variant()
+            engine = self.engine
+            codec = self.storage_codec
+
+            def write_full():
                 os.makedirs(os.path.dirname(path), exist_ok=True)
-                self._data.to_csv(path, index=False)
-            except Exception as e:
-                logger.exception("Failed to save workspace data to %s", self._active_working_copy)
+                if lazy is not None:
+                    # Out of core: stream the chunks; there is no frame to cache.
+                    atomic_write(path, lambda tmp: lazy.to_csv(tmp, codec))
+                    deltas.invalidate(rel_path)
+                    columns.invalidate(rel_path)
+                    cache.invalidate(rel_path)
+                    self._fingerprint_path(path)
+                    return
+                # Atomic replace: also detaches a copy still linked to its original.
+                atomic_write(path, lambda tmp: engine.write_csv(df, tmp, codec))
+                # The CSV is now the copy's base: drop any edit log or column files.
+                deltas.invalidate(rel_path)
+                columns.invalidate(rel_path)
+                # Refresh the sidecar from memory so the next activation
+                # skips parsing and keeps the in-session dtypes.
+                cache.store(rel_path, path, df, variant)
+                # Hash the new file while it is in the page cache, and keep
+                # the frame so re-activating the copy is a memory hit.
+                fingerprint = self._fingerprint_path(path)
+                if fingerprint and copy_on_write():
+                    self._frames.put((fingerprint, variant), df)
+
+            if storage == 'columns':
+                dirty, base_token = self._dirty_columns, self._column_token
+                queued = self._queued_column_save
+                if queued is not None and queued[0] == path and self._writer.is_queued(path):
+                    # This save replaces the queued one: build on what it built on.
+                    base_token = queued[1]
+                    dirty = None if dirty is None or queued[2] is None else dirty | queued[2]
+                token = new_token()
+
+                def write_columns():
+                    try:
+                        columns.save(rel_path, path, df, dirty, base_token, token)
+                    except (ValueError, TypeError) as e:
+                        # Mixed-type object columns have no Arrow equivalent.
+                        logger.warning("Column files unavailable for %s (%s); writing CSV", rel_path, e)
+                        write_full()
+                        return
+                    deltas.invalidate(rel_path)
+
+                self._writer.submit(path, write_columns)
+                self._queued_column_save = (path, base_token, None if dirty is None else set(dirty))
+                self._column_token = token
+            else:
+                self._writer.submit(path, write_full)
+                self._queued_column_save = None
+                self._column_token = None
+                # Record dtypes so a CSV re-parse restores them directly.
+                self._schemas[rel_path] = frame_schema(df)
+                self._update_metadata()
+            self.operations = []
+            self._dirty_columns = set()
+            return True
+        except Exception:
+            logger.exception("Failed to save workspace data to %s", self._active_working_copy)
+            return False
+
+    def _on_save_failed(self, path, _message):
+        """Make the next save of a copy whose write failed a full one.
+
+        The edit log and changed columns were reset when the save was
+        queued, so they no longer reach back to what is on disk.
+        """
+        if self._active_working_copy and path == self._resolve_data_path(self._active_working_copy):
+            self.operations = None
+            self._dirty_columns = None
+            self._queued_column_save = None
+
+    @property
+    def is_saving(self):
+        """True while a background save is queued or running."""
+        return self._writer.is_busy
+
+    def flush_saves(self, timeout=None):
+        """Block until queued saves are on disk (used before files move or the app exits)."""
+        return self._writer.flush(timeout)
+
+    def _record_recipe(self, rel_path, rebased):
+        """Add the edits a save of ``rel_path`` stores to its recipe (see ``recipes``).
+
+        Written when the save is queued: a queued save replaced by a
+        later one never runs, but its edits are part of the later one.
+        """
+        if not rel_path.startswith("copies/"):
+            return
+        try:
+            self._recipe_store().record(rel_path, self.operations, rebased,
+                                        self._original_rel_for(rel_path))
+        except OSError:
+            logger.exception("Failed to update the recipe of %s", rel_path)
+
+    def _original_rel_for(self, copy_rel_path):
+        original = self.get_original_for_copy(copy_rel_path)
+        return f"originals/{original}" if original else None
+
+    def recipe(self, copy_rel_path=None):
+        """The recipe of a working copy (default: the active one), including unsaved edits."""
+        rel_path = copy_rel_path or self._active_working_copy
+        if not (self.workspace_path and rel_path and rel_path.startswith("copies/")):
+            return None
+        store = self._recipe_store()
+        original = self._original_rel_for(rel_path)
+        if rel_path == self._active_working_copy and (self._data is not None or self._lazy is not None):
+            return store.current(rel_path, self.operations, original)
+        return store.load(rel_path) or new_recipe(original, complete=False)
+
+    def export_recipe(self, path, copy_rel_path=None):
+        """Write the recipe of a working copy to ``path`` for ``run_recipe.py``.
+
+        Returns the recipe, or None if there is no working copy.
+        """
+        recipe = self.recipe(copy_rel_path)
+        if recipe is None:
+            return None
+        recipe = dict(recipe, committed=len(recipe["steps"]))
+        write_recipe(recipe, path)
+        return recipe
+
+    def _copy_storage(self, path):
+        """How this save stores the active dataset: "csv", "delta" or "columns"."""
+        storage = self.get_setting('copy_storage', 'csv')
+        if storage == 'csv' or not self._active_working_copy.startswith("copies/"):
+            return 'csv'  # originals and legacy files are always full files
+        if self._lazy is not None:
+            return 'csv'  # column files and checkpoints need the frame in memory
+        if self._projection is not None:
+            # Edits made on some columns may not replay the same on all of them.
+            return 'csv'
+        if storage == 'columns':
+            return 'columns' if self._column_store().available else 'csv'
+        if self.operations is None:
+            logger.info("Edits to %s cannot be replayed; saving a full snapshot",
+                        self._active_working_copy)
+            return 'csv'
+        if self._writer.is_queued(path):
+            # The queued save may be the full write this log is based on;
+            # replacing it with a log would lose that base.
+            return 'csv'
+        if self._column_token is not None or self._column_store().has_store(self._active_working_copy):
+            # The log's base is the CSV, which the column files supersede.
+            return 'csv'
+        return 'delta'
+
+    # ── Named checkpoints ─────────────────────────────────────────────────
+
+    def _checkpoint_base(self, path):
+        """State of the copy on disk that a session's edit log applies to."""
+        try:
+            stamp = file_stamp(path)
+        except OSError:
+            stamp = None
+        return {"stamp": stamp, "column_token": self._column_token}
+
+    def list_checkpoints(self):
+        """Checkpoints of the active working copy, newest first."""
+        if not (self.workspace_path and self._active_working_copy):
+            return []
+        store = self._checkpoint_store()
+        if not store.available:
+            return []
+        return list(reversed(store.list(self._active_working_copy)))
+
+    def save_checkpoint(self, name, source=None, progress=None):
+        """Store ``source``'s frame (default: this manager's) as checkpoint ``name``.
+
+        ``source`` is the manager holding the edits, e.g. the Editing
+        View's; its edit log is stored too and adopted again on restore
+        if the working copy has not been saved since.  Raises ValueError
+        if the frame cannot be checkpointed and OSError if it cannot be
+        written.
+        """
+        source = source or self
+        if not (self.workspace_path and self._active_working_copy):
+            raise ValueError("Checkpoints need a working copy to belong to.")
+        if not self._checkpoint_store().available:
+            raise ValueError("Checkpoints need pyarrow, which is not installed.")
+        if source._lazy is not None:
+            raise ValueError("Out-of-core datasets cannot be checkpointed; "
+                             "checkpoints need the dataset in memory.")
+        if source.data is None:
+            raise ValueError("There is no data to checkpoint.")
+        self.flush_saves()  # the base is the copy as the queued save leaves it
+        path = self._resolve_data_path(self._active_working_copy)
+        return self._checkpoint_store().save(
+            self._active_working_copy, name, snapshot(source.data),
+            operations=source._operations_snapshot(),
+            base=self._checkpoint_base(path),
+            projection=source._projection,
+            progress=progress,
+        )
+
+    def load_checkpoint(self, name, progress=None):
+        """Read checkpoint ``name`` of the active working copy.
+
+        Returns ``(df, operations, projection)`` for ``restore_frame``;
+        ``operations`` is None when the copy has been saved since the
+        checkpoint, so its edit log no longer applies.  Raises KeyError
+        if there is no such checkpoint and OSError if it cannot be read.
+        """
+        self.flush_saves()
+        rel_path = self._active_working_copy
+        df, entry = self._checkpoint_store().load(rel_path, name, progress)
+        operations = entry.get("operations")
+        if entry.get("base") != self._checkpoint_base(self._resolve_data_path(rel_path)):
+            operations = None
+        projection = entry.get("projection")
+        if projection is not None:
+            projection = dict(projection, path=rel_path)  # the copy may have been renamed
+        return df, operations, projection
+
+    def delete_checkpoint(self, name):
+        if self.workspace_path and self._active_working_copy:
+            self._checkpoint_store().delete(self._active_working_copy, name)
+
+    def restore_frame(self, df, operations=None, projection=None):
+        """Make ``df`` current as an undoable edit (e.g. a restored checkpoint).
+
+        ``operations`` is the edit log that produced ``df`` from the copy
+        on disk, or None if there is none (the next save writes a full file).
+        """
+        self.save_state()
+        self._pending_entry = None  # the whole frame changes
+        self._data = df
+        self._lazy = None
+        self._projection = projection
+        self.operations = None if operations is None else list(operations)
+        self._dirty_columns = None
+        self._tailing = False
+        self._enforce_undo_budget()
+        self.data_loaded.emit(df)
 
     def load_workspace_data(self):
         """Load data from the workspace's active working copy.
@@ -706,50 +2356,69 @@ class DataManager(QObject):
         ``active_working_copy`` from metadata.json.  Falls back to
         ``workspace_data.csv`` for backward compatibility.
         """
-        if not self.workspace_path:
+        target = self._workspace_load_target()
+        if target is None:
             return False
 
+        relative_path, abs_path = target
+        try:
+            df, state = self._load_dataset(abs_path)
+        except Exception as e:
+            self.data_error.emit(f"Error loading workspace data: {str(e)}")
+            return False
+        self._finish_workspace_load(relative_path, df, state)
+        return True
+
+    def load_workspace_data_async(self):
+        """Like ``load_workspace_data`` but parses in a worker thread.
+
+        Migration and metadata reads still happen synchronously (they are
+        cheap); only the dataset parse runs in the background.  Returns
+        False when there is nothing to load.
+        """
+        target = self._workspace_load_target()
+        if target is None:
+            return False
+
+        relative_path, abs_path = target
+        self._start_load(
+            abs_path,
+            lambda df, state: self._finish_workspace_load(relative_path, df, state),
+            "Error loading workspace data",
+        )
+        return True
+
+    def _workspace_load_target(self):
+        """Return ``(relative_path, abs_path)`` of the dataset to open, or None."""
+        if not self.workspace_path:
+            return None
+
         # Migrate old flat data/ layout if needed
         self._migrate_flat_structure()
 
         # Load originals tracking from metadata
         self._load_originals_from_metadata()
 
-        metadata_path = os.path.join(self.workspace_path, "metadata.json")
-        target = None
-        try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            target = metadata.get('active_working_copy')
-        except Exception:
-            logger.exception("Failed to read metadata.json at %s", metadata_path)
+        target = self._metadata_store().get('active_working_copy')
 
         # If metadata has an active copy, try to load it
         if target:
             path = self._resolve_data_path(target)
             if os.path.exists(path):
-                try:
-                    self._data = pd.read_csv(path, low_memory=False)
-                    self._active_working_copy = target
-                    self.data_loaded.emit(self._data)
-                    return True
-                except Exception as e:
-                    self.data_error.emit(f"Error loading workspace data: {str(e)}")
-                    return False
+                return target, path
 
         # Backward compatibility: fall back to workspace_data.csv
         data_folder = os.path.join(self.workspace_path, "data")
         fallback = os.path.join(data_folder, "workspace_data.csv")
         if os.path.exists(fallback):
-            try:
-                self._data = pd.read_csv(fallback, low_memory=False)
-                self._active_working_copy = "workspace_data.csv"
-                self.data_loaded.emit(self._data)
-                return True
-            except Exception as e:
-                self.data_error.emit(f"Error loading workspace data: {str(e)}")
+            return "workspace_data.csv", fallback
 
-        return False
+        return None
+
+    def _finish_workspace_load(self, relative_path, df, state):
+        self._adopt_loaded(df, state)
+        self._active_working_copy = relative_path
+        self.data_loaded.emit(self._data)
 
     def get_correlation_analysis(self, column_name):
         """
@@ -897,23 +2566,34 @@ class DataManager(QObject):
         }
 
     def save_state(self):
-        """Save current state to history for undo functionality."""
+        """Save current state to history for undo functionality.
+
+        Each entry pairs the state of the frame (see ``undo_history``)
+        with the operation log that produced it (and the columns a
+        projected load has read), so undo/redo keep the log in step with
+        the data.  The entry starts as a snapshot of the frame, which
+        ``record_operation`` shrinks to the columns or rows the edit
+        changed.  Out-of-core datasets are immutable, so their entry just
+        keeps the dataset alive.  History is bounded by memory rather than
+        by depth (see ``_enforce_undo_budget``).
+        """
         if self._data is not None:
-            self.history.append(self._data.copy())
-            if len(self.history) > self.max_history:
-                self.history.pop(0)
+            self._pending_entry = self._history_entry(FullSnapshot(snapshot(self._data)))
+            self.history.append(self._pending_entry)
             self.redo_stack.clear()  # Clear redo stack when new action is performed
 
     def undo(self):
         """Undo the last operation."""
         if self.history:
-            # Save current state to redo stack
-            if self._data is not None:
-                self.redo_stack.append(self._data.copy())
-
-            # Restore previous state
-            previous_state = self.history.pop()
-            self._data = previous_state
+            # Restore previous state, saving the current one to the redo stack
+            try:
+                self._data, self.operations, self._lazy, self._projection = self._step(
+                    self.history, self.redo_stack)
+            except OSError as e:
+                self.data_error.emit(f"Undo history could not be read back: {e}")
+                return
+            self._dirty_columns = None  # may predate the last save
+            self._tailing = False
 
             # Notify all components of the change
             self.data_loaded.emit(self._data)
@@ -921,13 +2601,200 @@ class DataManager(QObject):
     def redo(self):
         """Redo the last undone operation."""
         if self.redo_stack:
-            # Save current state to history
-            if self._data is not None:
-                self.history.append(self._data.copy())
-
-            # Restore redo state
-            redo_state = self.redo_stack.pop()
-            self._data = redo_state
+            # Restore redo state, saving the current one to history
+            try:
+                self._data, self.operations, self._lazy, self._projection = self._step(
+                    self.redo_stack, self.history)
+            except OSError as e:
+                self.data_error.emit(f"Redo history could not be read back: {e}")
+                return
+            self._dirty_columns = None
+            self._tailing = False
 
             # Notify all components of the change
             self.data_loaded.emit(self._data)
+
+    def _step(self, source, target):
+        """Pop an entry off ``source`` and push its inverse onto ``target``.
+
+        Returns the popped entry with its frame rebuilt from the current one.
+        If a spilled entry cannot be paged back in, it is dropped along
+        with everything beyond it on ``source`` (which builds on it).
+        """
+        state, operations, lazy, projection = source.pop()
+        try:
+            restored = state.restore(self._data)
+        except OSError:
+            logger.exception("Could not page in an undo entry")
+            source.clear()
+            raise
+        if self._data is not None:
+            target.append(self._history_entry(state.inverse(self._data, restored)))
+        self._enforce_undo_budget(restored)
+        return restored, operations, lazy, projection
+
+    def _history_entry(self, state):
+        return state, self._operations_snapshot(), self._lazy, self._projection
+
+    def _compact_pending_entry(self, op, result, changed):
+        """Shrink the entry ``save_state`` pushed for ``op`` to what ``op`` changed."""
+        entry = self._pending_entry
+        if entry is None or not self.history or self.history[-1] is not entry:
+            return
+        state, operations, lazy, projection = entry
+        if lazy is not None or not isinstance(state, FullSnapshot):
+            return
+        before = state.frame
+        mask = None if changed is not None else kept_rows(op, before, result)
+        delta = compact(before, result, changed, mask)
+        if delta is not None:
+            self.history[-1] = (delta, operations, lazy, projection)
+
+    # ── Undo memory budget ────────────────────────────────────────────────
+
+    def _undo_memory_bytes(self):
+        """Memory the undo and redo stacks may hold before entries are spilled."""
+        setting = self.get_setting('undo_memory_mb')
+        if setting is not None:
+            return int(setting * 1024 * 1024)
+        memory = physical_memory()
+        return int(memory * UNDO_MEMORY_SHARE) if memory else UNDO_MEMORY_FALLBACK
+
+    def _undo_folder(self):
+        if not (HAS_PYARROW and self.workspace_path):
+            return None
+        return os.path.join(self._chunk_folder(), "undo")
+
+    def history_usage(self, current=None):
+        """Return ``(memory_bytes, disk_bytes)`` held by the undo and redo stacks.
+
+        Buffers the entries share with ``current`` (by default the current
+        frame) are not counted: the frame holds them anyway.
+        """
+        shared = frame_buffers(self._data if current is None else current)
+        states = [entry[0] for entry in self.history + self.redo_stack]
+        return sum(s.memory_bytes(shared) for s in states), sum(s.disk_bytes for s in states)
+
+    def _enforce_undo_budget(self, current=None):
+        """Spill undo entries to disk until the stacks fit the memory budget.
+
+        ``current`` is the frame about to be made current, if it is not
+        yet.  Entries furthest from the current state go first, skipping
+        those whose buffers are all shared with the current frame (which
+        spilling would not free).  An entry that cannot be spilled (no
+        workspace, a column Arrow cannot store) is dropped instead,
+        together with the older entries that build on it; so are the
+        furthest spilled entries once they take more than
+        ``UNDO_DISK_RATIO`` times the budget on disk.
+        """
+        budget = self._undo_memory_bytes()
+        disk_budget = budget * UNDO_DISK_RATIO
+        shared = frame_buffers(self._data if current is None else current)
+        memory, disk = self.history_usage(current)
+        if memory <= budget and disk <= disk_budget:
+            return
+        folder = self._undo_folder()
+        dropped_count = 0
+        # The bottom of each stack is furthest from the current state.
+        candidates = sorted(
+            ((len(stack) - i, stack, entry)
+             for stack in (self.history, self.redo_stack)
+             for i, entry in enumerate(stack)),
+            key=lambda c: -c[0],
+        )
+        for _distance, stack, entry in candidates:
+            if memory <= budget and disk <= disk_budget:
+                break
+            position = next((i for i, e in enumerate(stack) if e is entry), None)
+            if position is None:
+                continue  # dropped along with an older entry
+            state = entry[0]
+            if disk <= disk_budget:
+                if not state.frame_bytes(shared):
+                    continue  # spilled already, or nothing to free
+                size = state.memory_bytes(shared)
+                if folder is not None and state.spill(folder):
+                    memory -= size - state.memory_bytes(shared)
+                    disk += state.disk_bytes
+                    continue
+            for dropped, *_ in stack[:position + 1]:
+                memory -= dropped.memory_bytes(shared)
+                disk -= dropped.disk_bytes
+            del stack[:position + 1]
+            dropped_count += position + 1
+        if dropped_count:
+            logger.info("Dropped %d undo entries over the history budget", dropped_count)
+
+    # ── Operation log ─────────────────────────────────────────────────────
+
+    def _operations_snapshot(self):
+        return None if self.operations is None else list(self.operations)
+
+    def record_operation(self, op, result=None):
+        """Append a replayable operation (see ``operations``) to the log.
+
+        ``result`` is the frame ``op`` produced from the current data; call
+        this before making it current so the changed columns can be worked
+        out.  Without it every column counts as changed.  Out of core,
+        ``result`` must be the ``ChunkedDataset`` from ``run_operation``.
+        """
+        self.check_result(result)
+        self._tailing = False
+        if self.operations is not None:
+            self.operations.append(op)
+        if self._projection is not None and not self._projection.get('edited'):
+            # Replaced, not mutated: undo brings back the unedited projection.
+            self._projection = dict(self._projection, edited=True)
+        changed = None
+        if isinstance(result, pd.DataFrame) and self._data is not None:
+            changed = changed_columns(op, self._data, result)
+            self._compact_pending_entry(op, result, changed)
+        self._pending_entry = None
+        self._mark_dirty(changed)
+        self._enforce_undo_budget(result if isinstance(result, pd.DataFrame) else None)
+
+    def mark_untracked(self):
+        """Note an edit that cannot be replayed; the next save writes a full file."""
+        self._pending_entry = None  # its undo entry stays a full snapshot
+        self._enforce_undo_budget()
+        self.operations = None
+        self._dirty_columns = None
+        self._tailing = False
+
+    def _mark_dirty(self, columns):
+        if columns is None or self._dirty_columns is None:
+            self._dirty_columns = None
+        else:
+            self._dirty_columns |= set(columns)
+
+    def rebase_operations(self, saved):
+        """Drop ``saved``, a log another manager has just written into a new base, from this log.
+
+        This log has to start with ``saved`` to stay replayable on the new
+        base; otherwise the next save writes a full file.
+        """
+        if self.operations is None:
+            return
+        if saved is not None and self.operations[:len(saved)] == saved:
+            self.operations = self.operations[len(saved):]
+        else:
+            self.operations = None
+            self._dirty_columns = None
+
+    def sync_operations_from(self, other):
+        """Adopt ``other``'s operation log and changed columns along with a copy of its data.
+
+        The workspace settings (engine, storage, ...) are shared with
+        ``other`` rather than copied, so changing them applies to both.
+        The undo history comes along too: its entries rebuild frames from
+        the data they were made on, so they have to follow it.
+        """
+        self._lazy = other._lazy  # immutable, safe to share
+        self.history = list(other.history)  # entries are never mutated
+        self.redo_stack = list(other.redo_stack)
+        self._pending_entry = None
+        self._projection = other._projection  # replaced, never mutated
+        self._tailing = other._tailing
+        self._settings = other._settings
+        self.operations = other._operations_snapshot()
+        self._dirty_columns = None if other._dirty_columns is None else set(other._dirty_columns)
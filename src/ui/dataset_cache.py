@@ -0,0 +1,132 @@
+"""
+Columnar sidecar cache for workspace datasets.
+
+Parsing a large CSV is by far the slowest part of activating a dataset.
+Every CSV under a workspace's ``data/`` tree can have a Feather sidecar
+in ``data/.cache/`` that holds the already-parsed frame together with
+its dtypes.  A sidecar is only trusted while the size and mtime of its
+source file match the stamp recorded next to it, so editing or replacing
+the CSV outside the app silently invalidates it.  The stamp also records
+the parse *variant* (e.g. compact dtypes), so toggling how files are read
+never serves a frame parsed the other way.
+"""
+
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow  # noqa: F401  (Feather I/O is backed by pyarrow)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+CACHE_DIRNAME = ".cache"
+
+
+def file_stamp(path, variant=None):
+    """Return the ``{size, mtime_ns, variant}`` stamp used to validate a sidecar."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "variant": variant}
+
+
+class DatasetCache:
+    """Feather sidecars for the CSV files of one workspace ``data/`` folder.
+
+    Sidecars mirror the data-relative layout of their source files, e.g.
+    ``copies/foo_1.csv`` is cached as ``.cache/copies/foo_1.csv.feather``
+    with its stamp in ``.cache/copies/foo_1.csv.json``.
+    """
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.cache_folder = os.path.join(data_folder, CACHE_DIRNAME)
+
+    @property
+    def enabled(self):
+        return HAS_PYARROW
+
+    def _paths(self, rel_path):
+        base = os.path.join(self.cache_folder, rel_path.replace("/", os.sep))
+        return base + ".feather", base + ".json"
+
+    def load(self, rel_path, source_path, variant=None, columns=None):
+        """Return the cached frame for ``rel_path`` (only ``columns``, if given) or ``None`` on a miss."""
+        if not self.enabled:
+            return None
+        frame_path, stamp_path = self._paths(rel_path)
+        try:
+            with open(stamp_path, 'r') as f:
+                stamp = json.load(f)
+            if stamp != file_stamp(source_path, variant) or not os.path.isfile(frame_path):
+                return None
+            return pd.read_feather(frame_path, columns=columns)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception("Discarding unreadable cache entry for %s", rel_path)
+            self.invalidate(rel_path)
+            return None
+
+    def store(self, rel_path, source_path, df, variant=None):
+        """Write ``df`` as the sidecar for ``rel_path``.
+
+        The stamp is removed first and written last, so an interrupted
+        write can never leave a sidecar that looks valid.  Frames pyarrow
+        cannot represent (e.g. mixed-type object columns) are skipped.
+        """
+        if not self.enabled or df is None:
+            return False
+        frame_path, stamp_path = self._paths(rel_path)
+        self.invalidate(rel_path)
+        tmp_path = frame_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(frame_path), exist_ok=True)
+            df.reset_index(drop=True).to_feather(tmp_path)
+            os.replace(tmp_path, frame_path)
+            with open(stamp_path, 'w') as f:
+                json.dump(file_stamp(source_path, variant), f)
+            return True
+        except Exception as e:
+            logger.info("Not caching %s: %s", rel_path, e)
+            for path in (tmp_path, frame_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return False
+
+    def invalidate(self, rel_path):
+        """Remove the sidecar (if any) for ``rel_path``."""
+        for path in self._paths(rel_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.exception("Failed to remove cache file %s", path)
+
+    def rename(self, old_rel, new_rel):
+        """Move the sidecar along with a renamed dataset."""
+        old_paths = self._paths(old_rel)
+        new_paths = self._paths(new_rel)
+        self.invalidate(new_rel)
+        try:
+            for src, dst in zip(old_paths, new_paths):
+                if os.path.exists(src):
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    os.replace(src, dst)
+        except OSError:
+            logger.exception("Failed to move cache for %s -> %s", old_rel, new_rel)
+            self.invalidate(old_rel)
+            self.invalidate(new_rel)
+
+    def clear(self):
+        """Delete every sidecar in this workspace."""
+        if os.path.isdir(self.cache_folder):
+            shutil.rmtree(self.cache_folder, ignore_errors=True)
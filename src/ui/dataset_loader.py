@@ -0,0 +1,151 @@
+"""
+Background dataset loading.
+
+Parsing a multi-GB CSV on the GUI thread freezes the whole window, so
+``DataManager`` hands reads to a ``DatasetLoadWorker`` running in its own
+``QThread``.  The CSV is parsed in row chunks so the worker can report
+progress (bytes read / rows parsed) and notice cancellation between
+chunks; the finished frame is handed back to the GUI thread in one piece.
+"""
+
+import os
+import threading
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, union_categoricals
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .compression import disk_position, open_dataset
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+# Rows parsed per chunk; small enough for responsive progress/cancel,
+# large enough that per-chunk overhead stays negligible.
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+class LoadCancelled(Exception):
+    """Raised inside a read when the user cancels the load."""
+
+
+def read_csv_chunked(path, progress=None, is_cancelled=None,
+                     chunksize=DEFAULT_CHUNK_ROWS, **read_kwargs):
+    """Parse a CSV chunk by chunk and return the concatenated frame.
+
+    ``progress(bytes_read, total_bytes, rows_parsed)`` is called after
+    every chunk and ``is_cancelled()`` is polled before each one; a
+    cancellation raises ``LoadCancelled``.  The dtypes match a single
+    ``low_memory=False`` read: columns whose chunks were inferred
+    differently are parsed again in one piece.
+    """
+    total_bytes = os.path.getsize(path)
+    chunks = []
+    rows = 0
+    with open_dataset(path) as fh:
+        with pd.read_csv(fh, chunksize=chunksize, **read_kwargs) as reader:
+            for chunk in reader:
+                if is_cancelled is not None and is_cancelled():
+                    raise LoadCancelled()
+                chunks.append(chunk)
+                rows += len(chunk)
+                if progress is not None:
+                    progress(min(disk_position(fh), total_bytes), total_bytes, rows)
+
+    if not chunks:
+        with open_dataset(path) as fh:
+            return pd.read_csv(fh, **read_kwargs)
+    if len(chunks) == 1:
+        return chunks[0]
+    df = concat_chunks(chunks)
+    mixed = _mixed_columns(chunks)
+    if mixed:
+        # Each chunk infers its own dtypes (e.g. numbers early, text later),
+        # leaving mixed object columns; parse those whole as one read would.
+        logger.debug("Re-reading %d column(s) of %s whose chunk dtypes differ", len(mixed), path)
+        with open_dataset(path) as fh:
+            whole = pd.read_csv(fh, **dict(read_kwargs, usecols=mixed, low_memory=False))
+        for col in mixed:
+            df[col] = whole[col]
+    return df
+
+
+def _mixed_columns(chunks):
+    """Columns whose dtype differs between ``chunks`` in a way ``pd.concat`` cannot reconcile.
+
+    Numeric columns widen on concatenation (int + float is float, as in a
+    whole-file parse) and categoricals are unified by ``concat_chunks``.
+    """
+    mixed = []
+    for col in chunks[0].columns:
+        dtypes = [chunk[col].dtype for chunk in chunks]
+        if all(dtype == dtypes[0] for dtype in dtypes):
+            continue
+        if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            continue
+        if all(is_numeric_dtype(dtype) and not is_bool_dtype(dtype) for dtype in dtypes):
+            continue
+        mixed.append(col)
+    return mixed
+
+
+def concat_chunks(chunks):
+    """Concatenate parsed chunks, keeping categorical columns categorical.
+
+    Each chunk of a ``dtype='category'`` read has its own categories, and
+    ``pd.concat`` falls back to ``object`` when they differ; unify them first.
+    """
+    first = chunks[0]
+    for col in first.columns:
+        if not all(isinstance(chunk[col].dtype, pd.CategoricalDtype) for chunk in chunks):
+            continue
+        categories = union_categoricals([chunk[col] for chunk in chunks]).categories
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+class DatasetLoadWorker(QObject):
+    """Runs a read callable off the GUI thread.
+
+    ``read_fn(progress, is_cancelled)`` returns the load result (emitted
+    unchanged through ``loaded``); it is given the worker's progress
+    callback and cancellation probe.
+    """
+
+    progress = pyqtSignal('qint64', 'qint64', 'qint64')  # bytes_read, total_bytes, rows
+    loaded = pyqtSignal(object)                          # read_fn result
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, read_fn):
+        super().__init__()
+        self._read_fn = read_fn
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the running read to stop at the next chunk boundary."""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        try:
+            df = self._read_fn(self._report_progress, self.is_cancelled)
+        except LoadCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            logger.exception("Background dataset load failed")
+            self.failed.emit(str(e))
+            return
+
+        if self.is_cancelled():
+            self.cancelled.emit()
+        else:
+            self.loaded.emit(df)
+
+    def _report_progress(self, bytes_read, total_bytes, rows):
+        self.progress.emit(int(bytes_read), int(total_bytes), int(rows))
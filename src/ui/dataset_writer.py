@@ -0,0 +1,141 @@
+"""
+Background dataset writing.
+
+Saving a working copy serialises the whole frame, which for a large
+dataset froze the window for as long as the write took.  ``DataManager``
+now hands saves to a ``DatasetWriter``: one long-lived writer thread fed
+by a queue of jobs keyed by the file they write.
+
+* Submitting a job for a file that already has one waiting replaces the
+  waiting job, so a burst of saves of the same copy becomes one write of
+  the newest data.
+* Jobs run one at a time in submission order, so two writes of the same
+  file never interleave.
+* Jobs write through ``file_utils.atomic_write``, so readers see either
+  the old or the new file, never a partial one.
+
+Status is reported through Qt signals; GUI-thread receivers get them as
+queued calls.
+"""
+
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+# Copy-on-Write is always on from pandas 3; on 2.x it is opt-in.
+_ALWAYS_COW = int(pd.__version__.split(".")[0]) >= 3
+
+
+def copy_on_write():
+    """True if pandas runs with Copy-on-Write semantics."""
+    return _ALWAYS_COW or pd.get_option("mode.copy_on_write") is True
+
+
+def enable_copy_on_write():
+    """Opt in to Copy-on-Write on pandas 2.x, so snapshots share their columns."""
+    if not _ALWAYS_COW:
+        pd.set_option("mode.copy_on_write", True)
+
+
+def snapshot(df):
+    """Return a copy of ``df`` that later edits to ``df`` cannot reach.
+
+    Under Copy-on-Write a shallow copy already behaves as a copy (the
+    first write to either side copies the touched data), so the snapshot
+    is free; otherwise the data has to be copied up front.
+    """
+    if copy_on_write():
+        return df.copy(deep=False)
+    return df.copy()
+
+
+class DatasetWriter(QObject):
+    """Runs write jobs on a dedicated thread, coalescing repeats per file."""
+
+    save_started = pyqtSignal(str)      # key
+    save_finished = pyqtSignal(str)     # key
+    save_failed = pyqtSignal(str, str)  # key, error message
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # key -> write_fn, oldest first
+        self._running = None           # key of the job being written
+        self._thread = None
+
+    @property
+    def is_busy(self):
+        """True while any write is queued or running."""
+        with self._cond:
+            return self._running is not None or bool(self._pending)
+
+    def is_queued(self, key):
+        """True if a write of ``key`` is waiting to start."""
+        with self._cond:
+            return key in self._pending
+
+    def submit(self, key, write_fn):
+        """Queue ``write_fn()`` to run on the writer thread.
+
+        A job still waiting for ``key`` is replaced and keeps its place in
+        the queue; a job for ``key`` that is already running finishes and
+        the new one runs after it.
+        """
+        with self._cond:
+            if key in self._pending:
+                logger.debug("Coalescing queued write of %s", key)
+            self._pending[key] = write_fn
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="dataset-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+
+    def wait_for(self, key, timeout=None):
+        """Block until no write of ``key`` is queued or running.
+
+        Returns False if ``timeout`` (seconds) expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: key not in self._pending and self._running != key, timeout
+            )
+
+    def flush(self, timeout=None):
+        """Block until every queued write has finished."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and self._running is None, timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                key, write_fn = self._pending.popitem(last=False)
+                self._running = key
+
+            self.save_started.emit(key)
+            error = None
+            try:
+                write_fn()
+            except Exception as e:
+                logger.exception("Background write of %s failed", key)
+                error = str(e) or type(e).__name__
+
+            with self._cond:
+                self._running = None
+                self._cond.notify_all()
+            if error is None:
+                self.save_finished.emit(key)
+            else:
+                self.save_failed.emit(key, error)
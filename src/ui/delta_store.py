@@ -0,0 +1,184 @@
+"""
+Operation-log ("delta") storage for working copies.
+
+In delta mode a working copy is not rewritten on save.  Its CSV stays
+what it was when the log was started (usually still a link to the
+original, see ``file_utils``) and the edits are stored as the ordered
+list of operations from ``operations``::
+
+    data/.deltas/copies/foo_1.csv.delta/log.json    base stamp + operations
+    data/.deltas/copies/foo_1.csv.delta/<step>.feather
+
+Every few steps the edited frame is written as a columnar checkpoint, so
+rebuilding a copy replays only the operations after the newest
+checkpoint.  A checkpoint is trusted only while the base file and the
+operations before it are unchanged (both are hashed into its entry).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from .dataset_cache import HAS_PYARROW, file_stamp
+from .file_utils import atomic_write
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+DELTAS_DIRNAME = ".deltas"
+# Operations between checkpoints unless the workspace overrides it.
+DEFAULT_CHECKPOINT_EVERY = 10
+
+
+def ops_digest(ops):
+    """Stable hash of an operation list (used to validate checkpoints)."""
+    payload = json.dumps(ops, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+class DeltaStore:
+    """Operation logs and checkpoints for the copies of one workspace."""
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.root = os.path.join(data_folder, DELTAS_DIRNAME)
+
+    def _dir(self, rel_path):
+        return os.path.join(self.root, rel_path.replace("/", os.sep) + ".delta")
+
+    def _log_path(self, rel_path):
+        return os.path.join(self._dir(rel_path), "log.json")
+
+    def _checkpoint_path(self, rel_path, step):
+        return os.path.join(self._dir(rel_path), f"{step}.feather")
+
+    # ── Log ───────────────────────────────────────────────────────────────
+
+    def has_log(self, rel_path):
+        return os.path.isfile(self._log_path(rel_path))
+
+    def load(self, rel_path):
+        """Return the stored record ``{base_stamp, operations, checkpoints[, shape]}`` or None."""
+        try:
+            with open(self._log_path(rel_path), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception("Unreadable edit log for %s", rel_path)
+            return None
+
+    def save(self, rel_path, base_path, operations, df=None,
+             checkpoint_every=DEFAULT_CHECKPOINT_EVERY):
+        """Persist ``operations`` as the log of ``rel_path``.
+
+        ``df`` is the frame the operations produce; it is written as a
+        checkpoint when at least ``checkpoint_every`` operations have been
+        added since the newest checkpoint that is still valid.
+        """
+        base_stamp = file_stamp(base_path)
+        previous = self.load(rel_path) or {}
+        if previous.get("base_stamp") != base_stamp:
+            previous = {}
+        checkpoints = [
+            cp for cp in previous.get("checkpoints", [])
+            if cp["step"] <= len(operations)
+            and cp["ops_digest"] == ops_digest(operations[:cp["step"]])
+            and os.path.isfile(self._checkpoint_path(rel_path, cp["step"]))
+        ]
+        self._prune_checkpoints(rel_path, {cp["step"] for cp in checkpoints})
+
+        last_step = max((cp["step"] for cp in checkpoints), default=0)
+        if (df is not None and HAS_PYARROW and checkpoint_every > 0
+                and len(operations) - last_step >= checkpoint_every):
+            if self._write_checkpoint(rel_path, len(operations), df):
+                checkpoints.append({
+                    "step": len(operations),
+                    "ops_digest": ops_digest(operations),
+                })
+
+        record = {
+            "base_stamp": base_stamp,
+            "operations": operations,
+            "checkpoints": sorted(checkpoints, key=lambda cp: cp["step"]),
+        }
+        if df is not None:
+            # Lets the dataset manager show the copy's shape without replaying.
+            record["shape"] = {
+                "rows": len(df),
+                "columns": [str(c) for c in df.columns],
+                "dtypes": {str(c): str(t) for c, t in df.dtypes.items()},
+            }
+        os.makedirs(self._dir(rel_path), exist_ok=True)
+
+        def write(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump(record, f, indent=1, default=str)
+
+        atomic_write(self._log_path(rel_path), write)
+        return record
+
+    # ── Checkpoints ───────────────────────────────────────────────────────
+
+    def _write_checkpoint(self, rel_path, step, df):
+        path = self._checkpoint_path(rel_path, step)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, lambda tmp: df.reset_index(drop=True).to_feather(tmp))
+            return True
+        except Exception as e:
+            logger.info("No checkpoint for %s at step %d: %s", rel_path, step, e)
+            return False
+
+    def _prune_checkpoints(self, rel_path, keep_steps):
+        folder = self._dir(rel_path)
+        if not os.path.isdir(folder):
+            return
+        for name in os.listdir(folder):
+            stem, ext = os.path.splitext(name)
+            if ext == ".feather" and stem.isdigit() and int(stem) not in keep_steps:
+                try:
+                    os.remove(os.path.join(folder, name))
+                except OSError:
+                    logger.exception("Failed to remove stale checkpoint %s", name)
+
+    def latest_checkpoint(self, rel_path, record):
+        """Return ``(step, frame)`` for the newest usable checkpoint, or ``(0, None)``."""
+        if not HAS_PYARROW:
+            return 0, None
+        ops = record.get("operations", [])
+        for cp in sorted(record.get("checkpoints", []), key=lambda c: -c["step"]):
+            step = cp["step"]
+            if step > len(ops) or cp.get("ops_digest") != ops_digest(ops[:step]):
+                continue
+            try:
+                return step, pd.read_feather(self._checkpoint_path(rel_path, step))
+            except Exception:
+                logger.exception("Discarding unreadable checkpoint %d for %s", step, rel_path)
+        return 0, None
+
+    # ── Housekeeping ──────────────────────────────────────────────────────
+
+    def invalidate(self, rel_path):
+        """Drop the log and checkpoints of ``rel_path``."""
+        shutil.rmtree(self._dir(rel_path), ignore_errors=True)
+
+    def rename(self, old_rel, new_rel):
+        """Move the log along with a renamed copy."""
+        src, dst = self._dir(old_rel), self._dir(new_rel)
+        if not os.path.isdir(src):
+            return
+        shutil.rmtree(dst, ignore_errors=True)
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(src, dst)
+        except OSError:
+            logger.exception("Failed to move edit log %s -> %s", old_rel, new_rel)
+
+    def clear(self):
+        """Delete every edit log in this workspace."""
+        shutil.rmtree(self.root, ignore_errors=True)
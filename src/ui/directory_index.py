@@ -0,0 +1,62 @@
+"""
+Cached listings of the workspace data folders.
+
+``validate_metadata`` runs on every dataset-manager refresh and used to
+stat every tracked copy and list ``originals/`` and ``copies/`` each
+time.  ``DirectoryIndex`` remembers the file names of a folder together
+with the folder's modification time and only lists it again once that
+changes.  Adding, removing or renaming a file (including the atomic
+replace every save ends with) bumps the folder's mtime, so an unchanged
+folder costs one ``stat`` per refresh.
+
+A listing taken within ``_RACY_WINDOW`` seconds of the folder's mtime is
+not trusted on the next lookup: on filesystems with coarse timestamps a
+second change in the same tick would otherwise go unnoticed.
+"""
+
+import os
+import time
+
+
+# Filesystem timestamp granularity we guard against (FAT has 2 s).
+_RACY_WINDOW = 2.0
+
+
+class DirectoryIndex:
+    """File names per folder, re-listed only when the folder changes."""
+
+    def __init__(self):
+        self._entries = {}  # folder -> (mtime_ns, scanned_at, frozenset of file names)
+
+    def files(self, folder):
+        """Return the names of the regular files directly inside ``folder``."""
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            self._entries.pop(folder, None)
+            return frozenset()
+        cached = self._entries.get(folder)
+        if (cached is not None and cached[0] == mtime_ns
+                and cached[1] - mtime_ns / 1e9 > _RACY_WINDOW):
+            return cached[2]
+
+        scanned_at = time.time()
+        try:
+            with os.scandir(folder) as it:
+                names = frozenset(entry.name for entry in it if entry.is_file())
+        except OSError:
+            return frozenset()
+        self._entries[folder] = (mtime_ns, scanned_at, names)
+        return names
+
+    def exists(self, path):
+        """True if ``path`` is a regular file, answered from the folder listing."""
+        folder, name = os.path.split(path)
+        return name in self.files(folder)
+
+    def invalidate(self, folder=None):
+        """Forget the listing of ``folder`` (or of every folder)."""
+        if folder is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(folder, None)
@@ -0,0 +1,188 @@
+"""
+Dtype inference, memory downcasting and schema persistence for datasets.
+
+A plain ``read_csv`` leaves every numeric column at 64 bits and every text
+column as Python ``object`` strings.  The compact import mode reads the
+file twice: a cheap first pass over a sample of rows chooses a compact
+dtype per column (``category`` for low-cardinality text, Arrow-backed
+strings for the rest, parsed datetimes), and the full second pass reads
+with that dtype map.  Numeric columns are then narrowed to the smallest
+width that holds every value.
+
+Once a working copy has been saved, its column dtypes are recorded as a
+JSON-friendly *schema* (see ``frame_schema``) so the next parse can pass
+them straight to ``read_csv`` instead of re-inferring everything.
+"""
+
+import warnings
+
+import pandas as pd
+
+from .compression import open_dataset
+from .dataset_cache import HAS_PYARROW
+from .dataset_loader import LoadCancelled, read_csv_chunked
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+# Rows sampled by the first pass.
+SAMPLE_ROWS = 20_000
+# Text columns whose distinct/non-null ratio in the sample is below this
+# become ``category``.
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+# Fraction of sampled values that must parse for a column to be read as datetime.
+DATETIME_MIN_MATCH = 0.95
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def _looks_like_datetime(values):
+    """Return True if (nearly) all sampled strings parse as datetimes."""
+    sample = values.head(500).astype(str)
+    if sample.empty or not sample.str.contains(r'\d').all():
+        return False
+    # Plain numbers ("2021", "3.5") parse as datetimes too; never treat them so.
+    if sample.str.fullmatch(r'[+-]?\d+(\.\d+)?').any():
+        return False
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        parsed = pd.to_datetime(sample, errors='coerce')
+    return parsed.notna().mean() >= DATETIME_MIN_MATCH
+
+
+def infer_compact_dtypes(path, sample_rows=SAMPLE_ROWS):
+    """First pass: sample ``path`` and choose compact dtypes for text columns.
+
+    Returns ``(read_kwargs, baseline_bytes_per_row)`` where ``read_kwargs``
+    holds the ``dtype`` / ``parse_dates`` arguments for the second pass and
+    the per-row figure is the sample's memory footprint under a plain read,
+    used to estimate the savings.
+    """
+    with open_dataset(path) as f:
+        sample = pd.read_csv(f, nrows=sample_rows, low_memory=False)
+    baseline_per_row = (
+        sample.memory_usage(deep=True, index=False).sum() / len(sample) if len(sample) else 0.0
+    )
+
+    dtypes = {}
+    parse_dates = []
+    for col in sample.columns:
+        series = sample[col]
+        if not _is_text(series):
+            continue  # numeric/bool columns are downcast after the full read
+        non_null = series.dropna()
+        if non_null.empty:
+            continue
+        if _looks_like_datetime(non_null):
+            parse_dates.append(col)
+        elif non_null.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(non_null):
+            dtypes[col] = 'category'
+        elif HAS_PYARROW:
+            dtypes[col] = pd.StringDtype("pyarrow")
+
+    read_kwargs = {}
+    if dtypes:
+        read_kwargs['dtype'] = dtypes
+    if parse_dates:
+        read_kwargs['parse_dates'] = parse_dates
+    return read_kwargs, baseline_per_row
+
+
+def downcast_numeric(df):
+    """Narrow int/float columns of ``df`` in place to the smallest safe width."""
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+            continue
+        if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            continue  # nullable / Arrow numerics keep their semantics
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='float')
+    return df
+
+
+def read_csv_compact(path, progress=None, is_cancelled=None):
+    """Read ``path`` with inferred compact dtypes.
+
+    Returns ``(df, report)`` where ``report`` holds ``rows``,
+    ``baseline_bytes`` (estimated footprint of a plain read) and
+    ``compact_bytes`` (actual footprint).  If the second pass rejects the
+    inferred dtypes (e.g. a value outside the sampled rows does not fit),
+    the file is re-read with pandas defaults and only downcast.
+    """
+    read_kwargs, baseline_per_row = infer_compact_dtypes(path)
+    try:
+        df = read_csv_chunked(path, progress, is_cancelled, **read_kwargs)
+    except LoadCancelled:
+        raise
+    except (ValueError, TypeError) as e:
+        logger.warning("Compact dtypes rejected for %s (%s); reading with defaults", path, e)
+        df = read_csv_chunked(path, progress, is_cancelled)
+
+    downcast_numeric(df)
+    report = {
+        'rows': len(df),
+        'baseline_bytes': int(baseline_per_row * len(df)),
+        'compact_bytes': int(df.memory_usage(deep=True, index=False).sum()),
+    }
+    logger.info(
+        "Compact load of %s: %d rows, ~%d -> %d bytes",
+        path, report['rows'], report['baseline_bytes'], report['compact_bytes'],
+    )
+    return df, report
+
+
+# ── Persisted schemas ─────────────────────────────────────────────────────
+
+def _schema_dtype_name(dtype):
+    """Return a ``read_csv``-compatible name for ``dtype``, or None to skip it."""
+    if isinstance(dtype, pd.StringDtype):
+        # NaN-backed strings are what read_csv produces by default.
+        return f"string[{dtype.storage}]" if dtype.na_value is pd.NA else None
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Categories come back from CSV as text; only text categories round-trip.
+        return 'category' if _is_text(dtype.categories) else None
+    if (pd.api.types.is_object_dtype(dtype)
+            or pd.api.types.is_timedelta64_dtype(dtype)
+            or isinstance(dtype, (pd.PeriodDtype, pd.IntervalDtype))):
+        return None
+    return str(dtype)
+
+
+def frame_schema(df):
+    """Describe the dtypes of ``df`` as ``{"dtypes": {...}, "parse_dates": [...]}``.
+
+    Columns whose dtype ``read_csv`` would infer anyway (or cannot express)
+    are left out.
+    """
+    dtypes = {}
+    parse_dates = []
+    for col, dtype in df.dtypes.items():
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            parse_dates.append(str(col))
+            continue
+        name = _schema_dtype_name(dtype)
+        if name is not None:
+            dtypes[str(col)] = name
+    return {'dtypes': dtypes, 'parse_dates': parse_dates}
+
+
+def schema_read_kwargs(schema, columns=None):
+    """Turn a stored schema into ``dtype`` / ``parse_dates`` arguments for ``read_csv``.
+
+    With ``columns``, only the arguments for those columns are returned.
+    """
+    keep = (lambda col: True) if columns is None else set(columns).__contains__
+    read_kwargs = {}
+    dtypes = {col: name for col, name in (schema.get('dtypes') or {}).items() if keep(col)}
+    if dtypes:
+        read_kwargs['dtype'] = {col: pd.api.types.pandas_dtype(name) for col, name in dtypes.items()}
+    parse_dates = [col for col in schema.get('parse_dates') or [] if keep(col)]
+    if parse_dates:
+        read_kwargs['parse_dates'] = parse_dates
+    return read_kwargs
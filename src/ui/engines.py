@@ -0,0 +1,330 @@
+"""
+Dataframe engines.
+
+The engine-dependent heavy lifting on a dataset -- parsing and writing
+CSV, filtering, grouping and describing -- goes through an ``Engine``
+chosen per workspace with the ``engine`` setting:
+
+* ``"pandas"``: pandas defaults (the C CSV parser, NumPy dtypes).
+* ``"arrow"``: Arrow's multithreaded CSV reader and writer, text columns
+  held as Arrow-backed strings (pandas' ``pyarrow`` string storage), and
+  text filters, group-bys and text summaries evaluated by Arrow compute
+  kernels on all cores.
+
+Both engines produce the same values.  The text Arrow writes differs
+from pandas' (``1`` for ``1.0``, ``true`` for ``True``, dates with a
+time), which only the workspace's stored copies can absorb: their dtypes
+are recorded and restored when they are read back.  Files written for
+people or other tools (exports, recipe runs) always go through pandas'
+``write_frame``.  Numeric columns stay NumPy under
+either engine, since the analysis panels, scipy and scikit-learn expect
+NumPy numbers; whatever the Arrow engine cannot do exactly like pandas
+(a CSV whose types change after the first block, regex features Arrow
+lacks, unusual key dtypes) falls back to the pandas implementation.
+"""
+
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .compression import disk_position, open_dataset, write_frame
+from .dataset_cache import HAS_PYARROW
+from .dataset_loader import LoadCancelled, read_csv_chunked
+from .logging_utils import get_logger
+from .operations import apply_operation
+
+
+logger = get_logger(__name__)
+
+DEFAULT_ENGINE = "pandas"
+# Bytes Arrow parses per block (and per thread).
+ARROW_BLOCK_SIZE = 4 << 20
+# Rows below which a compute kernel is not worth splitting across threads.
+_MIN_SLICE_ROWS = 100_000
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+class PandasEngine:
+    """pandas defaults; the reference behaviour of every engine."""
+
+    name = "pandas"
+    label = "pandas"
+
+    def read_csv(self, path, progress=None, is_cancelled=None, **read_kwargs):
+        """Parse ``path``; chunked (with progress/cancel) when callbacks are given.
+
+        Compressed files are read transparently (see ``compression``).
+        """
+        if progress is None and is_cancelled is None:
+            with open_dataset(path) as f:
+                return pd.read_csv(f, low_memory=False, **read_kwargs)
+        return read_csv_chunked(path, progress, is_cancelled, **read_kwargs)
+
+    def write_csv(self, df, path, codec=None):
+        """Write ``df`` without its index, compressed with ``codec`` (see ``compression``)."""
+        write_frame(df, path, codec)
+
+    def apply_operation(self, df, op):
+        """Return the result of ``op`` on ``df`` (see ``operations``)."""
+        return apply_operation(df, op)
+
+    def describe(self, df, text=False):
+        """``df.describe()`` of the numeric columns, or of the text columns with ``text=True``."""
+        if text:
+            columns = [col for col in df.columns if _is_text(df[col])]
+            return df[columns].describe() if columns else pd.DataFrame()
+        return df.describe()
+
+
+class ArrowEngine(PandasEngine):
+    """Arrow-backed parsing, writing and text kernels; see the module docstring."""
+
+    name = "arrow"
+    label = "Arrow (multithreaded)"
+
+    def __init__(self):
+        import pyarrow as pa
+
+        self._threads = max(pa.cpu_count(), 1)
+        try:
+            self._string_dtype = pd.StringDtype("pyarrow", na_value=np.nan)
+        except TypeError:  # pandas < 2.3: no NaN-backed variant
+            self._string_dtype = pd.StringDtype("pyarrow")
+
+    # ── CSV ──
+
+    def _to_pandas(self, table):
+        import pyarrow as pa
+
+        mapping = {pa.string(): self._string_dtype, pa.large_string(): self._string_dtype}
+        return table.to_pandas(types_mapper=mapping.get, use_threads=True)
+
+    def read_csv(self, path, progress=None, is_cancelled=None, **read_kwargs):
+        import pyarrow as pa
+        import pyarrow.csv as pcsv
+
+        parse_dates = read_kwargs.pop('parse_dates', None) or []
+        dtypes = read_kwargs.pop('dtype', None) or {}
+        usecols = read_kwargs.pop('usecols', None)
+        if read_kwargs or callable(usecols):
+            # Options only the pandas parser understands.
+            return super().read_csv(path, progress, is_cancelled, parse_dates=parse_dates or None,
+                                    dtype=dtypes or None, usecols=usecols, **read_kwargs)
+
+        read_options = pcsv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE)
+        # pandas keeps dates and times as text unless asked; so must we.
+        with open_dataset(path) as f, pcsv.open_csv(
+                f, read_options=pcsv.ReadOptions(block_size=ARROW_BLOCK_SIZE)) as head:
+            temporal = {
+                field.name: pa.string() for field in head.schema
+                if pa.types.is_temporal(field.type)
+            }
+            names = head.schema.names
+        # Like pandas, keep ``usecols`` in file order.
+        include = [name for name in names if name in set(usecols)] if usecols is not None else []
+        convert_options = pcsv.ConvertOptions(column_types=temporal, strings_can_be_null=True,
+                                              include_columns=include)
+        try:
+            with open_dataset(path) as f:
+                source = _ProgressReader(f, os.path.getsize(path), progress, is_cancelled)
+                table = pcsv.read_csv(source, read_options=read_options,
+                                      convert_options=convert_options)
+        except LoadCancelled:
+            raise
+        except pa.ArrowInvalid as e:
+            # Arrow infers types from the first block only.
+            logger.info("Arrow could not parse %s (%s); using the pandas parser", path, e)
+            return super().read_csv(path, progress, is_cancelled, parse_dates=parse_dates or None,
+                                    dtype=dtypes or None, usecols=usecols)
+
+        df = self._to_pandas(table)
+        for col, dtype in dtypes.items():
+            if col in df.columns:
+                df[col] = df[col].astype(dtype)
+        for col in parse_dates:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col])
+        if progress is not None:
+            size = os.path.getsize(path)
+            progress(size, size, len(df))
+        return df
+
+    def write_csv(self, df, path, codec=None):
+        """Write a stored copy with Arrow's CSV writer (not for exports; see above)."""
+        import pyarrow as pa
+        import pyarrow.csv as pcsv
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError, TypeError) as e:
+            # Mixed-type object columns have no Arrow type.
+            logger.debug("Writing %s with pandas (%s)", path, e)
+            return super().write_csv(df, path, codec)
+        try:
+            options = pcsv.WriteOptions(quoting_style="needed")
+        except TypeError:  # pyarrow < 15 quotes every string
+            options = pcsv.WriteOptions()
+        if codec is None:
+            pcsv.write_csv(table, path, write_options=options)
+            return
+        with pa.CompressedOutputStream(path, codec) as sink:
+            pcsv.write_csv(table, sink, write_options=options)
+
+    # ── Kernels ──
+
+    def _parallel(self, kernel, array):
+        """Evaluate ``kernel`` over slices of ``array`` on all cores; returns a NumPy array."""
+        import pyarrow as pa
+
+        rows = len(array)
+        workers = min(self._threads, max(rows // _MIN_SLICE_ROWS, 1))
+        if workers == 1:
+            result = kernel(array)
+        else:
+            step = -(-rows // workers)
+            with ThreadPoolExecutor(workers) as pool:
+                # Arrow kernels release the GIL, so the slices run in parallel.
+                parts = list(pool.map(kernel, (array.slice(i, step) for i in range(0, rows, step))))
+            result = pa.chunked_array([chunk for part in parts for chunk in _chunks(part)])
+        return result.to_numpy(zero_copy_only=False)
+
+    def _text_mask(self, series, condition, value):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        array = pa.array(series, from_pandas=True)
+        if condition == "equals":
+            return self._parallel(lambda a: pc.fill_null(pc.equal(a, value), False), array)
+        if condition == "not equals":
+            return self._parallel(lambda a: pc.fill_null(pc.not_equal(a, value), True), array)
+        return self._parallel(
+            lambda a: pc.fill_null(pc.match_substring_regex(a, value, ignore_case=True), False),
+            array,
+        )
+
+    def apply_operation(self, df, op):
+        import pyarrow as pa
+
+        params = op.get("params", {})
+        try:
+            if (op["op"] == "filter_rows" and params.get("condition") in ("equals", "not equals", "contains")
+                    and pd.api.types.is_string_dtype(df[params["column"]])):
+                return df[self._text_mask(df[params["column"]], params["condition"], params["value"])]
+            if op["op"] == "group_by":
+                result = self._group_by(df, params["column"], params["aggregation"])
+                if result is not None:
+                    return result
+        except (pa.ArrowException, ValueError, TypeError, KeyError) as e:
+            logger.debug("Arrow %s failed (%s); using pandas", op["op"], e)
+        return super().apply_operation(df, op)
+
+    def _group_by(self, df, column, aggregation):
+        """Arrow group-by matching ``operations.group_by``, or None to use pandas."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        key = df[column]
+        if not (_is_text(key) or (pd.api.types.is_numeric_dtype(key)
+                                  and not isinstance(key.dtype, pd.api.extensions.ExtensionDtype))):
+            return None
+        if aggregation == 'count':
+            values, aggregations = [], [([], "count_all")]
+        else:
+            values = [c for c in df.select_dtypes(include=[np.number]).columns if c != column]
+            if not values or aggregation not in ("sum", "mean", "min", "max"):
+                return None  # pandas raises the right error
+            options = pc.ScalarAggregateOptions(min_count=0) if aggregation == "sum" else None
+            aggregations = [(c, aggregation, options) if options else (c, aggregation) for c in values]
+        table = pa.Table.from_pandas(df[[column] + values], preserve_index=False)
+        table = table.filter(pc.is_valid(table[column]))  # pandas drops missing keys
+        grouped = table.group_by(column, use_threads=True).aggregate(aggregations)
+        result = self._to_pandas(grouped)
+        names = {"count_all": "count"} if aggregation == 'count' else \
+            {f"{c}_{aggregation}": c for c in values}
+        result = result.rename(columns=names)[[column] + (["count"] if aggregation == 'count' else values)]
+        return result.sort_values(column, kind='stable').reset_index(drop=True)
+
+    def describe(self, df, text=False):
+        if not text:
+            return super().describe(df, text)
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        columns = [col for col in df.columns if _is_text(df[col])]
+        if not columns:
+            return pd.DataFrame()
+
+        def summarise(col):
+            try:
+                array = pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                return super(ArrowEngine, self).describe(df[[col]], text=True)[col]
+            counts = pc.value_counts(array.drop_null())
+            if len(counts):
+                top = pc.index(counts.field("counts"), pc.max(counts.field("counts")))
+                top_value = counts.field("values")[top.as_py()].as_py()
+                freq = counts.field("counts")[top.as_py()].as_py()
+            else:
+                top_value, freq = np.nan, np.nan
+            return pd.Series({"count": len(array) - array.null_count, "unique": len(counts),
+                              "top": top_value, "freq": freq}, name=col, dtype=object)
+
+        with ThreadPoolExecutor(min(self._threads, len(columns))) as pool:
+            return pd.concat(list(pool.map(summarise, columns)), axis=1)
+
+
+def _chunks(array):
+    return array.chunks if hasattr(array, "chunks") else [array]
+
+
+class _ProgressReader(io.RawIOBase):
+    """Stream wrapper that reports read progress and raises ``LoadCancelled`` on request."""
+
+    def __init__(self, raw, total_bytes, progress=None, is_cancelled=None):
+        super().__init__()
+        self._raw = raw
+        self._total = total_bytes
+        self._progress = progress
+        self._is_cancelled = is_cancelled
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._is_cancelled is not None and self._is_cancelled():
+            raise LoadCancelled()
+        n = self._raw.readinto(buffer)
+        if self._progress is not None and n:
+            # Rows are only known once Arrow has parsed the whole file.
+            self._progress(min(disk_position(self._raw), self._total), self._total, 0)
+        return n
+
+
+ENGINES = {PandasEngine.name: PandasEngine}
+if HAS_PYARROW:
+    ENGINES[ArrowEngine.name] = ArrowEngine
+
+_instances = {}
+
+
+def engine_options():
+    """``[(name, label)]`` of the engines available in this installation."""
+    return [(name, cls.label) for name, cls in ENGINES.items()]
+
+
+def get_engine(name):
+    """Return the engine called ``name``, or the pandas engine if it is unavailable."""
+    cls = ENGINES.get(name)
+    if cls is None:
+        if name != DEFAULT_ENGINE:
+            logger.warning("Dataframe engine %r is not available; using pandas", name)
+        cls = PandasEngine
+    if cls.name not in _instances:
+        _instances[cls.name] = cls()
+    return _instances[cls.name]
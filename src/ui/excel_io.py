@@ -0,0 +1,292 @@
+"""
+Streaming Excel import and export.
+
+Workspaces store every dataset as CSV, so an Excel workbook is imported
+by converting each of its sheets into a CSV original.  Rows are streamed
+from the workbook (openpyxl read-only mode for ``.xlsx``/``.xlsm``,
+xlrd with on-demand sheets for ``.xls``) into per-column buffers that
+are typed and appended to the CSV every ``CHUNK_ROWS`` rows, so memory
+stays bounded by one chunk however large the sheet is.
+
+Export goes through an openpyxl write-only workbook, which streams rows
+to disk instead of building every cell object in memory.  Frames longer
+than an Excel sheet allows continue on further sheets.
+"""
+
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from .file_utils import atomic_write
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+# Rows held in the column buffers before they are written out.
+CHUNK_ROWS = 50_000
+# Rows per worksheet, including the header row.
+MAX_SHEET_ROWS = 1_048_576
+
+
+class ImportCancelled(Exception):
+    """Raised when the progress callback asks to stop an import."""
+
+
+class _EmptySheet(Exception):
+    """A sheet without a header row; nothing is written for it."""
+
+
+def is_excel_file(path):
+    return path.lower().endswith(EXCEL_EXTENSIONS)
+
+
+# ── Reading ───────────────────────────────────────────────────────────────
+
+def _xlsx_sheets(path):
+    """Yield ``(name, sheet_count, row_count_hint, rows)`` per sheet of an xlsx workbook."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            yield ws.title, len(wb.worksheets), ws.max_row, ws.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _xls_sheets(path):
+    """Yield ``(name, sheet_count, row_count_hint, rows)`` per sheet of a legacy xls workbook."""
+    import xlrd
+
+    book = xlrd.open_workbook(path, on_demand=True)
+    try:
+        for index in range(book.nsheets):
+            sheet = book.sheet_by_index(index)
+
+            def rows(sheet=sheet):
+                for r in range(sheet.nrows):
+                    yield tuple(_xls_value(cell, book.datemode) for cell in sheet.row(r))
+
+            yield sheet.name, book.nsheets, sheet.nrows, rows()
+            book.unload_sheet(index)
+    finally:
+        book.release_resources()
+
+
+def _xls_value(cell, datemode):
+    import xlrd
+
+    if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+        return None
+    if cell.ctype == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate_as_datetime(cell.value, datemode)
+        except (ValueError, OverflowError):
+            return cell.value
+    if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(cell.value)
+    return cell.value
+
+
+def iter_sheets(path):
+    """Yield ``(sheet_name, sheet_count, row_count_hint, row_iterator)`` per sheet in ``path``."""
+    if path.lower().endswith('.xls'):
+        return _xls_sheets(path)
+    return _xlsx_sheets(path)
+
+
+def _header_names(row):
+    """Column names from a header row, pandas-style (``Unnamed: i``, ``a.1``)."""
+    names = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None or str(value).strip() == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen.setdefault(name, 0)
+        names.append(name)
+    return names
+
+
+def _typed_chunk(names, buffers):
+    """Build a frame from column buffers with a nullable dtype per column.
+
+    Whole-number floats become integers, as ``pandas.read_excel`` does,
+    so they are not written as ``1.0``.
+    """
+    columns = {}
+    for name, values in zip(names, buffers):
+        try:
+            array = pd.array(values)
+        except (TypeError, ValueError):
+            array = pd.array(values, dtype=object)
+        if array.dtype == "Float64":
+            present = array[~array.isna()]
+            if len(present) and (present % 1 == 0).all():
+                try:
+                    array = array.astype("Int64")
+                except (TypeError, ValueError, OverflowError):
+                    pass
+        columns[name] = array
+    return pd.DataFrame(columns)
+
+
+def sheet_to_csv(rows, dest_path, progress=None):
+    """Stream a sheet's ``rows`` into a CSV at ``dest_path``.
+
+    The first non-empty row is the header; trailing empty rows are
+    dropped.  ``progress(rows_done)`` is called after every chunk and may
+    return False to cancel (``ImportCancelled``).  Returns the number of
+    data rows written, or None if the sheet has no header row.
+    """
+    names = None
+    for row in rows:
+        if any(value is not None for value in row):
+            names = _header_names(row)
+            break
+    if names is None:
+        return None
+
+    width = len(names)
+    buffers = [[] for _ in range(width)]
+    blank_run = 0  # empty rows seen but not yet written
+    written = 0
+    first_chunk = True
+
+    with open(dest_path, 'w', newline='', encoding='utf-8') as out:
+        def flush():
+            nonlocal buffers, written, first_chunk
+            chunk = _typed_chunk(names, buffers)
+            chunk.to_csv(out, index=False, header=first_chunk)
+            written += len(chunk)
+            first_chunk = False
+            buffers = [[] for _ in range(width)]
+            if progress is not None and progress(written) is False:
+                raise ImportCancelled()
+
+        for row in rows:
+            if all(value is None for value in row):
+                blank_run += 1
+                continue
+            for _ in range(blank_run):
+                for buf in buffers:
+                    buf.append(None)
+            blank_run = 0
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            for buf, value in zip(buffers, row):
+                buf.append(value)
+            if len(buffers[0]) >= CHUNK_ROWS:
+                flush()
+        if buffers[0] or first_chunk:
+            flush()
+    return written
+
+
+def excel_to_csv(path, dest_folder, name_for_sheet, progress=None):
+    """Convert every non-empty sheet of ``path`` into a CSV in ``dest_folder``.
+
+    ``name_for_sheet(sheet_name, sheet_count)`` returns the CSV file name
+    for a sheet.  ``progress(fraction)`` receives 0..1 and may return
+    False to cancel (``ImportCancelled``; new files written so far are
+    removed).  Files are written atomically.  Returns the list of CSV
+    file names created, in sheet order.
+    """
+    created = []
+    new_files = []  # created files that did not replace an existing one
+    try:
+        for index, (sheet_name, sheet_count, row_hint, rows) in enumerate(iter_sheets(path)):
+            filename = name_for_sheet(sheet_name, sheet_count)
+            dest_path = os.path.join(dest_folder, filename)
+            existed = os.path.exists(dest_path)
+
+            def sheet_progress(rows_done, index=index, sheet_count=sheet_count, row_hint=row_hint):
+                if progress is None:
+                    return True
+                within = min(rows_done / row_hint, 1.0) if row_hint else 0.0
+                return progress((index + within) / sheet_count)
+
+            result = {}
+
+            def write(tmp_path, rows=rows):
+                result['rows'] = sheet_to_csv(rows, tmp_path, sheet_progress)
+                if result['rows'] is None:
+                    raise _EmptySheet()
+
+            try:
+                atomic_write(dest_path, write)
+            except _EmptySheet:
+                logger.info("Skipping empty sheet %r in %s", sheet_name, path)
+                continue
+            logger.info("Imported sheet %r of %s: %d rows -> %s",
+                        sheet_name, path, result['rows'], filename)
+            created.append(filename)
+            if not existed:
+                new_files.append(dest_path)
+    except ImportCancelled:
+        for dest_path in new_files:
+            os.remove(dest_path)
+        raise
+    if progress is not None:
+        progress(1.0)
+    return created
+
+
+# ── Writing ───────────────────────────────────────────────────────────────
+
+def _excel_rows(chunk):
+    """Rows of ``chunk`` as tuples of values openpyxl can write."""
+    if not len(chunk.columns):
+        return [()] * len(chunk)
+    columns = []
+    for _, series in chunk.items():
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            # Excel has no time zones; write wall-clock times.
+            series = series.dt.tz_localize(None)
+        values = series.astype(object).where(series.notna(), None)
+        columns.append([
+            v if v is None or isinstance(v, (str, int, float, bool, datetime, pd.Timedelta))
+            else str(v)
+            for v in values
+        ])
+    return zip(*columns)
+
+
+def write_excel(df, path, sheet_name="Sheet1", progress=None):
+    """Write ``df`` to an ``.xlsx`` file through a write-only workbook.
+
+    Rows are converted ``CHUNK_ROWS`` at a time.  When the frame does not
+    fit on one sheet it continues on ``"<sheet_name> (2)"`` and so on.
+    ``progress(fraction)`` receives 0..1.
+    """
+    import openpyxl
+
+    header = [str(c) for c in df.columns]
+    per_sheet = MAX_SHEET_ROWS - 1
+
+    def write(tmp_path):
+        wb = openpyxl.Workbook(write_only=True)
+        ws = None
+        sheet_rows = per_sheet
+        sheet_number = 0
+        for start in range(0, max(len(df), 1), CHUNK_ROWS):
+            chunk = df.iloc[start:start + CHUNK_ROWS]
+            for row in _excel_rows(chunk):
+                if sheet_rows >= per_sheet:
+                    sheet_number += 1
+                    title = sheet_name if sheet_number == 1 else f"{sheet_name[:25]} ({sheet_number})"
+                    ws = wb.create_sheet(title)
+                    ws.append(header)
+                    sheet_rows = 0
+                ws.append(row)
+                sheet_rows += 1
+            if progress is not None and len(df):
+                progress(min(start + CHUNK_ROWS, len(df)) / len(df))
+        if ws is None:
+            wb.create_sheet(sheet_name).append(header)
+        wb.save(tmp_path)
+
+    atomic_write(path, write)
@@ -0,0 +1,104 @@
+"""
+File helpers for workspace datasets.
+
+Working copies start out identical to their original, so instead of
+duplicating bytes they are created as a copy-on-write clone (reflink) or,
+where the filesystem cannot clone, a hardlink to the original.  A
+hardlinked copy shares its inode with the original, which makes in-place
+writes dangerous: every write to a dataset file must go through
+``atomic_write`` so the copy gets a fresh inode on its first save and the
+original is never touched.
+"""
+
+import os
+import shutil
+import sys
+
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+# ioctl request number for FICLONE (linux/fs.h): clone all extents of a file.
+_FICLONE = 0x40049409
+
+
+def reflink(src, dst):
+    """Clone ``src`` to ``dst`` sharing extents (btrfs, XFS, ...).
+
+    Returns True on success; False if the platform or filesystem cannot
+    clone, in which case ``dst`` does not exist afterwards.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'xb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            except OSError:
+                cloned = False
+            else:
+                cloned = True
+    except OSError:
+        return False
+    if not cloned:
+        os.remove(dst)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def clone_file(src, dst, allow_hardlink=True):
+    """Create ``dst`` with the contents of ``src`` as cheaply as possible.
+
+    Tries a reflink, then (if ``allow_hardlink``) a hardlink, then falls
+    back to a full ``shutil.copy2``.  Returns ``"reflink"``, ``"hardlink"``
+    or ``"copy"``.  Hardlinks are only safe when ``dst`` is written with
+    ``atomic_write``.
+    """
+    if reflink(src, dst):
+        return "reflink"
+    if allow_hardlink:
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except (OSError, NotImplementedError, AttributeError) as e:
+            logger.debug("Hardlink %s -> %s failed (%s); copying", src, dst, e)
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def atomic_write(path, write_fn):
+    """Write a file via ``write_fn(tmp_path)`` and move it over ``path``.
+
+    The replacement is a rename, so readers never see a half-written file
+    and a hardlinked ``path`` is detached from the file it shared an
+    inode with.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def detach(path):
+    """Give a hardlinked ``path`` an inode of its own.
+
+    The contents and modification time stay the same, so stamps taken
+    of ``path`` (see ``dataset_cache.file_stamp``) remain valid.
+    """
+    atomic_write(path, lambda tmp: clone_file(path, tmp, allow_hardlink=False))
+
+
+def is_shared(path):
+    """Return True if ``path`` still shares its inode with another file."""
+    try:
+        return os.stat(path).st_nlink > 1
+    except OSError:
+        return False
@@ -0,0 +1,103 @@
+"""
+Content fingerprints for workspace datasets.
+
+A fingerprint is a BLAKE2b hash of a file's bytes (its CSV text, for a
+compressed file; see ``compression``), computed in 1 MiB blocks so
+hashing never holds more than one block in memory.
+``DataManager`` records the fingerprint of every original and copy in
+metadata.json together with the file's size and mtime, and only hashes a
+file again once that stamp changes.  Two files with the same fingerprint
+have the same content, whatever they are called, which makes it a
+natural key for anything derived from a dataset:
+
+* importing a file whose content is already an original resolves to that
+  original instead of storing a second one;
+* ``FrameCache`` keeps recently read frames in memory by fingerprint, so
+  re-activating an unchanged file (or a fresh copy of an original that
+  was just read) does not parse it again.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from .compression import open_dataset
+
+
+BLOCK_SIZE = 1 << 20
+# Upper bound on the frames ``FrameCache`` keeps alive.
+FRAME_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def content_hash(path):
+    """Return the hex fingerprint of the file at ``path``."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open_dataset(path) as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stamp_matches(entry, path):
+    """True if a recorded ``{hash, size, mtime_ns}`` entry still describes ``path``."""
+    if not entry:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns
+
+
+def fingerprint_entry(path, known_hash=None):
+    """Return ``{hash, size, mtime_ns}`` for ``path``, hashing it unless ``known_hash`` is given."""
+    st = os.stat(path)
+    return {
+        'hash': known_hash or content_hash(path),
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+    }
+
+
+class FrameCache:
+    """Least-recently-used frames keyed by fingerprint, bounded in bytes.
+
+    Callers store snapshots (``dataset_writer.snapshot``); under
+    Copy-on-Write these share their buffers with the frame being edited,
+    so a cached copy of the active dataset costs next to nothing until
+    the data diverges.  Safe to use from the load thread.
+    """
+
+    def __init__(self, max_bytes=FRAME_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._frames = OrderedDict()  # key -> (frame, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None:
+                return None
+            self._frames.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, df):
+        nbytes = int(df.memory_usage(index=True, deep=False).sum())
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._frames.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._frames[key] = (df, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._frames.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
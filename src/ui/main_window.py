@@ -391,4 +391,5 @@ class MainWindow(QMainWindow):
                 elif result == "yes":
                     self.workspace_view.save_workspace()
 
+        self.workspace_view.shutdown()
         event.accept()
@@ -0,0 +1,179 @@
+"""
+Journaled, batched access to a workspace's metadata.json.
+
+``DataManager`` used to re-read and rewrite the whole metadata.json on
+every activation, import, rename, delete and dataset-manager refresh.
+``WorkspaceMetadata`` keeps the document in memory instead:
+
+* ``update()`` compares the new values with the in-memory ones and does
+  nothing when they are equal (the common case for refreshes);
+* changed keys are appended to ``metadata.journal`` (one JSON object per
+  line, flushed to disk) so a crash never loses an acknowledged update;
+* metadata.json itself is rewritten by a debounced flush, so a burst of
+  updates costs one write.  The journal is removed after each flush.
+
+Opening a workspace replays any journal a previous session left behind.
+``read_metadata`` / ``load_settings`` give the same view without writing
+anything, for tools that may run while the workspace is open elsewhere.
+Other code (the home screen, workspace manager) still edits metadata.json
+directly; a flush therefore re-reads the file and only overlays the keys
+that changed here.
+"""
+
+import copy
+import json
+import os
+
+from PyQt5.QtCore import QObject, QTimer
+
+from .file_utils import atomic_write
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+METADATA_FILENAME = "metadata.json"
+JOURNAL_FILENAME = "metadata.journal"
+# Quiet period after the last update before metadata.json is rewritten.
+FLUSH_DELAY_MS = 300
+_MISSING = object()
+
+
+def _read_document(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        logger.exception("Failed to read %s", path)
+        return {}
+
+
+def _journal_entries(journal_path):
+    """The complete entries of a metadata journal, oldest first."""
+    try:
+        with open(journal_path, 'r') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            # Torn last line from a crash mid-append; nothing after it.
+            logger.warning("Ignoring incomplete metadata journal entry in %s", journal_path)
+            break
+    return entries
+
+
+def read_metadata(workspace_path):
+    """metadata.json of ``workspace_path`` with its journal overlaid, read-only.
+
+    Unlike opening a ``WorkspaceMetadata``, this never flushes: the
+    journal and metadata.json stay as they are, so it is safe while a
+    session has the workspace open.
+    """
+    doc = _read_document(os.path.join(workspace_path, METADATA_FILENAME))
+    for entry in _journal_entries(os.path.join(workspace_path, JOURNAL_FILENAME)):
+        doc.update(entry)
+    return doc
+
+
+def load_settings(workspace_path):
+    """Per-workspace settings of ``workspace_path`` (see ``read_metadata``)."""
+    return read_metadata(workspace_path).get("settings") or {}
+
+
+class WorkspaceMetadata(QObject):
+    """In-memory metadata.json for one workspace with a write-ahead journal."""
+
+    def __init__(self, workspace_path, parent=None):
+        super().__init__(parent)
+        self.workspace_path = workspace_path
+        self.path = os.path.join(workspace_path, METADATA_FILENAME)
+        self.journal_path = os.path.join(workspace_path, JOURNAL_FILENAME)
+        self._dirty = set()  # keys changed since the last flush
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FLUSH_DELAY_MS)
+        self._timer.timeout.connect(self.flush)
+
+        self._doc = self._read_file()
+        replayed = self._replay_journal()
+        if replayed:
+            logger.info("Recovered %d metadata update(s) for %s", replayed, workspace_path)
+            self.flush()
+
+    # ── Reading ───────────────────────────────────────────────────────────
+
+    def _read_file(self):
+        return _read_document(self.path)
+
+    def _replay_journal(self):
+        entries = _journal_entries(self.journal_path)
+        for entry in entries:
+            self._doc.update(entry)
+            self._dirty.update(entry)
+        return len(entries)
+
+    def get(self, key, default=None):
+        """Return a copy of ``key``'s value (callers may mutate it freely)."""
+        return copy.deepcopy(self._doc.get(key, default))
+
+    @property
+    def is_dirty(self):
+        return bool(self._dirty)
+
+    # ── Writing ───────────────────────────────────────────────────────────
+
+    def update(self, **fields):
+        """Set top-level keys; unchanged values cost nothing.
+
+        Changed keys are journaled immediately and metadata.json is
+        rewritten after ``FLUSH_DELAY_MS`` without further updates.
+        """
+        changed = {k: v for k, v in fields.items() if self._doc.get(k, _MISSING) != v}
+        if not changed:
+            return False
+        changed = copy.deepcopy(changed)
+        try:
+            line = json.dumps(changed)
+            with open(self.journal_path, 'a') as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            logger.exception("Failed to journal metadata update for %s", self.workspace_path)
+        self._doc.update(changed)
+        self._dirty.update(changed)
+        self._timer.start()
+        return True
+
+    def flush(self):
+        """Write pending changes to metadata.json now and drop the journal."""
+        self._timer.stop()
+        if not self._dirty:
+            return
+        # Re-read so keys maintained elsewhere (name, counts, ...) survive.
+        doc = self._read_file()
+        for key in self._dirty:
+            doc[key] = self._doc.get(key)
+        try:
+            def write(tmp_path):
+                with open(tmp_path, 'w') as f:
+                    json.dump(doc, f, indent=4)
+
+            atomic_write(self.path, write)
+        except Exception:
+            logger.exception("Failed to update metadata.json at %s", self.path)
+            return
+        self._doc = doc
+        self._dirty.clear()
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.exception("Failed to remove %s", self.journal_path)
@@ -0,0 +1,607 @@
+"""
+Replayable dataset operations.
+
+Every edit made through the Preprocessing and Feature Engineering panels
+(and cell edits in the Main View preview) is described by a small
+JSON-serialisable dict::
+
+    {"op": "rename_column", "params": {"old": "a", "new": "b"}}
+
+and executed by ``apply_operation``.  Operations are pure: they never
+mutate the frame they are given.  They edit a ``snapshot`` of it, so
+under Copy-on-Write the result shares every column the operation does
+not write with its input.  Because the same function produces the
+in-session result and the replayed result, a working copy can be stored
+as its base file plus the ordered list of operations applied to it.
+
+Operations that keep the rows as they are also declare which columns
+they write (``touches``), so saves can rewrite just those columns (see
+``column_store``).  Operations that only drop rows declare it
+(``filters``), so undo can keep the dropped rows instead of a copy of
+the frame (see ``undo_history``).
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.preprocessing import LabelEncoder, MinMaxScaler, RobustScaler, StandardScaler
+
+from .dataset_writer import snapshot
+
+
+class OperationError(ValueError):
+    """An operation cannot be applied to the given data.
+
+    Raised for user-correctable problems (wrong column type, empty result,
+    ...); ``title`` is suitable for a warning dialog.
+    """
+
+    def __init__(self, message, title="Invalid Operation"):
+        super().__init__(message)
+        self.title = title
+
+
+OPERATIONS = {}
+TOUCHES = {}
+FILTERS = {}
+
+
+def operation(name, touches=None, filters=None):
+    """Register ``fn(df, **params) -> DataFrame`` under ``name``.
+
+    ``touches(result, **params)`` returns the columns of the result the
+    operation may have written.  Operations without it (or for which it
+    returns None) may change rows, so every column counts as changed.
+    ``filters(**params)`` returns True if the operation only drops rows,
+    leaving the values of the rows it keeps as they were.
+    """
+    def register(fn):
+        OPERATIONS[name] = fn
+        if touches is not None:
+            TOUCHES[name] = touches
+        if filters is not None:
+            FILTERS[name] = filters
+        return fn
+    return register
+
+
+def _prefixed(result, *prefixes):
+    """Columns of ``result`` whose name starts with one of ``prefixes``."""
+    return {c for c in result.columns if str(c).startswith(prefixes)}
+
+
+def _to_native(value):
+    """Convert numpy scalars (and containers of them) to plain Python values."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_to_native(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_native(v) for k, v in value.items()}
+    return value
+
+
+def make_operation(name, **params):
+    """Build a JSON-serialisable operation record."""
+    return {"op": name, "params": _to_native(params)}
+
+
+def apply_operation(df, op):
+    """Return the result of applying ``op`` to ``df``."""
+    try:
+        fn = OPERATIONS[op["op"]]
+    except KeyError:
+        raise OperationError(f"Unknown operation '{op.get('op')}'") from None
+    return fn(df, **op.get("params", {}))
+
+
+def apply_operations(df, ops):
+    """Apply ``ops`` in order and return the final frame."""
+    for op in ops:
+        df = apply_operation(df, op)
+    return df
+
+
+# Operations whose result rows are not a subset of the input rows.
+RESHAPES = {"unpivot", "group_by"}
+
+
+def changed_columns(op, before, after):
+    """Columns of ``after`` whose values may differ from ``before``.
+
+    ``after`` is the result of applying ``op`` to ``before``.  Returns None
+    when any column may have changed (rows added, removed or reordered).
+    """
+    touches = TOUCHES.get(op["op"])
+    if touches is None:
+        return None
+    touched = touches(after, **op.get("params", {}))
+    if touched is None:
+        return None
+    added = set(after.columns).difference(before.columns)
+    return (set(touched) | added) & set(after.columns)
+
+
+def kept_rows(op, before, after):
+    """Boolean mask of the rows of ``before`` that ``after`` kept.
+
+    ``after`` is the result of applying ``op`` to ``before``.  Returns None
+    unless ``op`` only drops rows and they can be matched up by label.
+    """
+    filters = FILTERS.get(op["op"])
+    if filters is None or not filters(**op.get("params", {})):
+        return None
+    if not before.index.is_unique or not before.columns.equals(after.columns):
+        return None
+    mask = before.index.isin(after.index)
+    if not before.index[mask].equals(after.index):
+        return None
+    return mask
+
+
+def describe_operation(op):
+    """Short human-readable label for an operation record."""
+    return op["op"].replace("_", " ").capitalize()
+
+
+# ── Column operations ─────────────────────────────────────────────────────
+
+@operation("rename_column", touches=lambda result, old, new: {new})
+def rename_column(df, old, new):
+    return df.rename(columns={old: new})
+
+
+@operation("drop_column", touches=lambda result, column: set())
+def drop_column(df, column):
+    return df.drop(columns=[column])
+
+
+@operation("change_type", touches=lambda result, column, dtype: {column})
+def change_type(df, column, dtype):
+    df = snapshot(df)
+    if dtype == "datetime":
+        df[column] = pd.to_datetime(df[column])
+    elif dtype == "boolean":
+        df[column] = df[column].astype(bool)
+    else:
+        df[column] = df[column].astype(dtype)
+    return df
+
+
+@operation("set_value", touches=lambda result, row, column, value: {column})
+def set_value(df, row, column, value):
+    """Set a single cell, addressed by row position and column name."""
+    df = snapshot(df)
+    df.loc[df.index[row], column] = value
+    return df
+
+
+# ── Preprocessing ─────────────────────────────────────────────────────────
+
+@operation("transform", touches=lambda result, column, method: {column})
+def transform_column(df, column, method):
+    df = snapshot(df)
+    data = df[column]
+
+    if method == "Standard Scale":
+        df[column] = StandardScaler().fit_transform(data.values.reshape(-1, 1))
+    elif method == "Min-Max Scale":
+        df[column] = MinMaxScaler().fit_transform(data.values.reshape(-1, 1))
+    elif method == "Robust Scale":
+        df[column] = RobustScaler().fit_transform(data.values.reshape(-1, 1))
+    elif method == "Log Transform":
+        # Handle negative or zero values
+        min_val = data.min()
+        if min_val <= 0:
+            df[column] = np.log(data + abs(min_val) + 1)
+        else:
+            df[column] = np.log(data)
+    elif method == "Square Root":
+        # Handle negative values
+        min_val = data.min()
+        if min_val < 0:
+            df[column] = np.sqrt(data + abs(min_val))
+        else:
+            df[column] = np.sqrt(data)
+    elif method == "Box-Cox":
+        # Box-Cox requires positive values
+        min_val = data.min()
+        if min_val <= 0:
+            transformed, _lambda = stats.boxcox(data + abs(min_val) + 1)
+        else:
+            transformed, _lambda = stats.boxcox(data)
+        df[column] = transformed
+    return df
+
+
+@operation("filter_rows", filters=lambda **_: True)
+def filter_rows(df, column, condition, value):
+    if condition == "equals":
+        try:
+            # Compare numerically when the column is numeric
+            if pd.api.types.is_numeric_dtype(df[column]):
+                return df[df[column] == float(value)]
+            return df[df[column] == value]
+        except ValueError:
+            return df[df[column] == value]
+    if condition == "not equals":
+        try:
+            if pd.api.types.is_numeric_dtype(df[column]):
+                return df[df[column] != float(value)]
+            return df[df[column] != value]
+        except ValueError:
+            return df[df[column] != value]
+    if condition in ("greater than", "less than"):
+        try:
+            number = float(value)
+        except ValueError:
+            raise OperationError(
+                f"Please enter a numeric value for '{condition}' comparison.", "Invalid Value"
+            ) from None
+        if condition == "greater than":
+            return df[df[column] > number]
+        return df[df[column] < number]
+    if condition == "contains":
+        return df[df[column].astype(str).str.contains(value, case=False, na=False)]
+    return df
+
+
+@operation("replace_values",
+           touches=lambda result, find, replace, column=None, exact=False:
+           {column} if column else None)
+def replace_values(df, find, replace, column=None, exact=False):
+    df = snapshot(df)
+    if column:
+        if pd.api.types.is_numeric_dtype(df[column]):
+            try:
+                find_numeric = float(find)
+                replace_numeric = float(replace) if replace else np.nan
+            except ValueError:
+                raise OperationError(
+                    "Cannot convert values to match column type.", "Type Mismatch"
+                ) from None
+            if exact:
+                mask = df[column] == find_numeric
+                df.loc[mask, column] = replace_numeric
+            else:
+                df[column] = df[column].replace(find_numeric, replace_numeric)
+        else:
+            if exact:
+                mask = df[column].astype(str) == find
+                df.loc[mask, column] = replace
+            else:
+                df[column] = df[column].replace(find, replace)
+        return df
+
+    # Replace in all columns
+    if not exact:
+        return df.replace(find, replace)
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            try:
+                find_numeric = float(find)
+                replace_numeric = float(replace) if replace else np.nan
+            except ValueError:
+                # Skip columns where conversion fails
+                continue
+            mask = df[col] == find_numeric
+            df.loc[mask, col] = replace_numeric
+        else:
+            # For non-numeric columns, compare as strings
+            mask = df[col].astype(str) == find
+            df.loc[mask, col] = replace
+    return df
+
+
+def outlier_mask(data, method, threshold):
+    """Boolean mask of outliers in ``data`` (NaNs already dropped)."""
+    if method == "IQR Method":
+        q1 = np.percentile(data, 25)
+        q3 = np.percentile(data, 75)
+        iqr = q3 - q1
+        if iqr == 0:
+            return pd.Series(False, index=data.index)
+        return (data < q1 - threshold * iqr) | (data > q3 + threshold * iqr)
+    if method == "Z-Score Method":
+        std = data.std()
+        if std == 0:
+            return pd.Series(False, index=data.index)
+        return np.abs((data - data.mean()) / std) > threshold
+    if method == "Modified Z-Score":
+        median = np.median(data)
+        mad = np.median(np.abs(data - median))
+        if mad == 0:
+            return pd.Series(False, index=data.index)
+        return 0.6745 * np.abs(data - median) / mad > threshold
+    raise OperationError(f"Unknown outlier detection method '{method}'")
+
+
+@operation("handle_outliers",
+           touches=lambda result, column, detection_method, threshold, action:
+           None if action == "Remove outliers" else {column},
+           filters=lambda column, detection_method, threshold, action:
+           action == "Remove outliers")
+def handle_outliers(df, column, detection_method, threshold, action):
+    df = snapshot(df)
+    non_null = df[column].dropna()
+    data = pd.Series(non_null.values, index=non_null.index)
+    mask = outlier_mask(data, detection_method, threshold)
+
+    if action == "Remove outliers":
+        return df[~mask.reindex(df.index, fill_value=False)]
+
+    if action == "Cap outliers":
+        # For capping, use percentiles of the non-outlier values
+        lower = np.percentile(data[~mask], 1)
+        upper = np.percentile(data[~mask], 99)
+        data[mask] = data[mask].clip(lower, upper)
+    elif action == "Replace with mean":
+        data[mask] = data[~mask].mean()
+    elif action == "Replace with median":
+        data[mask] = data[~mask].median()
+    df.loc[data.index, column] = data
+    return df
+
+
+@operation("round_column", touches=lambda result, column, digits: {column})
+def round_column(df, column, digits):
+    if not pd.api.types.is_numeric_dtype(df[column]):
+        raise OperationError(
+            "Rounding can only be applied to numeric columns.", "Invalid Column Type"
+        )
+    df = snapshot(df)
+    df[column] = df[column].round(digits)
+    return df
+
+
+@operation("split_column",
+           touches=lambda result, column, delimiter: _prefixed(result, f"{column}_"))
+def split_column(df, column, delimiter):
+    split_df = df[column].str.split(delimiter, expand=True)
+    if split_df is None or split_df.empty:
+        raise OperationError(
+            "The split operation did not produce any new columns. "
+            "Please check your delimiter and try again.",
+            "Split Failed",
+        )
+    df = snapshot(df)
+    split_df.columns = [f"{column}_{i + 1}" for i in range(split_df.shape[1])]
+    for new_col in split_df.columns:
+        df[new_col] = split_df[new_col]
+    return df
+
+
+@operation("unpivot")
+def unpivot(df, id_column):
+    value_columns = [col for col in df.columns if col != id_column]
+    if not value_columns:
+        raise OperationError(
+            "There must be at least one column to unpivot.", "Invalid Selection"
+        )
+    long = df.melt(id_vars=[id_column], value_vars=value_columns,
+                   var_name='Variable', value_name='Value')
+    # melt stacks one column after another; keep the rows in row-major order.
+    order = (np.arange(len(df))[:, None] + len(df) * np.arange(len(value_columns))).ravel()
+    return long.take(order).reset_index(drop=True)
+
+
+@operation("group_by")
+def group_by(df, column, aggregation):
+    numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    if column in numeric_columns:
+        numeric_columns.remove(column)
+    if aggregation == 'count':
+        # Count can be applied to any column
+        return df.groupby(column).size().reset_index(name='count')
+    if not numeric_columns:
+        raise OperationError(
+            f"There are no numeric columns to apply '{aggregation}' aggregation. "
+            f"Only 'count' can be used with non-numeric data.",
+            "Invalid Selection",
+        )
+    agg_dict = {col: aggregation for col in numeric_columns}
+    return df.groupby(column).agg(agg_dict).reset_index()
+
+
+@operation("missing_values",
+           touches=lambda result, action, column=None:
+           None if action == "Drop Rows" or column is None else {column},
+           filters=lambda action, column=None: action == "Drop Rows")
+def missing_values(df, action, column=None):
+    df = snapshot(df)
+    cols = df.columns.tolist() if column is None else [column]
+    for col in cols:
+        if action == "Drop Rows":
+            df = df.dropna(subset=[col])
+        elif action == "Fill with Mean":
+            if pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = df[col].fillna(df[col].mean())
+        elif action == "Fill with Median":
+            if pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = df[col].fillna(df[col].median())
+        elif action == "Fill with Mode":
+            if not df[col].mode().empty:
+                df[col] = df[col].fillna(df[col].mode()[0])
+        elif action == "Fill with 0":
+            if pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = df[col].fillna(0)
+        elif action == "Forward Fill":
+            df[col] = df[col].ffill()
+        elif action == "Backward Fill":
+            df[col] = df[col].bfill()
+    return df
+
+
+@operation("drop_duplicates", filters=lambda **_: True)
+def drop_duplicates(df, keep="first"):
+    return df.drop_duplicates(keep=keep)
+
+
+# ── Feature engineering ───────────────────────────────────────────────────
+
+@operation("numeric_feature", touches=lambda result, new_name, **_: {new_name})
+def numeric_feature(df, column, method, new_name, column2=None, power=2, bins=5):
+    df = snapshot(df)
+    col = column
+    if method == "square":
+        df[new_name] = df[col] ** 2
+    elif method == "power":
+        df[new_name] = df[col] ** power
+    elif method == "sqrt":
+        if (df[col] < 0).any():
+            raise ValueError("Cannot compute square root of negative values")
+        df[new_name] = np.sqrt(df[col])
+    elif method == "log":
+        # Handle zeros with +1 offset
+        df[new_name] = np.log(df[col] + 1)
+    elif method == "abs":
+        df[new_name] = df[col].abs()
+    elif method == "bin":
+        df[new_name] = pd.qcut(df[col], bins, labels=False, duplicates='drop')
+    elif method == "normalize":
+        col_min = df[col].min()
+        col_max = df[col].max()
+        if col_max == col_min:
+            df[new_name] = 0.0
+        else:
+            df[new_name] = (df[col] - col_min) / (col_max - col_min)
+    elif method == "zscore":
+        col_mean = df[col].mean()
+        col_std = df[col].std()
+        if col_std == 0:
+            df[new_name] = 0.0
+        else:
+            df[new_name] = (df[col] - col_mean) / col_std
+    else:
+        # Binary operations requiring a second column
+        if not column2:
+            raise OperationError("Please select a second column.", "Warning")
+        if method == "ratio":
+            if (df[column2] == 0).any():
+                raise ValueError("Division by zero encountered")
+            df[new_name] = df[col] / df[column2]
+        elif method == "add":
+            df[new_name] = df[col] + df[column2]
+        elif method == "subtract":
+            df[new_name] = df[col] - df[column2]
+        elif method == "multiply":
+            df[new_name] = df[col] * df[column2]
+    return df
+
+
+@operation("encode_categorical",
+           touches=lambda result, column, rare_threshold=None, **_:
+           ({column} if rare_threshold is not None else set()) | _prefixed(result, f"{column}_"))
+def encode_categorical(df, column, method, rare_threshold=None, target_column=None):
+    df = snapshot(df)
+    col = column
+    # Optionally collapse rare categories (threshold is a fraction)
+    if rare_threshold is not None:
+        freq = df[col].value_counts(normalize=True)
+        rare_cats = freq[freq < rare_threshold].index
+        if len(rare_cats) > 0:
+            df[col] = df[col].replace(rare_cats, "Other")
+
+    if method == "Label Encoding":
+        df[f"{col}_encoded"] = LabelEncoder().fit_transform(df[col])
+    elif method == "One-Hot Encoding":
+        encoded = pd.get_dummies(df[col], prefix=col)
+        df = pd.concat([df, encoded], axis=1)
+    elif method == "Binary Encoding":
+        unique_values = df[col].unique()
+        n_bits = int(np.ceil(np.log2(max(len(unique_values), 2))))
+        value_to_binary = {val: format(i, f'0{n_bits}b')
+                           for i, val in enumerate(unique_values)}
+        for bit in range(n_bits):
+            df[f"{col}_bin_{bit}"] = df[col].map(
+                lambda x, b=bit: int(value_to_binary[x][b]))
+    elif method == "Frequency Encoding":
+        frequency = df[col].value_counts(normalize=True)
+        df[f"{col}_freq"] = df[col].map(frequency)
+    elif method == "Target Encoding":
+        if not target_column:
+            raise OperationError("Please select a target column.", "Warning")
+        target_mean = df.groupby(col)[target_column].mean()
+        df[f"{col}_target_encoded"] = df[col].map(target_mean)
+    return df
+
+
+_SEASONS = {
+    12: "Winter", 1: "Winter", 2: "Winter",
+    3: "Spring", 4: "Spring", 5: "Spring",
+    6: "Summer", 7: "Summer", 8: "Summer",
+    9: "Fall", 10: "Fall", 11: "Fall",
+}
+
+
+@operation("datetime_features",
+           touches=lambda result, column, features: _prefixed(result, f"{column}_"))
+def datetime_features(df, column, features):
+    df = snapshot(df)
+    col = column
+    features = set(features)
+    dt_series = pd.to_datetime(df[col])
+
+    simple = {
+        "year": lambda s: s.dt.year,
+        "month": lambda s: s.dt.month,
+        "day": lambda s: s.dt.day,
+        "weekday": lambda s: s.dt.dayofweek,
+        "hour": lambda s: s.dt.hour,
+        "minute": lambda s: s.dt.minute,
+        "quarter": lambda s: s.dt.quarter,
+        "is_weekend": lambda s: s.dt.dayofweek.isin([5, 6]).astype(int),
+        "is_month_start": lambda s: s.dt.is_month_start.astype(int),
+        "is_month_end": lambda s: s.dt.is_month_end.astype(int),
+        "season": lambda s: s.dt.month.map(_SEASONS),
+        "days_since_min": lambda s: (s - s.min()).dt.days,
+    }
+    for key, extract in simple.items():
+        if key in features:
+            df[f"{col}_{key}"] = extract(dt_series)
+    if "cyclical_month" in features:
+        month = dt_series.dt.month
+        df[f"{col}_month_sin"] = np.sin(2 * np.pi * month / 12)
+        df[f"{col}_month_cos"] = np.cos(2 * np.pi * month / 12)
+    if "cyclical_dow" in features:
+        dow = dt_series.dt.dayofweek
+        df[f"{col}_dow_sin"] = np.sin(2 * np.pi * dow / 7)
+        df[f"{col}_dow_cos"] = np.cos(2 * np.pi * dow / 7)
+    return df
+
+
+@operation("combine_columns",
+           touches=lambda result, columns, new_name, **_:
+           {new_name} | _prefixed(result, *(f"{c}_" for c in columns)))
+def combine_columns(df, columns, method, new_name, degree=2, separator="_"):
+    df = snapshot(df)
+    if method == "sum":
+        df[new_name] = df[columns].sum(axis=1)
+    elif method == "mean":
+        df[new_name] = df[columns].mean(axis=1)
+    elif method == "product":
+        df[new_name] = df[columns].prod(axis=1)
+    elif method == "ratio":
+        if len(columns) != 2:
+            raise OperationError("Ratio requires exactly 2 columns.", "Warning")
+        c1, c2 = columns
+        if (df[c2] == 0).any():
+            raise ValueError("Division by zero encountered")
+        df[new_name] = df[c1] / df[c2]
+    elif method == "poly":
+        num_cols = [c for c in columns if np.issubdtype(df[c].dtype, np.number)]
+        if len(num_cols) < 2:
+            raise OperationError("Polynomial requires at least 2 numeric columns.", "Warning")
+        # Squared terms
+        for c in num_cols:
+            df[f"{c}_sq"] = df[c] ** 2
+        # Interaction terms
+        for i in range(len(num_cols)):
+            for j in range(i + 1, len(num_cols)):
+                df[f"{num_cols[i]}_x_{num_cols[j]}"] = df[num_cols[i]] * df[num_cols[j]]
+        if degree >= 3:
+            for c in num_cols:
+                df[f"{c}_cb"] = df[c] ** 3
+    elif method == "concat":
+        df[new_name] = df[columns].astype(str).agg(separator.join, axis=1)
+    return df
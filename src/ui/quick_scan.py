@@ -0,0 +1,137 @@
+"""
+Header-only dataset scans for the dataset manager.
+
+The dataset manager cards show a file's shape without loading it.
+``scan_csv`` reads the header and a small sample of rows for a dtype
+guess, then counts the remaining rows by counting newline bytes in large
+binary blocks; cells are never parsed.  Quoted fields that contain line
+breaks make that count an upper bound, which is fine for a card.
+
+Scan results are cached per data-relative path in
+``data/.cache/scans.json`` together with the file's size and mtime, so a
+refresh of hundreds of unchanged multi-GB files reads no data at all.
+"""
+
+import json
+import os
+import threading
+
+import pandas as pd
+
+from .compression import open_dataset
+from .dataset_cache import CACHE_DIRNAME, file_stamp
+from .file_utils import atomic_write
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+SCAN_CACHE_FILENAME = "scans.json"
+# Rows parsed to guess column dtypes.
+SAMPLE_ROWS = 200
+_BLOCK_SIZE = 8 << 20
+
+
+def count_lines(path):
+    """Count data lines in ``path`` (newline bytes, plus an unterminated last line)."""
+    lines = 0
+    last = b"\n"
+    with open_dataset(path) as f:
+        while True:
+            block = f.read(_BLOCK_SIZE)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return lines
+
+
+def scan_csv(path, lines=None):
+    """Return ``{rows, columns, dtypes}`` for a CSV without parsing its cells.
+
+    ``dtypes`` maps each column to the dtype pandas infers from the first
+    ``SAMPLE_ROWS`` rows.  ``lines`` skips the line count when the caller
+    already knows it (``count_lines``).
+    """
+    with open_dataset(path) as f:
+        sample = pd.read_csv(f, nrows=SAMPLE_ROWS, low_memory=False)
+    if lines is None:
+        lines = count_lines(path)
+    return {
+        "rows": max(lines - 1, 0),  # minus the header line
+        "columns": [str(c) for c in sample.columns],
+        "dtypes": {str(c): str(t) for c, t in sample.dtypes.items()},
+    }
+
+
+def format_shape(scan):
+    """``"12,345 rows × 8 cols"`` for a card's details line."""
+    if not scan:
+        return ""
+    return f"{scan['rows']:,} rows × {len(scan['columns'])} cols"
+
+
+class ScanCache:
+    """Scan results of one workspace, keyed by data-relative path and file stamp.
+
+    Safe to use from a scanning thread.
+    """
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.path = os.path.join(data_folder, CACHE_DIRNAME, SCAN_CACHE_FILENAME)
+        self._lock = threading.Lock()
+        self._entries = None  # {rel_path: {"stamp": ..., "scan": ...}}, read lazily
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception:
+                logger.exception("Discarding unreadable scan cache %s", self.path)
+                self._entries = {}
+        return self._entries
+
+    def get(self, rel_path, source_path):
+        """Return the cached scan of ``rel_path`` if ``source_path`` is unchanged."""
+        try:
+            stamp = file_stamp(source_path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load().get(rel_path)
+        if entry is None or entry.get("stamp") != stamp:
+            return None
+        return entry["scan"]
+
+    def put(self, rel_path, source_path, scan):
+        try:
+            stamp = file_stamp(source_path)
+        except OSError:
+            return
+        with self._lock:
+            self._load()[rel_path] = {"stamp": stamp, "scan": scan}
+
+    def forget(self, rel_path):
+        with self._lock:
+            self._load().pop(rel_path, None)
+
+    def save(self):
+        """Write the cache file."""
+        with self._lock:
+            entries = dict(self._load())
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            def write(tmp_path):
+                with open(tmp_path, 'w') as f:
+                    json.dump(entries, f)
+
+            atomic_write(self.path, write)
+        except OSError:
+            logger.exception("Failed to write scan cache %s", self.path)
@@ -0,0 +1,193 @@
+"""
+Preprocessing recipes of working copies.
+
+A recipe is every operation (see ``operations``) that turned a copy's
+original into the copy, in order, kept next to the copy::
+
+    data/.recipes/copies/foo_1.csv.json
+
+    {"version": 1, "original": "originals/foo.csv",
+     "steps": [{"op": "filter_rows", "params": {...}}, ...],
+     "committed": 3, "complete": true}
+
+The edit log a ``DataManager`` keeps only reaches back to the copy's
+last full save; each save appends it to the recipe.  ``committed`` is
+the number of steps the copy's stored base already contains, so the log
+of a delta-mode save (which is relative to that base) replaces the
+steps after it instead of being appended twice.  An edit that cannot be
+replayed makes the recipe incomplete: replaying it would not rebuild the
+copy, and ``run_recipe`` refuses to unless forced.
+
+``run_recipe`` re-applies a recipe to a fresh original without the GUI
+(see ``run_recipe.py``), e.g. to rebuild cleaned datasets nightly.
+"""
+
+import json
+import os
+import shutil
+
+from .compression import write_frame
+from .engines import DEFAULT_ENGINE, get_engine
+from .file_utils import atomic_write
+from .logging_utils import get_logger
+from .operations import describe_operation
+
+
+logger = get_logger(__name__)
+
+RECIPES_DIRNAME = ".recipes"
+RECIPE_VERSION = 1
+
+
+class RecipeError(ValueError):
+    """A recipe cannot be read or replayed."""
+
+
+def new_recipe(original=None, complete=True):
+    return {
+        "version": RECIPE_VERSION,
+        "original": original,
+        "steps": [],
+        "committed": 0,
+        "complete": complete,
+    }
+
+
+def read_recipe(path):
+    """Load and check an exported recipe file."""
+    try:
+        with open(path, 'r') as f:
+            recipe = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RecipeError(f"Cannot read recipe {path}: {e}") from e
+    if not isinstance(recipe, dict) or not isinstance(recipe.get("steps"), list):
+        raise RecipeError(f"{path} is not a recipe.")
+    if recipe.get("version", RECIPE_VERSION) > RECIPE_VERSION:
+        raise RecipeError(f"{path} was written by a newer version of the application.")
+    return recipe
+
+
+def write_recipe(recipe, path):
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(recipe, f, indent=1, default=str)
+
+    atomic_write(path, write)
+
+
+def run_recipe(recipe, input_path, output_path, engine=None, codec=None, force=False, progress=None):
+    """Replay ``recipe`` on the dataset at ``input_path`` and write the result.
+
+    The input is parsed once, every step is applied to the whole frame
+    with ``engine`` (see ``engines``; pandas by default) and the result
+    is written by pandas to ``output_path`` compressed with ``codec``.
+    ``progress(done, total, op)`` is called after every step.  Raises
+    RecipeError for an incomplete recipe (unless ``force``) or a step
+    that fails.  Returns the result frame.
+    """
+    if not recipe.get("complete", True) and not force:
+        raise RecipeError(
+            "The recipe is incomplete: the copy has edits that cannot be replayed."
+        )
+    engine = engine or get_engine(DEFAULT_ENGINE)
+    steps = recipe["steps"]
+    try:
+        df = engine.read_csv(input_path)
+    except (OSError, ValueError) as e:
+        raise RecipeError(f"Cannot read {input_path}: {e}") from e
+    logger.info("Replaying %d steps on %s (%d rows)", len(steps), input_path, len(df))
+    for index, op in enumerate(steps):
+        try:
+            df = engine.apply_operation(df, op)
+        except Exception as e:
+            raise RecipeError(
+                f"Step {index + 1} ({describe_operation(op)}) failed: {e}"
+            ) from e
+        if progress is not None:
+            progress(index + 1, len(steps), op)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    atomic_write(output_path, lambda tmp: write_frame(df, tmp, codec))
+    logger.info("Wrote %s (%d rows, %d columns)", output_path, len(df), len(df.columns))
+    return df
+
+
+class RecipeStore:
+    """Recipes of the copies of one workspace."""
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+        self.root = os.path.join(data_folder, RECIPES_DIRNAME)
+
+    def _path(self, rel_path):
+        return os.path.join(self.root, rel_path.replace("/", os.sep) + ".json")
+
+    def load(self, rel_path):
+        """Return the recipe of ``rel_path`` or None."""
+        try:
+            with open(self._path(rel_path), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.exception("Unreadable recipe for %s", rel_path)
+            return None
+
+    def _save(self, rel_path, recipe):
+        os.makedirs(os.path.dirname(self._path(rel_path)), exist_ok=True)
+        write_recipe(recipe, self._path(rel_path))
+
+    def start(self, rel_path, original):
+        """Give a fresh copy of ``original`` an empty recipe."""
+        self._save(rel_path, new_recipe(original))
+
+    def current(self, rel_path, operations, original=None):
+        """The recipe of ``rel_path`` with ``operations`` as the edits since its base.
+
+        A copy without a recipe predates recipes (or lost it), so its
+        earlier edits are unknown and the recipe starts out incomplete.
+        """
+        recipe = self.load(rel_path) or new_recipe(original, complete=False)
+        steps = recipe["steps"][:recipe["committed"]]
+        if operations is None:
+            recipe["complete"] = False
+        else:
+            steps = steps + list(operations)
+        recipe["steps"] = steps
+        return recipe
+
+    def record(self, rel_path, operations, rebased, original=None):
+        """Store a save of ``rel_path`` whose edits since its base are ``operations``.
+
+        ``rebased`` is True when the save writes a new base (a full or
+        column save), after which the next log starts from here.
+        """
+        recipe = self.current(rel_path, operations, original)
+        if rebased:
+            recipe["committed"] = len(recipe["steps"])
+        self._save(rel_path, recipe)
+
+    # ── Housekeeping ──────────────────────────────────────────────────────
+
+    def invalidate(self, rel_path):
+        """Drop the recipe of ``rel_path``."""
+        try:
+            os.remove(self._path(rel_path))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.exception("Failed to remove the recipe of %s", rel_path)
+
+    def rename(self, old_rel, new_rel):
+        """Move the recipe along with a renamed copy."""
+        src = self._path(old_rel)
+        if not os.path.isfile(src):
+            return
+        try:
+            os.makedirs(os.path.dirname(self._path(new_rel)), exist_ok=True)
+            os.replace(src, self._path(new_rel))
+        except OSError:
+            logger.exception("Failed to move recipe %s -> %s", old_rel, new_rel)
+
+    def clear(self):
+        """Delete every recipe in this workspace."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,138 @@
+"""
+Streaming SQLite import.
+
+A table, view or query of a SQLite database becomes a CSV original the
+same way a workbook sheet does (see ``excel_io``): rows are fetched from
+a ``sqlite3`` cursor ``chunk_rows`` at a time, turned into typed
+(nullable) columns and appended to the CSV, so memory stays bounded by
+one chunk however large the table is.  Databases are opened read-only,
+so a query can never change them.
+"""
+
+import io
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from .compression import open_dataset_writer
+from .excel_io import ImportCancelled
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+# Rows fetched from the cursor per chunk (see the ``sqlite_chunk_rows`` setting).
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def is_sqlite_file(path):
+    return path.lower().endswith(SQLITE_EXTENSIONS)
+
+
+def _connect(path):
+    """Open ``path`` read-only; raises ValueError if it is not a SQLite database."""
+    uri = Path(path).absolute().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        conn.execute("SELECT 1 FROM sqlite_master LIMIT 1")
+    except sqlite3.DatabaseError as e:
+        conn.close()
+        raise ValueError(f"{Path(path).name} is not a SQLite database ({e}).") from e
+    return conn
+
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def list_sources(path):
+    """Return ``[(name, "table" | "view")]`` for the user tables and views of ``path``."""
+    conn = _connect(path)
+    try:
+        return conn.execute(
+            "SELECT name, type FROM sqlite_master "
+            "WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%' "
+            "ORDER BY type, name"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def count_rows(path, name):
+    """Number of rows in a table or view."""
+    conn = _connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {quote_identifier(name)}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _unique_names(names):
+    """Result column names made unique pandas-style (``id``, ``id.1``)."""
+    seen = {}
+    unique = []
+    for name in names:
+        candidate = name
+        while candidate in seen:
+            seen[name] += 1
+            candidate = f"{name}.{seen[name]}"
+        seen.setdefault(candidate, 0)
+        unique.append(candidate)
+    return unique
+
+
+def _typed_chunk(names, rows):
+    """Build a frame from fetched rows with a nullable dtype per column.
+
+    SQLite columns are dynamically typed: a column that mixes types in
+    this chunk is kept as objects.  BLOBs are written as ``0x``-prefixed hex.
+    """
+    columns = {}
+    for name, values in zip(names, zip(*rows) if rows else [()] * len(names)):
+        try:
+            array = pd.array(values)
+        except (TypeError, ValueError):
+            array = None
+        if array is None or pd.api.types.is_object_dtype(array.dtype):
+            array = pd.array(
+                ['0x' + v.hex() if isinstance(v, bytes) else v for v in values], dtype=object)
+        columns[name] = array
+    return pd.DataFrame(columns, columns=names)
+
+
+def query_to_csv(path, query, dest_path, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None, codec=None):
+    """Stream the result of ``query`` on the database at ``path`` into a CSV.
+
+    ``dest_path`` is compressed with ``codec`` (see ``compression``).
+    ``progress(rows_done)`` is called after every chunk and may return
+    False to cancel (``ImportCancelled``).  Returns the number of rows
+    written.
+    """
+    conn = _connect(path)
+    try:
+        cursor = conn.execute(query)
+        if cursor.description is None:
+            raise ValueError("The statement does not return any rows.")
+        names = _unique_names([str(col[0]) for col in cursor.description])
+        written = 0
+        first_chunk = True
+        with open_dataset_writer(dest_path, codec) as raw:
+            out = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if rows or first_chunk:  # an empty result still gets its header
+                    _typed_chunk(names, rows).to_csv(out, index=False, header=first_chunk)
+                    first_chunk = False
+                written += len(rows)
+                if progress is not None and progress(written) is False:
+                    raise ImportCancelled()
+                if len(rows) < chunk_rows:
+                    break
+            out.flush()
+            out.detach()
+    finally:
+        conn.close()
+    logger.info("Imported %d rows from %s", written, Path(path).name)
+    return written
@@ -0,0 +1,361 @@
+"""
+Structural-sharing undo history.
+
+``DataManager`` used to push a full copy of the frame before every edit,
+so a deep history of a large dataset pinned many copies of it.  An undo
+entry now keeps only what it needs to rebuild the frame an edit
+replaced, given the frame the edit produced:
+
+* ``ColumnDelta`` -- edits that keep the rows (see
+  ``operations.changed_columns``) store the columns they changed or
+  removed; every other column is taken from the current frame, so
+  unchanged column buffers are shared rather than copied.
+* ``RowsRestore`` / ``RowsDrop`` -- edits that only drop rows (see
+  ``operations.kept_rows``) store a boolean mask of the kept rows and,
+  for undo, the dropped rows themselves.
+* ``FullSnapshot`` -- anything else (reshapes, untracked edits,
+  out-of-core previews) keeps the whole frame, which under
+  Copy-on-Write still shares its buffers until either side is written.
+
+``restore(current)`` rebuilds the entry's frame, where ``current`` must
+be the frame as it was right after the edit; ``inverse(current,
+restored)`` returns the entry going the other way (undo pushes it for
+redo and vice versa).  Entries are never modified after they are made,
+so two data managers can share them -- except that ``spill`` may move an
+entry's frames to a compressed Feather file, from which they are paged
+back in the next time the entry is used.  The files are deleted once no
+history refers to the entry any more.
+
+Sizes leave out buffers an entry shares with the current frame (see
+``frame_buffers``): spilling those would write them to disk without
+freeing any memory.
+"""
+
+import os
+import uuid
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .dataset_cache import HAS_PYARROW
+from .dataset_writer import copy_on_write, snapshot
+from .logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+SPILL_COMPRESSION = "zstd"
+_INDEX = "index"  # name of the column holding a spilled frame's row labels
+
+
+def _detached(series):
+    """``series``, safe to keep while the frame it came from is edited in place."""
+    return series if copy_on_write() else series.copy()
+
+
+def _buffers(values):
+    """Addresses of the memory behind a column or index (empty if unknown)."""
+    array = values.array
+    if isinstance(array, pd.arrays.ArrowExtensionArray):
+        return frozenset(
+            buffer.address
+            for chunk in array.__arrow_array__().chunks
+            for buffer in chunk.buffers() if buffer is not None and buffer.size
+        )
+    if isinstance(values.dtype, np.dtype):
+        arrays = [values.to_numpy()]
+    elif isinstance(array, pd.Categorical):
+        arrays = [array.codes]
+    else:
+        # Datetime/period arrays wrap one ndarray, masked arrays two.
+        arrays = [getattr(array, name, None) for name in ("_ndarray", "_data", "_mask")]
+    return frozenset(
+        a.__array_interface__["data"][0]
+        for a in arrays if isinstance(a, np.ndarray) and a.size
+    )
+
+
+def frame_buffers(frame):
+    """Addresses of the memory behind ``frame``'s columns and index."""
+    if not isinstance(frame, pd.DataFrame):
+        return frozenset()
+    keys = set(_buffers(frame.index))
+    for i in range(frame.shape[1]):
+        keys |= _buffers(frame.iloc[:, i])
+    return frozenset(keys)
+
+
+def _remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class HistoryState:
+    """Size accounting and paging to disk, shared by the entry types.
+
+    Subclasses list the frames that can be paged out in ``_frames`` and
+    take them back in ``_set_frames``; ``restore`` / ``inverse`` call
+    ``_page_in`` first.
+    """
+
+    _files = None     # {name: (path, columns, index, dtypes)} once spilled
+    _resident = True  # False while the frames live only in ``_files``
+    _sizes = None     # [(buffer addresses, bytes)] per column and index
+
+    def _frames(self):
+        return {}
+
+    def _set_frames(self, frames):
+        pass
+
+    def _fixed_bytes(self):
+        """Memory the entry keeps even when spilled (masks, indexes)."""
+        return 0
+
+    @property
+    def nbytes(self):
+        """Bytes of memory the entry holds."""
+        return self.memory_bytes()
+
+    def memory_bytes(self, shared=frozenset()):
+        """Bytes of memory the entry holds, leaving out the buffers in ``shared``."""
+        if not self._resident:
+            return self._fixed_bytes() + sum(index.nbytes for _, _, index, _ in self._files.values())
+        return self._fixed_bytes() + self.frame_bytes(shared)
+
+    def frame_bytes(self, shared=frozenset()):
+        """Bytes that spilling the entry would free while ``shared`` stays in memory.
+
+        ``shared`` is the ``frame_buffers`` of the current frame.
+        """
+        if not self._resident:
+            return 0
+        if self._sizes is None:
+            self._sizes = []
+            for frame in self._frames().values():
+                if not isinstance(frame.index, pd.RangeIndex):  # kept in memory when spilled
+                    self._sizes.append((_buffers(frame.index), int(frame.index.memory_usage(deep=True))))
+                self._sizes.extend(
+                    (_buffers(column), int(column.memory_usage(index=False, deep=True)))
+                    for column in (frame.iloc[:, i] for i in range(frame.shape[1]))
+                )
+        return sum(size for keys, size in self._sizes if not (keys and keys <= shared))
+
+    @property
+    def disk_bytes(self):
+        """Bytes of the entry's spill files (0 while it has none)."""
+        if not self._files:
+            return 0
+        total = 0
+        for path, *_ in self._files.values():
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    @property
+    def spilled(self):
+        return not self._resident
+
+    def spill(self, folder):
+        """Move the entry's frames to Feather files in ``folder``.
+
+        Returns False (keeping the frames) if they cannot be written,
+        e.g. a column mixes value types Arrow cannot store.
+        """
+        if not self._resident:
+            return True
+        frames = self._frames()
+        if not frames:
+            return True
+        if not HAS_PYARROW:
+            return False
+        if self._files is None:
+            os.makedirs(folder, exist_ok=True)
+            files = {}
+            try:
+                for name, frame in frames.items():
+                    path = os.path.join(folder, f"{uuid.uuid4().hex}.feather")
+                    data = frame.reset_index(drop=True)
+                    data.columns = [str(i) for i in range(len(data.columns))]
+                    index = frame.index
+                    if not isinstance(index, (pd.RangeIndex, pd.MultiIndex)):
+                        data[_INDEX] = index
+                        index = index[:0]  # keeps the dtype and name
+                    files[name] = (path, frame.columns, index, list(frame.dtypes))
+                    data.to_feather(path, compression=SPILL_COMPRESSION)
+            except (ValueError, TypeError, OSError) as e:
+                logger.debug("Undo entry kept in memory: %s", e)
+                _remove_files(path for path, *_ in files.values())
+                return False
+            self._files = files
+            weakref.finalize(self, _remove_files, [path for path, *_ in files.values()])
+        self._set_frames(None)
+        self._resident = False
+        self._sizes = None
+        return True
+
+    def _page_in(self):
+        if self._resident:
+            return
+        frames = {}
+        for name, (path, columns, index, dtypes) in self._files.items():
+            data = pd.read_feather(path)
+            if _INDEX in data.columns:
+                index = pd.Index(data.pop(_INDEX).astype(index.dtype).rename(index.name))
+            for i, dtype in enumerate(dtypes):
+                key = str(i)
+                if data[key].dtype != dtype:
+                    data[key] = data[key].astype(dtype)  # e.g. object text read back as str
+            data.columns = columns
+            data.index = index
+            frames[name] = data
+        self._set_frames(frames)
+        self._resident = True  # the files stay, so spilling again is free
+        self._sizes = None     # the paged-in frames share nothing
+
+
+class FullSnapshot(HistoryState):
+    """The whole frame."""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def _frames(self):
+        return {"frame": self.frame}
+
+    def _set_frames(self, frames):
+        self.frame = frames and frames["frame"]
+
+    def restore(self, current):
+        self._page_in()
+        return snapshot(self.frame)
+
+    def inverse(self, current, restored):
+        return FullSnapshot(snapshot(current))
+
+
+class ColumnDelta(HistoryState):
+    """The columns an edit changed; the others come from the current frame."""
+
+    def __init__(self, changed, columns, order):
+        self.changed = changed  # names whose values may differ between the two frames
+        self.columns = columns  # name -> Series of the frame to rebuild
+        self.order = order
+
+    @classmethod
+    def capture(cls, target, base, changed):
+        """Entry rebuilding ``target`` from ``base``, whose rows are the same.
+
+        Returns None if columns cannot be matched up by name (duplicates).
+        """
+        if not (target.columns.is_unique and base.columns.is_unique):
+            return None
+        changed = frozenset(changed)
+        columns = {
+            col: _detached(target[col])
+            for col in target.columns
+            if col in changed or col not in base.columns
+        }
+        return cls(changed, columns, target.columns)
+
+    def _frames(self):
+        if not self.columns:
+            return {}
+        # ``restore`` takes the row labels from the current frame.
+        frame = pd.DataFrame(self.columns, columns=list(self.columns), copy=False)
+        return {"columns": frame.reset_index(drop=True)}
+
+    def _set_frames(self, frames):
+        if frames is None:
+            self.columns = None
+        else:
+            self.columns = {col: frames["columns"][col] for col in frames["columns"].columns}
+
+    def restore(self, current):
+        self._page_in()
+        return pd.DataFrame(
+            {col: self.columns[col].set_axis(current.index) if col in self.columns else current[col]
+             for col in self.order},
+            index=current.index, columns=self.order, copy=False,
+        )
+
+    def inverse(self, current, restored):
+        return ColumnDelta.capture(current, restored, self.changed)
+
+
+class RowsRestore(HistoryState):
+    """The rows an edit dropped, and where they went."""
+
+    def __init__(self, mask, dropped, index):
+        self.mask = mask        # True for the rows the edit kept
+        self.dropped = dropped
+        self.index = index      # the original RangeIndex, or None to keep the taken labels
+
+    @classmethod
+    def capture(cls, before, mask):
+        index = before.index if isinstance(before.index, pd.RangeIndex) else None
+        return cls(mask, before.iloc[~mask], index)
+
+    def _frames(self):
+        return {"dropped": self.dropped} if len(self.dropped.columns) else {}
+
+    def _set_frames(self, frames):
+        self.dropped = frames and frames["dropped"]
+
+    def _fixed_bytes(self):
+        return self.mask.nbytes
+
+    def restore(self, current):
+        self._page_in()
+        kept = current[list(self.dropped.columns)]
+        if not len(self.dropped):
+            return kept
+        # Row p of the result is kept row k or dropped row j, in order.
+        source = np.empty(len(self.mask), dtype=np.intp)
+        source[self.mask] = np.arange(len(kept))
+        source[~self.mask] = np.arange(len(kept), len(self.mask))
+        frame = pd.concat([kept, self.dropped]).take(source)
+        if self.index is not None:
+            frame.index = self.index
+        return frame
+
+    def inverse(self, current, restored):
+        if not current.columns.equals(restored.columns):
+            # Columns loaded since the edit have no values for the dropped rows.
+            return FullSnapshot(snapshot(current))
+        return RowsDrop(self.mask)
+
+
+class RowsDrop(HistoryState):
+    """Drops the same rows again."""
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def _fixed_bytes(self):
+        return self.mask.nbytes
+
+    def restore(self, current):
+        return current.iloc[self.mask]
+
+    def inverse(self, current, restored):
+        return RowsRestore.capture(current, self.mask)
+
+
+def compact(before, after, changed=None, mask=None):
+    """Smallest entry that rebuilds ``before`` from ``after``, or None.
+
+    ``changed`` are the columns an edit keeping the rows may have
+    written; ``mask`` marks the rows an edit that only drops rows kept.
+    """
+    if changed is not None:
+        return ColumnDelta.capture(before, after, changed)
+    if mask is not None:
+        return RowsRestore.capture(before, mask)
+    return None
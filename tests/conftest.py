@@ -0,0 +1,60 @@
+"""
+Shared fixtures.
+
+The application runs from ``src`` (``python src/main.py``), so its
+packages are imported the same way here.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QCoreApplication  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """An empty workspace folder."""
+    path = tmp_path / "workspace"
+    path.mkdir()
+    with open(path / "metadata.json", "w") as f:
+        json.dump({"name": "Test"}, f)
+    return str(path)
+
+
+@pytest.fixture
+def open_manager(qapp, workspace):
+    """Return a function opening another ``DataManager`` on ``workspace``.
+
+    A second manager reads back only what the first one wrote to disk.
+    """
+    from ui.data_manager import DataManager
+
+    managers = []
+
+    def open_manager():
+        manager = DataManager()
+        manager.set_workspace_path(workspace)
+        manager.set_workspace_name("Test")
+        managers.append(manager)
+        return manager
+
+    yield open_manager
+    for manager in managers:
+        manager.flush_saves()
+
+
+@pytest.fixture
+def data_manager(open_manager):
+    """A ``DataManager`` with ``workspace`` open."""
+    return open_manager()
@@ -0,0 +1,129 @@
+"""Watched originals: rows appended to the source reach the files and the data in memory."""
+
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui.append_watch import SourceTruncated, append_frame, parse_rows, read_appended
+from ui.compression import open_dataset
+from ui.operations import apply_operation, make_operation
+
+
+def sample_frame(start=0, rows=6):
+    ids = range(start, start + rows)
+    return pd.DataFrame({
+        "id": list(ids),
+        "price": [i * 1.5 for i in ids],
+        "city": [["Paris", "Oslo", "Rome"][i % 3] for i in ids],
+    })
+
+
+def append_to(path, frame, partial=b""):
+    with open(path, "ab") as f:
+        f.write(frame.to_csv(index=False, header=False).encode("utf-8") + partial)
+
+
+def read_frame(path):
+    with open_dataset(path) as f:
+        return pd.read_csv(f)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "feed.csv"
+    sample_frame().to_csv(path, index=False)
+    return str(path)
+
+
+def test_read_appended_returns_complete_rows(source):
+    offset = os.path.getsize(source)
+    assert read_appended(source, offset) == (b"", offset)
+    append_to(source, sample_frame(6, 2), partial=b"8,12.0,Ro")
+    data, new_offset = read_appended(source, offset)
+    assert data == b"6,9.0,Paris\n7,10.5,Oslo\n"
+    assert new_offset == offset + len(data)
+
+    append_to(source, pd.DataFrame(), partial=b"me\n")
+    assert read_appended(source, new_offset)[0] == b"8,12.0,Rome\n"
+
+
+def test_read_appended_detects_truncation(source):
+    with pytest.raises(SourceTruncated):
+        read_appended(source, os.path.getsize(source) + 1)
+
+
+def test_append_frame_numbers_rows_on_and_merges_categories():
+    frame = sample_frame().astype({"city": "category"})
+    frame = frame[frame["city"] != "Rome"]
+    frame["city"] = frame["city"].cat.remove_unused_categories()
+    header = b"id,price,city\n"
+    rows = parse_rows(header, b"9,13.5,Rome\n10,15.0,Lima\n", frame)
+    result = append_frame(frame, rows)
+    assert list(result.index[-2:]) == [frame.index[-1] + 1, frame.index[-1] + 2]
+    assert isinstance(result["city"].dtype, pd.CategoricalDtype)
+    assert list(result["city"].iloc[-2:]) == ["Rome", "Lima"]
+    assert result["id"].dtype == frame["id"].dtype
+
+
+@pytest.fixture
+def watched(data_manager, source):
+    """``(original, copy)`` imported from ``source`` and watched, with the copy active."""
+    original, copy = data_manager.import_original(source)
+    assert data_manager.activate_dataset(copy)
+    data_manager.watch_original(original)
+    return original, copy
+
+
+def test_poll_appends_to_files_and_memory(data_manager, source, watched):
+    original, copy = watched
+    appended = []
+    data_manager.rows_appended.connect(appended.append)
+
+    append_to(source, sample_frame(6, 3), partial=b"9,13.5,Pa")
+    assert data_manager.poll_watches() == 3
+    expected = sample_frame(rows=9)
+    for rel_path in (f"originals/{original}", copy):
+        assert_frame_equal(read_frame(data_manager._resolve_data_path(rel_path)), expected)
+    assert_frame_equal(data_manager.data, expected)
+    assert_frame_equal(appended[0], sample_frame(6, 3).set_axis(range(6, 9)))
+
+    append_to(source, pd.DataFrame(), partial=b"ris\n")
+    assert data_manager.poll_watches() == 1
+    assert_frame_equal(data_manager.data, sample_frame(rows=10))
+    assert data_manager.poll_watches() == 0
+
+
+def test_saved_copy_stops_growing(data_manager, source, open_manager):
+    data_manager.set_setting('copy_storage', 'delta')
+    original, copy = data_manager.import_original(source)
+    assert data_manager.activate_dataset(copy)
+    op = make_operation("drop_column", column="price")
+    result = apply_operation(data_manager.data, op)
+    data_manager.save_state()
+    data_manager.record_operation(op, result)
+    data_manager._data = result
+    assert data_manager.save_workspace_data()
+    data_manager.flush_saves()
+    data_manager.watch_original(original)
+
+    append_to(source, sample_frame(6, 2))
+    assert data_manager.poll_watches() == 2
+    orig_path = data_manager._resolve_data_path(f"originals/{original}")
+    assert_frame_equal(read_frame(orig_path), sample_frame(rows=8))
+    # The edit log still applies to the copy's unchanged base.
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy)
+    assert_frame_equal(reopened.data, sample_frame().drop(columns="price"))
+    assert reopened.operations == [op]
+
+
+def test_truncated_source_is_no_longer_watched(data_manager, source, watched):
+    original, _copy = watched
+    errors = []
+    data_manager.data_error.connect(errors.append)
+    sample_frame(rows=2).to_csv(source, index=False)
+    assert data_manager.poll_watches() == 0
+    assert not data_manager.is_watched(original)
+    assert errors
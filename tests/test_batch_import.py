@@ -0,0 +1,95 @@
+"""Batch import of CSV files and concatenation of shards."""
+
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui.batch_import import (
+    combined_name, copy_shards, expand_sources, group_shards, unique_name,
+)
+from ui.compression import detect_codec, open_dataset
+from ui.excel_io import ImportCancelled
+from ui.fingerprint import content_hash
+
+
+def shard(start, rows=5):
+    ids = range(start, start + rows)
+    return pd.DataFrame({
+        "id": list(ids),
+        "price": [i * 1.5 for i in ids],
+        "city": [["Paris", "Oslo", "Rome"][i % 3] for i in ids],
+    })
+
+
+def read_frame(path):
+    with open_dataset(path) as f:
+        return pd.read_csv(f)
+
+
+@pytest.fixture
+def drop(tmp_path):
+    """A nightly drop: three sales shards, one without a final newline, and a stores file."""
+    folder = tmp_path / "drop"
+    (folder / "more").mkdir(parents=True)
+    paths = []
+    for i, name in enumerate(["sales_1.csv", "sales_2.csv", "more/sales_3.csv"]):
+        path = folder / name
+        shard(i * 5).to_csv(path, index=False)
+        paths.append(str(path))
+    with open(paths[1], "rb+") as f:
+        f.truncate(os.path.getsize(paths[1]) - 1)
+    stores = folder / "stores.csv"
+    stores.write_text("store,city\n1,Oslo\n2,Rome\n")
+    return str(folder), paths, str(stores)
+
+
+def test_expand_and_group(drop):
+    folder, sales, stores = drop
+    assert expand_sources(folder) == sorted(sales[:2] + [stores])
+    found = expand_sources(folder, "**/*.csv")
+    assert set(found) == set(sales + [stores])
+    assert group_shards(sales + [stores]) == [sales, [stores]]
+
+
+def test_names():
+    assert combined_name(["a/sales_1.csv", "a/sales_2.csv"]) == "sales.csv"
+    assert combined_name(["a/01.csv", "a/02.csv"]) == "01_combined.csv"
+    assert unique_name("sales.csv", {"sales.csv", "sales_2.csv"}) == "sales_3.csv"
+
+
+@pytest.mark.parametrize("codec", [None, "gzip"])
+def test_shards_concatenate_to_one_table(drop, tmp_path, codec):
+    _folder, sales, _stores = drop
+    dest = str(tmp_path / "sales.csv")
+    result = copy_shards(sales, dest, codec=codec)
+    assert detect_codec(dest) == codec
+    expected = pd.concat([pd.read_csv(p) for p in sales], ignore_index=True)
+    assert_frame_equal(read_frame(dest), expected)
+    assert result == {"hash": content_hash(dest), "lines": len(expected) + 1}
+
+
+def test_import_batch(data_manager, drop):
+    _folder, sales, stores = drop
+    imported, duplicates = data_manager.import_batch(group_shards(sales + [stores]))
+    assert [name for name, _copy in imported] == ["sales.csv", "stores.csv"]
+    assert duplicates == []
+    (_name, sales_copy), _stores = imported
+    assert data_manager.cached_scan(sales_copy)["rows"] == 15
+    assert data_manager.activate_dataset(sales_copy)
+    expected = pd.concat([shard(0), shard(5), shard(10)], ignore_index=True)
+    assert_frame_equal(data_manager.data, expected)
+
+    # The same content again is reported, not stored twice.
+    imported, duplicates = data_manager.import_batch([[stores]])
+    assert imported == []
+    assert duplicates == [(stores, "stores.csv")]
+
+
+def test_cancelled_batch_imports_nothing(data_manager, drop):
+    _folder, sales, stores = drop
+    with pytest.raises(ImportCancelled):
+        data_manager.import_batch([sales, [stores]], progress=lambda fraction: False)
+    assert not data_manager.get_originals()
+    assert os.listdir(data_manager._originals_folder()) == []
@@ -0,0 +1,112 @@
+"""Named checkpoints: save and restore round trips, and shared column files."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui.checkpoint_store import CheckpointStore
+from ui.operations import apply_operation, make_operation
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 6],
+        "price": [2.5, np.nan, 4.0, 3.5, 1.0, 8.0],
+        "qty": pd.array([3, None, 4, 1, 5, 9], dtype="Int64"),
+        "city": pd.Categorical(["Paris", "Oslo", "Rome", "Paris", None, "Oslo"]),
+        "when": pd.date_range("2021-01-01", periods=6, freq="D", tz="UTC"),
+        "note": ["a", None, "c", "d", "e", "f"],
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path))
+
+
+def column_files(store, rel_path):
+    return sorted(name for name in os.listdir(store._dir(rel_path)) if name.endswith(".feather"))
+
+
+@pytest.mark.parametrize("index", [
+    pd.RangeIndex(10, 22, 2),
+    pd.Index([5, 3, 9, 1, 0, 7], name="row"),
+    pd.Index(list("uvwxyz")),
+], ids=["range", "labels", "text"])
+def test_round_trip(store, index):
+    frame = sample_frame().set_axis(index)
+    ops = [make_operation("drop_column", column="x")]
+    store.save("copies/a.csv", "before", frame, operations=ops, base={"stamp": [1, 2]})
+    restored, entry = store.load("copies/a.csv", "before")
+    assert_frame_equal(restored, frame)
+    assert entry["operations"] == ops
+    assert entry["base"] == {"stamp": [1, 2]}
+
+
+def test_checkpoints_share_column_files(store):
+    frame = sample_frame()
+    store.save("copies/a.csv", "first", frame)
+    first = column_files(store, "copies/a.csv")
+    edited = apply_operation(frame, make_operation("round_column", column="price", digits=0))
+    store.save("copies/a.csv", "second", edited)
+    second = column_files(store, "copies/a.csv")
+    assert len(second) == len(first) + 1  # only the rounded column is new
+
+    store.delete("copies/a.csv", "first")
+    assert len(column_files(store, "copies/a.csv")) == len(first)
+    assert_frame_equal(store.load("copies/a.csv", "second")[0], edited)
+    with pytest.raises(KeyError):
+        store.load("copies/a.csv", "first")
+
+
+def test_mixed_type_column_is_refused(store):
+    frame = sample_frame().astype({"note": object})
+    frame.loc[0, "note"] = 7
+    with pytest.raises(ValueError):
+        store.save("copies/a.csv", "mixed", frame)
+    assert store.list("copies/a.csv") == []
+
+
+def edit(manager, op):
+    result = apply_operation(manager.data, op)
+    manager.save_state()
+    manager.record_operation(op, result)
+    manager._data = result
+    return result
+
+
+@pytest.fixture
+def manager(data_manager, tmp_path):
+    path = tmp_path / "sample.csv"
+    sample_frame()[["id", "price", "note"]].to_csv(path, index=False)
+    _original, copy = data_manager.import_original(str(path))
+    data_manager.activate_dataset(copy)
+    return data_manager
+
+
+def test_restore_adopts_edit_log_until_copy_is_saved(manager):
+    ops = [
+        make_operation("filter_rows", column="price", condition="greater than", value="2"),
+        make_operation("rename_column", old="note", new="label"),
+    ]
+    for op in ops:
+        edit(manager, op)
+    saved = manager.data.copy()
+    manager.save_checkpoint("cleaned")
+    assert [cp["name"] for cp in manager.list_checkpoints()] == ["cleaned"]
+
+    edit(manager, make_operation("drop_column", column="id"))
+    df, operations, projection = manager.load_checkpoint("cleaned")
+    manager.restore_frame(df, operations, projection)
+    assert_frame_equal(manager.data, saved)
+    assert manager.operations == ops
+    manager.undo()  # restoring is an undoable edit
+    assert "id" not in manager.data.columns
+
+    manager.save_workspace_data()
+    manager.flush_saves()
+    _df, operations, _projection = manager.load_checkpoint("cleaned")
+    assert operations is None  # the copy changed under the log
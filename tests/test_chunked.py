@@ -0,0 +1,102 @@
+"""``ChunkedDataset.apply`` against the same operation on the whole frame in memory."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui.chunked import ChunkedDataset
+from ui.operations import OperationError, apply_operation, make_operation
+
+
+CHUNK_ROWS = 7
+ROWS = 47  # the last chunk is a short one
+
+CHUNKED_OPERATIONS = [
+    make_operation("rename_column", old="price", new="cost"),
+    make_operation("drop_column", column="city"),
+    make_operation("change_type", column="qty", dtype="float64"),
+    make_operation("filter_rows", column="price", condition="greater than", value="50"),
+    make_operation("filter_rows", column="city", condition="equals", value="Oslo"),
+    make_operation("filter_rows", column="city", condition="contains", value="r"),
+    make_operation("replace_values", find="Paris", replace="Lyon", column="city"),
+    make_operation("replace_values", find="3", replace="30", column="qty", exact=True),
+    make_operation("round_column", column="price", digits=0),
+    make_operation("set_value", row=9, column="qty", value=99),
+    make_operation("missing_values", action="Fill with Mean", column="price"),
+    make_operation("missing_values", action="Fill with Median", column="price"),
+    make_operation("missing_values", action="Fill with Mode", column="city"),
+    make_operation("missing_values", action="Fill with 0", column="price"),
+    make_operation("missing_values", action="Forward Fill", column="price"),
+    make_operation("missing_values", action="Backward Fill"),
+    make_operation("missing_values", action="Drop Rows"),
+    make_operation("drop_duplicates", keep="first"),
+    make_operation("drop_duplicates", keep="last"),
+    make_operation("drop_duplicates", keep=False),
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = np.random.default_rng(7)
+    price = rng.uniform(1, 100, ROWS).round(2)
+    price[rng.random(ROWS) < 0.2] = np.nan
+    price[0] = price[-1] = np.nan  # nothing to carry into the first/last rows
+    frame = pd.DataFrame({
+        "id": np.arange(ROWS) % 20,
+        "price": price,
+        "qty": rng.integers(1, 6, ROWS),
+        "city": rng.choice(["Paris", "Oslo", "Rome"], ROWS).astype(object),
+    })
+    frame.loc[rng.random(ROWS) < 0.15, "city"] = None
+    frame.loc[[0, 8, 15], "city"] = "Paris"  # every chunk has some text
+    # Whole-row duplicates, within a chunk and across chunks.
+    frame.iloc[5] = frame.iloc[4]
+    frame.iloc[30] = frame.iloc[3]
+    frame.iloc[44] = frame.iloc[3]
+    path = tmp_path / "sample.csv"
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def dataset(csv_path, tmp_path):
+    return ChunkedDataset.from_csv(csv_path, str(tmp_path / "chunks"), chunk_rows=CHUNK_ROWS)
+
+
+def collect(dataset):
+    chunks = list(dataset.iter_chunks())
+    if not chunks:
+        return dataset.head(0)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def test_dataset_matches_csv(csv_path, dataset):
+    assert dataset.chunk_count == -(-ROWS // CHUNK_ROWS)
+    assert len(dataset) == ROWS
+    assert_frame_equal(collect(dataset), pd.read_csv(csv_path, low_memory=False))
+
+
+@pytest.mark.parametrize("op", CHUNKED_OPERATIONS,
+                         ids=[f"{op['op']}-{i}" for i, op in enumerate(CHUNKED_OPERATIONS)])
+def test_apply_matches_in_memory(csv_path, dataset, op):
+    expected = apply_operation(pd.read_csv(csv_path, low_memory=False), op)
+    result = dataset.apply(op)
+    assert len(result) == len(expected)
+    assert list(result.columns) == list(expected.columns)
+    assert_frame_equal(collect(result), expected.reset_index(drop=True))
+
+
+def test_apply_leaves_source_intact(csv_path, dataset):
+    dataset.apply(make_operation("drop_duplicates", keep=False))
+    assert_frame_equal(collect(dataset), pd.read_csv(csv_path, low_memory=False))
+
+
+def test_whole_frame_operation_is_refused(dataset):
+    with pytest.raises(OperationError):
+        dataset.apply(make_operation("group_by", column="city", aggregation="mean"))
+
+
+def test_corr_matches_in_memory(csv_path, dataset):
+    expected = pd.read_csv(csv_path, low_memory=False)[["id", "price", "qty"]].corr()
+    assert_frame_equal(dataset.corr(["id", "price", "qty"]), expected)
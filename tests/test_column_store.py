@@ -0,0 +1,130 @@
+"""Working copies stored column by column, rebuilt on the next activation."""
+
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui.column_store import ColumnStore, new_token
+from ui.operations import apply_operation, make_operation
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "price": [2.5, None, 4.0, 3.5, 1.0],
+        "qty": [3, 1, 4, 1, 5],
+        "city": ["Paris", "Oslo", "Rome", "Paris", "Oslo"],
+    })
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def files(manifest):
+    return {entry["name"]: entry["file"] for entry in manifest["columns"]}
+
+
+@pytest.fixture
+def manager(data_manager):
+    data_manager.set_setting('copy_storage', 'columns')
+    return data_manager
+
+
+@pytest.fixture
+def copy(manager, tmp_path):
+    """The working copy of an imported sample, active in ``manager``."""
+    path = tmp_path / "sample.csv"
+    sample_frame().to_csv(path, index=False)
+    _original, copy = manager.import_original(str(path))
+    manager.activate_dataset(copy)
+    return copy
+
+
+@pytest.fixture
+def store(manager):
+    return ColumnStore(os.path.join(manager.workspace_path, "data"))
+
+
+def edit_and_save(manager, ops):
+    for op in ops:
+        result = apply_operation(manager.data, op)
+        manager.save_state()
+        manager.record_operation(op, result)
+        manager._data = result
+    assert manager.save_workspace_data()
+    manager.flush_saves()
+    return manager.data.copy()
+
+
+def test_save_writes_columns_and_keeps_base(manager, copy, store, open_manager):
+    path = manager._resolve_data_path(copy)
+    base = read_bytes(path)
+    edited = edit_and_save(manager, [make_operation("round_column", column="price", digits=0)])
+
+    assert read_bytes(path) == base
+    manifest = store.load_manifest(copy, path)
+    assert [entry["name"] for entry in manifest["columns"]] == list(edited.columns)
+    assert manifest["rows"] == len(edited)
+
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy)
+    assert_frame_equal(reopened.data, edited)
+
+
+def test_later_save_rewrites_changed_columns_only(manager, copy, store, open_manager):
+    path = manager._resolve_data_path(copy)
+    edit_and_save(manager, [make_operation("round_column", column="price", digits=0)])
+    first = files(store.load_manifest(copy, path))
+
+    edited = edit_and_save(manager, [
+        make_operation("numeric_feature", column="qty", method="square", new_name="qty_sq"),
+        make_operation("replace_values", find="Oslo", replace="Bergen", column="city"),
+    ])
+    second = files(store.load_manifest(copy, path))
+    assert {name for name in second if second[name] != first.get(name)} == {"qty_sq", "city"}
+    # Files of replaced columns are removed.
+    folder = os.path.dirname(store._manifest_path(copy))
+    assert sorted(os.listdir(folder)) == sorted(
+        [f"{file_id}.feather" for file_id in second.values()] + ["manifest.json"])
+
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy)
+    assert_frame_equal(reopened.data, edited)
+
+
+def test_projected_load_reads_requested_columns(manager, copy, open_manager):
+    edited = edit_and_save(manager, [make_operation("drop_column", column="id")])
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy, columns=["qty", "city"])
+    assert_frame_equal(reopened.data, edited[["qty", "city"]])
+
+
+def test_unknown_base_token_rewrites_every_column(tmp_path):
+    base = tmp_path / "copies" / "a.csv"
+    base.parent.mkdir()
+    sample_frame().to_csv(base, index=False)
+    store = ColumnStore(str(tmp_path))
+    token = new_token()
+    assert store.save("copies/a.csv", str(base), sample_frame(), None, None, token) == 4
+    assert store.save("copies/a.csv", str(base), sample_frame(), {"qty"}, token, new_token()) == 1
+    # Built on a manifest that is no longer the one on disk.
+    assert store.save("copies/a.csv", str(base), sample_frame(), {"qty"}, token, new_token()) == 4
+
+
+def test_mixed_type_column_falls_back_to_csv(manager, copy, store, open_manager):
+    path = manager._resolve_data_path(copy)
+    edited = edit_and_save(manager, [
+        make_operation("change_type", column="city", dtype="object"),
+        make_operation("set_value", row=0, column="city", value=7),
+    ])
+    assert not store.has_store(copy)
+    assert read_bytes(path) != read_bytes(manager._resolve_data_path(
+        "originals/" + manager.get_original_for_copy(copy)))
+
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy)
+    assert reopened.data.shape == edited.shape
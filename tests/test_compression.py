@@ -0,0 +1,98 @@
+"""Datasets stored as gzip or zstd CSV: appends, recompression and round trips."""
+
+import io
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui.compression import (
+    detect_codec, open_dataset, open_dataset_writer, recompress, text_size, write_frame,
+)
+from ui.operations import apply_operation, make_operation
+
+
+CODECS = ["gzip", "zstd"]
+
+
+def sample_frame(start=0, rows=50):
+    ids = range(start, start + rows)
+    return pd.DataFrame({
+        "id": list(ids),
+        "price": [i * 1.5 for i in ids],
+        "city": [["Paris", "Oslo", "Rome"][i % 3] for i in ids],
+    })
+
+
+def read_frame(path):
+    with open_dataset(path) as f:
+        return pd.read_csv(f)
+
+
+def read_text(path):
+    with open_dataset(path) as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_written_frame_reads_back(tmp_path, codec):
+    path = str(tmp_path / "a.csv")
+    write_frame(sample_frame(), path, codec)
+    assert detect_codec(path) == codec
+    assert_frame_equal(read_frame(path), sample_frame())
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_append_adds_rows(tmp_path, codec):
+    path = str(tmp_path / "a.csv")
+    write_frame(sample_frame(), path, codec)
+    more = sample_frame(start=50, rows=20)
+    with open_dataset_writer(path, detect_codec(path), append=True) as out:
+        out.write(more.to_csv(index=False, header=False).encode("utf-8"))
+
+    assert detect_codec(path) == codec
+    assert_frame_equal(read_frame(path), sample_frame(rows=70))
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_recompress_keeps_text(tmp_path, codec):
+    plain = str(tmp_path / "plain.csv")
+    sample_frame().to_csv(plain, index=False)
+    compressed = str(tmp_path / "compressed.csv")
+    recompress(plain, compressed, codec)
+    other = str(tmp_path / "other.csv")
+    recompress(compressed, other, next(c for c in CODECS if c != codec))
+    back = str(tmp_path / "back.csv")
+    recompress(other, back)
+
+    with open(plain, "rb") as f:
+        text = f.read()
+    assert detect_codec(back) is None
+    for path in (compressed, other, back):
+        assert read_text(path) == text
+        assert text_size(path) == len(text)
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_stored_datasets_follow_setting(data_manager, tmp_path, open_manager, codec):
+    data_manager.set_setting('storage_compression', codec)
+    path = tmp_path / "sample.csv"
+    sample_frame().to_csv(path, index=False)
+    original, copy = data_manager.import_original(str(path))
+    assert detect_codec(data_manager._resolve_data_path(f"originals/{original}")) == codec
+    assert data_manager.activate_dataset(copy)
+    assert_frame_equal(data_manager.data, sample_frame())
+
+    op = make_operation("filter_rows", column="city", condition="equals", value="Oslo")
+    result = apply_operation(data_manager.data, op)
+    data_manager.save_state()
+    data_manager.record_operation(op, result)
+    data_manager._data = result
+    assert data_manager.save_workspace_data()
+    data_manager.flush_saves()
+    assert detect_codec(data_manager._resolve_data_path(copy)) == codec
+
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy)
+    expected = pd.read_csv(io.StringIO(result.to_csv(index=False)))
+    assert_frame_equal(reopened.data.reset_index(drop=True), expected)
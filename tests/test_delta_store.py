@@ -0,0 +1,125 @@
+"""Working copies stored as an edit log, rebuilt on the next activation."""
+
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui.data_manager import DataManager
+from ui.delta_store import DeltaStore
+from ui.operations import apply_operation, make_operation
+
+
+OPERATIONS = [
+    make_operation("rename_column", old="price", new="cost"),
+    make_operation("missing_values", action="Fill with 0", column="cost"),
+    make_operation("numeric_feature", column="qty", method="square", new_name="qty_sq"),
+]
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "price": [2.5, None, 4.0, 3.5, 1.0],
+        "qty": [3, 1, 4, 1, 5],
+        "city": ["Paris", "Oslo", "Rome", "Paris", "Oslo"],
+    })
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def manager(data_manager):
+    data_manager.set_setting('copy_storage', 'delta')
+    return data_manager
+
+
+@pytest.fixture
+def copy(manager, tmp_path):
+    """The working copy of an imported sample, active in ``manager``."""
+    path = tmp_path / "sample.csv"
+    sample_frame().to_csv(path, index=False)
+    _original, copy = manager.import_original(str(path))
+    manager.activate_dataset(copy)
+    return copy
+
+
+def edit_and_save(manager, ops):
+    for op in ops:
+        result = apply_operation(manager.data, op)
+        manager.save_state()
+        manager.record_operation(op, result)
+        manager._data = result
+    assert manager.save_workspace_data()
+    manager.flush_saves()
+    return manager.data.copy()
+
+
+def test_save_writes_log_and_keeps_base(manager, copy, open_manager):
+    path = manager._resolve_data_path(copy)
+    base = read_bytes(path)
+    edited = edit_and_save(manager, OPERATIONS)
+
+    assert read_bytes(path) == base
+    record = DeltaStore(os.path.join(manager.workspace_path, "data")).load(copy)
+    assert record["operations"] == OPERATIONS
+    assert record["shape"]["rows"] == len(edited)
+
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy)
+    assert_frame_equal(reopened.data, edited)
+    assert reopened.operations == OPERATIONS
+
+
+def test_rebuild_starts_from_checkpoint(manager, copy, open_manager, monkeypatch):
+    manager.set_setting('delta_checkpoint_every', 2)
+    checkpointed = edit_and_save(manager, OPERATIONS[:2])
+    edited = edit_and_save(manager, OPERATIONS[2:])
+    store = DeltaStore(os.path.join(manager.workspace_path, "data"))
+    record = store.load(copy)
+    assert record["operations"] == OPERATIONS
+    step, frame = store.latest_checkpoint(copy, record)
+    assert step == 2
+    assert_frame_equal(frame, checkpointed.reset_index(drop=True))
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("the base file was parsed")
+
+    monkeypatch.setattr(DataManager, "_read_dataset", no_parse)
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy)
+    assert_frame_equal(reopened.data, edited)
+    assert reopened.operations == OPERATIONS
+
+
+def test_checkpoint_of_other_edits_is_dropped(tmp_path):
+    base = tmp_path / "copies" / "a.csv"
+    base.parent.mkdir()
+    sample_frame().to_csv(base, index=False)
+    store = DeltaStore(str(tmp_path))
+    frame = apply_operation(sample_frame(), OPERATIONS[0])
+    store.save("copies/a.csv", str(base), OPERATIONS[:1], frame, checkpoint_every=1)
+    assert store.latest_checkpoint("copies/a.csv", store.load("copies/a.csv"))[0] == 1
+
+    # Undo, then a different edit: the checkpoint no longer matches the log.
+    other = [make_operation("drop_column", column="city")]
+    record = store.save("copies/a.csv", str(base), other, checkpoint_every=1)
+    assert record["checkpoints"] == []
+    assert store.latest_checkpoint("copies/a.csv", record) == (0, None)
+
+
+def test_log_is_ignored_once_base_changes(manager, copy, open_manager):
+    edit_and_save(manager, OPERATIONS)
+    path = manager._resolve_data_path(copy)
+    replacement = sample_frame().head(2)
+    replacement.to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)  # keeps the original's bytes intact
+
+    reopened = open_manager()
+    assert reopened.activate_dataset(copy)
+    assert_frame_equal(reopened.data, pd.read_csv(path))
+    assert reopened.operations == []
@@ -0,0 +1,128 @@
+"""Streaming Excel import and export."""
+
+import os
+
+import openpyxl
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui import excel_io
+from ui.excel_io import ImportCancelled, excel_to_csv, sheet_to_csv, write_excel
+
+
+def sample_frame(rows=23):
+    return pd.DataFrame({
+        "id": range(rows),
+        "price": [None if i % 5 == 0 else i * 1.25 for i in range(rows)],
+        "city": [["Paris", "Oslo", None][i % 3] for i in range(rows)],
+        "when": pd.date_range("2021-01-01", periods=rows, freq="D"),
+    })
+
+
+def workbook(path, sheets):
+    """Write ``{title: [rows]}`` as an xlsx workbook."""
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(excel_io, "CHUNK_ROWS", 4)
+
+
+def test_sheet_rows_stream_in_chunks(tmp_path, small_chunks):
+    rows = [
+        (None, None, None),
+        ("id", "price", None),   # header after a leading blank row
+        (1, 2.0, "x"),
+        (None, None, None),      # blank row inside the data is kept
+        (3, 4.5, None),
+    ] + [(i, float(i), "y") for i in range(4, 10)] + [(None, None, None)] * 3
+    dest = tmp_path / "sheet.csv"
+    seen = []
+    assert sheet_to_csv(iter(rows), str(dest), seen.append) == 9
+    assert seen == [4, 8, 9]
+
+    frame = pd.read_csv(dest)
+    assert list(frame.columns) == ["id", "price", "Unnamed: 2"]
+    assert len(frame) == 9
+    assert frame["id"].isna().sum() == 1
+    # Whole-number floats are written as integers, as read_excel reads them.
+    with open(dest) as f:
+        assert f.readlines()[-1] == "9,9,y\n"
+
+
+def test_empty_sheet_has_no_header(tmp_path):
+    assert sheet_to_csv(iter([(None, None)]), str(tmp_path / "empty.csv")) is None
+
+
+def test_export_import_round_trip(tmp_path, small_chunks):
+    path = str(tmp_path / "book.xlsx")
+    write_excel(sample_frame(), path)
+    created = excel_to_csv(path, str(tmp_path), lambda name, count: f"{name}.csv")
+    assert created == ["Sheet1.csv"]
+    result = pd.read_csv(tmp_path / "Sheet1.csv", parse_dates=["when"])
+    expected = sample_frame()
+    expected["when"] = expected["when"].astype(result["when"].dtype)
+    assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_export_continues_on_further_sheets(tmp_path, small_chunks, monkeypatch):
+    monkeypatch.setattr(excel_io, "MAX_SHEET_ROWS", 11)
+    path = str(tmp_path / "book.xlsx")
+    write_excel(sample_frame(), path, sheet_name="Data")
+    wb = openpyxl.load_workbook(path, read_only=True)
+    assert wb.sheetnames == ["Data", "Data (2)", "Data (3)"]
+    assert [sum(1 for _ in ws.iter_rows()) for ws in wb.worksheets] == [11, 11, 4]
+    wb.close()
+
+
+def test_every_non_empty_sheet_becomes_a_csv(tmp_path):
+    path = workbook(tmp_path / "book.xlsx", {
+        "First": [("a", "b"), (1, 2)],
+        "Blank": [],
+        "Second": [("c",), ("x",), ("y",)],
+    })
+    out = tmp_path / "out"
+    out.mkdir()
+    fractions = []
+    created = excel_to_csv(path, str(out), lambda name, count: f"{name}.csv",
+                           lambda fraction: fractions.append(fraction))
+    assert created == ["First.csv", "Second.csv"]
+    assert sorted(os.listdir(out)) == ["First.csv", "Second.csv"]
+    assert fractions[-1] == 1.0
+    assert pd.read_csv(out / "Second.csv")["c"].tolist() == ["x", "y"]
+
+
+def test_cancel_removes_new_files(tmp_path, small_chunks):
+    path = workbook(tmp_path / "book.xlsx", {
+        "First": [("a",), (1,)],
+        "Second": [("b",)] + [(i,) for i in range(10)],
+    })
+    out = tmp_path / "out"
+    out.mkdir()
+    with pytest.raises(ImportCancelled):
+        excel_to_csv(path, str(out), lambda name, count: f"{name}.csv",
+                     lambda fraction: fraction < 0.6)
+    assert os.listdir(out) == []
+
+
+def test_import_excel_adds_originals_without_replacing(data_manager, tmp_path):
+    path = workbook(tmp_path / "book.xlsx", {
+        "Orders": [("id", "qty"), (1, 3), (2, 5)],
+        "Stores": [("city",), ("Oslo",)],
+    })
+    imported = data_manager.import_excel(path)
+    assert [name for name, _copy in imported] == ["book_Orders.csv", "book_Stores.csv"]
+    assert data_manager.activate_dataset(imported[0][1])
+    assert data_manager.data["qty"].tolist() == [3, 5]
+
+    again = data_manager.import_excel(path)
+    assert not {name for name, _copy in again} & {name for name, _copy in imported}
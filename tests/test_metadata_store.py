@@ -0,0 +1,86 @@
+"""Journaled metadata.json updates and their replay after a crash."""
+
+import json
+import os
+
+import pytest
+
+from ui.metadata_store import JOURNAL_FILENAME, METADATA_FILENAME, WorkspaceMetadata
+
+
+def read_json(workspace):
+    with open(os.path.join(workspace, METADATA_FILENAME)) as f:
+        return json.load(f)
+
+
+def crash(metadata):
+    """Stop ``metadata`` the way a killed session would: no flush."""
+    metadata._timer.stop()
+    metadata.deleteLater()
+
+
+@pytest.fixture
+def metadata(qapp, workspace):
+    return WorkspaceMetadata(workspace)
+
+
+def test_update_is_journaled_before_flush(metadata, workspace):
+    assert metadata.update(active_dataset="copies/a.csv")
+    assert read_json(workspace) == {"name": "Test"}
+    with open(os.path.join(workspace, JOURNAL_FILENAME)) as f:
+        assert [json.loads(line) for line in f] == [{"active_dataset": "copies/a.csv"}]
+
+
+def test_unchanged_update_writes_nothing(metadata, workspace):
+    assert not metadata.update(name="Test")
+    assert not metadata.is_dirty
+    assert not os.path.exists(os.path.join(workspace, JOURNAL_FILENAME))
+
+
+def test_flush_writes_file_and_drops_journal(metadata, workspace):
+    metadata.update(active_dataset="copies/a.csv")
+    metadata.update(settings={"engine": "pyarrow"})
+    metadata.flush()
+    assert read_json(workspace) == {
+        "name": "Test", "active_dataset": "copies/a.csv", "settings": {"engine": "pyarrow"},
+    }
+    assert not os.path.exists(os.path.join(workspace, JOURNAL_FILENAME))
+    assert not metadata.is_dirty
+
+
+def test_flush_keeps_keys_written_elsewhere(metadata, workspace):
+    metadata.update(active_dataset="copies/a.csv")
+    doc = read_json(workspace)
+    doc["name"] = "Renamed"
+    with open(os.path.join(workspace, METADATA_FILENAME), "w") as f:
+        json.dump(doc, f)
+    metadata.flush()
+    assert read_json(workspace) == {"name": "Renamed", "active_dataset": "copies/a.csv"}
+
+
+def test_journal_is_replayed_after_crash(qapp, metadata, workspace):
+    metadata.update(active_dataset="copies/a.csv")
+    metadata.update(active_dataset="copies/b.csv", settings={"compression": "gzip"})
+    crash(metadata)
+    assert read_json(workspace) == {"name": "Test"}
+
+    reopened = WorkspaceMetadata(workspace)
+    assert reopened.get("active_dataset") == "copies/b.csv"
+    assert reopened.get("settings") == {"compression": "gzip"}
+    # Replaying flushes at once: the journal does not outlive the session.
+    assert read_json(workspace) == {
+        "name": "Test", "active_dataset": "copies/b.csv", "settings": {"compression": "gzip"},
+    }
+    assert not os.path.exists(os.path.join(workspace, JOURNAL_FILENAME))
+
+
+def test_torn_journal_line_is_ignored(qapp, metadata, workspace):
+    metadata.update(active_dataset="copies/a.csv")
+    crash(metadata)
+    with open(os.path.join(workspace, JOURNAL_FILENAME), "a") as f:
+        f.write('{"active_dataset": "copies/')  # cut off mid-append
+
+    reopened = WorkspaceMetadata(workspace)
+    assert reopened.get("active_dataset") == "copies/a.csv"
+    assert read_json(workspace)["active_dataset"] == "copies/a.csv"
+
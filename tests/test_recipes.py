@@ -0,0 +1,145 @@
+"""Recipes recorded by saves and replayed headlessly."""
+
+import os
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import run_recipe as runner
+from ui.metadata_store import JOURNAL_FILENAME, METADATA_FILENAME, load_settings
+from ui.operations import apply_operation, make_operation
+from ui.recipes import RecipeError, read_recipe, run_recipe
+
+
+OPERATIONS = [
+    make_operation("missing_values", action="Fill with Mean", column="price"),
+    make_operation("filter_rows", column="city", condition="not equals", value="Rome"),
+    make_operation("numeric_feature", column="qty", method="square", new_name="qty_sq"),
+    make_operation("rename_column", old="price", new="cost"),
+]
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 6],
+        "price": [2.5, None, 4.0, 3.5, 1.0, 8.0],
+        "qty": [3, 1, 4, 1, 5, 9],
+        "city": ["Paris", "Oslo", "Rome", "Paris", "Rome", "Oslo"],
+    })
+
+
+def edit(manager, op):
+    result = apply_operation(manager.data, op)
+    manager.save_state()
+    manager.record_operation(op, result)
+    manager._data = result
+
+
+def save(manager):
+    assert manager.save_workspace_data()
+    manager.flush_saves()
+
+
+@pytest.fixture
+def imported(data_manager, tmp_path):
+    """``(original path, copy)`` of an imported sample, with the copy active."""
+    path = tmp_path / "sample.csv"
+    sample_frame().to_csv(path, index=False)
+    original, copy = data_manager.import_original(str(path))
+    data_manager.activate_dataset(copy)
+    return data_manager._resolve_data_path(f"originals/{original}"), copy
+
+
+@pytest.mark.parametrize("storage", ["csv", "delta", "columns"])
+def test_saves_record_every_step_once(data_manager, imported, storage):
+    data_manager.set_setting('copy_storage', storage)
+    _original, copy = imported
+    for op in OPERATIONS[:2]:
+        edit(data_manager, op)
+    save(data_manager)
+    for op in OPERATIONS[2:]:
+        edit(data_manager, op)
+    # Unsaved edits are part of the recipe as well.
+    assert data_manager.recipe()["steps"] == OPERATIONS
+    save(data_manager)
+
+    recipe = data_manager.recipe(copy)
+    assert recipe["steps"] == OPERATIONS
+    assert recipe["complete"]
+    assert recipe["original"] == f"originals/{data_manager.get_original_for_copy(copy)}"
+
+
+def test_exported_recipe_replays_to_copy(data_manager, imported, tmp_path):
+    original, copy = imported
+    for op in OPERATIONS:
+        edit(data_manager, op)
+    save(data_manager)
+    path = str(tmp_path / "sample.recipe.json")
+    data_manager.export_recipe(path)
+    recipe = read_recipe(path)
+    assert recipe["committed"] == len(OPERATIONS)
+
+    output = str(tmp_path / "out" / "cleaned.csv")
+    done = []
+    result = run_recipe(recipe, original, output, progress=lambda i, total, op: done.append(i))
+    assert done == [1, 2, 3, 4]
+    assert_frame_equal(result, data_manager.data)
+    assert_frame_equal(pd.read_csv(output), pd.read_csv(data_manager._resolve_data_path(copy)))
+
+
+def test_untracked_edit_makes_recipe_incomplete(data_manager, imported, tmp_path):
+    original, _copy = imported
+    edit(data_manager, OPERATIONS[0])
+    data_manager.save_state()
+    data_manager._data = data_manager.data.iloc[::-1]
+    data_manager.mark_untracked()
+    save(data_manager)
+
+    recipe = data_manager.recipe()
+    assert not recipe["complete"]
+    output = str(tmp_path / "cleaned.csv")
+    with pytest.raises(RecipeError):
+        run_recipe(recipe, original, output)
+    assert not os.path.exists(output)
+    run_recipe(recipe, original, output, force=True)
+    assert os.path.exists(output)
+
+
+def test_failing_step_names_the_step(tmp_path):
+    path = tmp_path / "sample.csv"
+    sample_frame().to_csv(path, index=False)
+    recipe = {"steps": [OPERATIONS[0], make_operation("drop_column", column="missing")]}
+    with pytest.raises(RecipeError, match="Step 2"):
+        run_recipe(recipe, str(path), str(tmp_path / "cleaned.csv"))
+
+
+def test_runner_uses_workspace_recipe_and_settings(data_manager, imported, workspace, tmp_path):
+    _original, copy = imported
+    for op in OPERATIONS:
+        edit(data_manager, op)
+    save(data_manager)
+    data_manager.set_setting('engine', 'pandas')  # journaled, not yet flushed
+    journal = os.path.join(workspace, JOURNAL_FILENAME)
+    with open(os.path.join(workspace, METADATA_FILENAME)) as f:
+        metadata = f.read()
+    with open(journal) as f:
+        pending = f.read()
+    assert load_settings(workspace)["engine"] == "pandas"
+
+    output = str(tmp_path / "cleaned.csv")
+    assert runner.main([copy, output, "--workspace", workspace, "--compression", "gzip"]) == 0
+    with open(output, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+    expected = data_manager.data.reset_index(drop=True)
+    assert_frame_equal(pd.read_csv(output, compression="gzip"), expected, check_dtype=False)
+    # Reading the settings left the open workspace's files alone.
+    with open(os.path.join(workspace, METADATA_FILENAME)) as f:
+        assert f.read() == metadata
+    with open(journal) as f:
+        assert f.read() == pending
+
+
+def test_runner_reports_missing_recipe(workspace, tmp_path, capsys):
+    assert runner.main(["copies/none.csv", str(tmp_path / "out.csv"), "--workspace", workspace]) == 1
+    assert "No recipe" in capsys.readouterr().err
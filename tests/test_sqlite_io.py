@@ -0,0 +1,106 @@
+"""Streaming import of SQLite tables, views and queries."""
+
+import io
+import sqlite3
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui.excel_io import ImportCancelled
+from ui.sqlite_io import list_sources, query_to_csv
+
+
+ROWS = 10
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "shop.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE orders (id INTEGER, price REAL, city TEXT, code BLOB)")
+    conn.executemany("INSERT INTO orders VALUES (?, ?, ?, ?)", [
+        (i, None if i % 4 == 0 else i * 1.5, ["Paris", "Oslo", None][i % 3], bytes([i, 255]))
+        for i in range(ROWS)
+    ])
+    conn.execute("CREATE VIEW cheap AS SELECT id, price FROM orders WHERE price < 6")
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def expected_orders():
+    return pd.DataFrame({
+        "id": range(ROWS),
+        "price": [None if i % 4 == 0 else i * 1.5 for i in range(ROWS)],
+        "city": [["Paris", "Oslo", None][i % 3] for i in range(ROWS)],
+        "code": ["0x" + bytes([i, 255]).hex() for i in range(ROWS)],
+    })
+
+
+def test_list_sources(database):
+    assert list_sources(database) == [("orders", "table"), ("cheap", "view")]
+
+
+def test_not_a_database(tmp_path):
+    path = tmp_path / "notes.db"
+    path.write_text("not a database")
+    with pytest.raises(ValueError):
+        list_sources(str(path))
+
+
+def test_chunks_stream_into_one_csv(database, tmp_path):
+    dest = tmp_path / "orders.csv"
+    seen = []
+    written = query_to_csv(database, "SELECT * FROM orders", str(dest), chunk_rows=3,
+                           progress=seen.append)
+    assert written == ROWS
+    assert seen == [3, 6, 9, 10]
+    expected = io.StringIO(expected_orders().to_csv(index=False))
+    assert_frame_equal(pd.read_csv(dest), pd.read_csv(expected))
+
+
+def test_empty_result_keeps_header(database, tmp_path):
+    dest = tmp_path / "none.csv"
+    assert query_to_csv(database, "SELECT id, city FROM orders WHERE id < 0", str(dest)) == 0
+    assert dest.read_text().strip() == "id,city"
+
+
+def test_duplicate_result_names_are_made_unique(database, tmp_path):
+    dest = tmp_path / "pairs.csv"
+    query_to_csv(database, "SELECT a.id, b.id FROM orders a JOIN orders b ON a.id = b.id", str(dest))
+    assert list(pd.read_csv(dest).columns) == ["id", "id.1"]
+
+
+def test_cancel(database, tmp_path):
+    with pytest.raises(ImportCancelled):
+        query_to_csv(database, "SELECT * FROM orders", str(tmp_path / "orders.csv"),
+                     chunk_rows=3, progress=lambda rows: rows < 6)
+
+
+def test_database_is_opened_read_only(database, tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        query_to_csv(database, "DELETE FROM orders RETURNING id", str(tmp_path / "gone.csv"))
+    conn = sqlite3.connect(database)
+    assert conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == ROWS
+    conn.close()
+
+
+def test_import_table_view_and_query(data_manager, database):
+    original, copy = data_manager.import_sqlite(database, table="orders", chunk_rows=4)
+    assert original == "shop_orders.csv"
+    assert data_manager.activate_dataset(copy)
+    assert len(data_manager.data) == ROWS
+    assert list(data_manager.data.columns) == ["id", "price", "city", "code"]
+
+    view, _copy = data_manager.import_sqlite(database, table="cheap")
+    query, copy = data_manager.import_sqlite(
+        database, query="SELECT city, COUNT(*) AS n FROM orders GROUP BY city")
+    assert query == "shop_query.csv"
+    assert data_manager.activate_dataset(copy)
+    assert sorted(data_manager.data["n"]) == [3, 3, 4]
+
+    # Importing again never replaces an earlier original.
+    again, _copy = data_manager.import_sqlite(database, table="orders")
+    assert again not in (original, view, query)
+    assert set(data_manager.get_originals()) >= {original, view, query, again}
@@ -0,0 +1,172 @@
+"""Undo/redo round trips over every registered operation, in memory and spilled to disk."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from pandas.testing import assert_frame_equal
+
+from ui import data_manager as data_manager_module
+from ui.operations import OPERATIONS, apply_operation, make_operation
+from ui.undo_history import frame_buffers
+
+
+SAMPLE_OPERATIONS = [
+    make_operation("rename_column", old="price", new="cost"),
+    make_operation("drop_column", column="city"),
+    make_operation("change_type", column="qty", dtype="float64"),
+    make_operation("set_value", row=2, column="price", value=9.5),
+    make_operation("transform", column="qty", method="Standard Scale"),
+    make_operation("filter_rows", column="price", condition="greater than", value="3"),
+    make_operation("replace_values", find="Paris", replace="Lyon", column="city"),
+    make_operation("handle_outliers", column="price", detection_method="IQR Method",
+                   threshold=1.5, action="Remove outliers"),
+    make_operation("handle_outliers", column="price", detection_method="IQR Method",
+                   threshold=1.5, action="Cap outliers"),
+    make_operation("round_column", column="price", digits=0),
+    make_operation("split_column", column="tags", delimiter="-"),
+    make_operation("unpivot", id_column="id"),
+    make_operation("group_by", column="city", aggregation="mean"),
+    make_operation("missing_values", action="Fill with Mean", column="price"),
+    make_operation("missing_values", action="Drop Rows"),
+    make_operation("drop_duplicates", keep="first"),
+    make_operation("numeric_feature", column="qty", method="square", new_name="qty_sq"),
+    make_operation("encode_categorical", column="city", method="One-Hot Encoding"),
+    make_operation("datetime_features", column="date", features=["year", "month"]),
+    make_operation("combine_columns", columns=["qty", "id"], method="sum", new_name="total"),
+]
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 6, 6, 7, 8, 9],
+        "price": [2.5, np.nan, 4.0, 3.5, 120.0, 5.25, 5.25, np.nan, 1.0, 4.5],
+        "qty": [3, 1, 4, 1, 5, 9, 9, 2, 6, 5],
+        "city": ["Paris", "Oslo", None, "Paris", "Rome", "Oslo", "Oslo", "Rome", "Paris", None],
+        "tags": ["a-b", "c-d", "e-f", "a-b", "c-d", "e-f", "e-f", "a-b", "c-d", "e-f"],
+        "date": ["2021-01-05", "2021-02-10", "2021-03-15", "2021-04-20", "2021-05-25",
+                 "2021-06-30", "2021-06-30", "2021-07-04", "2021-08-09", "2021-09-14"],
+    })
+
+
+def load(manager, tmp_path, frame):
+    """Import ``frame`` as an original and make its working copy current."""
+    path = tmp_path / "sample.csv"
+    frame.to_csv(path, index=False)
+    _original, copy = manager.import_original(str(path))
+    manager.activate_dataset(copy)
+    return manager.data
+
+
+def edit(manager, op):
+    """Apply ``op`` the way the preprocessing panels do."""
+    result = apply_operation(manager.data, op)
+    manager.save_state()
+    manager.record_operation(op, result)
+    manager._data = result
+    return result
+
+
+@pytest.fixture(params=[False, True], ids=["in_memory", "spilled"])
+def manager(request, data_manager, monkeypatch):
+    if request.param:
+        # A one-byte budget spills every entry; leave room for them on disk.
+        monkeypatch.setattr(data_manager_module, "UNDO_DISK_RATIO", 10 ** 9)
+        data_manager.set_setting('undo_memory_mb', 1e-6)
+    data_manager.spill = request.param
+    return data_manager
+
+
+def assert_spilled(manager):
+    if manager.spill:
+        states = [entry[0] for entry in manager.history + manager.redo_stack]
+        # Masks and buffers shared with the current frame stay in memory;
+        # everything else goes to disk.
+        shared = frame_buffers(manager.data)
+        assert all(not state.frame_bytes(shared) for state in states)
+
+
+def storable(frame):
+    """True if Arrow can hold ``frame``, so its undo entry can be spilled."""
+    try:
+        pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return False
+    return True
+
+
+def test_sample_covers_every_operation():
+    assert {op["op"] for op in SAMPLE_OPERATIONS} == set(OPERATIONS)
+
+
+@pytest.mark.parametrize("op", SAMPLE_OPERATIONS,
+                         ids=[f"{op['op']}-{i}" for i, op in enumerate(SAMPLE_OPERATIONS)])
+def test_undo_redo_round_trip(manager, tmp_path, op):
+    before = load(manager, tmp_path, sample_frame()).copy()
+    after = edit(manager, op).copy()
+    assert_spilled(manager)
+
+    manager.undo()
+    assert_frame_equal(manager.data, before)
+    assert manager.operations == []
+    assert_spilled(manager)
+
+    if manager.spill and not storable(after):
+        # e.g. unpivot mixing numbers and text in one column: over budget,
+        # an entry that cannot be spilled is dropped.
+        assert manager.redo_stack == []
+        return
+    manager.redo()
+    assert_frame_equal(manager.data, after)
+    assert manager.operations == [op]
+
+    manager.undo()
+    assert_frame_equal(manager.data, before)
+
+
+def test_undo_redo_chain(manager, tmp_path):
+    ops = [
+        make_operation("missing_values", action="Fill with Median", column="price"),
+        make_operation("filter_rows", column="city", condition="not equals", value="Rome"),
+        make_operation("numeric_feature", column="price", method="log", new_name="log_price"),
+        make_operation("drop_column", column="tags"),
+        make_operation("drop_duplicates", keep="last"),
+        make_operation("rename_column", old="qty", new="quantity"),
+        make_operation("group_by", column="city", aggregation="sum"),
+    ]
+    frames = [load(manager, tmp_path, sample_frame()).copy()]
+    for op in ops:
+        frames.append(edit(manager, op).copy())
+    assert_spilled(manager)
+
+    for depth in range(len(ops), 0, -1):
+        manager.undo()
+        assert_frame_equal(manager.data, frames[depth - 1])
+        assert manager.operations == ops[:depth - 1]
+    for depth in range(1, len(ops) + 1):
+        manager.redo()
+        assert_frame_equal(manager.data, frames[depth])
+        assert manager.operations == ops[:depth]
+    assert_spilled(manager)
+
+
+def test_new_edit_clears_redo(manager, tmp_path):
+    load(manager, tmp_path, sample_frame())
+    edit(manager, make_operation("drop_column", column="tags"))
+    manager.undo()
+    edit(manager, make_operation("drop_column", column="date"))
+    assert manager.redo_stack == []
+    assert "tags" in manager.data.columns
+
+
+def test_shared_snapshot_is_not_spilled(manager, tmp_path):
+    load(manager, tmp_path, sample_frame())
+    manager.save_state()
+    manager.mark_untracked()  # the entry stays a snapshot of the current frame
+    state = manager.history[-1][0]
+    assert not state.spilled
+    assert manager.history_usage()[0] == 0
+
+    edit(manager, make_operation("round_column", column="price", digits=0))
+    assert state.spilled == manager.spill
+    assert_spilled(manager)